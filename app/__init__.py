@@ -16,6 +16,26 @@ app.secret_key = b'_5#y2L"F6Q7z\n\xec]/'
 # Establecer duración de la sesión, 15 minutos
 app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(minutes=15)
 
+# una conexion y una transaccion de base de datos por request
+from app.conexion.Sesion import iniciarSesiones
+iniciarSesiones(app)
+
+# lecturas @soloLectura contra la replica (DB_REPLICA_DSN / DB_REPLICA_HOST)
+from app.conexion.Replica import iniciarReplica
+iniciarReplica(app)
+
+# statement_timeout / lock_timeout / max_filas por endpoint; 503 o 413 si se exceden
+from app.conexion.Presupuesto import iniciarPresupuestos
+iniciarPresupuestos(app)
+
+# LISTEN cambios_tablas: descarta la cache cuando otro worker escribe (DB_ESCUCHAR_CAMBIOS)
+from app.conexion.Notificaciones import iniciarEscuchaCambios
+iniciarEscuchaCambios(app)
+
+# reporte de conexiones y cursores sin cerrar (DB_RASTREAR_FUGAS=1)
+from app.conexion.Rastreador import iniciarRastreo
+iniciarRastreo(app)
+
 # importar modulo de seguridad
 from app.rutas.login.login_routes import logmod
 app.register_blueprint(logmod)
@@ -144,6 +164,8 @@ from app.rutas.referenciales.dia.dia_api import diaapi
 from app.rutas.referenciales.duracion_consulta.duracion_consulta_api import duraconsuapi
 #turno
 from app.rutas.referenciales.turno.turno_api import turnoapi
+#referenciales genericas (CRUD y cargas por lote de todas las tablas del catalogo)
+from app.rutas.referenciales.generico.referencial_api import referencialapi
 
 
 
@@ -155,6 +177,9 @@ from app.rutas.Agendamiento.agendmedica.agenda_api import agendaapi
 from app.rutas.Agendamiento.regispaciente.registrarp_api import pacienteapi
 from app.rutas.Agendamiento.medico.medico_api import medicoapi
 from app.rutas.Agendamiento.personal.personal_api import personalapi
+from app.rutas.Agendamiento.slots.slots_api import slotsapi
+from app.rutas.Agendamiento.calendario.calendario_api import calendarioapi
+from app.rutas.Agendamiento.listaEspera.lista_espera_api import listaesperaapi
 
 from app.rutas.Agendamiento.avisosRecordatorios.AvisosRecordatorio_api import avisoapi
 from app.rutas.Agendamiento.ficha_medica.ficha_medica_api import fichaapi
@@ -173,6 +198,9 @@ from app.rutas.ModuloConsultorio.RegisConsulta.consulta_api import consultasapi
 from app.rutas.ModuloConsultorio.RegisDiagnostico.diagnostico_api import Rdiagnosticoapi
 from app.rutas.ModuloConsultorio.RegisTratamiento.tratamiento_api import tratamientoapi
 
+#diagnostico de conexiones
+from app.rutas.debug.debug_api import debugapi
+
 # APIS v1
 #Ciudad
 version1 = '/api/v1'
@@ -231,6 +259,8 @@ app.register_blueprint(duraconsuapi, url_prefix=version1)
 #turno
 app.register_blueprint(turnoapi, url_prefix=version1)
 
+app.register_blueprint(referencialapi, url_prefix=version1)
+
 version1 = '/api/v1'
 app.register_blueprint(odontogramaapi, url_prefix=version1)
 # Cita
@@ -240,6 +270,9 @@ app.register_blueprint(regiscitaapi, url_prefix=version1)
 
 version1 = '/api/v1'
 app.register_blueprint(agendaapi, url_prefix=version1)
+app.register_blueprint(slotsapi, url_prefix=version1)
+app.register_blueprint(calendarioapi, url_prefix=version1)
+app.register_blueprint(listaesperaapi, url_prefix=version1)
 
 version1 = '/api/v1'
 app.register_blueprint(pacienteapi, url_prefix=version1)
@@ -279,6 +312,9 @@ app.register_blueprint(consultasapi, url_prefix=version1)
 version1 = '/api/v1'
 app.register_blueprint(Rdiagnosticoapi, url_prefix=version1)
 
+#diagnostico de conexiones
+app.register_blueprint(debugapi, url_prefix=version1)
+
 @app.route('/login')
 def login():
     return render_template('login-index.html')
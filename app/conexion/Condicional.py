@@ -0,0 +1,95 @@
+"""GET condicional (ETag / Last-Modified / 304) a partir de versiones_tablas.
+
+    Los triggers de sql/03_versiones_tablas.sql suben la version de una
+    tabla en cada INSERT/UPDATE/DELETE, en la misma transaccion que el
+    cambio. Una vista marcada con @condicional('medico', 'ciudad') lee las
+    versiones de las tablas de su consulta (una busqueda por clave primaria)
+    y, si el navegador ya tiene esa version, responde 304 sin ejecutar la
+    consulta del listado.
+
+    Si alguna tabla no tiene version (script sin ejecutar) la vista responde
+    como siempre, sin ETag: nunca se arriesga un 304 con datos viejos.
+"""
+import functools
+import hashlib
+from flask import request, make_response, current_app
+from app.conexion.Conexion import Conexion
+
+VERSIONES_SQL = "SELECT tabla, version, modificado FROM versiones_tablas WHERE tabla = ANY(%s)"
+
+
+def versionesDe(tablas):
+    """{tabla: (version, modificado)} de las tablas que tienen version."""
+    con = Conexion().getConexion()
+    cur = con.cursor()
+    try:
+        cur.execute(VERSIONES_SQL, (list(tablas),))
+        return {tabla: (version, modificado) for tabla, version, modificado in cur.fetchall()}
+    except Exception:
+        con.rollback()
+        raise
+    finally:
+        cur.close()
+        con.close()
+
+
+def _validadores(tablas):
+    """(etag, ultima_modificacion) de la combinacion de tablas, o None."""
+    try:
+        versiones = versionesDe(tablas)
+    except Exception as e:
+        current_app.logger.warning(f"Sin versiones de tablas, se responde sin ETag: {str(e)}")
+        return None
+    if len(versiones) < len(tablas):
+        return None
+    firma = ','.join(f"{tabla}:{versiones[tabla][0]}" for tabla in tablas)
+    etag = hashlib.sha1(firma.encode('utf-8')).hexdigest()[:32]
+    return etag, max(modificado for _, modificado in versiones.values())
+
+
+def respuestaCondicional(tablas, generar):
+    """Responde 304 si el cliente tiene la version actual de `tablas`; si no, llama a generar().
+
+        A las respuestas 200 les agrega ETag, Last-Modified y
+        Cache-Control: no-cache (el navegador guarda y revalida siempre).
+    """
+    tablas = list(dict.fromkeys(tablas))
+    validadores = _validadores(tablas)
+    if validadores is None:
+        return generar()
+    etag, modificado = validadores
+
+    if request.if_none_match:
+        vigente = request.if_none_match.contains(etag)
+    else:
+        # la fecha HTTP no tiene fracciones: se compara con `modificado`
+        # completo, asi un cambio en el mismo segundo que la respuesta
+        # anterior nunca da 304. Sin ETag esto solo revalida cambios hechos
+        # en un segundo exacto; los navegadores mandan If-None-Match
+        desde = request.if_modified_since
+        vigente = desde is not None and modificado <= desde
+    if vigente:
+        response = current_app.response_class(status=304)
+    else:
+        response = make_response(generar())
+        if response.status_code != 200:
+            return response
+    response.set_etag(etag)
+    response.last_modified = modificado
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def condicional(*tablas):
+    """Decorador de vistas GET cuya respuesta depende solo del contenido de `tablas`.
+
+        En lugar de los nombres puede recibir una funcion que los calcula a
+        partir de los argumentos de la ruta: @condicional(lambda tabla, **_: [tabla])
+    """
+    def decorador(vista):
+        @functools.wraps(vista)
+        def envoltura(*args, **kwargs):
+            nombres = tablas[0](**kwargs) if callable(tablas[0]) else tablas
+            return respuestaCondicional(nombres, lambda: vista(*args, **kwargs))
+        return envoltura
+    return decorador
@@ -1,22 +1,168 @@
+import contextvars
+import functools
+import os
+import threading
 import psycopg2
+from app.conexion.PoolConexion import PoolConexion
+from app.conexion.Sesion import sesionActual
+from app.conexion.Rastreador import rastreador
+from app.conexion.Presupuesto import CursorPresupuesto, aplicarPresupuesto
+
+# https://www.psycopg.org/docs/extensions.html#psycopg2.extensions.parse_dsn
+# Los valores por defecto son los de desarrollo; en produccion se sobreescriben con variables de entorno.
+PARAMETROS_DB = {
+    'dbname': os.environ.get('DB_NAME', 'agendamiento'),
+    'user': os.environ.get('DB_USER', 'postgres'),
+    'password': os.environ.get('DB_PASSWORD', '12345678'),
+    'host': os.environ.get('DB_HOST', '127.0.0.1'),
+    'port': int(os.environ.get('DB_PORT', 5432)),
+}
+# un DSN completo ("host=... dbname=..." o "postgresql://...") tiene prioridad
+if os.environ.get('DB_DSN'):
+    PARAMETROS_DB.update(psycopg2.extensions.parse_dsn(os.environ['DB_DSN']))
+
+CONFIG_POOL = {
+    'minconn': int(os.environ.get('DB_POOL_MIN', 1)),
+    'maxconn': int(os.environ.get('DB_POOL_MAX', 20)),
+    'timeout': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+    'validar_despues': float(os.environ.get('DB_POOL_VALIDAR_DESPUES', 30)),
+}
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+# True mientras corre un metodo marcado con @soloLectura
+_solo_lectura = contextvars.ContextVar('solo_lectura', default=False)
+
+
+def getPool():
+    """Retorna el pool del proceso, creandolo la primera vez.
+
+        Si el proceso se bifurco (gunicorn --preload) se crea un pool nuevo,
+        ya que los sockets del padre no se pueden compartir.
+    """
+    global _pool, _pool_pid
+    pid = os.getpid()
+    if _pool is not None and _pool_pid == pid:
+        return _pool
+    with _pool_lock:
+        if _pool is None or _pool_pid != pid:
+            _pool = PoolConexion(**CONFIG_POOL, **PARAMETROS_DB, cursor_factory=CursorPresupuesto)
+            _pool_pid = pid
+    return _pool
+
+
+class ConexionPrestada:
+
+    """Envoltorio de una conexion del pool.
+
+        Se comporta como la conexion de psycopg2, pero close() la devuelve
+        al pool en lugar de cerrar el socket.
+    """
+    def __init__(self, pool):
+        self._pool = pool
+        self._con = pool.obtenerConexion()
+        rastreador.registrar(self, 'conexion')
+        try:
+            aplicarPresupuesto(self)
+        except Exception:
+            self.close()
+            raise
+
+    def cursor(self, *args, **kwargs):
+        cur = self.__getattr__('cursor')(*args, **kwargs)
+        rastreador.registrar(cur, 'cursor')
+        return cur
+
+    def __getattr__(self, nombre):
+        con = self.__dict__.get('_con')
+        if con is None:
+            raise psycopg2.InterfaceError("la conexion ya fue devuelta al pool")
+        return getattr(con, nombre)
+
+    def close(self):
+        con = self.__dict__.pop('_con', None)
+        if con is not None:
+            rastreador.liberar(self)
+            self._pool.devolverConexion(con)
+
+    @property
+    def closed(self):
+        con = self.__dict__.get('_con')
+        return 1 if con is None else con.closed
+
+    def __del__(self):
+        # red de seguridad para los DAO que nunca llaman a close()
+        try:
+            self.close()
+        except Exception:
+            pass
+
 
 class Conexion:
 
     """Metodo constructor
+
+        dentro de un request se une a la sesion del request (una conexion y
+        una transaccion por request); fuera de un request toma prestada una
+        conexion del pool del proceso. Dentro de un metodo @soloLectura usa
+        la replica si el enrutador lo permite.
     """
     def __init__(self):
-        # https://www.psycopg.org/docs/extensions.html#psycopg2.extensions.parse_dsn
-        dbname = "agendamiento"
-        user = "postgres"
-        password = "12345678"
-        host = "127.0.0.1"
-        port = 5432
-        #self.con = psycopg2.connect("dbname=agendamiento user=Postgres host=localhost password=12345678")
-        self.con = psycopg2.connect(dbname=dbname, user=user, password=password, host=host, port=port)
+        if _solo_lectura.get():
+            # Replica necesita PARAMETROS_DB y ConexionPrestada de este modulo
+            from app.conexion.Replica import enrutadorReplica
+            con = enrutadorReplica.conexionLectura()
+            if con is not None:
+                self.con = con
+                return
+        sesion = sesionActual()
+        if sesion is not None:
+            self.con = sesion.unirse()
+        else:
+            self.con = ConexionPrestada(getPool())
 
     """getConexion
 
         retorna la instancia de la base de datos
     """
     def getConexion(self):
-        return self.con
\ No newline at end of file
+        return self.con
+
+
+def usaConexion(metodo):
+    """Decorador para los DAO que trabajan con self.conn.
+
+        Toma la conexion al entrar al metodo y la cierra al salir, aunque el
+        metodo retorne antes o lance una excepcion. Las llamadas anidadas
+        (p.ej. una validacion dentro de un insert) reutilizan la misma conexion.
+    """
+    @functools.wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        if self.conn is not None:
+            return metodo(self, *args, **kwargs)
+        self.conn = Conexion().getConexion()
+        try:
+            return metodo(self, *args, **kwargs)
+        finally:
+            con, self.conn = self.conn, None
+            con.close()
+    return envoltura
+
+
+def soloLectura(metodo):
+    """Decorador para los metodos DAO que solo consultan.
+
+        Sus conexiones pueden salir de la replica (ver app.conexion.Replica);
+        si no esta configurada, atrasada o caida, se usa el primario como
+        siempre. Va por fuera de @usaConexion.
+    """
+    @functools.wraps(metodo)
+    def envoltura(*args, **kwargs):
+        token = _solo_lectura.set(True)
+        try:
+            return metodo(*args, **kwargs)
+        finally:
+            _solo_lectura.reset(token)
+    return envoltura
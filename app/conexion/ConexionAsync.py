@@ -0,0 +1,125 @@
+import asyncio
+import contextvars
+import os
+from datetime import date, datetime, time
+from decimal import Decimal
+import asyncpg
+from app.conexion.Conexion import PARAMETROS_DB
+from app.conexion.MapeoFilas import compilarMapeador
+from app.conexion.Paginacion import LIMITE_DEFECTO
+from app.conexion.Presupuesto import FilasExcedidasError, limitarFilas
+from app.conexion.Sentencias import convertirMarcadores
+
+CONFIG_POOL_ASYNC = {
+    'min_size': int(os.environ.get('DB_ASYNC_POOL_MIN', 2)),
+    'max_size': int(os.environ.get('DB_ASYNC_POOL_MAX', 50)),
+    'timeout': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+    # asyncpg prepara y guarda por conexion cada consulta que ejecuta con con.fetch()
+    'statement_cache_size': int(os.environ.get('DB_ASYNC_CACHE_SENTENCIAS', 200)),
+}
+
+# parametros que llegan como texto (query string, cursor de paginacion) y
+# asyncpg exige con su tipo de Python; psycopg2 los mandaba sin tipo
+CONVERSION_PARAMETROS = {
+    'date': date.fromisoformat,
+    'time': time.fromisoformat,
+    'timestamp': datetime.fromisoformat,
+    'timestamptz': datetime.fromisoformat,
+    'int2': int,
+    'int4': int,
+    'int8': int,
+    'numeric': Decimal,
+}
+
+_pool = None
+_pool_pid = None
+_pool_lock = None
+
+# presupuesto (Presupuesto.presupuestoDeEndpoint) de la lectura en curso; lo fija la aplicacion ASGI
+presupuestoAsync = contextvars.ContextVar('presupuesto_async', default=None)
+
+
+async def getPoolAsync():
+    """Pool de asyncpg del proceso, creado la primera vez dentro del event loop.
+
+        Es independiente del pool de psycopg2: lo usan solo las lecturas que
+        se sirven por la aplicacion ASGI.
+    """
+    global _pool, _pool_pid, _pool_lock
+    pid = os.getpid()
+    if _pool is not None and _pool_pid == pid:
+        return _pool
+    if _pool_lock is None or _pool_pid != pid:
+        _pool_lock = asyncio.Lock()
+        _pool_pid = pid
+        _pool = None
+    async with _pool_lock:
+        if _pool is None:
+            parametros = dict(PARAMETROS_DB)
+            parametros['database'] = parametros.pop('dbname')
+            _pool = await asyncpg.create_pool(**parametros, **CONFIG_POOL_ASYNC)
+    return _pool
+
+
+async def cerrarPoolAsync():
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        await pool.close()
+
+
+# sql -> (tipos de los parametros, nombres de las columnas); lo fija el
+# servidor y no cambia, se averigua con la primera ejecucion de cada consulta
+_firmas = {}
+
+
+def _adaptarParametros(tipos, params):
+    adaptados = []
+    for tipo, valor in zip(tipos, params):
+        convertir = CONVERSION_PARAMETROS.get(tipo)
+        if convertir is not None and isinstance(valor, str):
+            valor = convertir(valor)
+        adaptados.append(valor)
+    return adaptados
+
+
+async def consultarAsync(sql, params=()):
+    """Ejecuta `sql` (con %s como en psycopg2) y retorna (columnas, filas).
+
+        Las filas son Record de asyncpg, que se indexan por posicion igual que
+        las tuplas de psycopg2, asi sirven los mapeadores compilados.
+        con.fetch() usa la cache de sentencias de la conexion; solo la primera
+        vez que el proceso ve una consulta se prepara aparte para conocer los
+        tipos de sus parametros.
+    """
+    presupuesto = presupuestoAsync.get() or {}
+    maximo = presupuesto.get('max_filas')
+    sql_pg, _ = convertirMarcadores(limitarFilas(sql.strip().rstrip(';'), maximo))
+    pool = await getPoolAsync()
+    async with pool.acquire() as con:
+        firma = _firmas.get(sql_pg)
+        if firma is None:
+            sentencia = await con.prepare(sql_pg)
+            firma = _firmas[sql_pg] = ([t.name for t in sentencia.get_parameters()],
+                                       [a.name for a in sentencia.get_attributes()])
+        tipos, columnas = firma
+        # statement_timeout como timeout de asyncpg: al vencer cancela la consulta en el servidor
+        timeout = presupuesto.get('statement_timeout')
+        filas = await con.fetch(sql_pg, *_adaptarParametros(tipos, params),
+                                timeout=timeout / 1000 if timeout else None)
+    if maximo is not None and len(filas) > maximo:
+        raise FilasExcedidasError(f"La consulta devolvio mas de {maximo} filas.")
+    return columnas, filas
+
+
+async def filasAsync(sql, params=(), convertir=None):
+    """Version async de cur.execute + filasComoDicts."""
+    columnas, filas = await consultarAsync(sql, params)
+    return list(map(compilarMapeador(columnas, convertir), filas))
+
+
+async def paginaAsync(keyset, sql, params=(), limite=LIMITE_DEFECTO, cursor=None, convertir=None, conector="WHERE"):
+    """Version async de Keyset.consultar."""
+    consulta, parametros = keyset.armarConsulta(sql, params, limite, cursor, conector)
+    columnas, filas = await consultarAsync(consulta, parametros)
+    return keyset.armarPagina(filas, columnas, limite, compilarMapeador(columnas, convertir))
@@ -0,0 +1,77 @@
+import threading
+
+# ============================
+# CONVERSIONES
+# ============================
+
+def fechaISO(valor):
+    """date -> 'YYYY-MM-DD' (None y vacios quedan igual)."""
+    return valor.isoformat() if valor else valor
+
+
+def horaHHMM(valor):
+    """time -> 'HH:MM' (None y vacios quedan igual)."""
+    return valor.strftime("%H:%M") if valor else valor
+
+
+def horaHHMMSS(valor):
+    """time -> 'HH:MM:SS' (None y vacios quedan igual)."""
+    return valor.strftime("%H:%M:%S") if valor else valor
+
+
+# ============================
+# MAPEADORES COMPILADOS
+# ============================
+
+_mapeadores = {}
+_lock = threading.Lock()
+
+
+def compilarMapeador(columnas, convertir=None):
+    """Retorna una funcion fila -> dict para estas columnas.
+
+        En lugar de dict(zip(columnas, fila)) por cada fila, se genera una vez
+        por forma de consulta una funcion con el literal del dict y los indices
+        fijos, p.ej. lambda f: {'id_ciudad': f[0], 'fecha': _c1(f[1])}.
+        convertir: {columna: funcion} aplicada al valor dentro del mismo literal.
+    """
+    convertir = convertir or {}
+    clave = (tuple(columnas), tuple(sorted((c, id(f)) for c, f in convertir.items())))
+    mapeador = _mapeadores.get(clave)
+    if mapeador is not None:
+        return mapeador
+
+    entorno = {}
+    campos = []
+    for i, columna in enumerate(columnas):
+        funcion = convertir.get(columna)
+        if funcion is None:
+            campos.append(f"{columna!r}: f[{i}]")
+        else:
+            nombre = f"_c{i}"
+            entorno[nombre] = funcion
+            campos.append(f"{columna!r}: {nombre}(f[{i}])")
+    codigo = "def mapear(f):\n    return {" + ", ".join(campos) + "}\n"
+    exec(compile(codigo, "<mapeador>", "exec"), entorno)
+    mapeador = entorno['mapear']
+
+    with _lock:
+        mapeador = _mapeadores.setdefault(clave, mapeador)
+    return mapeador
+
+
+def mapeadorDe(cur, convertir=None):
+    """Mapeador compilado para las columnas del ultimo execute del cursor."""
+    return compilarMapeador([d[0] for d in cur.description], convertir)
+
+
+def filasComoDicts(cur, filas, convertir=None):
+    """Reemplazo de [dict(zip(columnas, row)) for row in rows]."""
+    return list(map(mapeadorDe(cur, convertir), filas))
+
+
+def filaComoDict(cur, fila, convertir=None):
+    """Reemplazo de dict(zip(columnas, row)); retorna None si no hay fila."""
+    if fila is None:
+        return None
+    return mapeadorDe(cur, convertir)(fila)
@@ -0,0 +1,143 @@
+"""Avisos de cambios entre workers con LISTEN/NOTIFY.
+
+    Los triggers de sql/02_notificar_cambios.sql publican cada escritura en
+    las tablas referenciales y maestras por el canal cambios_tablas. Cada
+    proceso tiene un hilo que escucha ese canal y llama a las funciones
+    registradas con suscribirCambios(), que descartan lo que haya en cache.
+"""
+import json
+import os
+import select
+import threading
+import psycopg2
+import psycopg2.extensions
+
+CANAL_CAMBIOS = 'cambios_tablas'
+
+CONFIG_ESCUCHA = {
+    'activa': os.environ.get('DB_ESCUCHAR_CAMBIOS', 'True') == 'True',
+    # cada cuanto se revisa si hay que detener el hilo mientras no llegan avisos
+    'espera': float(os.environ.get('DB_ESCUCHA_ESPERA', 5)),
+    # segundos antes de reconectar si se pierde la conexion
+    'reintentar_despues': float(os.environ.get('DB_ESCUCHA_REINTENTAR', 5)),
+}
+
+# [(funcion(tabla, operacion[, aviso]), al_reconectar o None, detalle)]
+_suscripciones = []
+
+
+def suscribirCambios(funcion, al_reconectar=None, detalle=False):
+    """Registra `funcion(tabla, operacion)` para cada aviso del canal.
+
+        al_reconectar() se llama cada vez que el hilo (re)abre su conexion:
+        los avisos enviados mientras no se escuchaba se pierden, asi que hay
+        que descartar todo lo que la cache tenga.
+
+        Con detalle=True se llama funcion(tabla, operacion, aviso) con el
+        JSON completo (los triggers por fila agregan id_medico, fecha, etc.).
+    """
+    _suscripciones.append((funcion, al_reconectar, detalle))
+
+
+class EscuchaCambios(threading.Thread):
+
+    """Hilo que mantiene una conexion propia (fuera del pool) con LISTEN."""
+    def __init__(self, parametros, logger, canal=CANAL_CAMBIOS, suscripciones=None, config=None):
+        super().__init__(name=f'escucha-{canal}', daemon=True)
+        self.parametros = parametros
+        self.logger = logger
+        self.canal = canal
+        self.suscripciones = _suscripciones if suscripciones is None else suscripciones
+        self.config = dict(CONFIG_ESCUCHA, **(config or {}))
+        self.escuchando = threading.Event()
+        self._detener = threading.Event()
+        self._stats = {'avisos': 0, 'reconexiones': 0, 'errores': 0}
+
+    def detener(self):
+        self._detener.set()
+
+    def run(self):
+        while not self._detener.is_set():
+            try:
+                self._escuchar()
+            except Exception as e:
+                self._stats['errores'] += 1
+                self.logger.warning(f"Escucha de {self.canal} interrumpida, se reintenta: {str(e)}")
+            self.escuchando.clear()
+            self._detener.wait(self.config['reintentar_despues'])
+
+    def _escuchar(self):
+        con = psycopg2.connect(**self.parametros)
+        try:
+            con.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            cur = con.cursor()
+            try:
+                cur.execute(f"LISTEN {self.canal}")
+            finally:
+                cur.close()
+            self._stats['reconexiones'] += 1
+            for _, al_reconectar, _ in self.suscripciones:
+                if al_reconectar is not None:
+                    al_reconectar()
+            self.escuchando.set()
+            while not self._detener.is_set():
+                if select.select([con], [], [], self.config['espera']) == ([], [], []):
+                    continue
+                con.poll()
+                while con.notifies:
+                    self._procesar(con.notifies.pop(0).payload)
+        finally:
+            con.close()
+
+    def _procesar(self, payload):
+        self._stats['avisos'] += 1
+        try:
+            aviso = json.loads(payload)
+            tabla, operacion = aviso['tabla'], aviso.get('op')
+        except (ValueError, KeyError, TypeError):
+            self.logger.warning(f"Aviso invalido en {self.canal}: {payload!r}")
+            return
+        for funcion, _, detalle in self.suscripciones:
+            try:
+                if detalle:
+                    funcion(tabla, operacion, aviso)
+                else:
+                    funcion(tabla, operacion)
+            except Exception as e:
+                self.logger.error(f"Error al procesar el cambio de {tabla}: {str(e)}")
+
+    def getEstadisticas(self):
+        return dict(self._stats, canal=self.canal, escuchando=self.escuchando.is_set())
+
+
+_escucha = None
+_escucha_pid = None
+_escucha_lock = threading.Lock()
+
+
+def escuchaActual():
+    """Hilo de escucha de este proceso, o None si todavia no se inicio."""
+    return _escucha if _escucha_pid == os.getpid() else None
+
+
+def iniciarEscuchaCambios(app):
+    """Arranca el hilo de escucha con el primer request de cada proceso.
+
+        No se arranca al importar: con gunicorn --preload el hilo del
+        proceso padre no existe en los workers bifurcados.
+    """
+    if not CONFIG_ESCUCHA['activa']:
+        return
+
+    @app.before_request
+    def _asegurarEscucha():
+        global _escucha, _escucha_pid
+        pid = os.getpid()
+        if _escucha_pid == pid:
+            return
+        with _escucha_lock:
+            if _escucha_pid != pid:
+                from app.conexion.Conexion import PARAMETROS_DB
+                _escucha = EscuchaCambios(PARAMETROS_DB, app.logger)
+                _escucha.start()
+                _escucha_pid = pid
@@ -0,0 +1,117 @@
+import base64
+import json
+from flask import request
+from app.conexion.MapeoFilas import mapeadorDe
+
+LIMITE_DEFECTO = 50
+LIMITE_MAXIMO = 500
+
+
+class PaginaInvalidaError(ValueError):
+    """limit o cursor mal formados; las API lo responden como 400."""
+
+
+class Keyset:
+
+    """Paginacion por clave (keyset / seek) para un listado.
+
+        En lugar de OFFSET, cada pagina continua despues de la ultima fila de
+        la anterior con WHERE (fecha, hora, id) < (%s, %s, %s), por lo que con
+        el indice compuesto correspondiente la pagina N cuesta lo mismo que la 1.
+        columnas: [(expresion_sql, columna_del_resultado)], de la mas a la menos
+        significativa; la ultima debe ser unica (el id) y ninguna puede ser NULL.
+    """
+    def __init__(self, nombre, columnas, descendente=True):
+        self.nombre = nombre
+        self.expresiones = [c[0] for c in columnas]
+        self.claves = [c[1] for c in columnas]
+        self.descendente = descendente
+        direccion = "DESC" if descendente else "ASC"
+        self.orden = " ORDER BY " + ", ".join(f"{e} {direccion}" for e in self.expresiones)
+
+    # ============================
+    # CURSOR OPACO
+    # ============================
+
+    def crearCursor(self, valores):
+        crudo = json.dumps([self.nombre, list(valores)], default=lambda v: v.isoformat(), separators=(',', ':'))
+        return base64.urlsafe_b64encode(crudo.encode()).decode().rstrip('=')
+
+    def leerCursor(self, token):
+        try:
+            relleno = '=' * (-len(token) % 4)
+            nombre, valores = json.loads(base64.urlsafe_b64decode(token + relleno))
+        except Exception:
+            raise PaginaInvalidaError("El cursor de paginación no es válido.")
+        if nombre != self.nombre or not isinstance(valores, list) or len(valores) != len(self.claves):
+            raise PaginaInvalidaError("El cursor de paginación no corresponde a este listado.")
+        return valores
+
+    # ============================
+    # CONSULTA
+    # ============================
+
+    def filtro(self, valores, conector="WHERE"):
+        """Condicion de busqueda para continuar despues de `valores`.
+
+            Los valores viajan como texto en el cursor; PostgreSQL los convierte
+            al tipo de cada columna al compararlos con la fila.
+        """
+        operador = "<" if self.descendente else ">"
+        marcadores = ", ".join(["%s"] * len(valores))
+        return f" {conector} ({', '.join(self.expresiones)}) {operador} ({marcadores})", list(valores)
+
+    def armarConsulta(self, sql, params=(), limite=LIMITE_DEFECTO, cursor=None, conector="WHERE"):
+        """SQL y parametros de una pagina: filtro del cursor, ORDER BY y LIMIT."""
+        params = list(params)
+        if cursor:
+            condicion, valores = self.filtro(self.leerCursor(cursor), conector)
+            sql = sql.rstrip() + condicion
+            params += valores
+        # se pide una fila de mas para saber si hay pagina siguiente
+        return sql.rstrip() + self.orden + " LIMIT %s", params + [limite + 1]
+
+    def armarPagina(self, filas, columnas, limite, mapear):
+        """{'data', 'paginacion'} a partir de las filas de armarConsulta."""
+        siguiente = None
+        if len(filas) > limite:
+            filas = filas[:limite]
+            # el cursor se arma con los valores crudos, antes de las conversiones a texto
+            ultima = filas[-1]
+            siguiente = self.crearCursor([ultima[columnas.index(c)] for c in self.claves])
+        return {
+            'data': list(map(mapear, filas)),
+            'paginacion': {'limite': limite, 'siguiente': siguiente},
+        }
+
+    def consultar(self, cur, sql, params=(), limite=LIMITE_DEFECTO, cursor=None, convertir=None, conector="WHERE"):
+        """Ejecuta `sql` (sin ORDER BY) paginado y retorna {'data', 'paginacion'}.
+
+            conector: "AND" si `sql` ya tiene su propio WHERE.
+        """
+        cur.execute(*self.armarConsulta(sql, params, limite, cursor, conector))
+        filas = cur.fetchall()
+        columnas = [d[0] for d in cur.description]
+        return self.armarPagina(filas, columnas, limite, mapeadorDe(cur, convertir))
+
+
+def leerPagina(args=None):
+    """Lee ?limit=&cursor= del request (o de `args`, p.ej. en la aplicacion ASGI).
+
+        Retorna None si no se pidio paginacion (el listado sale completo, como
+        antes) o (limite, cursor). Lanza PaginaInvalidaError si limit no es valido.
+    """
+    args = request.args if args is None else args
+    limite = args.get('limit')
+    cursor = args.get('cursor')
+    if limite is None and cursor is None:
+        return None
+    if limite is None:
+        limite = LIMITE_DEFECTO
+    try:
+        limite = int(limite)
+    except (TypeError, ValueError):
+        raise PaginaInvalidaError("El parámetro limit debe ser un número entero.")
+    if limite < 1:
+        raise PaginaInvalidaError("El parámetro limit debe ser mayor a cero.")
+    return min(limite, LIMITE_MAXIMO), cursor or None
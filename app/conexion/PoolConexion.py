@@ -0,0 +1,194 @@
+import threading
+import time
+import psycopg2
+from psycopg2 import extensions
+from app.conexion.Sentencias import sentencias
+
+
+class PoolAgotadoError(Exception):
+    """Se lanza cuando no se consigue una conexion libre dentro del timeout."""
+    pass
+
+
+class PoolConexion:
+
+    """Pool de conexiones thread-safe compartido por todo el proceso.
+
+        minconn: conexiones que se abren al iniciar y se mantienen abiertas
+        maxconn: tope de conexiones simultaneas contra PostgreSQL
+        timeout: segundos que espera un hilo por una conexion libre
+        validar_despues: segundos de inactividad a partir de los cuales
+            se ejecuta un SELECT 1 antes de prestar la conexion
+    """
+    def __init__(self, minconn=1, maxconn=10, timeout=10, validar_despues=30, **parametros):
+        if minconn < 0 or maxconn < 1 or minconn > maxconn:
+            raise ValueError("Configuracion de pool invalida: se requiere 0 <= minconn <= maxconn y maxconn >= 1")
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.validar_despues = validar_despues
+        self._parametros = parametros
+
+        self._lock = threading.Condition(threading.Lock())
+        self._libres = []       # lista de (conexion, instante en que se devolvio)
+        self._en_uso = set()
+        self._abiertas = 0
+        self._cerrado = False
+
+        self._stats = {
+            'creadas': 0,
+            'descartadas': 0,
+            'prestamos': 0,
+            'devoluciones': 0,
+            'esperas': 0,
+            'timeouts': 0,
+            'validaciones_fallidas': 0,
+            'tiempo_espera_total': 0.0,
+        }
+
+        for _ in range(minconn):
+            con = self._crear()
+            self._libres.append((con, time.monotonic()))
+
+    # ============================
+    # INTERNOS
+    # ============================
+
+    def _crear(self):
+        con = psycopg2.connect(**self._parametros)
+        self._abiertas += 1
+        self._stats['creadas'] += 1
+        return con
+
+    def _descartar(self, con):
+        self._abiertas -= 1
+        self._stats['descartadas'] += 1
+        try:
+            con.close()
+        except Exception:
+            pass
+
+    def _esSana(self, con, inactiva_desde):
+        """Health check: descarta conexiones cerradas y valida las que
+        estuvieron inactivas mas de `validar_despues` segundos."""
+        if con.closed:
+            return False
+        if self.validar_despues is None or time.monotonic() - inactiva_desde < self.validar_despues:
+            return True
+        try:
+            cur = con.cursor()
+            try:
+                cur.execute("SELECT 1")
+                cur.fetchone()
+            finally:
+                cur.close()
+            con.rollback()
+            return True
+        except Exception:
+            return False
+
+    # ============================
+    # API PUBLICA
+    # ============================
+
+    def obtenerConexion(self):
+        """Presta una conexion sana; espera hasta `timeout` segundos si el pool esta lleno."""
+        inicio = time.monotonic()
+        limite = inicio + self.timeout
+        espero = False
+        while True:
+            candidata = None
+            reservar = False
+            with self._lock:
+                while True:
+                    if self._cerrado:
+                        raise PoolAgotadoError("El pool de conexiones esta cerrado")
+                    if self._libres:
+                        candidata = self._libres.pop()
+                        break
+                    if self._abiertas < self.maxconn:
+                        # se reserva el lugar y la conexion se abre fuera del lock
+                        self._abiertas += 1
+                        reservar = True
+                        break
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolAgotadoError(
+                            f"No hay conexiones libres luego de {self.timeout}s (max={self.maxconn})"
+                        )
+                    if not espero:
+                        self._stats['esperas'] += 1
+                        espero = True
+                    self._lock.wait(restante)
+
+            if reservar:
+                try:
+                    con = psycopg2.connect(**self._parametros)
+                except Exception:
+                    with self._lock:
+                        self._abiertas -= 1
+                        self._lock.notify()
+                    raise
+                with self._lock:
+                    self._stats['creadas'] += 1
+                    return self._prestar(con, inicio, espero)
+
+            con, inactiva_desde = candidata
+            if self._esSana(con, inactiva_desde):
+                with self._lock:
+                    return self._prestar(con, inicio, espero)
+            with self._lock:
+                self._stats['validaciones_fallidas'] += 1
+                self._descartar(con)
+
+    def _prestar(self, con, inicio, espero):
+        self._en_uso.add(con)
+        sentencias.conexionPrestada(con)
+        self._stats['prestamos'] += 1
+        if espero:
+            self._stats['tiempo_espera_total'] += time.monotonic() - inicio
+        return con
+
+    def devolverConexion(self, con, descartar=False):
+        """Devuelve una conexion al pool, deshaciendo cualquier transaccion abierta."""
+        with self._lock:
+            if con not in self._en_uso:
+                return
+
+        if not descartar and not con.closed:
+            try:
+                if con.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                    con.rollback()
+            except Exception:
+                descartar = True
+
+        with self._lock:
+            self._en_uso.discard(con)
+            self._stats['devoluciones'] += 1
+            if descartar or con.closed or self._cerrado:
+                self._descartar(con)
+            else:
+                self._libres.append((con, time.monotonic()))
+            self._lock.notify()
+
+    def getEstadisticas(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                'minconn': self.minconn,
+                'maxconn': self.maxconn,
+                'abiertas': self._abiertas,
+                'en_uso': len(self._en_uso),
+                'libres': len(self._libres),
+            })
+            return stats
+
+    def cerrarTodo(self):
+        """Cierra las conexiones libres; las prestadas se cierran al devolverse."""
+        with self._lock:
+            self._cerrado = True
+            while self._libres:
+                con, _ = self._libres.pop()
+                self._descartar(con)
+            self._lock.notify_all()
@@ -0,0 +1,207 @@
+"""Presupuestos de base de datos por blueprint y por endpoint.
+
+    Cada request lleva un statement_timeout, un lock_timeout (milisegundos)
+    y un maximo de filas por consulta. Se aplican al tomar la conexion, con
+    SET LOCAL, asi vuelven solos a los valores del servidor cuando termina
+    la transaccion y la conexion regresa al pool.
+
+    Los valores se combinan de lo general a lo particular:
+    PRESUPUESTO_DEFECTO < blueprint < endpoint. app.config['PRESUPUESTOS_BD']
+    agrega o pisa entradas de PRESUPUESTOS con la misma forma:
+
+        app.config['PRESUPUESTOS_BD'] = {
+            'avisoapi': {'statement_timeout': 3000},
+            'consultasapi.generarFichaMedica': {'max_filas': 2000},
+        }
+
+    None deja el valor del servidor / sin limite.
+"""
+import os
+import re
+import threading
+import psycopg2.extensions
+from psycopg2 import errors
+from flask import g, has_request_context, jsonify, request, current_app
+
+
+def _entero(nombre):
+    valor = os.environ.get(nombre)
+    return int(valor) if valor else None
+
+
+PRESUPUESTO_DEFECTO = {
+    'statement_timeout': int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', 30000)),
+    'lock_timeout': int(os.environ.get('DB_LOCK_TIMEOUT_MS', 5000)),
+    'max_filas': _entero('DB_MAX_FILAS'),
+}
+
+PRESUPUESTOS = {
+    # la ficha y el detalle completo recorren todas las consultas del paciente
+    'consultasapi.generarFichaMedica': {'statement_timeout': 5000, 'max_filas': 5000},
+    'consultasapi.getConsultasDetalleConInfo': {'statement_timeout': 5000, 'max_filas': 20000},
+    # reservar no debe quedar esperando un bloqueo mientras la pantalla espera
+    'regiscitaapi': {'lock_timeout': 2000},
+    'agendaapi': {'lock_timeout': 2000},
+}
+
+# errores de PostgreSQL que corresponden a cada limite
+ERRORES_PRESUPUESTO = {
+    errors.QueryCanceled: 'statement_timeout',
+    errors.LockNotAvailable: 'lock_timeout',
+}
+
+
+class FilasExcedidasError(Exception):
+    """Una consulta devolvio mas filas que max_filas."""
+
+
+class EstadisticasPresupuesto:
+
+    """Cantidad de excesos por endpoint y por tipo de limite."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._excesos = {}
+
+    def contar(self, endpoint, tipo):
+        with self._lock:
+            por_tipo = self._excesos.setdefault(endpoint or '-', {})
+            por_tipo[tipo] = por_tipo.get(tipo, 0) + 1
+
+    def getEstadisticas(self):
+        with self._lock:
+            return {endpoint: dict(tipos) for endpoint, tipos in self._excesos.items()}
+
+
+estadisticasPresupuesto = EstadisticasPresupuesto()
+
+
+def presupuestoDeEndpoint(tabla, endpoint):
+    """PRESUPUESTO_DEFECTO combinado con las entradas del blueprint y del endpoint."""
+    presupuesto = dict(PRESUPUESTO_DEFECTO)
+    blueprint = endpoint.rpartition('.')[0] if endpoint else None
+    for clave in (blueprint, endpoint):
+        if clave in tabla:
+            presupuesto.update(tabla[clave])
+    return presupuesto
+
+
+def presupuestoActual():
+    """Presupuesto del request en curso (dict), o None fuera de un request."""
+    if not has_request_context():
+        return None
+    presupuesto = g.get('_presupuesto_bd')
+    if presupuesto is None:
+        tabla = current_app.extensions.get('presupuestos_bd', PRESUPUESTOS)
+        presupuesto = presupuestoDeEndpoint(tabla, request.endpoint)
+        g._presupuesto_bd = presupuesto
+    return presupuesto
+
+
+def respuestaExceso(tipo, presupuesto):
+    """(cuerpo, estado, encabezados) de la respuesta a un request que excedio el limite `tipo`."""
+    if tipo == 'max_filas':
+        return {
+            'success': False,
+            'error': f'El resultado supera el máximo de {presupuesto["max_filas"]} registros. '
+                     'Use la paginación (?limit=) o acote la búsqueda.'
+        }, 413, {}
+    return {
+        'success': False,
+        'error': 'La consulta tardó demasiado. Intente de nuevo en unos segundos.'
+    }, 503, {'Retry-After': '5'}
+
+
+def aplicarPresupuesto(con):
+    """Fija los timeouts del request en la transaccion de `con` (SET LOCAL)."""
+    presupuesto = presupuestoActual()
+    if presupuesto is None:
+        return
+    ajustes = [
+        (nombre, f"{presupuesto[nombre]}ms")
+        for nombre in ('statement_timeout', 'lock_timeout')
+        if presupuesto.get(nombre) is not None
+    ]
+    if not ajustes:
+        return
+    cur = con.cursor()
+    try:
+        cur.execute(
+            "SELECT " + ", ".join("set_config(%s, %s, true)" for _ in ajustes),
+            [valor for ajuste in ajustes for valor in ajuste]
+        )
+    finally:
+        cur.close()
+
+
+def _registrarExceso(tipo, detalle):
+    endpoint = request.endpoint
+    estadisticasPresupuesto.contar(endpoint, tipo)
+    current_app.logger.warning(f"Presupuesto de BD excedido en {endpoint} ({tipo}): {detalle}")
+    # la vista suele atrapar el error; after_request lo convierte en 503/413
+    if g.get('_presupuesto_excedido') is None:
+        g._presupuesto_excedido = tipo
+
+
+_ES_SELECT = re.compile(r"\s*select\b", re.IGNORECASE)
+
+
+def limitarFilas(sql, maximo):
+    """`sql` envuelto para que el servidor corte en maximo + 1 filas.
+
+        Asi una consulta que excede max_filas no llega a producir ni enviar
+        el resultado completo: la fila de mas alcanza para saber que se paso.
+        Solo se envuelven los SELECT (texto); EXECUTE de sentencias
+        preparadas, CTE con escrituras y el resto quedan igual.
+    """
+    if maximo is None or not isinstance(sql, str) or not _ES_SELECT.match(sql):
+        return sql
+    return f"SELECT * FROM ({sql.strip().rstrip(';')}) AS limitada LIMIT {int(maximo) + 1}"
+
+
+class CursorPresupuesto(psycopg2.extensions.cursor):
+
+    """Cursor de las conexiones del pool que controla el presupuesto del request.
+
+        Registra los cortes por statement_timeout y lock_timeout y corta las
+        consultas que traen mas de max_filas (con LIMIT max_filas + 1 en los
+        SELECT, ver limitarFilas). Los cursores con nombre (streaming) no
+        cuentan filas: existen justamente para listados grandes.
+    """
+    def execute(self, sql, params=None):
+        maximo = None
+        if self.name is None and has_request_context():
+            maximo = presupuestoActual().get('max_filas')
+            sql = limitarFilas(sql, maximo)
+        try:
+            resultado = super().execute(sql, params)
+        except tuple(ERRORES_PRESUPUESTO) as e:
+            if has_request_context():
+                _registrarExceso(ERRORES_PRESUPUESTO[type(e)], str(e).strip())
+            raise
+        if maximo is not None and self.description is not None and self.rowcount > maximo:
+            _registrarExceso('max_filas', f"mas de {maximo} filas")
+            raise FilasExcedidasError(f"La consulta devolvio mas de {maximo} filas.")
+        return resultado
+
+
+def iniciarPresupuestos(app):
+    """Convierte la respuesta de un request que excedio su presupuesto en 503/413.
+
+        Debe llamarse despues de iniciarSesiones(): los after_request corren en
+        orden inverso, asi la sesion ve el error y deshace la transaccion.
+    """
+    tabla = {clave: dict(valores) for clave, valores in PRESUPUESTOS.items()}
+    for clave, valores in app.config.get('PRESUPUESTOS_BD', {}).items():
+        tabla.setdefault(clave, {}).update(valores)
+    app.extensions['presupuestos_bd'] = tabla
+
+    @app.after_request
+    def _responderPresupuesto(response):
+        tipo = g.get('_presupuesto_excedido')
+        if tipo is None:
+            return response
+        cuerpo, estado, encabezados = respuestaExceso(tipo, presupuestoActual())
+        response = jsonify(cuerpo)
+        response.status_code = estado
+        response.headers.update(encabezados)
+        return response
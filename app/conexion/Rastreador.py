@@ -0,0 +1,132 @@
+import os
+import threading
+import time
+import traceback
+import weakref
+from collections import deque
+from flask import g, has_request_context
+
+
+class RastreadorFugas:
+
+    """Registra conexiones y cursores abiertos junto con la pila donde se crearon.
+
+        Cuando esta inactivo registrar() no hace nada, por lo que el costo en
+        produccion es una sola comparacion. Se activa con DB_RASTREAR_FUGAS=1.
+    """
+    def __init__(self, activo=False, profundidad=10):
+        self.activo = activo
+        self.profundidad = profundidad
+        self._lock = threading.Lock()
+        self._abiertos = {}
+        self._liberados = deque()
+        self._fugas_detectadas = 0
+
+    def _pila(self):
+        # se descartan los frames del propio rastreador y de la capa de conexion
+        pila = traceback.extract_stack(limit=self.profundidad + 3)[:-3]
+        return [f"{f.filename}:{f.lineno} en {f.name}" for f in pila]
+
+    def registrar(self, objeto, tipo):
+        """tipo: 'conexion' o 'cursor'. Los cursores se consideran cerrados
+        cuando cursor.closed es verdadero o cuando el objeto se libera."""
+        if not self.activo:
+            return
+        clave = id(objeto)
+        registro = {
+            'tipo': tipo,
+            # el callback del weakref puede correr durante el GC con el lock
+            # tomado, por eso solo encola la clave y se purga despues
+            'ref': weakref.ref(objeto, lambda _r, c=clave: self._liberados.append(c)),
+            'creado': time.time(),
+            'hilo': threading.current_thread().name,
+            'pila': self._pila(),
+        }
+        with self._lock:
+            self._purgar()
+            self._abiertos[clave] = registro
+        if has_request_context():
+            g.setdefault('_rastreo_bd', []).append(clave)
+
+    def liberar(self, objeto):
+        if not self.activo:
+            return
+        self._olvidar(id(objeto))
+
+    def _olvidar(self, clave):
+        with self._lock:
+            self._abiertos.pop(clave, None)
+
+    def _purgar(self):
+        while self._liberados:
+            clave = self._liberados.popleft()
+            registro = self._abiertos.get(clave)
+            if registro is not None and registro['ref']() is None:
+                del self._abiertos[clave]
+
+    def _estaAbierto(self, registro):
+        objeto = registro['ref']()
+        if objeto is None:
+            return False
+        return not objeto.closed
+
+    def _describir(self, registro, ahora):
+        return {
+            'tipo': registro['tipo'],
+            'abierto_hace_seg': round(ahora - registro['creado'], 3),
+            'hilo': registro['hilo'],
+            'pila': registro['pila'],
+        }
+
+    def getAbiertos(self, antiguedad_min=0):
+        """Lista de objetos todavia abiertos con al menos `antiguedad_min` segundos."""
+        ahora = time.time()
+        with self._lock:
+            self._purgar()
+            registros = list(self._abiertos.values())
+        return [
+            self._describir(r, ahora) for r in registros
+            if ahora - r['creado'] >= antiguedad_min and self._estaAbierto(r)
+        ]
+
+    def revisarRequest(self):
+        """Retorna lo que se abrio durante el request y no se cerro."""
+        if not self.activo or not has_request_context():
+            return []
+        claves = g.pop('_rastreo_bd', [])
+        ahora = time.time()
+        fugas = []
+        with self._lock:
+            # dict.fromkeys: un id() reutilizado dentro del request aparece una sola vez
+            registros = [self._abiertos.get(c) for c in dict.fromkeys(claves)]
+        for registro in registros:
+            if registro is not None and self._estaAbierto(registro):
+                fugas.append(self._describir(registro, ahora))
+        if fugas:
+            with self._lock:
+                self._fugas_detectadas += len(fugas)
+        return fugas
+
+    def getResumen(self):
+        with self._lock:
+            self._purgar()
+            return {
+                'activo': self.activo,
+                'registrados': len(self._abiertos),
+                'fugas_detectadas': self._fugas_detectadas,
+            }
+
+
+rastreador = RastreadorFugas(activo=os.environ.get('DB_RASTREAR_FUGAS', '0') == '1')
+
+
+def iniciarRastreo(app):
+    """Al terminar cada request registra en el log las conexiones y cursores sin cerrar."""
+
+    @app.teardown_request
+    def _reportarFugasBD(exc):
+        for fuga in rastreador.revisarRequest():
+            app.logger.warning(
+                f"Fuga de {fuga['tipo']} en el request: no se cerró. Creado en:\n  "
+                + "\n  ".join(fuga['pila'])
+            )
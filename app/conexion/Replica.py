@@ -0,0 +1,232 @@
+"""Lecturas contra una replica de PostgreSQL (streaming replication).
+
+    Se activa definiendo DB_REPLICA_DSN o DB_REPLICA_HOST; el resto de
+    DB_REPLICA_* toma por defecto los valores del primario. Para probar en local con dos instancias:
+
+        pg_basebackup -h 127.0.0.1 -p 5432 -U postgres -D /tmp/replica -R -X stream
+        pg_ctl -D /tmp/replica -o "-p 5433" start
+        DB_REPLICA_HOST=127.0.0.1 DB_REPLICA_PORT=5433 python run.py
+
+    GET /api/v1/debug/conexiones muestra el lag medido y cuantas lecturas
+    fueron a cada servidor y por que.
+"""
+import os
+import threading
+import time
+from flask import has_request_context, request, session
+
+CONFIG_REPLICA = {
+    # segundos de atraso a partir de los cuales se lee del primario
+    'lag_maximo': float(os.environ.get('DB_REPLICA_LAG_MAXIMO', 5)),
+    # cada cuanto se vuelve a medir el lag
+    'verificar_cada': float(os.environ.get('DB_REPLICA_VERIFICAR_CADA', 1)),
+    # segundos despues de una escritura en que ese cliente lee del primario
+    'ventana_escritura': float(os.environ.get('DB_REPLICA_VENTANA_ESCRITURA', 10)),
+    # si la replica no responde, segundos hasta el proximo intento
+    'reintentar_despues': float(os.environ.get('DB_REPLICA_REINTENTAR', 30)),
+}
+
+CONFIG_POOL_REPLICA = {
+    'minconn': 0,
+    'maxconn': int(os.environ.get('DB_REPLICA_POOL_MAX', 20)),
+    'timeout': float(os.environ.get('DB_REPLICA_POOL_TIMEOUT', 2)),
+    'validar_despues': float(os.environ.get('DB_POOL_VALIDAR_DESPUES', 30)),
+}
+
+# en el primario o con la replica al dia el lag es 0; si no, antiguedad de lo ultimo aplicado
+LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+METODOS_ESCRITURA = ('POST', 'PUT', 'PATCH', 'DELETE')
+CLAVE_ESCRITURA = '_bd_ultima_escritura'
+
+
+def parametrosReplica():
+    """Parametros de conexion de la replica, o None si no esta configurada."""
+    from app.conexion.Conexion import PARAMETROS_DB
+    if os.environ.get('DB_REPLICA_DSN'):
+        import psycopg2.extensions
+        return dict(PARAMETROS_DB, **psycopg2.extensions.parse_dsn(os.environ['DB_REPLICA_DSN']))
+    host = os.environ.get('DB_REPLICA_HOST')
+    if not host:
+        return None
+    return {
+        'dbname': os.environ.get('DB_REPLICA_NAME', PARAMETROS_DB['dbname']),
+        'user': os.environ.get('DB_REPLICA_USER', PARAMETROS_DB['user']),
+        'password': os.environ.get('DB_REPLICA_PASSWORD', PARAMETROS_DB['password']),
+        'host': host,
+        'port': int(os.environ.get('DB_REPLICA_PORT', PARAMETROS_DB['port'])),
+    }
+
+
+class EnrutadorReplica:
+
+    """Decide si una lectura puede ir a la replica.
+
+        Se lee del primario si la replica no esta configurada o no responde,
+        si su lag supera lag_maximo, si el request es una escritura o si el
+        mismo cliente escribio hace menos de ventana_escritura segundos
+        (leer lo propio: la marca viaja en la sesion de Flask).
+    """
+    def __init__(self, parametros=None, config=None):
+        self.parametros = parametros
+        self.config = dict(CONFIG_REPLICA, **(config or {}))
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pool_pid = None
+        self._lag = None
+        self._medido_en = 0.0
+        self._midiendo = False
+        self._caida_hasta = 0.0
+        self._stats = {
+            'lecturas_replica': 0,
+            'lecturas_primario': 0,
+            'por_escritura': 0,
+            'por_lag': 0,
+            'por_caida': 0,
+        }
+
+    @property
+    def activa(self):
+        return self.parametros is not None
+
+    def _getPool(self):
+        from app.conexion.PoolConexion import PoolConexion
+        from app.conexion.Presupuesto import CursorPresupuesto
+        pid = os.getpid()
+        if self._pool is not None and self._pool_pid == pid:
+            return self._pool
+        with self._lock:
+            if self._pool is None or self._pool_pid != pid:
+                self._pool = PoolConexion(**CONFIG_POOL_REPLICA, **self.parametros, cursor_factory=CursorPresupuesto)
+                self._pool_pid = pid
+        return self._pool
+
+    def _contar(self, *claves):
+        with self._lock:
+            for clave in claves:
+                self._stats[clave] += 1
+
+    def _marcarCaida(self, error):
+        from flask import current_app
+        self._caida_hasta = time.monotonic() + self.config['reintentar_despues']
+        self._lag = None
+        if has_request_context():
+            current_app.logger.warning(f"Replica no disponible, se lee del primario: {str(error)}")
+
+    # ============================
+    # LAG
+    # ============================
+
+    def _medirLag(self):
+        pool = self._getPool()
+        con = pool.obtenerConexion()
+        descartar = False
+        try:
+            cur = con.cursor()
+            try:
+                cur.execute(LAG_SQL)
+                return float(cur.fetchone()[0])
+            finally:
+                cur.close()
+        except Exception:
+            descartar = True
+            raise
+        finally:
+            pool.devolverConexion(con, descartar=descartar)
+
+    def getLag(self):
+        """Lag en segundos (medido como mucho cada verificar_cada), o None si no responde."""
+        ahora = time.monotonic()
+        if ahora < self._caida_hasta:
+            return None
+        if ahora - self._medido_en < self.config['verificar_cada']:
+            return self._lag
+        with self._lock:
+            # un solo hilo mide; los demas usan el ultimo valor
+            if self._midiendo:
+                return self._lag
+            self._midiendo = True
+        try:
+            self._lag = self._medirLag()
+        except Exception as e:
+            self._marcarCaida(e)
+        finally:
+            self._medido_en = time.monotonic()
+            self._midiendo = False
+        return self._lag
+
+    # ============================
+    # DECISION
+    # ============================
+
+    def _escrituraReciente(self):
+        if not has_request_context():
+            return False
+        if request.method in METODOS_ESCRITURA:
+            return True
+        ultima = session.get(CLAVE_ESCRITURA)
+        return ultima is not None and time.time() - ultima < self.config['ventana_escritura']
+
+    def conexionLectura(self):
+        """ConexionPrestada de la replica, o None si la lectura debe ir al primario."""
+        if not self.activa:
+            return None
+        if self._escrituraReciente():
+            self._contar('lecturas_primario', 'por_escritura')
+            return None
+        lag = self.getLag()
+        if lag is None:
+            self._contar('lecturas_primario', 'por_caida')
+            return None
+        if lag > self.config['lag_maximo']:
+            self._contar('lecturas_primario', 'por_lag')
+            return None
+        from app.conexion.Conexion import ConexionPrestada
+        try:
+            con = ConexionPrestada(self._getPool())
+        except Exception as e:
+            self._marcarCaida(e)
+            self._contar('lecturas_primario', 'por_caida')
+            return None
+        self._contar('lecturas_replica')
+        return con
+
+    def getEstadisticas(self):
+        if not self.activa:
+            return {'activa': False}
+        with self._lock:
+            stats = dict(self._stats)
+        stats.update({
+            'activa': True,
+            'host': f"{self.parametros.get('host')}:{self.parametros.get('port')}",
+            'lag_segundos': self._lag,
+            'caida': time.monotonic() < self._caida_hasta,
+            'config': self.config,
+            'pool': self._pool.getEstadisticas() if self._pool is not None else None,
+        })
+        return stats
+
+
+enrutadorReplica = EnrutadorReplica(parametrosReplica())
+
+
+def iniciarReplica(app):
+    """Marca en la sesion de Flask el momento de cada escritura confirmada.
+
+        Las lecturas de ese cliente van al primario durante ventana_escritura
+        segundos, hasta que la replica tuvo tiempo de recibir el cambio.
+    """
+    if not enrutadorReplica.activa:
+        return
+
+    @app.after_request
+    def _marcarEscritura(response):
+        if request.method in METODOS_ESCRITURA and response.status_code < 400:
+            session[CLAVE_ESCRITURA] = time.time()
+        return response
@@ -0,0 +1,159 @@
+import re
+import threading
+import time
+import weakref
+from psycopg2 import errors, extensions
+
+_MARCADOR = re.compile(r"%s|%%")
+
+
+def convertirMarcadores(sql):
+    """Pasa los %s de psycopg2 a $1..$n (PREPARE, asyncpg); retorna (sql, cantidad)."""
+    contador = [0]
+
+    def reemplazo(m):
+        if m.group(0) == '%%':
+            return '%'
+        contador[0] += 1
+        return f"${contador[0]}"
+
+    return _MARCADOR.sub(reemplazo, sql), contador[0]
+
+
+class RegistroSentencias:
+
+    """Sentencias preparadas del lado del servidor para las consultas mas usadas.
+
+        La primera vez que una conexion ejecuta una sentencia se hace PREPARE;
+        las siguientes solo EXECUTE, asi PostgreSQL no vuelve a parsear ni
+        planificar el SQL. Lo preparado se recuerda por conexion fisica: una
+        conexion nueva del pool (p.ej. luego de una reconexion) vuelve a preparar.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sentencias = {}
+        self._preparadas = weakref.WeakKeyDictionary()
+        # conexiones devueltas y prestadas de nuevo desde su ultimo EXECUTE
+        self._por_verificar = weakref.WeakSet()
+
+    def _getSentencia(self, nombre, sql):
+        sentencia = self._sentencias.get(nombre)
+        if sentencia is None:
+            sql_pg, cantidad = convertirMarcadores(sql.strip().rstrip(';'))
+            sentencia = {
+                'nombre': f"ps_{nombre}",
+                'sql': sql_pg,
+                'parametros': cantidad,
+                'ejecuciones': 0,
+                'preparaciones': 0,
+                'reintentos': 0,
+                'tiempo_total': 0.0,
+            }
+            with self._lock:
+                sentencia = self._sentencias.setdefault(nombre, sentencia)
+        return sentencia
+
+    def _preparadasDe(self, con):
+        with self._lock:
+            preparadas = self._preparadas.get(con)
+            if preparadas is None:
+                preparadas = set()
+                self._preparadas[con] = preparadas
+            return preparadas
+
+    def conexionPrestada(self, con):
+        """El pool volvio a prestar `con`: su primer EXECUTE se verifica (ver ejecutar)."""
+        with self._lock:
+            if self._preparadas.get(con):
+                self._por_verificar.add(con)
+
+    def _ejecutarVerificando(self, cur, ejecutar_sql, params):
+        """EXECUTE dentro de un savepoint: si la sentencia no existe la transaccion sigue viva.
+
+            El SAVEPOINT viaja con el EXECUTE; el RELEASE (o el ROLLBACK TO)
+            va por otro cursor para no pisar el resultado de `cur`.
+        """
+        auxiliar = cur.connection.cursor()
+        try:
+            try:
+                cur.execute("SAVEPOINT ps_verificar; " + ejecutar_sql, params)
+            except errors.InvalidSqlStatementName:
+                auxiliar.execute("ROLLBACK TO SAVEPOINT ps_verificar; RELEASE SAVEPOINT ps_verificar")
+                raise
+            auxiliar.execute("RELEASE SAVEPOINT ps_verificar")
+        finally:
+            auxiliar.close()
+
+    def ejecutar(self, cur, nombre, sql, params=()):
+        """Ejecuta `sql` en `cur` como sentencia preparada `nombre`.
+
+            Se usa igual que cur.execute(sql, params); despues se leen los
+            resultados con fetchone()/fetchall() y cur.description como siempre.
+
+            Si el servidor perdio la sentencia (DISCARD ALL, reinicio de la
+            sesion) se vuelve a preparar y se reintenta una vez. Eso solo puede
+            pasar entre prestamos de la conexion, asi que el primer EXECUTE de
+            cada prestamo dentro de una transaccion abierta va en un savepoint,
+            para que el error no la aborte; el resto va directo.
+        """
+        sentencia = self._getSentencia(nombre, sql)
+        con = cur.connection
+        preparadas = self._preparadasDe(con)
+        inicio = time.perf_counter()
+
+        if sentencia['parametros']:
+            marcadores = ", ".join(["%s"] * sentencia['parametros'])
+            ejecutar_sql = f"EXECUTE {sentencia['nombre']} ({marcadores})"
+        else:
+            ejecutar_sql = f"EXECUTE {sentencia['nombre']}"
+        params = tuple(params)
+
+        for intento in (1, 2):
+            if sentencia['nombre'] not in preparadas:
+                cur.execute(f"PREPARE {sentencia['nombre']} AS {sentencia['sql']}")
+                preparadas.add(sentencia['nombre'])
+                with self._lock:
+                    sentencia['preparaciones'] += 1
+                    self._por_verificar.discard(con)
+            en_transaccion = (not con.autocommit
+                              and con.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE)
+            try:
+                if en_transaccion and con in self._por_verificar:
+                    self._ejecutarVerificando(cur, ejecutar_sql, params)
+                else:
+                    cur.execute(ejecutar_sql, params)
+                break
+            except errors.InvalidSqlStatementName:
+                # se perdieron todas las de la conexion: se vuelven a preparar
+                preparadas.clear()
+                if intento == 2 or (en_transaccion and con not in self._por_verificar):
+                    # dentro de una transaccion sin savepoint el error ya la aborto
+                    raise
+                if not en_transaccion and not con.autocommit:
+                    con.rollback()
+                with self._lock:
+                    sentencia['reintentos'] += 1
+            finally:
+                self._por_verificar.discard(con)
+
+        with self._lock:
+            sentencia['ejecuciones'] += 1
+            sentencia['tiempo_total'] += time.perf_counter() - inicio
+
+    def getEstadisticas(self):
+        """Por sentencia: ejecuciones, PREPARE realizados y planificaciones ahorradas."""
+        with self._lock:
+            sentencias = [(nombre, dict(s)) for nombre, s in self._sentencias.items()]
+        return {
+            nombre: {
+                'ejecuciones': s['ejecuciones'],
+                'preparaciones': s['preparaciones'],
+                'reintentos': s['reintentos'],
+                'planificaciones_ahorradas': max(s['ejecuciones'] - s['preparaciones'], 0),
+                'tiempo_promedio_ms': round(s['tiempo_total'] * 1000 / s['ejecuciones'], 3) if s['ejecuciones'] else None,
+            }
+            for nombre, s in sentencias
+        }
+
+
+sentencias = RegistroSentencias()
@@ -0,0 +1,238 @@
+from contextlib import contextmanager
+from flask import g, has_request_context, current_app, jsonify
+from psycopg2.extensions import TRANSACTION_STATUS_INERROR
+from app.conexion.Rastreador import rastreador
+from app.conexion.Presupuesto import aplicarPresupuesto
+
+
+class SesionBD:
+
+    """Unidad de trabajo por request.
+
+        Toma una sola conexion del pool la primera vez que un DAO la pide y
+        todos los DAO del mismo request trabajan sobre ella, dentro de una
+        unica transaccion que se confirma al terminar el request.
+    """
+    def __init__(self, pool):
+        self._pool = pool
+        self._con = pool.obtenerConexion()
+        try:
+            aplicarPresupuesto(self._con)
+        except Exception:
+            pool.devolverConexion(self._con, descartar=True)
+            raise
+        self._contador = 0
+        self._al_confirmar = []
+        self.finalizada = False
+
+    def getConexion(self):
+        return self._con
+
+    def unirse(self):
+        """Retorna la conexion que usan los DAO para sumarse a la sesion."""
+        return ConexionUnida(self)
+
+    def alConfirmar(self, funcion):
+        """Registra una funcion que se ejecuta solo si la transaccion se confirma."""
+        self._al_confirmar.append(funcion)
+
+    # ============================
+    # SAVEPOINTS
+    # ============================
+
+    def _abrirSavepoint(self):
+        self._contador += 1
+        nombre = f"sp_{self._contador}"
+        cur = self._con.cursor()
+        try:
+            cur.execute(f"SAVEPOINT {nombre}")
+        finally:
+            cur.close()
+        return nombre
+
+    def _liberarSavepoint(self, nombre):
+        cur = self._con.cursor()
+        try:
+            cur.execute(f"RELEASE SAVEPOINT {nombre}")
+        finally:
+            cur.close()
+
+    def _volverASavepoint(self, nombre):
+        cur = self._con.cursor()
+        try:
+            cur.execute(f"ROLLBACK TO SAVEPOINT {nombre}")
+            cur.execute(f"RELEASE SAVEPOINT {nombre}")
+        finally:
+            cur.close()
+
+    @contextmanager
+    def savepoint(self):
+        """Bloque anidado explicito: si falla se deshace solo lo hecho dentro.
+
+            with sesionActual().savepoint() as con:
+                ...
+        """
+        nombre = self._abrirSavepoint()
+        try:
+            yield self._con
+        except Exception:
+            self._volverASavepoint(nombre)
+            raise
+        else:
+            self._liberarSavepoint(nombre)
+
+    # ============================
+    # CIERRE
+    # ============================
+
+    def commit(self):
+        self._con.commit()
+
+    def rollback(self):
+        self._con.rollback()
+
+    def finalizar(self, confirmar):
+        """Confirma o deshace la transaccion y devuelve la conexion al pool."""
+        if self.finalizada:
+            return
+        self.finalizada = True
+        descartar = False
+        try:
+            if confirmar:
+                self._con.commit()
+            else:
+                self._con.rollback()
+        except Exception:
+            descartar = True
+            raise
+        finally:
+            self._pool.devolverConexion(self._con, descartar=descartar)
+        if confirmar:
+            self._ejecutarAlConfirmar()
+
+    def _ejecutarAlConfirmar(self):
+        funciones, self._al_confirmar = self._al_confirmar, []
+        for funcion in funciones:
+            try:
+                funcion()
+            except Exception as e:
+                current_app.logger.error(f"Error en una tarea posterior al commit: {str(e)}")
+
+
+class ConexionUnida:
+
+    """Conexion que entrega Conexion() a un DAO dentro de una SesionBD.
+
+        Cada DAO trabaja en su propio savepoint, que se abre al crear el primer
+        cursor: commit() lo libera, rollback() deshace solo lo del DAO y close()
+        no devuelve nada al pool, eso lo hace la sesion al final del request.
+        Si el DAO capturo un error sin hacer rollback, close() vuelve al
+        savepoint para que la transaccion siga sirviendo a los DAO siguientes.
+    """
+    def __init__(self, sesion):
+        self._sesion = sesion
+        self._savepoint = None
+        self._cerrada = False
+        rastreador.registrar(self, 'conexion')
+
+    def cursor(self, *args, **kwargs):
+        if self._savepoint is None:
+            self._savepoint = self._sesion._abrirSavepoint()
+        cur = self._sesion.getConexion().cursor(*args, **kwargs)
+        rastreador.registrar(cur, 'cursor')
+        return cur
+
+    def commit(self):
+        if self._savepoint is not None:
+            self._sesion._liberarSavepoint(self._savepoint)
+            self._savepoint = None
+
+    def rollback(self):
+        if self._savepoint is not None:
+            self._sesion._volverASavepoint(self._savepoint)
+            self._savepoint = None
+
+    def close(self):
+        if self._cerrada:
+            return
+        self._cerrada = True
+        rastreador.liberar(self)
+        if self._savepoint is not None and not self._sesion.finalizada:
+            if self._sesion.getConexion().get_transaction_status() == TRANSACTION_STATUS_INERROR:
+                self._sesion._volverASavepoint(self._savepoint)
+            else:
+                self._sesion._liberarSavepoint(self._savepoint)
+        self._savepoint = None
+
+    @property
+    def closed(self):
+        return 1 if self._cerrada else self._sesion.getConexion().closed
+
+    def __getattr__(self, nombre):
+        return getattr(self._sesion.getConexion(), nombre)
+
+
+def sesionActual():
+    """Retorna la SesionBD del request en curso, creandola si hace falta.
+
+        Retorna None fuera de un request o si la aplicacion no llamo a
+        iniciarSesiones(); en ese caso los DAO usan el pool directamente.
+    """
+    if not has_request_context() or not current_app.extensions.get('sesion_bd'):
+        return None
+    sesion = g.get('_sesion_bd')
+    if sesion is None:
+        from app.conexion.Conexion import getPool
+        sesion = SesionBD(getPool())
+        g._sesion_bd = sesion
+    return sesion
+
+
+def despuesDeConfirmar(funcion):
+    """Ejecuta `funcion` cuando los cambios del request queden confirmados.
+
+        Dentro de una sesion se difiere hasta el commit del request (y se
+        descarta si hay rollback); fuera de un request los DAO ya confirmaron
+        con su propio commit, asi que se ejecuta en el momento.
+    """
+    sesion = g.get('_sesion_bd') if has_request_context() else None
+    if sesion is not None and not sesion.finalizada:
+        sesion.alConfirmar(funcion)
+    else:
+        funcion()
+
+
+def iniciarSesiones(app):
+    """Registra los hooks que confirman o deshacen la sesion de cada request.
+
+        Se confirma en after_request solo si la respuesta es < 400, para poder
+        responder 500 si el commit falla. teardown_request deshace lo que haya
+        quedado pendiente (excepciones, respuestas de error) y libera la conexion.
+    """
+    app.extensions['sesion_bd'] = True
+
+    @app.after_request
+    def _confirmarSesionBD(response):
+        sesion = g.get('_sesion_bd')
+        if sesion is None or sesion.finalizada or response.status_code >= 400:
+            return response
+        try:
+            sesion.finalizar(True)
+        except Exception as e:
+            app.logger.error(f"Error al confirmar la transaccion del request: {str(e)}")
+            response = jsonify({
+                'success': False,
+                'error': 'Ocurrió un error interno. Consulte con el administrador.'
+            })
+            response.status_code = 500
+        return response
+
+    @app.teardown_request
+    def _cerrarSesionBD(exc):
+        sesion = g.pop('_sesion_bd', None)
+        if sesion is None or sesion.finalizada:
+            return
+        try:
+            sesion.finalizar(False)
+        except Exception as e:
+            app.logger.error(f"Error al deshacer la transaccion del request: {str(e)}")
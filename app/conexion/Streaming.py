@@ -0,0 +1,120 @@
+import itertools
+import os
+import uuid
+from flask import Response, current_app, request, stream_with_context
+from app.conexion.MapeoFilas import mapeadorDe
+
+# filas que se traen del servidor por cada fetchmany del cursor con nombre
+TAMANO_LOTE = int(os.environ.get('DB_STREAM_LOTE', 1000))
+
+FORMATOS_STREAM = {
+    'ndjson': 'application/x-ndjson',
+    'json': 'application/json',
+}
+
+
+def iterarConsulta(sql, params=(), convertir=None, transformar=None, nombre='stream', tamano=None):
+    """Generador de dicts para listados grandes.
+
+        Usa un cursor con nombre (DECLARE ... CURSOR del lado del servidor) y
+        fetchmany, asi en memoria solo hay un lote de filas a la vez.
+        Trabaja sobre una conexion propia del pool y no sobre la sesion del
+        request: la sesion se confirma en after_request, antes de que se
+        empiece a enviar el cuerpo de la respuesta.
+        transformar: funcion opcional dict -> dict aplicada a cada fila.
+    """
+    from app.conexion.Conexion import ConexionPrestada, getPool
+
+    tamano = tamano or TAMANO_LOTE
+    con = ConexionPrestada(getPool())
+    try:
+        cur = con.cursor(name=f"{nombre}_{uuid.uuid4().hex[:12]}")
+        try:
+            cur.execute(sql.strip().rstrip(';'), params)
+            mapear = None
+            while True:
+                filas = cur.fetchmany(tamano)
+                if not filas:
+                    break
+                if mapear is None:
+                    # en un cursor con nombre description existe recien despues del primer fetch
+                    mapear = mapeadorDe(cur, convertir)
+                for fila in filas:
+                    dato = mapear(fila)
+                    yield transformar(dato) if transformar else dato
+        finally:
+            cur.close()
+    finally:
+        # devolverConexion hace rollback: cierra la transaccion de solo lectura
+        con.close()
+
+
+def formatoStream():
+    """Formato pedido con ?stream=ndjson|json, o None para la respuesta normal."""
+    formato = (request.args.get('stream') or '').lower()
+    return formato if formato in FORMATOS_STREAM else None
+
+
+def respuestaStream(filas, formato, lote=500):
+    """Respuesta HTTP enviada por partes a medida que se leen las filas.
+
+        ndjson: un objeto JSON por linea.
+        json:   el mismo sobre que jsonify ({"success", "data", "error"}),
+                con el arreglo "data" escrito por partes.
+        La primera fila se lee antes de responder, asi los errores de conexion
+        o de SQL se manejan en la vista como siempre (500). Si algo falla ya
+        enviado el encabezado, se registra y se cierra el cuerpo con el error.
+    """
+    origen = iter(filas)
+    try:
+        primera = [next(origen)]
+    except StopIteration:
+        primera = []
+    filas = itertools.chain(primera, origen)
+    dumps = current_app.json.dumps
+    mensaje_error = 'Ocurrió un error interno al leer los datos.'
+
+    def cerrarOrigen():
+        # si el cliente corta la descarga se cierra el cursor y se devuelve la conexion ya
+        cerrar = getattr(origen, 'close', None)
+        if cerrar is not None:
+            cerrar()
+
+    def generarNdjson():
+        partes = []
+        try:
+            for fila in filas:
+                partes.append(dumps(fila))
+                if len(partes) >= lote:
+                    yield "\n".join(partes) + "\n"
+                    partes = []
+        except Exception as e:
+            current_app.logger.error(f"Error durante el envio por partes ({request.path}): {str(e)}")
+            partes.append(dumps({'success': False, 'error': mensaje_error}))
+        finally:
+            cerrarOrigen()
+        if partes:
+            yield "\n".join(partes) + "\n"
+
+    def generarJson():
+        yield '{"success": true, "data": ['
+        partes = []
+        separador = ''
+        error = None
+        try:
+            for fila in filas:
+                partes.append(separador + dumps(fila))
+                separador = ','
+                if len(partes) >= lote:
+                    yield "".join(partes)
+                    partes = []
+        except Exception as e:
+            current_app.logger.error(f"Error durante el envio por partes ({request.path}): {str(e)}")
+            error = mensaje_error
+        finally:
+            cerrarOrigen()
+        partes.append('], "error": ' + dumps(error) + '}')
+        yield "".join(partes)
+
+    generador = generarNdjson() if formato == 'ndjson' else generarJson()
+    return Response(stream_with_context(generador), status=200, mimetype=FORMATOS_STREAM[formato])
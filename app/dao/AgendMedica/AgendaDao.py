@@ -1,46 +1,49 @@
 # AgendaDao.py
 from flask import current_app as app
+from psycopg2 import errors
 from app.conexion.Conexion import Conexion
+from app.conexion.MapeoFilas import filasComoDicts, filaComoDict
+
+# listado de agendas; tambien lo usa la version async (LecturasAsyncDao)
+AGENDAS_SQL = """
+    SELECT a.id_agenda_medica,
+           m.nombre || ' ' || m.apellido AS medico_nombre,
+           d.descripcion AS dia,
+           t.descripcion AS turno,
+           e.descripcion AS especialidad,
+           c.codigo AS consultorio_id,
+           c.nombre_consultorio AS consultorio_nombre,
+           p.id_personal,
+           p.nombre || ' ' || p.apellido AS personal_nombre,
+           a.horario_disponible,
+           a.cupos,
+           a.estado,
+           a.fecha_agenda,
+           a.id_medico,
+           a.id_dia,
+           a.id_turno,
+           a.id_especialidad
+    FROM agenda_medica a
+    JOIN medico m ON a.id_medico = m.id_medico
+    JOIN dia d ON a.id_dia = d.id_dia
+    JOIN turno t ON a.id_turno = t.id_turno
+    JOIN especialidad e ON a.id_especialidad = e.id_especialidad
+    JOIN consultorio c ON a.codigo = c.codigo
+    JOIN personal p ON a.id_personal = p.id_personal
+    ORDER BY a.id_agenda_medica
+"""
 
 class AgendaDao:
 
     # Listar todas las agendas
     def getAgendas(self):
-        sql = """
-        SELECT a.id_agenda_medica,
-               m.nombre || ' ' || m.apellido AS medico_nombre,
-               d.descripcion AS dia,
-               t.descripcion AS turno,
-               e.descripcion AS especialidad,
-               c.codigo AS consultorio_id,
-               c.nombre_consultorio AS consultorio_nombre,
-               p.id_personal,
-               p.nombre || ' ' || p.apellido AS personal_nombre,
-               a.horario_disponible,
-               a.cupos,
-               a.estado,
-               a.fecha_agenda,
-               a.id_medico,
-               a.id_dia,
-               a.id_turno,
-               a.id_especialidad
-        FROM agenda_medica a
-        JOIN medico m ON a.id_medico = m.id_medico
-        JOIN dia d ON a.id_dia = d.id_dia
-        JOIN turno t ON a.id_turno = t.id_turno
-        JOIN especialidad e ON a.id_especialidad = e.id_especialidad
-        JOIN consultorio c ON a.codigo = c.codigo
-        JOIN personal p ON a.id_personal = p.id_personal
-        ORDER BY a.id_agenda_medica;
-        """
         conexion = Conexion()
         con = conexion.getConexion()
         cur = con.cursor()
         try:
-            cur.execute(sql)
+            cur.execute(AGENDAS_SQL)
             rows = cur.fetchall()
-            columnas = [desc[0] for desc in cur.description]
-            return [dict(zip(columnas, row)) for row in rows]
+            return filasComoDicts(cur, rows)
         except Exception as e:
             app.logger.error(f"Error al obtener agendas: {e}")
             return []
@@ -84,8 +87,7 @@ class AgendaDao:
             cur.execute(sql, (id_agenda,))
             row = cur.fetchone()
             if row:
-                columnas = [desc[0] for desc in cur.description]
-                return dict(zip(columnas, row))
+                return filaComoDict(cur, row)
             return None
         except Exception as e:
             app.logger.error(f"Error al obtener agenda {id_agenda}: {e}")
@@ -94,62 +96,15 @@ class AgendaDao:
             cur.close()
             con.close()
 
-    # ==============================
-    # Validar duplicado antes de insertar o actualizar
-    # ==============================
-    def existeDuplicado(self, id_medico, id_dia, id_turno, codigo,
-                         fecha_agenda=None, horario_disponible=None, id_agenda=None):
-        sql = """
-        SELECT COUNT(*)
-        FROM agenda_medica
-        WHERE id_medico = %s
-          AND id_dia = %s
-          AND id_turno = %s
-          AND codigo = %s
-        """
-        params = [id_medico, id_dia, id_turno, codigo]
-
-        if fecha_agenda:
-            sql += " AND fecha_agenda = %s"
-            params.append(fecha_agenda)
-        if horario_disponible:
-            sql += " AND horario_disponible = %s"
-            params.append(horario_disponible)
-        if id_agenda:
-            sql += " AND id_agenda_medica != %s"
-            params.append(id_agenda)
-
-        conexion = Conexion()
-        con = conexion.getConexion()
-        cur = con.cursor()
-        try:
-            cur.execute(sql, tuple(params))
-            return cur.fetchone()[0] > 0
-        except Exception as e:
-            app.logger.error(f"Error al validar duplicado: {e}")
-            return True
-        finally:
-            cur.close()
-            con.close()
-
     # Agregar una agenda
+    # None si ya existe (indice unico de sql/04_indices_unicos.sql), False si falla
     def addAgenda(self, agenda):
-        if self.existeDuplicado(
-            agenda['id_medico'],
-            agenda['id_dia'],
-            agenda['id_turno'],
-            agenda['codigo'],
-            fecha_agenda=agenda.get('fecha_agenda'),
-            horario_disponible=agenda.get('horario_disponible')
-        ):
-            app.logger.warning("Intento de duplicado detectado")
-            return None
-
         sql = """
         INSERT INTO agenda_medica (
             id_medico, id_dia, id_turno, codigo, id_personal, id_especialidad,
             fecha_agenda, horario_disponible, cupos, estado, cupos_maximos
         ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        ON CONFLICT DO NOTHING
         RETURNING id_agenda_medica;
         """
         conexion = Conexion()
@@ -170,31 +125,23 @@ class AgendaDao:
                 agenda.get('estado', True),
                 cupos  # cupos_maximos = cupos
             ))
-            id_agenda = cur.fetchone()[0]
+            fila = cur.fetchone()
             con.commit()
-            return id_agenda
+            if fila is None:
+                app.logger.warning("Intento de duplicado detectado")
+                return None
+            return fila[0]
         except Exception as e:
             con.rollback()
             app.logger.error(f"Error al agregar agenda: {e}")
-            return None
+            return False
         finally:
             cur.close()
             con.close()
 
     # Actualizar agenda
+    # None si choca con otra agenda, False si no existe o falla
     def updateAgenda(self, id_agenda, agenda):
-        if self.existeDuplicado(
-            agenda['id_medico'],
-            agenda['id_dia'],
-            agenda['id_turno'],
-            agenda['codigo'],
-            fecha_agenda=agenda.get('fecha_agenda'),
-            horario_disponible=agenda.get('horario_disponible'),
-            id_agenda=id_agenda
-        ):
-            app.logger.warning(f"Intento de duplicado detectado al actualizar {id_agenda}")
-            return False
-
         sql = """
         UPDATE agenda_medica SET
             id_medico = %s,
@@ -234,6 +181,10 @@ class AgendaDao:
             ))
             con.commit()
             return True
+        except errors.UniqueViolation:
+            con.rollback()
+            app.logger.warning(f"Intento de duplicado detectado al actualizar {id_agenda}")
+            return None
         except Exception as e:
             con.rollback()
             app.logger.error(f"Error al actualizar agenda {id_agenda}: {e}")
@@ -309,8 +260,7 @@ class AgendaDao:
             cur.execute(sql, (id_disponibilidad,))
             row = cur.fetchone()
             if row:
-                columnas = [desc[0] for desc in cur.description]
-                return dict(zip(columnas, row))
+                return filaComoDict(cur, row)
             return None
         except Exception as e:
             app.logger.error(f"Error en getDisponibilidadById({id_disponibilidad}): {e}")
@@ -0,0 +1,93 @@
+# CalendarioDao.py
+"""Calendario de un medico (semana o mes) leido con una sola consulta.
+
+    Junta en una respuesta lo que las pantallas de agenda pedian por
+    separado (/agenda, /registroc, /agenda/disponibilidad): los rangos de
+    disponibilidad con sus cupos libres, las citas con su estado y las
+    agendas del periodo. Cada seccion va en columnas ({columna: [valores]})
+    para no repetir los nombres de las claves en cada fila.
+"""
+from app.conexion.Conexion import Conexion
+from app.conexion.Sentencias import sentencias
+from app.dao.AgendMedica.SlotsDao import ESTADOS_SIN_CUPO
+
+_ACTIVAS = f"id_estado NOT IN ({', '.join(str(e) for e in ESTADOS_SIN_CUPO)})"
+
+# Los rangos de disponibilidad son [inicio, fin): una cita a la hora de fin
+# de un bloque cuenta para el bloque que empieza a esa hora, no para los dos.
+# tipo: 'D' disponibilidad, 'C' cita, 'A' agenda. Columnas genericas:
+#   D: id_disponibilidad, fecha, inicio, fin, cupos, cupos libres
+#   C: id_cita, fecha, hora, -, id_estado, id_agenda_medica, estado, paciente, id_paciente
+#   A: id_agenda_medica, fecha, -, -, cupos_maximos, cupos, turno, consultorio, codigo
+CALENDARIO_SQL = f"""
+    SELECT 'D' AS tipo, d.id_disponibilidad AS id, d.disponibilidad_fecha AS fecha,
+           d.disponibilidad_hora_inicio AS inicio, d.disponibilidad_hora_fin AS fin,
+           d.disponibilidad_cupos AS numero1,
+           d.disponibilidad_cupos - (
+               SELECT count(*) FROM cita c
+               WHERE c.id_medico = d.id_medico AND c.fecha_cita = d.disponibilidad_fecha
+                 AND c.hora >= d.disponibilidad_hora_inicio AND c.hora < d.disponibilidad_hora_fin
+                 AND c.{_ACTIVAS}
+           ) AS numero2,
+           NULL::text AS texto1, NULL::text AS texto2, NULL::int AS numero3
+    FROM disponibilidad_horaria d
+    WHERE d.id_medico = %s AND d.disponibilidad_fecha BETWEEN %s AND %s
+    UNION ALL
+    SELECT 'C', c.id_cita, c.fecha_cita, c.hora, NULL,
+           c.id_estado, c.id_agenda_medica,
+           ec.descripcion, p.nombre || ' ' || p.apellido, c.id_paciente
+    FROM cita c
+    JOIN estado_cita ec ON c.id_estado = ec.id_estado
+    JOIN paciente p ON c.id_paciente = p.id_paciente
+    WHERE c.id_medico = %s AND c.fecha_cita BETWEEN %s AND %s
+    UNION ALL
+    SELECT 'A', a.id_agenda_medica, a.fecha_agenda, NULL, NULL,
+           a.cupos_maximos, a.cupos,
+           t.descripcion, co.nombre_consultorio, a.codigo
+    FROM agenda_medica a
+    JOIN turno t ON a.id_turno = t.id_turno
+    LEFT JOIN consultorio co ON a.codigo = co.codigo
+    WHERE a.id_medico = %s AND a.estado AND a.fecha_agenda BETWEEN %s AND %s
+    ORDER BY 1, 3, 4 NULLS FIRST, 2
+"""
+
+# nombre de cada columna de la respuesta y su posicion en la fila
+SECCIONES = {
+    'D': ('disponibilidades', [('id_disponibilidad', 1), ('fecha', 2), ('hora_inicio', 3), ('hora_fin', 4),
+                               ('cupos', 5), ('cupos_libres', 6)]),
+    'C': ('citas', [('id_cita', 1), ('fecha', 2), ('hora', 3), ('id_estado', 5), ('estado', 7),
+                    ('id_paciente', 9), ('paciente', 8), ('id_agenda_medica', 6)]),
+    'A': ('agendas', [('id_agenda_medica', 1), ('fecha', 2), ('turno', 7), ('codigo', 9),
+                      ('consultorio', 8), ('cupos', 6), ('cupos_maximos', 5)]),
+}
+
+
+def _valor(valor):
+    """Fechas y horas como texto corto: '2026-01-05', '08:30'."""
+    if valor is None or isinstance(valor, (int, str)):
+        return valor
+    if hasattr(valor, 'hour'):
+        return valor.strftime('%H:%M')
+    return valor.isoformat()
+
+
+class CalendarioDao:
+
+    def getCalendarioMedico(self, id_medico, desde, hasta):
+        """{'disponibilidades': {...}, 'citas': {...}, 'agendas': {...}}, cada una en columnas."""
+        resultado = {nombre: {columna: [] for columna, _ in columnas} for nombre, columnas in SECCIONES.values()}
+        conexion = Conexion()
+        con = conexion.getConexion()
+        cur = con.cursor()
+        try:
+            sentencias.ejecutar(cur, 'calendario_medico', CALENDARIO_SQL,
+                                (id_medico, desde, hasta) * 3)
+            for fila in cur.fetchall():
+                nombre, columnas = SECCIONES[fila[0]]
+                seccion = resultado[nombre]
+                for columna, posicion in columnas:
+                    seccion[columna].append(_valor(fila[posicion]))
+            return resultado
+        finally:
+            cur.close()
+            con.close()
@@ -0,0 +1,214 @@
+# IndiceSlots.py
+"""Indice en memoria de slots libres por dia, en bitmaps, para buscar el primer turno.
+
+    Para cada (fecha, duracion) se guarda {id_medico: bitmap}: el bit k esta
+    encendido si ese medico tiene un slot libre que empieza en el minuto k
+    del dia (SlotsDao.slotsLibres). Los N primeros turnos de una especialidad
+    salen de recorrer las fechas en orden y mezclar los bits mas bajos de los
+    medicos candidatos, sin volver a leer la agenda de cada uno.
+
+    Un dia se carga entero (todos los medicos) con una consulta. Despues se
+    actualiza por (medico, fecha): los triggers de sql/06_notificar_agenda.sql
+    avisan cada cita o disponibilidad que cambia y en la siguiente busqueda
+    solo se recalculan esos medicos en esa fecha. El ttl acota lo que puede
+    durar un dia si se pierden avisos (escucha desactivada o caida).
+"""
+import heapq
+import os
+import threading
+import time
+from datetime import date, datetime, time as hora_del_dia, timedelta
+from app.conexion.Notificaciones import suscribirCambios
+from app.dao.AgendMedica.SlotsDao import SlotsDao, minutosDelDia
+
+CONFIG_INDICE_SLOTS = {
+    'ttl': float(os.environ.get('SLOTS_INDICE_TTL', 600)),
+}
+
+TABLAS_AGENDA = ('cita', 'disponibilidad_horaria')
+
+
+def bitmapDeSlots(slots):
+    """[(inicio, fin, id_disponibilidad)] -> int con el bit `inicio` encendido."""
+    bitmap = 0
+    for inicio, _, _ in slots:
+        bitmap |= 1 << inicio
+    return bitmap
+
+
+def minutosDeBitmap(bitmap, desde_minuto=0):
+    """Minutos encendidos del bitmap, de menor a mayor, desde `desde_minuto`."""
+    bitmap >>= desde_minuto
+    base = desde_minuto
+    while bitmap:
+        bajo = bitmap & -bitmap
+        yield base + bajo.bit_length() - 1
+        bitmap ^= bajo
+
+
+def _slotsDeMedico(id_medico, bitmap, desde_minuto):
+    for minuto in minutosDeBitmap(bitmap, desde_minuto):
+        yield minuto, id_medico
+
+
+class _Dia:
+    __slots__ = ('bitmaps', 'cargado_en', 'sucios')
+
+    def __init__(self):
+        self.bitmaps = None     # None mientras se carga
+        self.cargado_en = time.monotonic()
+        self.sucios = set()     # medicos a recalcular
+
+
+class IndiceSlots:
+
+    def __init__(self, ttl=None, dao=None):
+        self.ttl = CONFIG_INDICE_SLOTS['ttl'] if ttl is None else ttl
+        self.dao = dao or SlotsDao()
+        self._lock = threading.Lock()
+        self._dias = {}         # (fecha, duracion) -> _Dia
+        self._stats = {'busquedas': 0, 'dias_cargados': 0, 'medicos_recalculados': 0,
+                       'avisos': 0, 'vaciados': 0}
+
+    # ============================
+    # AVISOS DE CAMBIOS
+    # ============================
+
+    def marcarCambio(self, id_medico, fecha):
+        """Recalcular `id_medico` en `fecha` (todas las duraciones) en la proxima busqueda."""
+        with self._lock:
+            self._stats['avisos'] += 1
+            for (dia_fecha, _), dia in self._dias.items():
+                if dia_fecha == fecha:
+                    dia.sucios.add(id_medico)
+
+    def vaciar(self):
+        with self._lock:
+            self._stats['vaciados'] += 1
+            self._dias.clear()
+
+    def _procesarAviso(self, tabla, operacion, aviso):
+        if tabla not in TABLAS_AGENDA:
+            return
+        try:
+            id_medico = int(aviso['id_medico'])
+            fecha = date.fromisoformat(aviso['fecha'])
+        except (KeyError, TypeError, ValueError):
+            # aviso por sentencia (TRUNCATE) o sin datos de la fila
+            self.vaciar()
+            return
+        self.marcarCambio(id_medico, fecha)
+
+    # ============================
+    # CARGA
+    # ============================
+
+    def _inicioDelDia(self, fecha):
+        # los bitmaps se calculan con el dia completo; lo ya pasado se filtra al buscar
+        return datetime.combine(fecha, hora_del_dia.min)
+
+    def _cargarDias(self, fechas, duracion):
+        """Carga de una vez (todos los medicos) los dias que faltan o vencieron."""
+        if not fechas:
+            return
+        with self._lock:
+            for fecha in fechas:
+                self._dias[(fecha, duracion)] = _Dia()
+        desde, hasta = min(fechas), max(fechas)
+        por_dia = {fecha: {} for fecha in fechas}
+        for (id_medico, fecha), slots in self.dao.calcularSlots(None, desde, hasta, duracion,
+                                                                 ahora=self._inicioDelDia(desde)).items():
+            if fecha in por_dia:
+                por_dia[fecha][id_medico] = bitmapDeSlots(slots)
+        with self._lock:
+            for fecha, bitmaps in por_dia.items():
+                dia = self._dias.get((fecha, duracion))
+                if dia is not None and dia.bitmaps is None:
+                    dia.bitmaps = bitmaps
+            self._stats['dias_cargados'] += len(fechas)
+
+    def _recalcular(self, sucios, duracion):
+        """sucios: {fecha: {id_medico}}. Una consulta para todos."""
+        medicos = set().union(*sucios.values())
+        desde, hasta = min(sucios), max(sucios)
+        calculados = self.dao.calcularSlots(medicos, desde, hasta, duracion, ahora=self._inicioDelDia(desde))
+        with self._lock:
+            for fecha, ids in sucios.items():
+                dia = self._dias.get((fecha, duracion))
+                if dia is None or dia.bitmaps is None:
+                    continue
+                for id_medico in ids:
+                    bitmap = bitmapDeSlots(calculados.get((id_medico, fecha), ()))
+                    if bitmap:
+                        dia.bitmaps[id_medico] = bitmap
+                    else:
+                        dia.bitmaps.pop(id_medico, None)
+                self._stats['medicos_recalculados'] += len(ids)
+
+    def _prepararDias(self, fechas, duracion):
+        """Deja al dia las entradas de `fechas`; retorna {fecha: {id_medico: bitmap}}."""
+        ahora = time.monotonic()
+        faltan, sucios = [], {}
+        with self._lock:
+            for clave in [c for c in self._dias if c[0] < date.today()]:
+                del self._dias[clave]
+            for fecha in fechas:
+                dia = self._dias.get((fecha, duracion))
+                if dia is None or dia.bitmaps is None or ahora - dia.cargado_en >= self.ttl:
+                    faltan.append(fecha)
+                elif dia.sucios:
+                    # se toman antes de leer: un aviso que llegue durante la lectura vuelve a marcarlo
+                    sucios[fecha], dia.sucios = dia.sucios, set()
+        self._cargarDias(faltan, duracion)
+        if sucios:
+            self._recalcular(sucios, duracion)
+        with self._lock:
+            resultado = {}
+            for fecha in fechas:
+                dia = self._dias.get((fecha, duracion))
+                resultado[fecha] = dict(dia.bitmaps) if dia is not None and dia.bitmaps else {}
+            return resultado
+
+    # ============================
+    # BUSQUEDA
+    # ============================
+
+    def primerosLibres(self, candidatos, desde, hasta, duracion, cantidad, ahora=None):
+        """Los `cantidad` slots libres mas tempranos de los medicos candidatos.
+
+            candidatos: {id_medico: None | set(fechas)}; None = cualquier fecha
+            del periodo, un set limita el medico a esas fechas (agenda por turno
+            o consultorio). Retorna [(fecha, minuto, id_medico)] en orden.
+        """
+        ahora = ahora or datetime.now()
+        desde = max(desde, ahora.date())
+        with self._lock:
+            self._stats['busquedas'] += 1
+        if not candidatos or hasta < desde:
+            return []
+        fechas = [desde + timedelta(days=n) for n in range((hasta - desde).days + 1)]
+        dias = self._prepararDias(fechas, duracion)
+
+        resultado = []
+        for fecha in fechas:
+            desde_minuto = minutosDelDia(ahora.time()) if fecha == ahora.date() else 0
+            iteradores = [
+                _slotsDeMedico(id_medico, bitmap, desde_minuto)
+                for id_medico, bitmap in dias[fecha].items()
+                if id_medico in candidatos and (candidatos[id_medico] is None or fecha in candidatos[id_medico])
+            ]
+            for minuto, id_medico in heapq.merge(*iteradores):
+                resultado.append((fecha, minuto, id_medico))
+                if len(resultado) >= cantidad:
+                    return resultado
+        return resultado
+
+    def getEstadisticas(self):
+        with self._lock:
+            return dict(self._stats, ttl=self.ttl, dias_en_indice=len(self._dias))
+
+
+indiceSlots = IndiceSlots()
+
+# citas y disponibilidades modificadas por cualquier worker (sql/06_notificar_agenda.sql)
+suscribirCambios(indiceSlots._procesarAviso, al_reconectar=indiceSlots.vaciar, detalle=True)
@@ -0,0 +1,210 @@
+# SlotsDao.py
+"""Turnos libres (slots) de los medicos, calculados en el servidor.
+
+    Un slot es un intervalo de `duracion` minutos dentro de un rango de
+    disponibilidad_horaria que no se superpone con ninguna cita activa
+    (las canceladas / no asistidas, estados 14 y 15, no ocupan lugar).
+    Los rangos cuyas citas ya agotaron disponibilidad_cupos no ofrecen slots.
+
+    Todo el periodo pedido se lee con una sola consulta; el calculo es por
+    minutos del dia sobre listas ordenadas, O(rangos + citas) por dia.
+"""
+import os
+import re
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import datetime
+from flask import current_app as app
+from app.conexion.Conexion import Conexion
+from app.conexion.Sentencias import sentencias
+
+CONFIG_SLOTS = {
+    # minutos por consulta cuando no se indica duracion
+    'duracion': int(os.environ.get('SLOTS_DURACION', 30)),
+    # periodo maximo que se calcula en una llamada
+    'dias_maximo': int(os.environ.get('SLOTS_DIAS_MAXIMO', 62)),
+}
+
+# mismos estados que RegistroCDao.estado_es_cancelado
+ESTADOS_SIN_CUPO = (14, 15)
+
+
+def _periodoSQL(por_medico):
+    """Disponibilidades ('D') y citas activas ('C') del periodo, de algunos medicos o de todos."""
+    medicos = "id_medico = ANY(%s::int[]) AND " if por_medico else ""
+    return f"""
+    SELECT 'D' AS tipo, id_medico, disponibilidad_fecha AS fecha,
+           disponibilidad_hora_inicio AS inicio, disponibilidad_hora_fin AS fin,
+           id_disponibilidad, disponibilidad_cupos AS cupos
+    FROM disponibilidad_horaria
+    WHERE {medicos}disponibilidad_fecha BETWEEN %s AND %s
+    UNION ALL
+    SELECT 'C', id_medico, fecha_cita, hora, NULL, NULL, NULL
+    FROM cita
+    WHERE {medicos}fecha_cita BETWEEN %s AND %s
+      AND id_estado NOT IN ({', '.join(str(e) for e in ESTADOS_SIN_CUPO)})
+    """
+
+
+SLOTS_PERIODO_SQL = _periodoSQL(por_medico=True)
+SLOTS_PERIODO_TODOS_SQL = _periodoSQL(por_medico=False)
+
+# medicos de una especialidad; con turno o consultorio, solo en las fechas de sus agendas activas
+CANDIDATOS_ESPECIALIDAD_SQL = """
+    SELECT id_medico, nombre || ' ' || apellido AS medico_nombre, NULL::date AS fecha
+    FROM medico
+    WHERE id_especialidad = %s
+"""
+
+CANDIDATOS_AGENDA_SQL = """
+    SELECT DISTINCT a.id_medico, m.nombre || ' ' || m.apellido AS medico_nombre, a.fecha_agenda
+    FROM agenda_medica a
+    JOIN medico m ON a.id_medico = m.id_medico
+    WHERE a.id_especialidad = %s AND a.estado
+      AND a.fecha_agenda BETWEEN %s AND %s
+"""
+
+_DURACION = re.compile(r"(\d+)\s*(H|HS|HORA|HORAS)?\b", re.IGNORECASE)
+
+
+def minutosDelDia(hora):
+    """time -> minutos desde la medianoche."""
+    return hora.hour * 60 + hora.minute
+
+
+def horaDeMinutos(minutos):
+    """minutos desde la medianoche -> 'HH:MM'."""
+    return f"{minutos // 60:02d}:{minutos % 60:02d}"
+
+
+def duracionEnMinutos(descripcion):
+    """'30 MINUTOS' -> 30, '1 HORA' -> 60; None si no tiene un numero."""
+    m = _DURACION.search(descripcion or '')
+    if not m:
+        return None
+    minutos = int(m.group(1)) * (60 if m.group(2) else 1)
+    return minutos or None
+
+
+def slotsLibres(rangos, citas, duracion, desde_minuto=0):
+    """Slots libres de un dia.
+
+        rangos: [(inicio, fin, id_disponibilidad, cupos)] en minutos, ordenados por inicio.
+        citas: minutos de inicio de las citas activas, ordenados.
+        Cada cita ocupa [hora, hora + duracion). Los slots van en grilla desde
+        el inicio del rango; si uno choca con una cita, el siguiente empieza
+        cuando la cita termina. Retorna [(inicio, fin, id_disponibilidad)].
+    """
+    libres = []
+    for inicio, fin, id_disponibilidad, cupos in rangos:
+        # la reserva acepta horas en [inicio, fin) (validar_horario_medico_disponibilidad)
+        if cupos is not None and bisect_left(citas, fin) - bisect_left(citas, inicio) >= cupos:
+            continue
+        t = inicio
+        j = bisect_right(citas, inicio - duracion)      # primera cita que termina despues de inicio
+        while t + duracion <= fin:
+            while j < len(citas) and citas[j] + duracion <= t:
+                j += 1
+            if j < len(citas) and citas[j] < t + duracion:
+                t = citas[j] + duracion
+                continue
+            if t >= desde_minuto:
+                libres.append((t, t + duracion, id_disponibilidad))
+            t += duracion
+    return libres
+
+
+class SlotsDao:
+
+    def _leerPeriodo(self, id_medicos, desde, hasta):
+        """{(id_medico, fecha): (rangos, citas)} con rangos y citas en minutos, ordenados.
+
+            id_medicos=None lee todos los medicos.
+        """
+        conexion = Conexion()
+        con = conexion.getConexion()
+        cur = con.cursor()
+        try:
+            if id_medicos is None:
+                sentencias.ejecutar(cur, 'slots_periodo_todos', SLOTS_PERIODO_TODOS_SQL, (desde, hasta, desde, hasta))
+            else:
+                ids = list(id_medicos)
+                sentencias.ejecutar(cur, 'slots_periodo', SLOTS_PERIODO_SQL, (ids, desde, hasta, ids, desde, hasta))
+            dias = defaultdict(lambda: ([], []))
+            for tipo, id_medico, fecha, inicio, fin, id_disponibilidad, cupos in cur.fetchall():
+                rangos, citas = dias[(id_medico, fecha)]
+                if tipo == 'D':
+                    rangos.append((minutosDelDia(inicio), minutosDelDia(fin), id_disponibilidad, cupos))
+                else:
+                    citas.append(minutosDelDia(inicio))
+            for rangos, citas in dias.values():
+                rangos.sort()
+                citas.sort()
+            return dias
+        finally:
+            cur.close()
+            con.close()
+
+    def calcularSlots(self, id_medicos, desde, hasta, duracion, ahora=None):
+        """{(id_medico, fecha): [(inicio, fin, id_disponibilidad)]} de los dias con slots libres.
+
+            Los slots anteriores a `ahora` (por defecto, el momento actual) no se ofrecen.
+        """
+        ahora = ahora or datetime.now()
+        resultado = {}
+        for (id_medico, fecha), (rangos, citas) in self._leerPeriodo(id_medicos, desde, hasta).items():
+            if not rangos or fecha < ahora.date():
+                continue
+            desde_minuto = minutosDelDia(ahora.time()) if fecha == ahora.date() else 0
+            libres = slotsLibres(rangos, citas, duracion, desde_minuto)
+            if libres:
+                resultado[(id_medico, fecha)] = libres
+        return resultado
+
+    def getCandidatos(self, id_especialidad, desde, hasta, id_turno=None, codigo=None):
+        """({id_medico: None | set(fechas)}, {id_medico: nombre}) para IndiceSlots.primerosLibres."""
+        if id_turno is None and codigo is None:
+            sql, params = CANDIDATOS_ESPECIALIDAD_SQL, [id_especialidad]
+        else:
+            sql, params = CANDIDATOS_AGENDA_SQL, [id_especialidad, desde, hasta]
+            if id_turno is not None:
+                sql += " AND a.id_turno = %s"
+                params.append(id_turno)
+            if codigo is not None:
+                sql += " AND a.codigo = %s"
+                params.append(codigo)
+        conexion = Conexion()
+        con = conexion.getConexion()
+        cur = con.cursor()
+        try:
+            cur.execute(sql, tuple(params))
+            candidatos, nombres = {}, {}
+            for id_medico, nombre, fecha in cur.fetchall():
+                nombres[id_medico] = nombre
+                if fecha is None:
+                    candidatos[id_medico] = None
+                else:
+                    candidatos.setdefault(id_medico, set()).add(fecha)
+            return candidatos, nombres
+        finally:
+            cur.close()
+            con.close()
+
+    def getSlotsMedico(self, id_medico, desde, hasta, duracion):
+        """Slots libres de un medico agrupados por dia; None si falla la consulta."""
+        try:
+            por_dia = self.calcularSlots([id_medico], desde, hasta, duracion)
+        except Exception as e:
+            app.logger.error(f"Error al calcular slots del médico {id_medico}: {str(e)}")
+            return None
+        return [
+            {
+                'fecha': fecha.isoformat(),
+                'slots': [
+                    {'hora_inicio': horaDeMinutos(inicio), 'hora_fin': horaDeMinutos(fin),
+                     'id_disponibilidad': id_disponibilidad}
+                    for inicio, fin, id_disponibilidad in por_dia[(id_medico, fecha)]
+                ],
+            }
+            for _, fecha in sorted(por_dia)
+        ]
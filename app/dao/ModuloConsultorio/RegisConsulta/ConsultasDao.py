@@ -1,10 +1,74 @@
 from flask import current_app as app
-from app.conexion.Conexion import Conexion
+from psycopg2 import errors
+from app.conexion.Conexion import usaConexion, soloLectura
+from app.conexion.MapeoFilas import filasComoDicts, filaComoDict
+from app.conexion.Sentencias import sentencias
+from app.conexion.Streaming import iterarConsulta
+from app.conexion.Paginacion import Keyset
+
+# listado de cabeceras sin ORDER BY: el orden lo agrega KEYSET_CONSULTAS
+CONSULTAS_CABECERA_SQL = """
+    SELECT 
+        cc.id_consulta_cab, cc.id_personal, cc.id_consultorio, 
+        cc.id_medico, cc.id_paciente,
+        TO_CHAR(cc.fecha_cita, 'YYYY-MM-DD') AS fecha_cita,
+        TO_CHAR(cc.hora_cita, 'HH24:MI:SS') AS hora_cita,
+        cc.duracion_minutos, cc.estado,
+        p.nombre || ' ' || p.apellido AS nombre_personal,
+        c.nombre_consultorio AS nombre_consultorio,
+        m.nombre || ' ' || m.apellido AS nombre_medico,
+        pac.nombre || ' ' || pac.apellido AS nombre_paciente
+    FROM consultas_cabecera cc
+    INNER JOIN personal p ON cc.id_personal = p.id_personal
+    INNER JOIN consultorio c ON cc.id_consultorio = c.codigo
+    INNER JOIN medico m ON cc.id_medico = m.id_medico
+    INNER JOIN paciente pac ON cc.id_paciente = pac.id_paciente
+"""
+
+KEYSET_CONSULTAS = Keyset('consultas', [
+    ('cc.fecha_cita', 'fecha_cita'),
+    ('cc.hora_cita', 'hora_cita'),
+    ('cc.id_consulta_cab', 'id_consulta_cab'),
+])
+
+# compartido por el listado normal y el envio por partes
+CONSULTAS_DETALLE_INFO_SQL = """
+    SELECT 
+        cd.id_consulta_detalle, 
+        cd.id_consulta_cab, 
+        cd.id_sintoma,
+        cd.pieza_dental, 
+        cd.diagnostico, 
+        cd.tratamiento, 
+        cd.procedimiento,
+        cd.id_tipo_diagnostico,
+        cd.id_tipo_procedimiento,
+        s.descripcion_sintoma AS descripcion_sintoma,
+        cc.id_medico,
+        cc.id_paciente,
+        TO_CHAR(cc.fecha_cita, 'YYYY-MM-DD') AS fecha_cita,
+        TO_CHAR(cc.hora_cita, 'HH24:MI:SS') AS hora_cita,
+        m.nombre || ' ' || m.apellido AS nombre_medico,
+        p.nombre || ' ' || p.apellido AS nombre_paciente,
+        con.nombre_consultorio AS nombre_consultorio,
+        COALESCE(td.tipo_diagnostico, 'Sin tipo') AS descripcion_tipo_diagnostico,
+        COALESCE(tp.procedimiento, 'Sin tipo') AS descripcion_tipo_procedimiento
+    FROM consultas_detalle cd
+    INNER JOIN sintoma s ON cd.id_sintoma = s.id_sintoma
+    INNER JOIN consultas_cabecera cc ON cd.id_consulta_cab = cc.id_consulta_cab
+    INNER JOIN medico m ON cc.id_medico = m.id_medico
+    INNER JOIN paciente p ON cc.id_paciente = p.id_paciente
+    LEFT JOIN consultorio con ON cc.id_consultorio = con.codigo
+    LEFT JOIN tipo_diagnostico td ON cd.id_tipo_diagnostico = td.id_tipo_diagnostico
+    LEFT JOIN tipo_procedimiento_medico tp ON cd.id_tipo_procedimiento = tp.id_tipo_procedimiento
+    ORDER BY cd.id_consulta_detalle DESC
+"""
 
 class ConsultasDao:
 
     def __init__(self):
-        self.conn = Conexion().getConexion()
+        # la conexion se toma por llamada con @usaConexion
+        self.conn = None
 
     # ============================
     # Validación de datos CABECERA
@@ -29,55 +93,14 @@ class ConsultasDao:
             except ValueError:
                 raise ValueError("La duración debe ser un número entero válido")
             
-    def _validar_consulta_duplicada(self, data, id_consulta_cab=None):
-        """Valida que no exista una consulta duplicada en la misma fecha, hora y consultorio"""
-        try:
-            cursor = self.conn.cursor()
-            
-            if id_consulta_cab:
-                # Para UPDATE: excluir el registro actual
-                cursor.execute("""
-                    SELECT COUNT(*) 
-                    FROM consultas_cabecera 
-                    WHERE id_consultorio = %s 
-                    AND fecha_cita = %s 
-                    AND hora_cita = %s
-                    AND id_consulta_cab != %s
-                """, (
-                    data.get("id_consultorio"),
-                    data.get("fecha_cita"),
-                    data.get("hora_cita"),
-                    id_consulta_cab
-                ))
-            else:
-                # Para INSERT
-                cursor.execute("""
-                    SELECT COUNT(*) 
-                    FROM consultas_cabecera 
-                    WHERE id_consultorio = %s 
-                    AND fecha_cita = %s 
-                    AND hora_cita = %s
-                """, (
-                    data.get("id_consultorio"),
-                    data.get("fecha_cita"),
-                    data.get("hora_cita")
-                ))
-            
-            count = cursor.fetchone()[0]
-            cursor.close()
-            
-            if count > 0:
-                raise ValueError(
-                    f"Ya existe una consulta programada en el consultorio "
-                    f"'{data.get('id_consultorio')}' para la fecha {data.get('fecha_cita')} "
-                    f"a las {data.get('hora_cita')}"
-                )
-        except ValueError:
-            raise
-        except Exception as e:
-            app.logger.error(f"Error al validar consulta duplicada: {str(e)}")
-            raise ValueError("Error al validar disponibilidad de la consulta")
+    def _mensaje_consulta_solapada(self, data):
+        return (
+            f"Ya existe una consulta programada en el consultorio "
+            f"'{data.get('id_consultorio')}' para la fecha {data.get('fecha_cita')} "
+            f"a las {data.get('hora_cita')}"
+        )
 
+    @usaConexion
     def getFichaMedicaPaciente(self, id_paciente):
         try:
             sql = """
@@ -112,40 +135,35 @@ class ConsultasDao:
     # ============================
     # CONSULTAS CABECERA
     # ============================
+    @soloLectura
+    @usaConexion
     def getConsultasCabecera(self):
         try:
             cursor = self.conn.cursor()
-            cursor.execute("""
-                SELECT 
-                    cc.id_consulta_cab, cc.id_personal, cc.id_consultorio, 
-                    cc.id_medico, cc.id_paciente,
-                    TO_CHAR(cc.fecha_cita, 'YYYY-MM-DD') AS fecha_cita,
-                    TO_CHAR(cc.hora_cita, 'HH24:MI:SS') AS hora_cita,
-                    cc.duracion_minutos, cc.estado,
-                    p.nombre || ' ' || p.apellido AS nombre_personal,
-                    c.nombre_consultorio AS nombre_consultorio,
-                    m.nombre || ' ' || m.apellido AS nombre_medico,
-                    pac.nombre || ' ' || pac.apellido AS nombre_paciente
-                FROM consultas_cabecera cc
-                INNER JOIN personal p ON cc.id_personal = p.id_personal
-                INNER JOIN consultorio c ON cc.id_consultorio = c.codigo
-                INNER JOIN medico m ON cc.id_medico = m.id_medico
-                INNER JOIN paciente pac ON cc.id_paciente = pac.id_paciente
-                ORDER BY cc.fecha_cita DESC, cc.hora_cita DESC
-            """)
+            cursor.execute(CONSULTAS_CABECERA_SQL + KEYSET_CONSULTAS.orden)
             rows = cursor.fetchall()
-            columnas = [desc[0] for desc in cursor.description]
-            consultas = [dict(zip(columnas, row)) for row in rows]
+            consultas = filasComoDicts(cursor, rows)
             cursor.close()
             return consultas
         except Exception as e:
             app.logger.error(f"Error al obtener consultas cabecera: {str(e)}")
             return []
 
+    @soloLectura
+    @usaConexion
+    def getConsultasCabeceraPagina(self, limite, cursor_pagina=None):
+        """Una pagina de cabeceras; cursor_pagina es el 'siguiente' de la pagina anterior"""
+        cursor = self.conn.cursor()
+        try:
+            return KEYSET_CONSULTAS.consultar(cursor, CONSULTAS_CABECERA_SQL, (), limite, cursor_pagina)
+        finally:
+            cursor.close()
+
+    @usaConexion
     def getConsultaCabeceraById(self, id_consulta_cab):
         try:
             cursor = self.conn.cursor()
-            cursor.execute("""
+            sentencias.ejecutar(cursor, 'consulta_cabecera_por_id', """
                 SELECT 
                     cc.id_consulta_cab, cc.id_personal, cc.id_consultorio, 
                     cc.id_medico, cc.id_paciente,
@@ -165,9 +183,9 @@ class ConsultasDao:
             """, (id_consulta_cab,))
             row = cursor.fetchone()
             if not row:
+                cursor.close()
                 return None
-            columnas = [desc[0] for desc in cursor.description]
-            consulta = dict(zip(columnas, row))
+            consulta = filaComoDict(cursor, row)
             cursor.close()
             return consulta
         except Exception as e:
@@ -177,10 +195,10 @@ class ConsultasDao:
     # ============================
     # INSERT / UPDATE / DELETE CABECERA
     # ============================
+    @usaConexion
     def addConsultaCabecera(self, data):
         try:
             self._validar_datos_cabecera(data)
-            self._validar_consulta_duplicada(data)
             cursor = self.conn.cursor()
             cursor.execute("""
                 INSERT INTO consultas_cabecera(
@@ -203,15 +221,18 @@ class ConsultasDao:
             self.conn.commit()
             cursor.close()
             return id_consulta_cab
+        except errors.ExclusionViolation:
+            self.conn.rollback()
+            raise ValueError(self._mensaje_consulta_solapada(data))
         except Exception as e:
             self.conn.rollback()
             app.logger.error(f"Error al insertar consulta cabecera: {str(e)}")
             return None
 
+    @usaConexion
     def updateConsultaCabecera(self, id_consulta_cab, data):
         try:
             self._validar_datos_cabecera(data)
-            self._validar_consulta_duplicada(data, id_consulta_cab)
             cursor = self.conn.cursor()
             cursor.execute("""
                 UPDATE consultas_cabecera SET
@@ -238,11 +259,15 @@ class ConsultasDao:
             self.conn.commit()
             cursor.close()
             return True
+        except errors.ExclusionViolation:
+            self.conn.rollback()
+            raise ValueError(self._mensaje_consulta_solapada(data))
         except Exception as e:
             self.conn.rollback()
             app.logger.error(f"Error al actualizar consulta cabecera: {str(e)}")
             return False
 
+    @usaConexion
     def deleteConsultaCabecera(self, id_consulta_cab):
         try:
             cursor = self.conn.cursor()
@@ -258,6 +283,7 @@ class ConsultasDao:
     # ============================
     # CONSULTAS DETALLE
     # ============================
+    @usaConexion
     def getConsultasDetalle(self):
         try:
             cursor = self.conn.cursor()
@@ -276,14 +302,14 @@ class ConsultasDao:
                 ORDER BY cd.id_consulta_detalle DESC
             """)
             rows = cursor.fetchall()
-            columnas = [desc[0] for desc in cursor.description]
-            detalles = [dict(zip(columnas, row)) for row in rows]
+            detalles = filasComoDicts(cursor, rows)
             cursor.close()
             return detalles
         except Exception as e:
             app.logger.error(f"Error al obtener consultas detalle: {str(e)}")
             return []
 
+    @usaConexion
     def getConsultaDetalleByIdConInfo(self, id_consulta_detalle):
         """Obtiene un detalle específico con información completa de médico y paciente"""
         try:
@@ -318,15 +344,16 @@ class ConsultasDao:
             """, (id_consulta_detalle,))
             row = cursor.fetchone()
             if not row:
+                cursor.close()
                 return None
-            columnas = [desc[0] for desc in cursor.description]
-            detalle = dict(zip(columnas, row))
+            detalle = filaComoDict(cursor, row)
             cursor.close()
             return detalle
         except Exception as e:
             app.logger.error(f"Error al obtener consulta detalle con info: {str(e)}")
             return None
 
+    @usaConexion
     def getConsultaDetalleById(self, id_consulta_detalle):
         try:
             cursor = self.conn.cursor()
@@ -340,59 +367,34 @@ class ConsultasDao:
             """, (id_consulta_detalle,))
             row = cursor.fetchone()
             if not row:
+                cursor.close()
                 return None
-            columnas = [desc[0] for desc in cursor.description]
-            detalle = dict(zip(columnas, row))
+            detalle = filaComoDict(cursor, row)
             cursor.close()
             return detalle
         except Exception as e:
             app.logger.error(f"Error al obtener consulta detalle: {str(e)}")
             return None
 
+    @usaConexion
     def getConsultasDetalleConInfo(self):
         """Obtiene todos los detalles de consulta con información de médico y paciente"""
         try:
             cursor = self.conn.cursor()
-            cursor.execute("""
-                SELECT 
-                    cd.id_consulta_detalle, 
-                    cd.id_consulta_cab, 
-                    cd.id_sintoma,
-                    cd.pieza_dental, 
-                    cd.diagnostico, 
-                    cd.tratamiento, 
-                    cd.procedimiento,
-                    cd.id_tipo_diagnostico,
-                    cd.id_tipo_procedimiento,
-                    s.descripcion_sintoma AS descripcion_sintoma,
-                    cc.id_medico,
-                    cc.id_paciente,
-                    TO_CHAR(cc.fecha_cita, 'YYYY-MM-DD') AS fecha_cita,
-                    TO_CHAR(cc.hora_cita, 'HH24:MI:SS') AS hora_cita,
-                    m.nombre || ' ' || m.apellido AS nombre_medico,
-                    p.nombre || ' ' || p.apellido AS nombre_paciente,
-                    con.nombre_consultorio AS nombre_consultorio,
-                    COALESCE(td.tipo_diagnostico, 'Sin tipo') AS descripcion_tipo_diagnostico,
-                    COALESCE(tp.procedimiento, 'Sin tipo') AS descripcion_tipo_procedimiento
-                FROM consultas_detalle cd
-                INNER JOIN sintoma s ON cd.id_sintoma = s.id_sintoma
-                INNER JOIN consultas_cabecera cc ON cd.id_consulta_cab = cc.id_consulta_cab
-                INNER JOIN medico m ON cc.id_medico = m.id_medico
-                INNER JOIN paciente p ON cc.id_paciente = p.id_paciente
-                LEFT JOIN consultorio con ON cc.id_consultorio = con.codigo
-                LEFT JOIN tipo_diagnostico td ON cd.id_tipo_diagnostico = td.id_tipo_diagnostico
-                LEFT JOIN tipo_procedimiento_medico tp ON cd.id_tipo_procedimiento = tp.id_tipo_procedimiento
-                ORDER BY cd.id_consulta_detalle DESC
-            """)
+            cursor.execute(CONSULTAS_DETALLE_INFO_SQL)
             rows = cursor.fetchall()
-            columnas = [desc[0] for desc in cursor.description]
-            detalles = [dict(zip(columnas, row)) for row in rows]
+            detalles = filasComoDicts(cursor, rows)
             cursor.close()
             return detalles
         except Exception as e:
             app.logger.error(f"Error al obtener consultas detalle con info: {str(e)}")
             return []
 
+    def iterConsultasDetalleConInfo(self):
+        """Igual que getConsultasDetalleConInfo pero como generador (cursor del servidor)"""
+        return iterarConsulta(CONSULTAS_DETALLE_INFO_SQL, nombre='consultas_detalle_info')
+
+    @usaConexion
     def getDetallesByConsultaCab(self, id_consulta_cab):
         try:
             cursor = self.conn.cursor()
@@ -418,8 +420,7 @@ class ConsultasDao:
                 ORDER BY cd.id_consulta_detalle
             """, (id_consulta_cab,))
             rows = cursor.fetchall()
-            columnas = [desc[0] for desc in cursor.description]
-            detalles = [dict(zip(columnas, row)) for row in rows]
+            detalles = filasComoDicts(cursor, rows)
             cursor.close()
             return detalles
         except Exception as e:
@@ -427,6 +428,7 @@ class ConsultasDao:
             return []
 
 
+    @usaConexion
     def _validar_detalle_duplicado(self, data, id_consulta_detalle=None):
         """Valida que no exista un detalle duplicado con el mismo síntoma en la misma consulta"""
         try:
@@ -475,6 +477,7 @@ class ConsultasDao:
             app.logger.error(f"Error al validar detalle duplicado: {str(e)}")
             raise ValueError("Error al validar duplicidad del detalle")
 
+    @usaConexion
     def addConsultaDetalle(self, data):
         try:
             self._validar_datos_detalle(data)
@@ -508,6 +511,7 @@ class ConsultasDao:
             return None
 
 
+    @usaConexion
     def updateConsultaDetalle(self, id_consulta_detalle, data):
         try:
             self._validar_datos_detalle(data)
@@ -543,6 +547,7 @@ class ConsultasDao:
             app.logger.error(f"Error al actualizar consulta detalle: {str(e)}")
             return False
 
+    @usaConexion
     def updateDiagnosticoPrincipal(self, id_consulta_detalle, data):
         """Actualiza solo el diagnóstico principal en consultas_detalle"""
         try:
@@ -565,6 +570,7 @@ class ConsultasDao:
             app.logger.error(f"Error al actualizar diagnóstico principal: {str(e)}")
             return False
 
+    @usaConexion
     def updateTratamientoPrincipal(self, id_consulta_detalle, data):
         """Actualiza solo el tratamiento principal en consultas_detalle"""
         try:
@@ -585,6 +591,7 @@ class ConsultasDao:
             app.logger.error(f"Error al actualizar tratamiento principal: {str(e)}")
             return False
 
+    @usaConexion
     def deleteConsultaDetalle(self, id_consulta_detalle):
         try:
             cursor = self.conn.cursor()
@@ -624,6 +631,7 @@ class ConsultasDao:
     # ============================
     # DIAGNÓSTICOS
     # ============================
+    @usaConexion
     def getDiagnosticosByConsultaDetalle(self, id_consulta_detalle):
         """Obtiene todos los diagnósticos de una consulta detalle específica"""
         try:
@@ -643,8 +651,7 @@ class ConsultasDao:
                 ORDER BY d.fecha_diagnostico DESC, d.id_diagnostico DESC
             """, (id_consulta_detalle,))
             rows = cursor.fetchall()
-            columnas = [desc[0] for desc in cursor.description]
-            diagnosticos = [dict(zip(columnas, row)) for row in rows]
+            diagnosticos = filasComoDicts(cursor, rows)
             cursor.close()
             return diagnosticos
         except Exception as e:
@@ -652,6 +659,7 @@ class ConsultasDao:
             return []
 
 
+    @usaConexion
     def _validar_diagnostico_duplicado(self, data, id_diagnostico=None):
         """Valida que no exista un diagnóstico duplicado exactamente igual"""
         try:
@@ -716,6 +724,7 @@ class ConsultasDao:
             raise ValueError("Error al validar duplicidad del diagnóstico")
 
 
+    @usaConexion
     def addDiagnostico(self, data):
         """Agrega un nuevo diagnóstico detallado con pieza_dental de consulta_detalle si no se proporciona"""
         try:
@@ -774,6 +783,7 @@ class ConsultasDao:
             return None
 
 
+    @usaConexion
     def updateDiagnostico(self, id_diagnostico, data):
         """Actualiza un diagnóstico específico con validación de duplicados"""
         try:
@@ -840,6 +850,7 @@ class ConsultasDao:
             app.logger.error(f"Error al actualizar diagnóstico: {str(e)}")
             return False
     
+    @usaConexion
     def deleteDiagnostico(self, id_diagnostico):
         """Elimina un diagnóstico específico"""
         try:
@@ -887,6 +898,7 @@ class ConsultasDao:
             if valor is None or (isinstance(valor, str) and valor.strip() == ""):
                 raise ValueError(f"El campo '{campo}' es obligatorio y no puede estar vacío")
 
+    @usaConexion
     def getTratamientosByConsultaDetalle(self, id_consulta_detalle):
         """Obtiene todos los tratamientos de una consulta detalle específica"""
         try:
@@ -911,8 +923,7 @@ class ConsultasDao:
                 ORDER BY t.fecha_tratamiento DESC, t.id_tratamiento DESC
             """, (id_consulta_detalle,))
             rows = cursor.fetchall()
-            columnas = [desc[0] for desc in cursor.description]
-            tratamientos = [dict(zip(columnas, row)) for row in rows]
+            tratamientos = filasComoDicts(cursor, rows)
             cursor.close()
             return tratamientos
         except Exception as e:
@@ -920,6 +931,7 @@ class ConsultasDao:
             return []
 
 
+    @usaConexion
     def _validar_tratamiento_duplicado(self, data, id_tratamiento=None):
         """Valida que no exista un tratamiento duplicado exactamente igual"""
         try:
@@ -981,6 +993,7 @@ class ConsultasDao:
 
 
 
+    @usaConexion
     def addTratamiento(self, data):
         """Agrega un nuevo tratamiento con la fecha de la consulta"""
         try:
@@ -1031,6 +1044,7 @@ class ConsultasDao:
             app.logger.error(f"Error al insertar tratamiento: {str(e)}")
             return None
 
+    @usaConexion
     def updateTratamiento(self, id_tratamiento, data):
         """Actualiza un tratamiento específico con validación de duplicados"""
         try:
@@ -1097,6 +1111,7 @@ class ConsultasDao:
             app.logger.error(f"Error al actualizar tratamiento: {str(e)}")
             return False
     
+    @usaConexion
     def deleteTratamiento(self, id_tratamiento):
         """Elimina un tratamiento específico"""
         try:
@@ -1110,6 +1125,8 @@ class ConsultasDao:
             app.logger.error(f"Error al eliminar tratamiento: {str(e)}")
             return False
 
+    @soloLectura
+    @usaConexion
     def getFichaMedicaPaciente(self, id_paciente):
         """Obtiene toda la información para generar la ficha médica del paciente"""
         try:
@@ -1,37 +1,45 @@
 # DiagnosticoDao.py
 from flask import current_app as app
 from app.conexion.Conexion import Conexion
+from app.conexion.MapeoFilas import filasComoDicts, filaComoDict
+from app.conexion.Paginacion import Keyset
+
+# listado sin ORDER BY: el orden lo agrega KEYSET_DIAGNOSTICOS
+DIAGNOSTICOS_SQL = """
+    SELECT d.id_diagnostico,
+           d.id_consulta_detalle,
+           d.id_medico,
+           d.id_paciente,
+           d.id_tipo_diagnostico,
+           td.tipo_diagnostico AS tipo_diagnostico,
+           d.descripcion_diagnostico,
+           d.fecha_diagnostico,
+           d.pieza_dental,
+           m.nombre || ' ' || m.apellido AS medico_nombre,
+           p.nombre || ' ' || p.apellido AS paciente_nombre
+    FROM diagnosticos d
+    LEFT JOIN tipo_diagnostico td ON d.id_tipo_diagnostico = td.id_tipo_diagnostico
+    LEFT JOIN medico m ON d.id_medico = m.id_medico
+    LEFT JOIN paciente p ON d.id_paciente = p.id_paciente
+"""
+
+KEYSET_DIAGNOSTICOS = Keyset('diagnosticos', [
+    ('d.fecha_diagnostico', 'fecha_diagnostico'),
+    ('d.id_diagnostico', 'id_diagnostico'),
+])
 
 class DiagnosticoDao:
 
     # Listar todos los diagnósticos
     def getDiagnosticos(self):
-        sql = """
-        SELECT d.id_diagnostico,
-               d.id_consulta_detalle,
-               d.id_medico,
-               d.id_paciente,
-               d.id_tipo_diagnostico,
-               td.tipo_diagnostico AS tipo_diagnostico,
-               d.descripcion_diagnostico,
-               d.fecha_diagnostico,
-               d.pieza_dental,
-               m.nombre || ' ' || m.apellido AS medico_nombre,
-               p.nombre || ' ' || p.apellido AS paciente_nombre
-        FROM diagnosticos d
-        LEFT JOIN tipo_diagnostico td ON d.id_tipo_diagnostico = td.id_tipo_diagnostico
-        LEFT JOIN medico m ON d.id_medico = m.id_medico
-        LEFT JOIN paciente p ON d.id_paciente = p.id_paciente
-        ORDER BY d.fecha_diagnostico DESC, d.id_diagnostico DESC;
-        """
+        sql = DIAGNOSTICOS_SQL + KEYSET_DIAGNOSTICOS.orden
         conexion = Conexion()
         con = conexion.getConexion()
         cur = con.cursor()
         try:
             cur.execute(sql)
             rows = cur.fetchall()
-            columnas = [desc[0] for desc in cur.description]
-            return [dict(zip(columnas, row)) for row in rows]
+            return filasComoDicts(cur, rows)
         except Exception as e:
             app.logger.error(f"Error al obtener diagnósticos: {e}")
             return []
@@ -39,6 +47,17 @@ class DiagnosticoDao:
             cur.close()
             con.close()
 
+    # Una página de diagnósticos (paginación por clave)
+    def getDiagnosticosPagina(self, limite, cursor_pagina=None):
+        conexion = Conexion()
+        con = conexion.getConexion()
+        cur = con.cursor()
+        try:
+            return KEYSET_DIAGNOSTICOS.consultar(cur, DIAGNOSTICOS_SQL, (), limite, cursor_pagina)
+        finally:
+            cur.close()
+            con.close()
+
     # Obtener un diagnóstico por id
     def getDiagnosticoById(self, id_diagnostico):
         sql = """
@@ -66,8 +85,7 @@ class DiagnosticoDao:
             cur.execute(sql, (id_diagnostico,))
             row = cur.fetchone()
             if row:
-                columnas = [desc[0] for desc in cur.description]
-                return dict(zip(columnas, row))
+                return filaComoDict(cur, row)
             return None
         except Exception as e:
             app.logger.error(f"Error al obtener diagnóstico {id_diagnostico}: {e}")
@@ -103,8 +121,7 @@ class DiagnosticoDao:
         try:
             cur.execute(sql, (id_consulta_detalle,))
             rows = cur.fetchall()
-            columnas = [desc[0] for desc in cur.description]
-            return [dict(zip(columnas, row)) for row in rows]
+            return filasComoDicts(cur, rows)
         except Exception as e:
             app.logger.error(f"Error al obtener diagnósticos de consulta {id_consulta_detalle}: {e}")
             return []
@@ -137,8 +154,7 @@ class DiagnosticoDao:
         try:
             cur.execute(sql, (id_paciente,))
             rows = cur.fetchall()
-            columnas = [desc[0] for desc in cur.description]
-            return [dict(zip(columnas, row)) for row in rows]
+            return filasComoDicts(cur, rows)
         except Exception as e:
             app.logger.error(f"Error al obtener diagnósticos del paciente {id_paciente}: {e}")
             return []
@@ -171,8 +187,7 @@ class DiagnosticoDao:
         try:
             cur.execute(sql, (id_medico,))
             rows = cur.fetchall()
-            columnas = [desc[0] for desc in cur.description]
-            return [dict(zip(columnas, row)) for row in rows]
+            return filasComoDicts(cur, rows)
         except Exception as e:
             app.logger.error(f"Error al obtener diagnósticos del médico {id_medico}: {e}")
             return []
@@ -1,36 +1,44 @@
 # TratamientoDao.py
 from flask import current_app as app
 from app.conexion.Conexion import Conexion
+from app.conexion.MapeoFilas import filasComoDicts, filaComoDict
+from app.conexion.Paginacion import Keyset
+
+# listado sin ORDER BY: el orden lo agrega KEYSET_TRATAMIENTOS
+TRATAMIENTOS_SQL = """
+    SELECT t.id_tratamiento,
+           t.id_consulta_detalle,
+           t.id_medico,
+           t.id_paciente,
+           t.descripcion_tratamiento,
+           t.fecha_tratamiento,
+           t.duracion_estimada,
+           t.costo_estimado,
+           t.estado,
+           m.nombre || ' ' || m.apellido AS medico_nombre,
+           p.nombre || ' ' || p.apellido AS paciente_nombre
+    FROM tratamientos t
+    LEFT JOIN medico m ON t.id_medico = m.id_medico
+    LEFT JOIN paciente p ON t.id_paciente = p.id_paciente
+"""
+
+KEYSET_TRATAMIENTOS = Keyset('tratamientos', [
+    ('t.fecha_tratamiento', 'fecha_tratamiento'),
+    ('t.id_tratamiento', 'id_tratamiento'),
+])
 
 class TratamientoDao:
 
     # Listar todos los tratamientos
     def getTratamientos(self):
-        sql = """
-        SELECT t.id_tratamiento,
-               t.id_consulta_detalle,
-               t.id_medico,
-               t.id_paciente,
-               t.descripcion_tratamiento,
-               t.fecha_tratamiento,
-               t.duracion_estimada,
-               t.costo_estimado,
-               t.estado,
-               m.nombre || ' ' || m.apellido AS medico_nombre,
-               p.nombre || ' ' || p.apellido AS paciente_nombre
-        FROM tratamientos t
-        LEFT JOIN medico m ON t.id_medico = m.id_medico
-        LEFT JOIN paciente p ON t.id_paciente = p.id_paciente
-        ORDER BY t.fecha_tratamiento DESC, t.id_tratamiento DESC;
-        """
+        sql = TRATAMIENTOS_SQL + KEYSET_TRATAMIENTOS.orden
         conexion = Conexion()
         con = conexion.getConexion()
         cur = con.cursor()
         try:
             cur.execute(sql)
             rows = cur.fetchall()
-            columnas = [desc[0] for desc in cur.description]
-            return [dict(zip(columnas, row)) for row in rows]
+            return filasComoDicts(cur, rows)
         except Exception as e:
             app.logger.error(f"Error al obtener tratamientos: {e}")
             return []
@@ -38,6 +46,17 @@ class TratamientoDao:
             cur.close()
             con.close()
 
+    # Una página de tratamientos (paginación por clave)
+    def getTratamientosPagina(self, limite, cursor_pagina=None):
+        conexion = Conexion()
+        con = conexion.getConexion()
+        cur = con.cursor()
+        try:
+            return KEYSET_TRATAMIENTOS.consultar(cur, TRATAMIENTOS_SQL, (), limite, cursor_pagina)
+        finally:
+            cur.close()
+            con.close()
+
     # Obtener un tratamiento por id
     def getTratamientoById(self, id_tratamiento):
         sql = """
@@ -64,8 +83,7 @@ class TratamientoDao:
             cur.execute(sql, (id_tratamiento,))
             row = cur.fetchone()
             if row:
-                columnas = [desc[0] for desc in cur.description]
-                return dict(zip(columnas, row))
+                return filaComoDict(cur, row)
             return None
         except Exception as e:
             app.logger.error(f"Error al obtener tratamiento {id_tratamiento}: {e}")
@@ -100,8 +118,7 @@ class TratamientoDao:
         try:
             cur.execute(sql, (id_consulta_detalle,))
             rows = cur.fetchall()
-            columnas = [desc[0] for desc in cur.description]
-            return [dict(zip(columnas, row)) for row in rows]
+            return filasComoDicts(cur, rows)
         except Exception as e:
             app.logger.error(f"Error al obtener tratamientos de consulta {id_consulta_detalle}: {e}")
             return []
@@ -133,8 +150,7 @@ class TratamientoDao:
         try:
             cur.execute(sql, (id_paciente,))
             rows = cur.fetchall()
-            columnas = [desc[0] for desc in cur.description]
-            return [dict(zip(columnas, row)) for row in rows]
+            return filasComoDicts(cur, rows)
         except Exception as e:
             app.logger.error(f"Error al obtener tratamientos del paciente {id_paciente}: {e}")
             return []
@@ -166,8 +182,7 @@ class TratamientoDao:
         try:
             cur.execute(sql, (id_medico,))
             rows = cur.fetchall()
-            columnas = [desc[0] for desc in cur.description]
-            return [dict(zip(columnas, row)) for row in rows]
+            return filasComoDicts(cur, rows)
         except Exception as e:
             app.logger.error(f"Error al obtener tratamientos del médico {id_medico}: {e}")
             return []
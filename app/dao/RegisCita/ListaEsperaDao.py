@@ -0,0 +1,240 @@
+# ListaEsperaDao.py
+"""Lista de espera por especialidad y fecha (sql/08_lista_espera.sql).
+
+    Cuando una cita se cancela y devuelve su cupo, updateRegistroC llama a
+    ofrecerLugar con su cursor: el primero de la cola pasa a OFRECIDA y se
+    deja un aviso pendiente para el paciente, en la misma transaccion que la
+    cancelacion (si la cancelacion se deshace, la oferta tambien). El
+    paciente acepta con aceptarOferta, que reserva la hora liberada; si la
+    hora ya no se puede reservar vuelve a EN_ESPERA y el lugar se ofrece al
+    siguiente. Las cancelaciones y movimientos por lote de un medico
+    (cancelarCitasMedico, moverCitasMedico) no ofrecen nada: el medico no
+    atiende esas horas.
+"""
+from flask import current_app as app
+from app.conexion.Conexion import Conexion, soloLectura
+from app.conexion.Sentencias import sentencias
+from app.conexion.MapeoFilas import filasComoDicts, fechaISO
+
+ESTADO_RESERVADO = 10
+PRIORIDAD_POR_DEFECTO = 3
+MOTIVO_LISTA_ESPERA = 'Lista de espera'
+
+CONVERSION_ESPERA = {'fecha': fechaISO}
+
+COLA_SQL = """
+    SELECT e.id_espera, e.id_paciente, p.nombre || ' ' || p.apellido AS paciente,
+           e.id_especialidad, e.id_medico, e.fecha, e.prioridad, e.estado,
+           e.id_cita_liberada
+    FROM lista_espera e
+    JOIN paciente p ON e.id_paciente = p.id_paciente
+    WHERE e.id_especialidad = %s AND e.fecha = %s AND e.estado IN ('EN_ESPERA', 'OFRECIDA')
+    ORDER BY e.estado DESC, e.prioridad, e.creado, e.id_espera
+"""
+
+AGREGAR_SQL = """
+    INSERT INTO lista_espera (id_paciente, id_especialidad, id_medico, fecha, prioridad)
+    VALUES (%s, %s, %s, %s, %s)
+    ON CONFLICT (id_paciente, id_especialidad, fecha) WHERE estado IN ('EN_ESPERA', 'OFRECIDA')
+    DO NOTHING
+    RETURNING id_espera
+"""
+
+# El primero de la cola sale de ix_lista_espera_cola (especialidad, fecha,
+# prioridad, creado): una bajada por el indice, sin ordenar la lista. SKIP
+# LOCKED: si otra cancelacion ya tomo a ese paciente se ofrece al siguiente.
+# Solo se ofrece si la hora sigue libre y la agenda tiene cupo: al volver a
+# ofrecer una hora que otro ya reservo no se avisa a nadie.
+OFRECER_LUGAR_SQL = """
+    WITH liberada AS (
+        SELECT c.id_cita, c.id_medico, c.id_especialidad, c.fecha_cita, c.hora, c.id_agenda_medica
+        FROM cita c
+        JOIN agenda_medica a ON a.id_agenda_medica = c.id_agenda_medica
+        WHERE c.id_cita = %s AND a.cupos > 0
+          AND NOT EXISTS (
+              SELECT 1 FROM cita x
+              WHERE x.id_medico = c.id_medico AND x.fecha_cita = c.fecha_cita AND x.hora = c.hora
+                AND x.id_estado NOT IN (14, 15)
+          )
+    ),
+    siguiente AS (
+        SELECT e.id_espera
+        FROM lista_espera e, liberada l
+        WHERE e.estado = 'EN_ESPERA' AND e.id_especialidad = l.id_especialidad
+          AND e.fecha = l.fecha_cita AND (e.id_medico IS NULL OR e.id_medico = l.id_medico)
+        ORDER BY e.prioridad, e.creado, e.id_espera
+        LIMIT 1
+        FOR UPDATE OF e SKIP LOCKED
+    ),
+    ofrecida AS (
+        UPDATE lista_espera e
+        SET estado = 'OFRECIDA', id_cita_liberada = l.id_cita, ofrecido_en = now()
+        FROM siguiente s, liberada l
+        WHERE e.id_espera = s.id_espera
+        RETURNING e.id_espera, e.id_paciente
+    ),
+    aviso AS (
+        INSERT INTO avisos_recordatorios (id_paciente, id_personal, id_medico, codigo, fecha_cita, hora_cita,
+                                          forma_envio, mensaje, estado_envio, estado_confirmacion)
+        SELECT o.id_paciente, a.id_personal, l.id_medico, a.codigo, l.fecha_cita, l.hora, 'WhatsApp',
+               'Se liberó un turno el ' || to_char(l.fecha_cita, 'DD/MM/YYYY') || ' a las '
+                   || to_char(l.hora, 'HH24:MI') || '. Responda para confirmarlo.',
+               'Pendiente', 'Pendiente'
+        FROM ofrecida o, liberada l
+        JOIN agenda_medica a ON a.id_agenda_medica = l.id_agenda_medica
+        RETURNING id_aviso
+    )
+    SELECT o.id_espera, o.id_paciente, (SELECT id_aviso FROM aviso)
+    FROM ofrecida o
+"""
+
+# La espera queda bloqueada hasta el commit: un segundo aceptar simultaneo
+# espera, vuelve a leer la fila ya ASIGNADA y recibe SIN_OFERTA.
+OFERTA_SQL = """
+    SELECT e.id_cita_liberada, e.id_paciente, c.id_medico, c.id_especialidad, c.id_turno,
+           c.fecha_cita, c.hora, c.id_agenda_medica
+    FROM lista_espera e
+    LEFT JOIN cita c ON c.id_cita = e.id_cita_liberada
+    WHERE e.id_espera = %s AND e.estado = 'OFRECIDA'
+    FOR UPDATE OF e
+"""
+
+# la oferta no se pudo tomar: el paciente conserva su lugar en la cola
+VOLVER_A_ESPERA_SQL = """
+    UPDATE lista_espera SET estado = 'EN_ESPERA', id_cita_liberada = NULL, ofrecido_en = NULL
+    WHERE id_espera = %s
+"""
+
+
+class ListaEsperaDao:
+
+    @soloLectura
+    def getCola(self, id_especialidad, fecha):
+        """Ofrecidas primero, despues las que esperan en el orden en que se les ofrecera."""
+        conexion = Conexion()
+        con = conexion.getConexion()
+        cur = con.cursor()
+        try:
+            cur.execute(COLA_SQL, (id_especialidad, fecha))
+            return filasComoDicts(cur, cur.fetchall(), CONVERSION_ESPERA)
+        except Exception as e:
+            app.logger.error(f"Error al obtener la lista de espera: {str(e)}")
+            return None
+        finally:
+            cur.close()
+            con.close()
+
+    def agregar(self, id_paciente, id_especialidad, fecha, id_medico=None, prioridad=PRIORIDAD_POR_DEFECTO):
+        """Retorna el id_espera, "DUPLICADO" si el paciente ya espera ese dia o None si falla."""
+        conexion = Conexion()
+        con = conexion.getConexion()
+        cur = con.cursor()
+        try:
+            cur.execute(AGREGAR_SQL, (id_paciente, id_especialidad, id_medico, fecha, prioridad))
+            fila = cur.fetchone()
+            con.commit()
+            return fila[0] if fila else "DUPLICADO"
+        except Exception as e:
+            app.logger.error(f"Error al agregar a la lista de espera: {str(e)}")
+            con.rollback()
+            return None
+        finally:
+            cur.close()
+            con.close()
+
+    def retirar(self, id_espera):
+        """Saca de la cola una espera u oferta pendiente."""
+        conexion = Conexion()
+        con = conexion.getConexion()
+        cur = con.cursor()
+        try:
+            cur.execute("""
+                UPDATE lista_espera SET estado = 'RETIRADA'
+                WHERE id_espera = %s AND estado IN ('EN_ESPERA', 'OFRECIDA')
+            """, (id_espera,))
+            retirada = cur.rowcount > 0
+            con.commit()
+            return retirada
+        except Exception as e:
+            app.logger.error(f"Error al retirar de la lista de espera {id_espera}: {str(e)}")
+            con.rollback()
+            return False
+        finally:
+            cur.close()
+            con.close()
+
+    def ofrecerLugar(self, cur, id_cita):
+        """Ofrece la hora de la cita `id_cita` (recien cancelada) al primero de la cola.
+
+            Corre dentro de la transaccion de `cur`, bajo un savepoint: si la
+            lista de espera falla la cancelacion sigue adelante. Retorna
+            (id_espera, id_paciente, id_aviso) o None si no habia nadie.
+        """
+        cur.execute("SAVEPOINT lista_espera")
+        try:
+            sentencias.ejecutar(cur, 'ofrecer_lugar', OFRECER_LUGAR_SQL, (id_cita,))
+            oferta = cur.fetchone()
+            cur.execute("RELEASE SAVEPOINT lista_espera")
+            return oferta
+        except Exception as e:
+            app.logger.error(f"Error al ofrecer la cita {id_cita} a la lista de espera: {str(e)}")
+            cur.execute("ROLLBACK TO SAVEPOINT lista_espera")
+            return None
+
+    def aceptarOferta(self, id_espera):
+        """Reserva para el paciente la hora que se le ofrecio.
+
+            La reserva y el paso a ASIGNADA van en la misma transaccion. Si
+            la hora ya no se puede reservar la espera vuelve a EN_ESPERA y el
+            lugar se ofrece al siguiente de la cola (si sigue libre).
+            Retorna el id de la cita nueva, "SIN_OFERTA" (nada cambia),
+            "OFERTA_ANULADA" (la cita liberada se elimino), los motivos de
+            guardarRegistroC ("FUERA_DE_HORARIO", "DUPLICADO", "SIN_CUPOS")
+            o None si falla. Salvo SIN_OFERTA y None, la espera queda de
+            nuevo EN_ESPERA.
+        """
+        from app.dao.RegisCita.RegistroCDao import RegistroCDao
+
+        conexion = Conexion()
+        con = conexion.getConexion()
+        cur = con.cursor()
+        try:
+            cur.execute(OFERTA_SQL, (id_espera,))
+            oferta = cur.fetchone()
+            if oferta is None:
+                return "SIN_OFERTA"
+            id_cita_liberada, id_paciente, id_medico, id_especialidad, id_turno, fecha, hora, id_agenda = oferta
+            if id_medico is None:
+                # la cita liberada se elimino: no hay hora que reservar
+                cur.execute(VOLVER_A_ESPERA_SQL, (id_espera,))
+                con.commit()
+                return "OFERTA_ANULADA"
+
+            cur.execute("SAVEPOINT aceptar_oferta")
+            resultado, id_cita = RegistroCDao().reservarCita(cur, id_paciente, id_medico, id_especialidad,
+                                                             id_turno, fecha, hora, ESTADO_RESERVADO,
+                                                             MOTIVO_LISTA_ESPERA, id_agenda)
+            if resultado is not None:
+                cur.execute("ROLLBACK TO SAVEPOINT aceptar_oferta")
+                # se ofrece antes de volver a EN_ESPERA para no elegir al mismo paciente
+                siguiente = self.ofrecerLugar(cur, id_cita_liberada)
+                cur.execute(VOLVER_A_ESPERA_SQL, (id_espera,))
+                con.commit()
+                app.logger.warning(f"Lista de espera {id_espera}: oferta no tomada ({resultado})" +
+                                   (f", ofrecida a {siguiente[0]}" if siguiente else ""))
+                return resultado
+
+            cur.execute("""
+                UPDATE lista_espera SET estado = 'ASIGNADA', id_cita = %s
+                WHERE id_espera = %s
+            """, (id_cita, id_espera))
+            con.commit()
+            app.logger.info(f"Lista de espera {id_espera}: cita {id_cita} asignada")
+            return id_cita
+        except Exception as e:
+            app.logger.error(f"Error al aceptar la oferta {id_espera}: {str(e)}")
+            con.rollback()
+            return None
+        finally:
+            cur.close()
+            con.close()
@@ -1,5 +1,240 @@
 from flask import current_app as app
+from psycopg2 import errors
 from app.conexion.Conexion import Conexion
+from app.conexion.Sentencias import sentencias
+from app.conexion.MapeoFilas import filasComoDicts, horaHHMMSS
+from app.conexion.Streaming import iterarConsulta
+from app.conexion.Paginacion import Keyset
+from app.dao.RegisCita.ListaEsperaDao import ListaEsperaDao
+
+# compartido por el listado normal, el paginado y el envio por partes; los
+# alias son las claves que espera el frontend (especialidad, turno, estado).
+# Sin ORDER BY: el orden lo agrega KEYSET_CITAS
+REGISTROS_CITA_SQL = """
+    SELECT 
+        cita.id_cita,
+        cita.id_paciente,
+        cita.id_medico,
+        cita.id_especialidad,
+        cita.id_turno,
+        cita.fecha_cita,
+        cita.hora,
+        cita.id_estado,
+        cita.motivo_consulta,
+        cita.id_agenda_medica,
+        paciente.nombre AS paciente_nombre,
+        paciente.apellido AS paciente_apellido,
+        medico.nombre AS medico_nombre,
+        medico.apellido AS medico_apellido,
+        especialidad.descripcion AS especialidad,
+        turno.descripcion AS turno,
+        estado_cita.descripcion AS estado
+    FROM cita
+    JOIN paciente ON cita.id_paciente = paciente.id_paciente
+    JOIN medico ON cita.id_medico = medico.id_medico
+    JOIN especialidad ON cita.id_especialidad = especialidad.id_especialidad
+    JOIN turno ON cita.id_turno = turno.id_turno
+    JOIN estado_cita ON cita.id_estado = estado_cita.id_estado
+"""
+
+KEYSET_CITAS = Keyset('citas', [
+    ('cita.fecha_cita', 'fecha_cita'),
+    ('cita.hora', 'hora'),
+    ('cita.id_cita', 'id_cita'),
+])
+
+# cupos de agenda_medica sin leer-verificar-escribir (ver RegistroCDao.ajustarCupos)
+OCUPAR_CUPO_SQL = """
+    UPDATE agenda_medica SET cupos = cupos - 1
+    WHERE id_agenda_medica = %s AND cupos > 0
+    RETURNING cupos
+"""
+
+LIBERAR_CUPO_SQL = """
+    UPDATE agenda_medica SET cupos = cupos + 1
+    WHERE id_agenda_medica = %s
+"""
+
+# Reserva completa en una ida a la base: la misma validacion que
+# validar_horario_medico_disponibilidad (el primer rango [inicio, fin) que
+# contiene la hora debe tener cupos), el control de duplicado de medico/fecha/hora, el cupo de
+# la agenda y el INSERT. La cita solo se inserta si el UPDATE del cupo devolvio
+# fila (cuando el estado ocupa cupo), asi que el cupo sigue siendo atomico.
+# El control de duplicado lee la foto de la sentencia: dos reservas
+# simultaneas de la misma hora lo pasan las dos, y la segunda choca con
+# ux_cita_activa (sql/09_cita_unica.sql) en el ON CONFLICT. Sin objetivo de
+# conflicto: si el indice todavia no se creo la reserva funciona igual, solo
+# con el control de duplicado.
+# resultado NULL = cita creada; si no, el motivo y el llamador hace rollback
+# (el cupo pudo haberse tomado antes del choque).
+RESERVAR_CITA_SQL = """
+    WITH horario AS (
+        SELECT COALESCE((
+            SELECT disponibilidad_cupos > 0
+            FROM disponibilidad_horaria
+            WHERE id_medico = %s AND disponibilidad_fecha = %s::date
+              AND %s::time >= disponibilidad_hora_inicio AND %s::time < disponibilidad_hora_fin
+            ORDER BY disponibilidad_hora_inicio
+            LIMIT 1
+        ), false) AS ok
+    ),
+    duplicado AS (
+        SELECT EXISTS (
+            SELECT 1 FROM cita
+            WHERE id_medico = %s AND fecha_cita = %s::date AND hora = %s::time
+              AND id_estado NOT IN (14, 15)
+        ) AS hay
+    ),
+    cupo AS (
+        UPDATE agenda_medica SET cupos = cupos - 1
+        WHERE id_agenda_medica = %s AND cupos > 0 AND %s::boolean
+          AND (SELECT ok FROM horario) AND NOT (SELECT hay FROM duplicado)
+        RETURNING id_agenda_medica
+    ),
+    nueva AS (
+        INSERT INTO cita (id_paciente, id_medico, id_especialidad, id_turno,
+                          fecha_cita, hora, id_estado, motivo_consulta, id_agenda_medica)
+        SELECT %s::integer, %s::integer, %s::integer, %s::integer,
+               %s::date, %s::time, %s::integer, %s::text, %s::integer
+        WHERE (SELECT ok FROM horario) AND NOT (SELECT hay FROM duplicado)
+          AND (NOT %s::boolean OR EXISTS (SELECT 1 FROM cupo))
+        ON CONFLICT DO NOTHING
+        RETURNING id_cita
+    )
+    SELECT CASE
+               WHEN NOT (SELECT ok FROM horario) THEN 'FUERA_DE_HORARIO'
+               WHEN (SELECT hay FROM duplicado) THEN 'DUPLICADO'
+               WHEN EXISTS (SELECT 1 FROM nueva) THEN NULL
+               -- el cupo se tomo pero el INSERT choco con el indice: reserva simultanea
+               WHEN EXISTS (SELECT 1 FROM cupo) OR NOT %s::boolean THEN 'DUPLICADO'
+               ELSE 'SIN_CUPOS'
+           END AS resultado,
+           (SELECT id_cita FROM nueva) AS id_cita
+"""
+
+# ===== OPERACIONES POR LOTE SOBRE EL DIA DE UN MEDICO =====
+# Una sentencia por operacion: se bloquean las citas afectadas, se modifican
+# todas juntas y los cupos de cada agenda se ajustan con un solo UPDATE por
+# agenda (suma de las citas que ocupaban cupo). Las canceladas / no
+# asistidas (14, 15) y las realizadas (4) no se tocan.
+# Son para cuando el medico no atiende ese dia: las horas que quedan libres
+# no se ofrecen a la lista de espera (ListaEsperaDao.ofrecerLugar), el
+# paciente de la lista llegaria a una consulta que no se va a dar.
+
+CANCELAR_CITAS_MEDICO_SQL = """
+    WITH afectadas AS (
+        SELECT id_cita, id_estado AS estado_anterior
+        FROM cita
+        WHERE id_medico = %(id_medico)s AND fecha_cita BETWEEN %(desde)s AND %(hasta)s
+          AND id_estado NOT IN (4, 14, 15)
+        FOR UPDATE
+    ),
+    canceladas AS (
+        UPDATE cita c SET id_estado = %(id_estado)s
+        FROM afectadas a
+        WHERE c.id_cita = a.id_cita
+        RETURNING c.id_cita, c.fecha_cita, c.hora, c.id_agenda_medica, a.estado_anterior
+    ),
+    devueltos AS (
+        UPDATE agenda_medica ag SET cupos = ag.cupos + d.cantidad
+        FROM (
+            SELECT id_agenda_medica, count(*) AS cantidad
+            FROM canceladas
+            WHERE estado_anterior = ANY(%(ocupan)s) AND id_agenda_medica IS NOT NULL
+            GROUP BY id_agenda_medica
+        ) d
+        WHERE ag.id_agenda_medica = d.id_agenda_medica
+    )
+    SELECT id_cita, fecha_cita, hora, estado_anterior, id_agenda_medica, 'CANCELADA' AS resultado
+    FROM canceladas
+    ORDER BY fecha_cita, hora, id_cita
+"""
+
+# Cada cita se valida contra el destino igual que guardarRegistroC
+# (disponibilidad, duplicado, cupos). Los cupos de la agenda destino se
+# reparten por hora: las primeras que entran se mueven, el resto queda
+# SIN_CUPOS. Las que no se pueden mover quedan como estaban.
+# Las que ya estan en la agenda destino no toman un cupo nuevo (toma_cupo),
+# y al mover al mismo medico y fecha una cita no es duplicado de si misma.
+MOVER_CITAS_MEDICO_SQL = """
+    WITH origen AS (
+        SELECT id_cita, hora, id_estado, id_agenda_medica,
+               id_estado = ANY(%(ocupan)s) AS ocupa
+        FROM cita
+        WHERE id_medico = %(id_medico)s AND fecha_cita = %(fecha)s
+          AND id_estado NOT IN (4, 14, 15)
+        FOR UPDATE
+    ),
+    destino AS (
+        SELECT cupos, id_turno, id_especialidad FROM agenda_medica
+        WHERE id_agenda_medica = %(id_agenda_destino)s AND id_medico = %(id_medico_destino)s
+        FOR UPDATE
+    ),
+    evaluadas AS (
+        SELECT o.*,
+               COALESCE((
+                   SELECT d.disponibilidad_cupos > 0
+                   FROM disponibilidad_horaria d
+                   WHERE d.id_medico = %(id_medico_destino)s AND d.disponibilidad_fecha = %(fecha_destino)s
+                     AND o.hora >= d.disponibilidad_hora_inicio AND o.hora < d.disponibilidad_hora_fin
+                   ORDER BY d.disponibilidad_hora_inicio
+                   LIMIT 1
+               ), false) AS en_horario,
+               EXISTS (
+                   SELECT 1 FROM cita x
+                   WHERE x.id_medico = %(id_medico_destino)s AND x.fecha_cita = %(fecha_destino)s
+                     AND x.hora = o.hora AND x.id_estado NOT IN (14, 15)
+                     AND x.id_cita <> o.id_cita
+               ) AS duplicado,
+               o.ocupa AND o.id_agenda_medica IS DISTINCT FROM %(id_agenda_destino)s AS toma_cupo
+        FROM origen o
+    ),
+    ordenadas AS (
+        SELECT e.*,
+               count(*) FILTER (WHERE e.toma_cupo AND e.en_horario AND NOT e.duplicado)
+                   OVER (ORDER BY e.hora, e.id_cita) AS orden_cupo
+        FROM evaluadas e
+    ),
+    resultado AS (
+        SELECT o.id_cita, o.hora, o.id_agenda_medica, o.ocupa,
+               CASE
+                   WHEN NOT EXISTS (SELECT 1 FROM destino) THEN 'SIN_AGENDA'
+                   WHEN NOT o.en_horario THEN 'FUERA_DE_HORARIO'
+                   WHEN o.duplicado THEN 'DUPLICADO'
+                   WHEN o.toma_cupo AND o.orden_cupo > COALESCE((SELECT cupos FROM destino), 0) THEN 'SIN_CUPOS'
+                   ELSE 'MOVIDA'
+               END AS resultado
+        FROM ordenadas o
+    ),
+    movidas AS (
+        UPDATE cita c
+        SET id_medico = %(id_medico_destino)s, fecha_cita = %(fecha_destino)s,
+            id_agenda_medica = %(id_agenda_destino)s,
+            id_turno = d.id_turno, id_especialidad = d.id_especialidad
+        FROM resultado r, destino d
+        WHERE c.id_cita = r.id_cita AND r.resultado = 'MOVIDA'
+        RETURNING c.id_cita
+    ),
+    ajuste_cupos AS (
+        -- un solo UPDATE por agenda aunque la de origen sea tambien la de destino
+        UPDATE agenda_medica ag SET cupos = ag.cupos + d.delta
+        FROM (
+            SELECT id_agenda_medica, sum(delta) AS delta
+            FROM (
+                SELECT id_agenda_medica, 1 AS delta FROM resultado
+                WHERE resultado = 'MOVIDA' AND ocupa AND id_agenda_medica IS NOT NULL
+                UNION ALL
+                SELECT %(id_agenda_destino)s, -1 FROM resultado
+                WHERE resultado = 'MOVIDA' AND ocupa
+            ) movimientos
+            GROUP BY id_agenda_medica
+        ) d
+        WHERE ag.id_agenda_medica = d.id_agenda_medica AND d.delta <> 0
+    )
+    SELECT r.id_cita, r.hora, r.id_agenda_medica, r.resultado, (SELECT count(*) FROM movidas) AS movidas
+    FROM resultado r
+    ORDER BY r.hora, r.id_cita
+"""
 
 class RegistroCDao:
 
@@ -11,6 +246,26 @@ class RegistroCDao:
         """Estados que NO ocupan cupo (liberan cupo)"""
         return id_estado in [14, 15]  # Cancelado, No Asistió, etc.
 
+    def ajustarCupos(self, cur, ocupar=None, liberar=None):
+        """Resta un cupo de la agenda `ocupar` y devuelve uno a `liberar`, dentro de la transaccion de `cur`.
+
+            Cada cambio es un UPDATE condicional sobre la fila de la agenda, sin
+            leer antes el valor: ocupar solo resta si quedan cupos (la fila
+            queda bloqueada hasta el commit, las reservas simultaneas esperan y
+            ven el valor nuevo). Las agendas se tocan en orden de id para que
+            dos movimientos cruzados no se bloqueen entre si. Retorna False si
+            `ocupar` no tenia cupo; el llamador debe hacer rollback.
+        """
+        cambios = [(id_agenda, accion) for id_agenda, accion in ((ocupar, 'ocupar'), (liberar, 'liberar')) if id_agenda]
+        for id_agenda, accion in sorted(cambios):
+            if accion == 'ocupar':
+                sentencias.ejecutar(cur, 'cupo_ocupar', OCUPAR_CUPO_SQL, (id_agenda,))
+                if cur.fetchone() is None:
+                    return False
+            else:
+                sentencias.ejecutar(cur, 'cupo_liberar', LIBERAR_CUPO_SQL, (id_agenda,))
+        return True
+
     # ===== NUEVOS MÉTODOS DE VALIDACIÓN DE HORARIOS =====
     def validar_horario_medico_disponibilidad(self, id_medico, fecha_cita, hora_cita):
         """
@@ -37,7 +292,7 @@ class RegistroCDao:
         cur = con.cursor()
         
         try:
-            cur.execute(validarDisponibilidadSQL, (id_medico, fecha_cita))
+            sentencias.ejecutar(cur, 'validar_disponibilidad_medico', validarDisponibilidadSQL, (id_medico, fecha_cita))
             disponibilidades = cur.fetchall()
             
             if not disponibilidades:
@@ -57,7 +312,7 @@ class RegistroCDao:
                 hora_fin = disponibilidad[1] 
                 cupos_disponibles = disponibilidad[2]
                 
-                if hora_inicio <= hora_obj <= hora_fin:
+                if hora_inicio <= hora_obj < hora_fin:
                     if cupos_disponibles > 0:
                         app.logger.info(f"Hora {hora_cita} válida para médico {id_medico} el {fecha_cita} (rango: {hora_inicio}-{hora_fin}, cupos: {cupos_disponibles})")
                         return True
@@ -124,60 +379,13 @@ class RegistroCDao:
             con.close()
 
     def getRegistrosC(self):
-        registrocSQL = """
-        SELECT 
-            cita.id_cita,
-            cita.id_paciente,
-            cita.id_medico,
-            cita.id_especialidad,
-            cita.id_turno,
-            cita.fecha_cita,
-            cita.hora,
-            cita.id_estado,
-            cita.motivo_consulta,
-            cita.id_agenda_medica,
-            paciente.nombre AS paciente_nombre,
-            paciente.apellido AS paciente_apellido,
-            medico.nombre AS medico_nombre,
-            medico.apellido AS medico_apellido,
-            especialidad.descripcion AS especialidad_descripcion,
-            turno.descripcion AS turno_descripcion,
-            estado_cita.descripcion AS estado_descripcion
-        FROM cita
-        JOIN paciente ON cita.id_paciente = paciente.id_paciente
-        JOIN medico ON cita.id_medico = medico.id_medico
-        JOIN especialidad ON cita.id_especialidad = especialidad.id_especialidad
-        JOIN turno ON cita.id_turno = turno.id_turno
-        JOIN estado_cita ON cita.id_estado = estado_cita.id_estado
-        ORDER BY cita.fecha_cita DESC, cita.hora DESC
-        """
         conexion = Conexion()
         con = conexion.getConexion()
         cur = con.cursor()
         try:
-            cur.execute(registrocSQL)
+            sentencias.ejecutar(cur, 'registros_cita', REGISTROS_CITA_SQL + KEYSET_CITAS.orden)
             citas = cur.fetchall()
-            return [
-                {
-                    'id_cita': cita[0],
-                    'id_paciente': cita[1],
-                    'id_medico': cita[2],
-                    'id_especialidad': cita[3],
-                    'id_turno': cita[4],
-                    'fecha_cita': cita[5],
-                    'hora': cita[6],
-                    'id_estado': cita[7],
-                    'motivo_consulta': cita[8],
-                    'id_agenda_medica': cita[9],
-                    'paciente_nombre': cita[10],
-                    'paciente_apellido': cita[11],
-                    'medico_nombre': cita[12],
-                    'medico_apellido': cita[13],
-                    'especialidad': cita[14],
-                    'turno': cita[15],
-                    'estado': cita[16]
-                } for cita in citas
-            ]
+            return filasComoDicts(cur, citas)
         except Exception as e:
             app.logger.error(f"Error al obtener todas las citas: {str(e)}")
             return []
@@ -185,6 +393,22 @@ class RegistroCDao:
             cur.close()
             con.close()
 
+    def iterRegistrosC(self):
+        """Igual que getRegistrosC pero como generador; la hora sale como 'HH:MM:SS'"""
+        return iterarConsulta(REGISTROS_CITA_SQL + KEYSET_CITAS.orden, convertir={'hora': horaHHMMSS}, nombre='registros_cita')
+
+    def getRegistrosCPagina(self, limite, cursor_pagina=None):
+        """Una pagina de citas; la hora sale como 'HH:MM:SS'"""
+        conexion = Conexion()
+        con = conexion.getConexion()
+        cur = con.cursor()
+        try:
+            return KEYSET_CITAS.consultar(cur, REGISTROS_CITA_SQL, (), limite, cursor_pagina,
+                                          convertir={'hora': horaHHMMSS})
+        finally:
+            cur.close()
+            con.close()
+
     def getRegistroCById(self, id_cita):
         registrocSQL = """
         SELECT 
@@ -221,7 +445,7 @@ class RegistroCDao:
         con = conexion.getConexion()
         cur = con.cursor()
         try:
-            cur.execute(registrocSQL, (id_cita,))
+            sentencias.ejecutar(cur, 'registro_cita_por_id', registrocSQL, (id_cita,))
             cita = cur.fetchone()
             if cita:
                 return {
@@ -255,67 +479,49 @@ class RegistroCDao:
             cur.close()
             con.close()
 
+    def reservarCita(self, cur, id_paciente, id_medico, id_especialidad, id_turno,
+                     fecha_cita, hora, id_estado, motivo_consulta, id_agenda_medica):
+        """Ejecuta RESERVAR_CITA_SQL dentro de la transaccion de `cur`, sin commit.
+
+            Retorna (resultado, id_cita) como guardarRegistroC. Si resultado
+            no es None el llamador debe deshacer (rollback o rollback a un
+            savepoint): el cupo pudo haberse tomado antes del choque.
+        """
+        # Restar cupo SOLO si el estado inicial ocupa cupo
+        ocupa_cupo = int(id_estado) in self.estados_que_usan_cupo()
+        sentencias.ejecutar(cur, 'reservar_cita', RESERVAR_CITA_SQL, (
+            id_medico, fecha_cita, hora, hora,
+            id_medico, fecha_cita, hora,
+            id_agenda_medica, ocupa_cupo,
+            id_paciente, id_medico, id_especialidad, id_turno,
+            fecha_cita, hora, id_estado, motivo_consulta, id_agenda_medica,
+            ocupa_cupo, ocupa_cupo,
+        ))
+        return cur.fetchone()
+
     def guardarRegistroC(self, id_paciente, id_medico, id_especialidad, id_turno,
                         fecha_cita, hora, id_estado, motivo_consulta, id_agenda_medica):
-        
-        # ===== NUEVA VALIDACIÓN DE HORARIO CON DISPONIBILIDAD =====
-        if not self.validar_horario_medico_disponibilidad(id_medico, fecha_cita, hora):
-            return "FUERA_DE_HORARIO"
-        
-        # Verificar si ya existe la cita
-        verificarSQL = """
-        SELECT COUNT(*) FROM cita 
-        WHERE id_medico = %s AND fecha_cita = %s AND hora = %s
-        """
-        
-        # Verificar cupos disponibles
-        verificarCuposSQL = "SELECT cupos FROM agenda_medica WHERE id_agenda_medica = %s"
-        
-        # Insertar nueva cita
-        insertarSQL = """
-        INSERT INTO cita (id_paciente, id_medico, id_especialidad, id_turno, 
-                         fecha_cita, hora, id_estado, motivo_consulta, id_agenda_medica)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        RETURNING id_cita
+        """Reserva una cita con una sola sentencia (RESERVAR_CITA_SQL).
+
+            Retorna el id de la cita, "FUERA_DE_HORARIO", "DUPLICADO",
+            "SIN_CUPOS" o None si falla la consulta.
         """
-        
-        # Restar cupo
-        restarCupoSQL = "UPDATE agenda_medica SET cupos = cupos - 1 WHERE id_agenda_medica = %s"
-        
         conexion = Conexion()
         con = conexion.getConexion()
         cur = con.cursor()
         
         try:
-            # Verificar duplicados
-            cur.execute(verificarSQL, (id_medico, fecha_cita, hora))
-            if cur.fetchone()[0] > 0:
-                return "DUPLICADO"
-            
-            # Verificar cupos SOLO si el estado inicial ocupa cupo
-            if int(id_estado) in self.estados_que_usan_cupo():
-                cur.execute(verificarCuposSQL, (id_agenda_medica,))
-                cupos_result = cur.fetchone()
-                if not cupos_result or cupos_result[0] <= 0:
-                    return "SIN_CUPOS"
-            
-            # Insertar cita
-            cur.execute(insertarSQL, (
-                id_paciente, id_medico, id_especialidad, id_turno,
-                fecha_cita, hora, id_estado, motivo_consulta, id_agenda_medica
-            ))
-            
-            cita_id = cur.fetchone()[0]
+            resultado, cita_id = self.reservarCita(cur, id_paciente, id_medico, id_especialidad, id_turno,
+                                                   fecha_cita, hora, id_estado, motivo_consulta, id_agenda_medica)
             
-            # Restar cupo SOLO si el estado inicial ocupa cupo
-            if int(id_estado) in self.estados_que_usan_cupo():
-                cur.execute(restarCupoSQL, (id_agenda_medica,))
-                app.logger.info(f"Cupo restado por crear cita con estado que ocupa cupo: {id_estado}")
-            else:
-                app.logger.info(f"No se restó cupo - estado {id_estado} no ocupa cupo")
+            if resultado is not None:
+                con.rollback()
+                app.logger.warning(f"Cita no guardada ({resultado}): médico {id_medico}, {fecha_cita} {hora}, agenda {id_agenda_medica}")
+                return resultado
             
             con.commit()
-            app.logger.info(f"Cita guardada exitosamente con ID: {cita_id}")
+            app.logger.info(f"Cita guardada exitosamente con ID: {cita_id}" +
+                            ("" if int(id_estado) in self.estados_que_usan_cupo() else f" - estado {id_estado} no ocupa cupo"))
             return cita_id
             
         except Exception as e:
@@ -333,8 +539,9 @@ class RegistroCDao:
         if not self.validar_horario_medico_disponibilidad(id_medico, fecha_cita, hora):
             return "FUERA_DE_HORARIO"
         
-        # Obtener datos actuales de la cita
-        getAgendaSQL = "SELECT id_agenda_medica, id_estado FROM cita WHERE id_cita = %s"
+        # Obtener datos actuales de la cita (bloqueada hasta el commit: dos
+        # cambios simultaneos de la misma cita no devuelven el cupo dos veces)
+        getAgendaSQL = "SELECT id_agenda_medica, id_estado FROM cita WHERE id_cita = %s FOR UPDATE"
         
         # Actualizar la cita
         updateCitaSQL = """
@@ -343,11 +550,6 @@ class RegistroCDao:
             fecha_cita=%s, hora=%s, id_estado=%s, motivo_consulta=%s, id_agenda_medica=%s
         WHERE id_cita=%s
         """
-        
-        # Operaciones de cupos
-        devolverCupoSQL = "UPDATE agenda_medica SET cupos = cupos + 1 WHERE id_agenda_medica = %s"
-        restarCupoSQL = "UPDATE agenda_medica SET cupos = cupos - 1 WHERE id_agenda_medica = %s"
-        verificarCuposSQL = "SELECT cupos FROM agenda_medica WHERE id_agenda_medica = %s"
 
         conexion = Conexion()
         con = conexion.getConexion()
@@ -372,74 +574,65 @@ class RegistroCDao:
             estado_anterior_ocupa_cupo = estado_anterior in self.estados_que_usan_cupo()
             estado_nuevo_ocupa_cupo = id_estado in self.estados_que_usan_cupo()
             
-            # Verificar cupos ANTES de hacer cambios (solo si necesitamos ocupar un nuevo cupo)
-            cambio_de_agenda = id_agenda_medica != id_agenda_anterior
-            necesita_nuevo_cupo = False
-            
-            if cambio_de_agenda and estado_nuevo_ocupa_cupo:
-                # Cambió de agenda Y el nuevo estado ocupa cupo
-                necesita_nuevo_cupo = True
-            elif not cambio_de_agenda and not estado_anterior_ocupa_cupo and estado_nuevo_ocupa_cupo:
-                # Misma agenda, pero cambió de "no ocupa cupo" a "ocupa cupo"
-                necesita_nuevo_cupo = True
-                
-            if necesita_nuevo_cupo:
-                agenda_a_verificar = id_agenda_medica if cambio_de_agenda else id_agenda_anterior
-                cur.execute(verificarCuposSQL, (agenda_a_verificar,))
-                cupos_result = cur.fetchone()
-                if not cupos_result or cupos_result[0] <= 0:
-                    app.logger.error(f"Sin cupos disponibles en agenda: {agenda_a_verificar}")
-                    return "SIN_CUPOS"
-
-            # Actualizar la cita
-            cur.execute(updateCitaSQL, (
-                id_paciente, id_medico, id_especialidad, id_turno,
-                fecha_cita, hora, id_estado, motivo_consulta, id_agenda_medica, id_cita
-            ))
-            
-            filas_afectadas = cur.rowcount
-            
             # =========== LÓGICA SIMPLIFICADA DE CUPOS ===========
+            # Los cupos se mueven ANTES de actualizar la cita: si la agenda
+            # nueva no tiene cupo no se toca nada
+            cambio_de_agenda = id_agenda_medica != id_agenda_anterior
+            ocupar = liberar = None
             
             if cambio_de_agenda:
-                # CAMBIÓ DE AGENDA
+                # CAMBIÓ DE AGENDA: liberar la anterior (si ocupaba cupo) y ocupar la nueva (si el nuevo estado ocupa cupo)
                 app.logger.info(f"Cambio de agenda: {id_agenda_anterior} → {id_agenda_medica}")
-                
-                # 1. Liberar cupo de agenda anterior (si ocupaba cupo)
                 if estado_anterior_ocupa_cupo:
-                    cur.execute(devolverCupoSQL, (id_agenda_anterior,))
-                    app.logger.info(f"Cupo liberado de agenda anterior: {id_agenda_anterior}")
-                
-                # 2. Ocupar cupo en nueva agenda (si el nuevo estado ocupa cupo)
+                    liberar = id_agenda_anterior
                 if estado_nuevo_ocupa_cupo:
-                    cur.execute(restarCupoSQL, (id_agenda_medica,))
-                    app.logger.info(f"Cupo ocupado en nueva agenda: {id_agenda_medica}")
-                    
+                    ocupar = id_agenda_medica
             else:
                 # MISMA AGENDA - SOLO CAMBIÓ EL ESTADO
                 app.logger.info(f"Cambio de estado: {estado_anterior} → {id_estado}")
-                
                 if estado_anterior_ocupa_cupo and not estado_nuevo_ocupa_cupo:
                     # Era ocupado → ahora es libre (ej: Confirmado → Cancelado)
-                    cur.execute(devolverCupoSQL, (id_agenda_anterior,))
-                    app.logger.info(f"Cupo liberado por cambio a estado libre: {id_agenda_anterior}")
-                    
+                    liberar = id_agenda_anterior
                 elif not estado_anterior_ocupa_cupo and estado_nuevo_ocupa_cupo:
                     # Era libre → ahora es ocupado (ej: Cancelado → Confirmado)
-                    cur.execute(restarCupoSQL, (id_agenda_medica,))
-                    app.logger.info(f"Cupo ocupado por cambio a estado ocupado: {id_agenda_medica}")
-                    
-                # Si ambos ocupan cupo O ambos no ocupan cupo → NO hacer nada
-                # Esto resuelve el problema: Reservado ↔ Confirmado no cambia cupos
-                elif estado_anterior_ocupa_cupo and estado_nuevo_ocupa_cupo:
-                    app.logger.info(f"Cambio entre estados que ocupan cupo - no se modifica cupo")
-                elif not estado_anterior_ocupa_cupo and not estado_nuevo_ocupa_cupo:
-                    app.logger.info(f"Cambio entre estados que no ocupan cupo - no se modifica cupo")
+                    ocupar = id_agenda_medica
+                else:
+                    # Reservado ↔ Confirmado, o entre estados libres: no cambia cupos
+                    app.logger.info(f"Cambio entre estados del mismo tipo - no se modifica cupo")
+
+            if not self.ajustarCupos(cur, ocupar=ocupar, liberar=liberar):
+                app.logger.error(f"Sin cupos disponibles en agenda: {ocupar}")
+                con.rollback()
+                return "SIN_CUPOS"
+            if ocupar:
+                app.logger.info(f"Cupo ocupado en agenda: {ocupar}")
+            if liberar:
+                app.logger.info(f"Cupo liberado de agenda: {liberar}")
+
+            # Actualizar la cita
+            cur.execute(updateCitaSQL, (
+                id_paciente, id_medico, id_especialidad, id_turno,
+                fecha_cita, hora, id_estado, motivo_consulta, id_agenda_medica, id_cita
+            ))
+            
+            filas_afectadas = cur.rowcount
+
+            # Cancelada en su misma agenda: la hora queda libre y se ofrece
+            # al primero de la lista de espera, en esta misma transaccion
+            if filas_afectadas and liberar and not cambio_de_agenda and self.estado_es_cancelado(id_estado):
+                oferta = ListaEsperaDao().ofrecerLugar(cur, id_cita)
+                if oferta:
+                    app.logger.info(f"Cita {id_cita} ofrecida a lista de espera {oferta[0]} (paciente {oferta[1]})")
 
             con.commit()
             app.logger.info(f"Cita actualizada exitosamente: {id_cita}")
             return filas_afectadas > 0
             
+        except errors.UniqueViolation:
+            # otra cita activa ya tiene esa hora del medico (ux_cita_activa)
+            app.logger.warning(f"Cita {id_cita} no actualizada (DUPLICADO): médico {id_medico}, {fecha_cita} {hora}")
+            con.rollback()
+            return "DUPLICADO"
         except Exception as e:
             app.logger.error(f"Error al actualizar cita {id_cita}: {str(e)}")
             con.rollback()
@@ -449,35 +642,30 @@ class RegistroCDao:
             con.close()
 
     def deleteRegistroC(self, id_cita):
-        # Obtener datos de la cita antes de eliminar para manejar cupos
-        getCitaSQL = "SELECT id_agenda_medica, id_estado FROM cita WHERE id_cita = %s"
-        deleteRegistrocSQL = "DELETE FROM cita WHERE id_cita=%s"
-        devolverCupoSQL = "UPDATE agenda_medica SET cupos = cupos + 1 WHERE id_agenda_medica = %s"
+        # Eliminar y obtener los datos para manejar cupos en una sola sentencia:
+        # si dos pedidos borran la misma cita, solo uno recibe la fila
+        deleteRegistrocSQL = "DELETE FROM cita WHERE id_cita=%s RETURNING id_agenda_medica, id_estado"
         
         conexion = Conexion()
         con = conexion.getConexion()
         cur = con.cursor()
         
         try:
-            # Obtener datos de la cita
-            cur.execute(getCitaSQL, (id_cita,))
+            # Eliminar la cita
+            cur.execute(deleteRegistrocSQL, (id_cita,))
             citaData = cur.fetchone()
             
             if citaData:
                 id_agenda_medica, id_estado = citaData
                 
-                # Eliminar la cita
-                cur.execute(deleteRegistrocSQL, (id_cita,))
-                filas_afectadas = cur.rowcount
-                
                 # Si la cita tenía un estado que usaba cupo, devolver el cupo
                 if int(id_estado) in self.estados_que_usan_cupo() and id_agenda_medica:
-                    cur.execute(devolverCupoSQL, (id_agenda_medica,))
+                    self.ajustarCupos(cur, liberar=id_agenda_medica)
                     app.logger.info(f"Cupo devuelto a agenda {id_agenda_medica} por eliminación de cita con estado {id_estado}")
                 
                 con.commit()
                 app.logger.info(f"Cita eliminada exitosamente: {id_cita}")
-                return filas_afectadas > 0
+                return True
             else:
                 app.logger.error(f"No se encontró la cita con ID: {id_cita}")
                 return False
@@ -528,4 +716,83 @@ class RegistroCDao:
             return []
         finally:
             cur.close()
-            con.close()
\ No newline at end of file
+            con.close()
+
+    # ===== OPERACIONES POR LOTE =====
+    def cancelarCitasMedico(self, id_medico, desde, hasta, id_estado=14):
+        """Cancela (o marca No Asistió) todas las citas activas del médico en [desde, hasta].
+
+            Retorna [{'id_cita', 'fecha_cita', 'hora', 'estado_anterior', 'resultado'}]
+            o None si falla; no se modifica nada si falla. Las horas liberadas
+            no se ofrecen a la lista de espera: el medico no atiende.
+        """
+        conexion = Conexion()
+        con = conexion.getConexion()
+        cur = con.cursor()
+        try:
+            cur.execute(CANCELAR_CITAS_MEDICO_SQL, {
+                'id_medico': id_medico, 'desde': desde, 'hasta': hasta,
+                'id_estado': id_estado, 'ocupan': self.estados_que_usan_cupo(),
+            })
+            filas = cur.fetchall()
+            con.commit()
+            app.logger.info(f"Citas canceladas por lote: médico {id_medico}, {desde} a {hasta}, {len(filas)} citas")
+            return [
+                {
+                    'id_cita': id_cita,
+                    'fecha_cita': str(fecha_cita),
+                    'hora': horaHHMMSS(hora),
+                    'estado_anterior': estado_anterior,
+                    'id_agenda_medica': id_agenda_medica,
+                    'resultado': resultado,
+                }
+                for id_cita, fecha_cita, hora, estado_anterior, id_agenda_medica, resultado in filas
+            ]
+        except Exception as e:
+            app.logger.error(f"Error al cancelar citas del médico {id_medico}: {str(e)}")
+            con.rollback()
+            return None
+        finally:
+            cur.close()
+            con.close()
+
+    def moverCitasMedico(self, id_medico, fecha, fecha_destino, id_agenda_destino, id_medico_destino=None):
+        """Mueve las citas activas del médico en `fecha` a `fecha_destino`, misma hora.
+
+            Opcionalmente a otro médico. Cada cita se valida contra el destino
+            como en guardarRegistroC; las que no pasan quedan como estaban.
+            Retorna [{'id_cita', 'hora', 'resultado'}] con resultado MOVIDA,
+            FUERA_DE_HORARIO, DUPLICADO, SIN_CUPOS o SIN_AGENDA (la agenda
+            destino no existe o es de otro médico), o None si falla. Las
+            horas que quedan libres en `fecha` no se ofrecen a la lista de
+            espera: el medico no atiende ese dia.
+        """
+        conexion = Conexion()
+        con = conexion.getConexion()
+        cur = con.cursor()
+        try:
+            cur.execute(MOVER_CITAS_MEDICO_SQL, {
+                'id_medico': id_medico, 'fecha': fecha,
+                'id_medico_destino': id_medico_destino or id_medico, 'fecha_destino': fecha_destino,
+                'id_agenda_destino': id_agenda_destino, 'ocupan': self.estados_que_usan_cupo(),
+            })
+            filas = cur.fetchall()
+            con.commit()
+            movidas = filas[0][4] if filas else 0
+            app.logger.info(f"Citas movidas por lote: médico {id_medico}, {fecha} → {fecha_destino}, {movidas} de {len(filas)}")
+            return [
+                {
+                    'id_cita': id_cita,
+                    'hora': horaHHMMSS(hora),
+                    'id_agenda_medica': id_agenda_destino if resultado == 'MOVIDA' else id_agenda_medica,
+                    'resultado': resultado,
+                }
+                for id_cita, hora, id_agenda_medica, resultado, _ in filas
+            ]
+        except Exception as e:
+            app.logger.error(f"Error al mover citas del médico {id_medico}: {str(e)}")
+            con.rollback()
+            return None
+        finally:
+            cur.close()
+            con.close()
@@ -1,40 +1,39 @@
 from flask import current_app as app
+from psycopg2 import errors
 from app.conexion.Conexion import Conexion
+from app.conexion.MapeoFilas import filasComoDicts
+from app.conexion.Paginacion import Keyset
+
+
+def _texto(valor):
+    return str(valor) if valor else None
+
+# las fechas del paciente se entregan como texto
+CONVERSION_PACIENTE = {'fecha_nacimiento': _texto, 'fecha_registro': _texto}
+
+# listado sin ORDER BY: el orden lo agrega KEYSET_PACIENTES
+PACIENTES_SQL = """
+    SELECT p.id_paciente, p.nombre, p.apellido, 
+           p.cedula_entidad, p.fecha_nacimiento, p.fecha_registro, 
+           p.telefono, p.direccion, p.correo, 
+           p.id_ciudad, c.descripcion AS ciudad
+    FROM paciente p
+    LEFT JOIN ciudad c ON p.id_ciudad = c.id_ciudad
+"""
+
+KEYSET_PACIENTES = Keyset('pacientes', [('p.id_paciente', 'id_paciente')], descendente=False)
 
 class PacienteDao:
 
     def getPacientes(self):
-        sql = """
-            SELECT p.id_paciente, p.nombre, p.apellido, 
-                   p.cedula_entidad, p.fecha_nacimiento, p.fecha_registro, 
-                   p.telefono, p.direccion, p.correo, 
-                   p.id_ciudad, c.descripcion AS ciudad
-            FROM paciente p
-            LEFT JOIN ciudad c ON p.id_ciudad = c.id_ciudad
-            ORDER BY p.id_paciente
-        """
+        sql = PACIENTES_SQL + KEYSET_PACIENTES.orden
         conexion = Conexion()
         con = conexion.getConexion()
         cur = con.cursor()
         try:
             cur.execute(sql)
             pacientes = cur.fetchall()
-            return [
-                {
-                    "id_paciente": p[0],
-                    "nombre": p[1],
-                    "apellido": p[2],
-                    "cedula_entidad": p[3],
-                    "fecha_nacimiento": str(p[4]) if p[4] else None,
-                    "fecha_registro": str(p[5]) if p[5] else None,
-                    "telefono": p[6],
-                    "direccion": p[7],
-                    "correo": p[8],
-                    "id_ciudad": p[9],
-                    "ciudad": p[10]
-                }
-                for p in pacientes
-            ]
+            return filasComoDicts(cur, pacientes, CONVERSION_PACIENTE)
         except Exception as e:
             app.logger.error(f"Error al obtener todos los pacientes: {str(e)}")
             return []
@@ -42,6 +41,18 @@ class PacienteDao:
             cur.close()
             con.close()
 
+    def getPacientesPagina(self, limite, cursor_pagina=None):
+        """Una pagina de pacientes ordenada por id"""
+        conexion = Conexion()
+        con = conexion.getConexion()
+        cur = con.cursor()
+        try:
+            return KEYSET_PACIENTES.consultar(cur, PACIENTES_SQL, (), limite, cursor_pagina,
+                                              convertir=CONVERSION_PACIENTE)
+        finally:
+            cur.close()
+            con.close()
+
     def getPacienteById(self, paciente_id):
         sql = """
             SELECT p.id_paciente, p.nombre, p.apellido, 
@@ -88,6 +99,7 @@ class PacienteDao:
                                   fecha_nacimiento, fecha_registro, 
                                   telefono, direccion, correo, id_ciudad)
             VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s)
+            ON CONFLICT DO NOTHING
             RETURNING id_paciente
         """
         conexion = Conexion()
@@ -97,9 +109,10 @@ class PacienteDao:
             cur.execute(sql, (nombre, apellido, cedula_entidad, 
                               fecha_nacimiento, fecha_registro, 
                               telefono, direccion, correo, id_ciudad))
-            paciente_id = cur.fetchone()[0]
+            fila = cur.fetchone()
             con.commit()
-            return paciente_id
+            # sin fila: el indice unico de cedula_entidad rechazo el duplicado
+            return fila[0] if fila else None
         except Exception as e:
             app.logger.error(f"Error al insertar paciente: {str(e)}")
             con.rollback()
@@ -128,6 +141,9 @@ class PacienteDao:
             actualizado = cur.rowcount > 0
             con.commit()
             return actualizado
+        except errors.UniqueViolation:
+            con.rollback()
+            return None
         except Exception as e:
             app.logger.error(f"Error al actualizar paciente: {str(e)}")
             con.rollback()
@@ -153,20 +169,3 @@ class PacienteDao:
         finally:
             cur.close()
             con.close()
-
-    def existeDuplicado(self, cedula_entidad):
-        """Verifica si ya existe un paciente con la misma cédula"""
-        sql = "SELECT COUNT(*) FROM paciente WHERE cedula_entidad = %s"
-        conexion = Conexion()
-        con = conexion.getConexion()
-        cur = con.cursor()
-        try:
-            cur.execute(sql, (cedula_entidad,))
-            result = cur.fetchone()[0]
-            return result > 0
-        except Exception as e:
-            app.logger.error(f"Error al verificar duplicado: {str(e)}")
-            return False
-        finally:
-            cur.close()
-            con.close()
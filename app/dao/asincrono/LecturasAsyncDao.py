@@ -0,0 +1,52 @@
+# Data access object - DAO async para los listados de solo lectura mas consultados
+from app.conexion.ConexionAsync import filasAsync, paginaAsync
+from app.conexion.MapeoFilas import horaHHMMSS
+from app.dao.referenciales.disponibilidad_horaria.DisponibilidadHorariaDao import (
+    DISPONIBILIDADES_SQL, DISPONIBILIDADES_MEDICO_FECHA_SQL, CONVERSION_DISPONIBILIDAD
+)
+from app.dao.RegisCita.RegistroCDao import REGISTROS_CITA_SQL, KEYSET_CITAS
+from app.dao.avisosRecordatorios.AvisosRecordatorioDao import AVISOS_SQL, KEYSET_AVISOS, CONVERSION_AVISO
+
+CONVERSION_CITA = {'hora': horaHHMMSS}
+
+
+class LecturasAsyncDao:
+
+    """Mismas consultas y mismo resultado que los DAO sincronicos, sobre asyncpg.
+
+        Las excepciones se propagan: la aplicacion ASGI las registra y
+        responde 500, igual que las vistas de Flask.
+    """
+
+    # ============================
+    # DISPONIBILIDAD
+    # ============================
+
+    async def getDisponibilidades(self):
+        return await filasAsync(DISPONIBILIDADES_SQL, convertir=CONVERSION_DISPONIBILIDAD)
+
+    async def getDisponibilidadesPorMedicoFecha(self, id_medico, fecha):
+        return await filasAsync(DISPONIBILIDADES_MEDICO_FECHA_SQL, (id_medico, fecha),
+                                convertir=CONVERSION_DISPONIBILIDAD)
+
+    # ============================
+    # CITAS
+    # ============================
+
+    async def getRegistrosC(self):
+        return await filasAsync(REGISTROS_CITA_SQL + KEYSET_CITAS.orden, convertir=CONVERSION_CITA)
+
+    async def getRegistrosCPagina(self, limite, cursor_pagina=None):
+        return await paginaAsync(KEYSET_CITAS, REGISTROS_CITA_SQL, (), limite, cursor_pagina,
+                                 convertir=CONVERSION_CITA)
+
+    # ============================
+    # AVISOS
+    # ============================
+
+    async def getAvisos(self):
+        return await filasAsync(AVISOS_SQL + KEYSET_AVISOS.orden, convertir=CONVERSION_AVISO)
+
+    async def getAvisosPagina(self, limite, cursor_pagina=None):
+        return await paginaAsync(KEYSET_AVISOS, AVISOS_SQL, (), limite, cursor_pagina,
+                                 convertir=CONVERSION_AVISO)
@@ -1,7 +1,42 @@
 from flask import current_app as app
-from app.conexion.Conexion import Conexion
+from app.conexion.Conexion import Conexion, soloLectura
+from app.conexion.Sentencias import sentencias
+from app.conexion.MapeoFilas import filasComoDicts, filaComoDict, fechaISO, horaHHMM
+from app.conexion.Streaming import iterarConsulta
+from app.conexion.Paginacion import Keyset
 from datetime import datetime
 
+# fecha y hora de la cita se entregan como texto listo para el JSON
+CONVERSION_AVISO = {'fecha_cita': fechaISO, 'hora_cita': horaHHMM}
+
+# compartido por el listado normal, el paginado y el envio por partes.
+# Sin ORDER BY: el orden lo agrega KEYSET_AVISOS
+AVISOS_SQL = """
+    SELECT a.id_aviso,
+        p.nombre || ' ' || p.apellido AS paciente,
+        p.telefono AS telefono_paciente,
+        per.nombre || ' ' || per.apellido AS personal,
+        m.nombre || ' ' || m.apellido AS medico,
+        c.nombre_consultorio,
+        a.fecha_cita,
+        a.hora_cita,
+        a.forma_envio,
+        a.mensaje,
+        a.estado_envio,
+        a.estado_confirmacion
+    FROM avisos_recordatorios a
+    JOIN paciente p ON a.id_paciente = p.id_paciente
+    JOIN personal per ON a.id_personal = per.id_personal
+    LEFT JOIN medico m ON a.id_medico = m.id_medico
+    JOIN consultorio c ON a.codigo = c.codigo
+"""
+
+KEYSET_AVISOS = Keyset('avisos', [
+    ('a.fecha_cita', 'fecha_cita'),
+    ('a.hora_cita', 'hora_cita'),
+    ('a.id_aviso', 'id_aviso'),
+])
+
 class AvisoRecordatorioDao:
 
     # ==============================
@@ -53,44 +88,15 @@ class AvisoRecordatorioDao:
     # ==============================
     #   LISTAR TODOS LOS AVISOS
     # ==============================
+    @soloLectura
     def getAvisos(self):
-        sql = """
-        SELECT a.id_aviso,
-            p.nombre || ' ' || p.apellido AS paciente,
-            p.telefono AS telefono_paciente,
-            per.nombre || ' ' || per.apellido AS personal,
-            m.nombre || ' ' || m.apellido AS medico,
-            c.nombre_consultorio,
-            a.fecha_cita,
-            a.hora_cita,
-            a.forma_envio,
-            a.mensaje,
-            a.estado_envio,
-            a.estado_confirmacion
-        FROM avisos_recordatorios a
-        JOIN paciente p ON a.id_paciente = p.id_paciente
-        JOIN personal per ON a.id_personal = per.id_personal
-        LEFT JOIN medico m ON a.id_medico = m.id_medico
-        JOIN consultorio c ON a.codigo = c.codigo
-        ORDER BY a.fecha_cita DESC, a.hora_cita DESC;
-        """
         conexion = Conexion()
         con = conexion.getConexion()
         cur = con.cursor()
         try:
-            cur.execute(sql)
+            cur.execute(AVISOS_SQL + KEYSET_AVISOS.orden)
             rows = cur.fetchall()
-            columnas = [desc[0] for desc in cur.description]
-
-            def convert(row):
-                data = dict(zip(columnas, row))
-                if data.get("fecha_cita") and hasattr(data["fecha_cita"], "isoformat"):
-                    data["fecha_cita"] = data["fecha_cita"].isoformat()
-                if data.get("hora_cita") and hasattr(data["hora_cita"], "strftime"):
-                    data["hora_cita"] = data["hora_cita"].strftime("%H:%M")
-                return data
-
-            return [convert(row) for row in rows]
+            return filasComoDicts(cur, rows, CONVERSION_AVISO)
         except Exception as e:
             app.logger.error(f"Error en AvisoRecordatorioDao.getAvisos: {e}")
             return []
@@ -98,6 +104,22 @@ class AvisoRecordatorioDao:
             cur.close()
             con.close()
 
+    def iterAvisos(self):
+        """Igual que getAvisos pero como generador (cursor del servidor)"""
+        return iterarConsulta(AVISOS_SQL + KEYSET_AVISOS.orden, convertir=CONVERSION_AVISO, nombre='avisos')
+
+    @soloLectura
+    def getAvisosPagina(self, limite, cursor_pagina=None):
+        """Una pagina de avisos; cursor_pagina es el 'siguiente' de la pagina anterior"""
+        conexion = Conexion()
+        con = conexion.getConexion()
+        cur = con.cursor()
+        try:
+            return KEYSET_AVISOS.consultar(cur, AVISOS_SQL, (), limite, cursor_pagina, convertir=CONVERSION_AVISO)
+        finally:
+            cur.close()
+            con.close()
+
     # ==============================
 #   VERIFICAR DUPLICADO
 # ==============================
@@ -162,20 +184,12 @@ class AvisoRecordatorioDao:
         con = conexion.getConexion()
         cur = con.cursor()
         try:
-            cur.execute(sql, (id_aviso,))
+            sentencias.ejecutar(cur, 'aviso_por_id', sql, (id_aviso,))
             row = cur.fetchone()
             if not row:
                 return None
 
-            columnas = [desc[0] for desc in cur.description]
-            data = dict(zip(columnas, row))
-
-            if data.get("fecha_cita") and hasattr(data["fecha_cita"], "isoformat"):
-                data["fecha_cita"] = data["fecha_cita"].isoformat()
-            if data.get("hora_cita") and hasattr(data["hora_cita"], "strftime"):
-                data["hora_cita"] = data["hora_cita"].strftime("%H:%M")
-
-            return data
+            return filaComoDict(cur, row, CONVERSION_AVISO)
         except Exception as e:
             app.logger.error(f"Error en AvisoRecordatorioDao.getAvisoById: {e}")
             return None
@@ -1,10 +1,48 @@
 from flask import current_app as app
-from app.conexion.Conexion import Conexion
+from app.conexion.Conexion import usaConexion
+from app.conexion.MapeoFilas import filaComoDict, mapeadorDe
+from app.conexion.Streaming import iterarConsulta
+from app.conexion.Paginacion import Keyset
+
+# compartido por el listado normal, el paginado y el envio por partes. Los
+# medicamentos se agregan por ficha en un LATERAL (sin GROUP BY sobre todas las
+# columnas), asi el filtro de la paginacion se aplica antes de agregar.
+# Sin ORDER BY: el orden lo agrega KEYSET_FICHAS
+FICHAS_SQL = """
+    SELECT f.id_ficha_medica, f.id_paciente, f.id_medico, f.cedula, f.edad, 
+           f.fecha_registro, f.alergias, f.enfermedades, f.diagnosticos, 
+           f.sintomas, f.tratamientos, f.cirugias_realizadas, f.recetas_medicas,
+           f.motivos_consultas, f.observaciones, f.estado, f.procedimiento_medico,
+           f.id_tipo_diagnostico, f.id_tipo_procedimiento_medico, f.id_consultorio,
+           p.nombre AS paciente_nombre, p.apellido AS paciente_apellido,
+           m.nombre AS medico_nombre, m.apellido AS medico_apellido,
+           td.tipo_diagnostico AS tipo_diagnostico_descripcion,
+           tpm.procedimiento AS tipo_procedimiento_medico_descripcion,
+           c.nombre_consultorio AS consultorio_nombre,
+           meds.medicamentos_ids,
+           meds.medicamentos_nombres
+    FROM ficha_medica f
+    INNER JOIN paciente p ON f.id_paciente = p.id_paciente
+    INNER JOIN medico m ON f.id_medico = m.id_medico
+    LEFT JOIN tipo_diagnostico td ON f.id_tipo_diagnostico = td.id_tipo_diagnostico
+    LEFT JOIN tipo_procedimiento_medico tpm ON f.id_tipo_procedimiento_medico = tpm.id_tipo_procedimiento
+    LEFT JOIN consultorio c ON f.id_consultorio = c.codigo
+    CROSS JOIN LATERAL (
+        SELECT COALESCE(ARRAY_AGG(fm.id_medicamento) FILTER (WHERE fm.id_medicamento IS NOT NULL), ARRAY[]::INTEGER[]) AS medicamentos_ids,
+               COALESCE(ARRAY_AGG(md.nombre_medicamento) FILTER (WHERE md.nombre_medicamento IS NOT NULL), ARRAY[]::TEXT[]) AS medicamentos_nombres
+        FROM ficha_medicamento fm
+        LEFT JOIN medicamento md ON fm.id_medicamento = md.id_medicamento
+        WHERE fm.id_ficha_medica = f.id_ficha_medica
+    ) meds
+"""
+
+KEYSET_FICHAS = Keyset('fichas', [('f.id_ficha_medica', 'id_ficha_medica')])
 
 class FichaMedicaDao:
 
     def __init__(self):
-        self.conn = Conexion().getConexion()
+        # la conexion se toma por llamada con @usaConexion
+        self.conn = None
 
     # ============================
     # Validación de datos
@@ -45,58 +83,48 @@ class FichaMedicaDao:
     # ============================
     # Obtener todas las fichas médicas - CORREGIDO
     # ============================
+    @usaConexion
     def getFichas(self):
         try:
             cursor = self.conn.cursor()
-            cursor.execute("""
-                SELECT f.id_ficha_medica, f.id_paciente, f.id_medico, f.cedula, f.edad, 
-                       f.fecha_registro, f.alergias, f.enfermedades, f.diagnosticos, 
-                       f.sintomas, f.tratamientos, f.cirugias_realizadas, f.recetas_medicas,
-                       f.motivos_consultas, f.observaciones, f.estado, f.procedimiento_medico,
-                       f.id_tipo_diagnostico, f.id_tipo_procedimiento_medico, f.id_consultorio,
-                       p.nombre AS paciente_nombre, p.apellido AS paciente_apellido,
-                       m.nombre AS medico_nombre, m.apellido AS medico_apellido,
-                       td.tipo_diagnostico AS tipo_diagnostico_descripcion,
-                       tpm.procedimiento AS tipo_procedimiento_medico_descripcion,
-                       c.nombre_consultorio AS consultorio_nombre,
-                       COALESCE(ARRAY_REMOVE(ARRAY_AGG(fm.id_medicamento), NULL), ARRAY[]::INTEGER[]) AS medicamentos_ids,
-                       COALESCE(ARRAY_REMOVE(ARRAY_AGG(md.nombre_medicamento), NULL), ARRAY[]::TEXT[]) AS medicamentos_nombres
-                FROM ficha_medica f
-                INNER JOIN paciente p ON f.id_paciente = p.id_paciente
-                INNER JOIN medico m ON f.id_medico = m.id_medico
-                LEFT JOIN tipo_diagnostico td ON f.id_tipo_diagnostico = td.id_tipo_diagnostico
-                LEFT JOIN tipo_procedimiento_medico tpm ON f.id_tipo_procedimiento_medico = tpm.id_tipo_procedimiento
-                LEFT JOIN consultorio c ON f.id_consultorio = c.codigo
-                LEFT JOIN ficha_medicamento fm ON f.id_ficha_medica = fm.id_ficha_medica
-                LEFT JOIN medicamento md ON fm.id_medicamento = md.id_medicamento
-                GROUP BY f.id_ficha_medica, f.id_paciente, f.id_medico, f.cedula, f.edad, 
-                         f.fecha_registro, f.alergias, f.enfermedades, f.diagnosticos, 
-                         f.sintomas, f.tratamientos, f.cirugias_realizadas, f.recetas_medicas,
-                         f.motivos_consultas, f.observaciones, f.estado, f.procedimiento_medico,
-                         f.id_tipo_diagnostico, f.id_tipo_procedimiento_medico, f.id_consultorio,
-                         p.nombre, p.apellido, m.nombre, m.apellido,
-                         td.tipo_diagnostico, tpm.procedimiento, c.nombre_consultorio
-                ORDER BY f.id_ficha_medica DESC
-            """)
+            cursor.execute(FICHAS_SQL + KEYSET_FICHAS.orden)
             rows = cursor.fetchall()
-            columnas = [desc[0] for desc in cursor.description]
-            fichas = []
-            for row in rows:
-                fila = dict(zip(columnas, row))
-                meds_ids = fila.pop("medicamentos_ids") or []
-                meds_nombres = fila.pop("medicamentos_nombres") or []
-                fila["medicamentos"] = [{"id_medicamento": i, "nombre_medicamento": n} 
-                                        for i, n in zip(meds_ids, meds_nombres)]
-                fichas.append(fila)
+            mapear = mapeadorDe(cursor)
+            fichas = [self._armarMedicamentos(mapear(row)) for row in rows]
             cursor.close()
             return fichas
         except Exception as e:
             app.logger.error(f"Error al obtener fichas médicas: {str(e)}")
             return []
 
+    def iterFichas(self):
+        """Igual que getFichas pero como generador (cursor del servidor)"""
+        return iterarConsulta(FICHAS_SQL + KEYSET_FICHAS.orden, transformar=self._armarMedicamentos, nombre='fichas')
+
+    @usaConexion
+    def getFichasPagina(self, limite, cursor_pagina=None):
+        """Una pagina de fichas; cursor_pagina es el 'siguiente' de la pagina anterior"""
+        cursor = self.conn.cursor()
+        try:
+            pagina = KEYSET_FICHAS.consultar(cursor, FICHAS_SQL, (), limite, cursor_pagina)
+        finally:
+            cursor.close()
+        pagina['data'] = [self._armarMedicamentos(fila) for fila in pagina['data']]
+        return pagina
+
+    @staticmethod
+    def _armarMedicamentos(fila):
+        """Une los arreglos medicamentos_ids/medicamentos_nombres en una lista de dicts"""
+        meds_ids = fila.pop("medicamentos_ids") or []
+        meds_nombres = fila.pop("medicamentos_nombres") or []
+        fila["medicamentos"] = [{"id_medicamento": i, "nombre_medicamento": n} 
+                                for i, n in zip(meds_ids, meds_nombres)]
+        return fila
+
     # ============================
     # Obtener ficha por ID - CORREGIDO
     # ============================
+    @usaConexion
     def getFichaById(self, id_ficha):
         try:
             cursor = self.conn.cursor()
@@ -132,9 +160,9 @@ class FichaMedicaDao:
             """, (id_ficha,))
             row = cursor.fetchone()
             if not row:
+                cursor.close()
                 return None
-            columnas = [desc[0] for desc in cursor.description]
-            fila = dict(zip(columnas, row))
+            fila = filaComoDict(cursor, row)
             meds_ids = fila.pop("medicamentos_ids") or []
             meds_nombres = fila.pop("medicamentos_nombres") or []
             fila["medicamentos"] = [{"id_medicamento": i, "nombre_medicamento": n} 
@@ -148,6 +176,7 @@ class FichaMedicaDao:
     # ============================
     # Agregar nueva ficha médica
     # ============================
+    @usaConexion
     def addFicha(self, data):
         try:
             self._validar_datos(data)  # <--- validación
@@ -204,6 +233,7 @@ class FichaMedicaDao:
     # ============================
     # Actualizar ficha médica
     # ============================
+    @usaConexion
     def updateFicha(self, id_ficha, data):
         try:
             self._validar_datos(data)  # <--- validación
@@ -273,6 +303,7 @@ class FichaMedicaDao:
     # ============================
     # Eliminar ficha médica
     # ============================
+    @usaConexion
     def deleteFicha(self, id_ficha):
         try:
             cursor = self.conn.cursor()
@@ -1,4 +1,5 @@
 from flask import current_app as app
+from psycopg2 import errors
 from app.conexion.Conexion import Conexion
 
 class MedicoDao:
@@ -98,6 +99,7 @@ class MedicoDao:
                                 cedula, fecha_nacimiento, fecha_registro,
                                 telefono, direccion, correo, id_ciudad)
             VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+            ON CONFLICT DO NOTHING
             RETURNING id_medico
         """
         conexion = Conexion()
@@ -107,9 +109,10 @@ class MedicoDao:
             cur.execute(sql, (nombre, apellido, id_especialidad, num_registro,
                               cedula, fecha_nacimiento, fecha_registro,
                               telefono, direccion, correo, id_ciudad))
-            medico_id = cur.fetchone()[0]
+            fila = cur.fetchone()
             con.commit()
-            return medico_id
+            # sin fila: un indice unico (cedula o num_registro) rechazo el duplicado
+            return fila[0] if fila else None
         except Exception as e:
             app.logger.error(f"Error al insertar médico: {str(e)}")
             con.rollback()
@@ -138,6 +141,9 @@ class MedicoDao:
             actualizado = cur.rowcount > 0
             con.commit()
             return actualizado
+        except errors.UniqueViolation:
+            con.rollback()
+            return None
         except Exception as e:
             app.logger.error(f"Error al actualizar médico: {str(e)}")
             con.rollback()
@@ -163,20 +169,3 @@ class MedicoDao:
         finally:
             cur.close()
             con.close()
-
-    def existeDuplicado(self, cedula, num_registro):
-        """Verifica si ya existe un médico con la misma cédula o número de registro"""
-        sql = "SELECT COUNT(*) FROM medico WHERE cedula = %s OR num_registro = %s"
-        conexion = Conexion()
-        con = conexion.getConexion()
-        cur = con.cursor()
-        try:
-            cur.execute(sql, (cedula, num_registro))
-            result = cur.fetchone()[0]
-            return result > 0
-        except Exception as e:
-            app.logger.error(f"Error al verificar duplicado: {str(e)}")
-            return False
-        finally:
-            cur.close()
-            con.close()
\ No newline at end of file
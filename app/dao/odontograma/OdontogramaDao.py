@@ -1,5 +1,6 @@
 from flask import current_app as app
 from app.conexion.Conexion import Conexion
+from app.conexion.MapeoFilas import filasComoDicts, filaComoDict
 
 class OdontogramaDao:
 
@@ -32,8 +33,7 @@ class OdontogramaDao:
         try:
             cur.execute(sql)
             rows = cur.fetchall()
-            columnas = [desc[0] for desc in cur.description]
-            return [dict(zip(columnas, row)) for row in rows]
+            return filasComoDicts(cur, rows)
         except Exception as e:
             app.logger.error(f"Error al obtener odontogramas: {e}")
             return []
@@ -87,15 +87,13 @@ class OdontogramaDao:
             if not row:
                 return None
                 
-            columnas = [desc[0] for desc in cur.description]
-            odontograma = dict(zip(columnas, row))
+            odontograma = filaComoDict(cur, row)
             
             # Obtener detalles
             cur.execute(detalles_sql, (id_odontograma,))
             detalles_rows = cur.fetchall()
             if detalles_rows:
-                detalles_columnas = [desc[0] for desc in cur.description]
-                detalles = [dict(zip(detalles_columnas, detail_row)) for detail_row in detalles_rows]
+                detalles = filasComoDicts(cur, detalles_rows)
                 odontograma['detalle'] = detalles
             else:
                 odontograma['detalle'] = []
@@ -136,8 +134,7 @@ class OdontogramaDao:
             cur.execute(sql, (id_paciente,))
             row = cur.fetchone()
             if row:
-                columnas = [desc[0] for desc in cur.description]
-                return dict(zip(columnas, row))
+                return filaComoDict(cur, row)
             return None
         except Exception as e:
             app.logger.error(f"Error al obtener odontograma del paciente {id_paciente}: {e}")
@@ -253,8 +250,7 @@ class OdontogramaDao:
         try:
             cur.execute(sql, (id_odontograma,))
             rows = cur.fetchall()
-            columnas = [desc[0] for desc in cur.description]
-            return [dict(zip(columnas, row)) for row in rows]
+            return filasComoDicts(cur, rows)
         except Exception as e:
             app.logger.error(f"Error al obtener detalles del odontograma {id_odontograma}: {e}")
             return []
@@ -375,8 +371,7 @@ class OdontogramaDao:
         try:
             cur.execute(sql)
             rows = cur.fetchall()
-            columnas = [desc[0] for desc in cur.description]
-            return [dict(zip(columnas, row)) for row in rows]
+            return filasComoDicts(cur, rows)
         except Exception as e:
             app.logger.error(f"Error al obtener estados dentales: {e}")
             return []
@@ -402,8 +397,7 @@ class OdontogramaDao:
         try:
             cur.execute(sql)
             rows = cur.fetchall()
-            columnas = [desc[0] for desc in cur.description]
-            return [dict(zip(columnas, row)) for row in rows]
+            return filasComoDicts(cur, rows)
         except Exception as e:
             app.logger.error(f"Error al obtener pacientes: {e}")
             return []
@@ -429,8 +423,7 @@ class OdontogramaDao:
         try:
             cur.execute(sql)
             rows = cur.fetchall()
-            columnas = [desc[0] for desc in cur.description]
-            return [dict(zip(columnas, row)) for row in rows]
+            return filasComoDicts(cur, rows)
         except Exception as e:
             app.logger.error(f"Error al obtener médicos: {e}")
             return []
@@ -0,0 +1,79 @@
+# Tablas referenciales que atiende ReferencialDao
+from app.dao.referenciales.ReferencialDao import Columna, TablaReferencial
+
+LETRAS_NUMEROS = r"^[A-Za-zÁÉÍÓÚáéíóúÑñ0-9\s]+$"
+LETRAS = r"^[A-Za-zÁÉÍÓÚáéíóúÑñüÜ\s]+$"
+TEXTO_CLINICO = r"^[A-Za-zÁÉÍÓÚáéíóúÑñ\s\,\.]+$"
+TEXTO_CLINICO_NUMEROS = r"^[A-Za-z0-9ÁÉÍÓÚáéíóúÑñ\s\/\-\,\.]+$"
+TEXTO_MEDICAMENTO = r"^[A-Za-zÁÉÍÓÚáéíóúÑñ\s/]+$"
+
+
+def _descripcion(patron=None, mensaje=None, **opciones):
+    return Columna('descripcion', etiqueta='descripción', patron=patron, mensaje=mensaje, mayusculas=True, **opciones)
+
+
+def _simple(tabla, etiqueta, clave='id'):
+    """Tablas (id, descripcion) sin reglas de formato: sexos, paises, etc."""
+    return TablaReferencial(tabla, clave, [_descripcion()], comparar='mayusculas', etiqueta=etiqueta)
+
+
+def _conNumeros(tabla, clave, etiqueta):
+    """Tablas (id_x, descripcion) con letras, numeros y espacios: ciudad, cargo, etc."""
+    return TablaReferencial(
+        tabla, clave,
+        [_descripcion(LETRAS_NUMEROS, 'La descripción solo puede contener letras, números y espacios.')],
+        etiqueta=etiqueta,
+    )
+
+
+def _calendario(tabla, clave, etiqueta):
+    """dia y turno: solo letras, de 3 a 50 caracteres, sin repetir ignorando mayusculas y espacios."""
+    return TablaReferencial(
+        tabla, clave,
+        [_descripcion(LETRAS, 'La descripción solo puede contener letras y espacios', largo_min=3, largo_max=50)],
+        comparar='normalizado', etiqueta=etiqueta,
+    )
+
+
+def _clinica(tabla, clave, columna, patron, etiqueta):
+    """sintoma, tipo_analisis y tipo_estudio: texto con al menos una vocal."""
+    return TablaReferencial(
+        tabla, clave,
+        [Columna(columna, etiqueta='descripción', patron=patron,
+                 mensaje='La descripción contiene caracteres no permitidos.', con_vocal=True)],
+        comparar='mayusculas', etiqueta=etiqueta,
+    )
+
+
+CATALOGO = {spec.tabla: spec for spec in [
+    _simple('sexos', 'sexo'),
+    _simple('paises', 'país'),
+    _simple('nacionalidades', 'nacionalidad'),
+    _simple('ocupaciones', 'ocupación'),
+    _simple('estado_civil', 'estado civil'),
+    _simple('duracion_consulta', 'duración de consulta'),
+    _conNumeros('ciudad', 'id_ciudad', 'ciudad'),
+    _conNumeros('cargo', 'id_cargo', 'cargo'),
+    _conNumeros('estado_cita', 'id_estado', 'estado de cita'),
+    _conNumeros('especialidad', 'id_especialidad', 'especialidad'),
+    _calendario('dia', 'id_dia', 'día'),
+    _calendario('turno', 'id_turno', 'turno'),
+    _clinica('sintoma', 'id_sintoma', 'descripcion_sintoma', TEXTO_CLINICO, 'síntoma'),
+    _clinica('tipo_analisis', 'id_tipo_analisis', 'descripcion_analisis', TEXTO_CLINICO_NUMEROS, 'tipo de análisis'),
+    _clinica('tipo_estudio', 'id_tipo_estudio', 'descripcion_estudio', TEXTO_CLINICO_NUMEROS, 'tipo de estudio'),
+    TablaReferencial(
+        'medicamento', 'id_medicamento',
+        [
+            Columna('nombre_medicamento', etiqueta='nombre del medicamento', patron=TEXTO_MEDICAMENTO,
+                    mensaje='El nombre del medicamento solo puede contener letras, espacios y "/"', con_vocal=True),
+            Columna('dosis', patron=r"^[A-Za-z0-9\s\.\,\-\/\%]+$",
+                    mensaje='La dosis tiene un formato inválido. Use formatos como: 500mg, 2.5ml, 10%, etc.'),
+            Columna('indicaciones', patron=r"^[A-Za-zÁÉÍÓÚáéíóúÑñ0-9\s/\,\.\;\:\(\)\-]+$",
+                    mensaje='Las indicaciones contienen caracteres no permitidos.', con_vocal=True),
+            Columna('forma_farmaceutica', etiqueta='forma farmacéutica', patron=TEXTO_MEDICAMENTO,
+                    mensaje='La forma farmacéutica solo puede contener letras, espacios y "/"', con_vocal=True),
+        ],
+        unica=['nombre_medicamento', 'dosis', 'forma_farmaceutica'],
+        comparar='mayusculas', etiqueta='medicamento',
+    ),
+]}
@@ -0,0 +1,542 @@
+# Data access object - DAO generico para las tablas referenciales
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from flask import g, has_request_context
+from psycopg2 import errors
+from psycopg2.extras import execute_values
+from app.conexion.Conexion import Conexion
+from app.conexion.MapeoFilas import filasComoDicts, filaComoDict
+from app.conexion.Sesion import despuesDeConfirmar
+from app.conexion.Notificaciones import suscribirCambios
+
+# maximo de filas por lote en guardarLote/actualizarLote/eliminarLote
+LOTE_MAXIMO = 1000
+
+# tablas que guarda CacheReferenciales y segundos que dura cada listado (0: sin vencimiento)
+CACHE_MAXIMO = int(os.environ.get('DB_CACHE_REFERENCIALES_MAX', 32))
+CACHE_TTL = float(os.environ.get('DB_CACHE_REFERENCIALES_TTL', 300))
+ESTADISTICAS_CACHE = ('aciertos', 'fallos', 'expirados', 'desalojos', 'invalidaciones')
+
+# expresion con la que se comparan los valores unicos: (sql, python)
+COMPARACIONES = {
+    'exacto': ("{}", lambda v: v),
+    'mayusculas': ("UPPER({})", lambda v: v.upper() if isinstance(v, str) else v),
+    'normalizado': ("LOWER(TRIM({}))", lambda v: v.strip().lower() if isinstance(v, str) else v),
+}
+
+VOCAL = re.compile(r"[aeiouáéíóúAEIOUÁÉÍÓÚ]")
+
+
+class ValidacionError(ValueError):
+    """Datos con formato invalido; las API lo responden como 400."""
+
+
+class DuplicadoError(ValueError):
+    """Ya existe un registro con los mismos valores unicos (409)."""
+
+
+class EnUsoError(ValueError):
+    """El registro esta referenciado desde otra tabla y no se puede eliminar (409)."""
+
+
+# ============================
+# ESPECIFICACION
+# ============================
+
+class Columna:
+
+    """Columna editable de una tabla referencial y sus validaciones.
+
+        patron: regex que debe cumplir el valor completo (mensaje si falla).
+        con_vocal: exige al menos una vocal ("palabras entendibles").
+        mayusculas: el valor se guarda en mayusculas, como hacen las API.
+    """
+    def __init__(self, nombre, tipo='text', etiqueta=None, requerida=True, patron=None, mensaje=None,
+                 con_vocal=False, mayusculas=False, largo_min=None, largo_max=None):
+        self.nombre = nombre
+        self.tipo = tipo
+        self.etiqueta = etiqueta or nombre
+        self.requerida = requerida
+        self.patron = re.compile(patron) if patron else None
+        self.mensaje = mensaje or f"El campo {self.etiqueta} tiene un formato inválido."
+        self.con_vocal = con_vocal
+        self.mayusculas = mayusculas
+        self.largo_min = largo_min
+        self.largo_max = largo_max
+
+    def limpiar(self, valor):
+        """Retorna el valor normalizado o lanza ValidacionError."""
+        if isinstance(valor, str):
+            valor = valor.strip()
+            if self.mayusculas:
+                valor = valor.upper()
+        if valor is None or valor == '':
+            if self.requerida:
+                raise ValidacionError(f"El campo {self.etiqueta} es obligatorio y no puede estar vacío.")
+            return None
+        if not isinstance(valor, str):
+            raise ValidacionError(f"El campo {self.etiqueta} debe ser un texto.")
+        if self.largo_min and len(valor) < self.largo_min:
+            raise ValidacionError(f"El campo {self.etiqueta} debe tener al menos {self.largo_min} caracteres.")
+        if self.largo_max and len(valor) > self.largo_max:
+            raise ValidacionError(f"El campo {self.etiqueta} no puede superar los {self.largo_max} caracteres.")
+        if self.patron is not None and not self.patron.match(valor):
+            raise ValidacionError(self.mensaje)
+        if self.con_vocal and not VOCAL.search(valor):
+            raise ValidacionError(f"El campo {self.etiqueta} debe contener palabras entendibles.")
+        return valor
+
+
+class TablaReferencial:
+
+    """Descripcion declarativa de una tabla referencial.
+
+        tabla: nombre de la tabla; clave: columna de la clave primaria (serial).
+        columnas: lista de Columna editables.
+        unica: columnas que juntas no se pueden repetir (por defecto todas).
+        comparar: 'exacto', 'mayusculas' o 'normalizado' (LOWER(TRIM(...))),
+        la forma en que cada DAO original buscaba los duplicados.
+    """
+    def __init__(self, tabla, clave, columnas, unica=None, comparar='exacto', etiqueta=None):
+        if comparar not in COMPARACIONES:
+            raise ValueError(f"Comparacion desconocida: {comparar}")
+        self.tabla = tabla
+        self.clave = clave
+        self.columnas = columnas
+        self.nombres = [c.nombre for c in columnas]
+        self.unica = unica or list(self.nombres)
+        self.comparar = comparar
+        self.etiqueta = etiqueta or tabla
+        self.selectSQL = f"SELECT {clave}, {', '.join(self.nombres)} FROM {tabla}"
+
+    def expresion(self, columna):
+        return COMPARACIONES[self.comparar][0].format(columna)
+
+    def claveUnica(self, valores):
+        """Valores unicos de una fila tal como los compara la base."""
+        normalizar = COMPARACIONES[self.comparar][1]
+        return tuple(normalizar(valores.get(c)) for c in self.unica)
+
+    def validar(self, datos):
+        """dict recibido -> dict con solo las columnas editables, ya limpias."""
+        if not isinstance(datos, dict):
+            raise ValidacionError("Cada registro debe ser un objeto JSON.")
+        return {c.nombre: c.limpiar(datos.get(c.nombre)) for c in self.columnas}
+
+
+# ============================
+# CACHE COMPARTIDA
+# ============================
+
+class CacheReferenciales:
+
+    """Listados completos de las tablas referenciales, compartidos por todo el proceso.
+
+        Cada tabla tiene un numero de generacion que aumenta en cada
+        invalidacion; un listado leido de la base solo se guarda si la
+        generacion no cambio mientras se leia, asi una lectura que se cruza
+        con una escritura nunca deja datos viejos en la cache.
+
+        Guarda como mucho `maximo` tablas (se desaloja la menos usada) y cada
+        listado vence a los `ttl` segundos: la invalidacion al escribir solo
+        alcanza al proceso que escribio, el ttl acota lo que tarda en verse
+        un cambio hecho por otro worker o directamente en la base.
+    """
+    def __init__(self, maximo=CACHE_MAXIMO, ttl=CACHE_TTL):
+        self.maximo = maximo
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._datos = OrderedDict()     # tabla -> (listado, vence_en)
+        self._generaciones = {}
+        self._stats = {}
+
+    def _contar(self, tabla, clave):
+        por_tabla = self._stats.setdefault(tabla, dict.fromkeys(ESTADISTICAS_CACHE, 0))
+        por_tabla[clave] += 1
+
+    def obtener(self, tabla):
+        with self._lock:
+            entrada = self._datos.get(tabla)
+            if entrada is None:
+                self._contar(tabla, 'fallos')
+                return None
+            listado, vence_en = entrada
+            if vence_en is not None and time.monotonic() >= vence_en:
+                del self._datos[tabla]
+                self._contar(tabla, 'expirados')
+                self._contar(tabla, 'fallos')
+                return None
+            self._datos.move_to_end(tabla)
+            self._contar(tabla, 'aciertos')
+            return listado
+
+    def generacion(self, tabla):
+        return self._generaciones.get(tabla, 0)
+
+    def guardar(self, tabla, generacion, listado):
+        with self._lock:
+            if self._generaciones.get(tabla, 0) != generacion:
+                return
+            vence_en = time.monotonic() + self.ttl if self.ttl else None
+            self._datos[tabla] = (listado, vence_en)
+            self._datos.move_to_end(tabla)
+            while len(self._datos) > self.maximo:
+                desalojada, _ = self._datos.popitem(last=False)
+                self._contar(desalojada, 'desalojos')
+
+    def invalidar(self, tabla):
+        with self._lock:
+            self._generaciones[tabla] = self._generaciones.get(tabla, 0) + 1
+            if self._datos.pop(tabla, None) is not None:
+                self._contar(tabla, 'invalidaciones')
+
+    def invalidarTodo(self):
+        with self._lock:
+            for tabla in set(self._generaciones) | set(self._datos):
+                self._generaciones[tabla] = self._generaciones.get(tabla, 0) + 1
+            for tabla in self._datos:
+                self._contar(tabla, 'invalidaciones')
+            self._datos.clear()
+
+    def getEstadisticas(self):
+        with self._lock:
+            tablas = {tabla: dict(stats) for tabla, stats in self._stats.items()}
+            en_cache = list(self._datos)
+        total = {clave: sum(t[clave] for t in tablas.values()) for clave in ESTADISTICAS_CACHE}
+        consultas = total['aciertos'] + total['fallos']
+        return {
+            'maximo': self.maximo,
+            'ttl': self.ttl,
+            'en_cache': en_cache,
+            'total': total,
+            'tasa_aciertos': round(total['aciertos'] / consultas, 4) if consultas else None,
+            'tablas': tablas,
+        }
+
+
+cacheReferenciales = CacheReferenciales()
+
+# escrituras de otros workers o nodos (triggers de sql/02_notificar_cambios.sql)
+suscribirCambios(
+    lambda tabla, operacion: cacheReferenciales.invalidar(tabla),
+    al_reconectar=cacheReferenciales.invalidarTodo,
+)
+
+
+def _modificadaEnRequest(tabla):
+    """True si este request ya escribio en la tabla (cambios aun sin confirmar)."""
+    return has_request_context() and tabla in g.get('_referenciales_modificados', ())
+
+
+def _firma(filas):
+    contenido = json.dumps(filas, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha1(contenido.encode('utf-8')).hexdigest()[:20]
+
+
+def _copiar(filas):
+    # los dicts de la cache no se entregan directamente: quien los reciba puede modificarlos
+    return [dict(f) for f in filas]
+
+
+# ============================
+# DAO GENERICO
+# ============================
+
+class ReferencialDao:
+
+    """CRUD de una tabla referencial a partir de su TablaReferencial.
+
+        Los metodos lanzan excepciones (ValidacionError, DuplicadoError,
+        EnUsoError o las de psycopg2); los DAO de cada tabla las atrapan y
+        conservan sus valores de retorno de siempre.
+    """
+    def __init__(self, spec):
+        self.spec = spec
+
+    def _invalidar(self):
+        tabla = self.spec.tabla
+        cacheReferenciales.invalidar(tabla)
+        if has_request_context():
+            if '_referenciales_modificados' not in g:
+                g._referenciales_modificados = set()
+            g._referenciales_modificados.add(tabla)
+        # otra vez al confirmar: descarta lo que otro request haya leido antes del commit
+        despuesDeConfirmar(lambda: cacheReferenciales.invalidar(tabla))
+
+    def _escribir(self, ejecutar):
+        """Ejecuta `ejecutar(cur)` en una transaccion y traduce los errores de integridad."""
+        con = Conexion().getConexion()
+        cur = con.cursor()
+        try:
+            resultado = ejecutar(cur)
+            con.commit()
+        except errors.ForeignKeyViolation:
+            con.rollback()
+            raise EnUsoError(f"El registro de {self.spec.etiqueta} está siendo utilizado y no se puede eliminar.")
+        except errors.UniqueViolation:
+            con.rollback()
+            raise DuplicadoError(f"Ya existe un registro de {self.spec.etiqueta} con esos datos.")
+        except Exception:
+            con.rollback()
+            raise
+        finally:
+            cur.close()
+            con.close()
+        self._invalidar()
+        return resultado
+
+    # ============================
+    # LECTURA
+    # ============================
+
+    def getListado(self):
+        """(filas, firma) de la tabla completa, desde la cache si se puede.
+
+            firma es un hash del contenido: igual en todos los workers para
+            los mismos datos, sirve de ETag. Las filas son las de la cache,
+            no se deben modificar.
+        """
+        spec = self.spec
+        usar_cache = not _modificadaEnRequest(spec.tabla)
+        if usar_cache:
+            listado = cacheReferenciales.obtener(spec.tabla)
+            if listado is not None:
+                return listado
+            generacion = cacheReferenciales.generacion(spec.tabla)
+
+        con = Conexion().getConexion()
+        cur = con.cursor()
+        try:
+            cur.execute(f"{spec.selectSQL} ORDER BY {spec.clave}")
+            filas = filasComoDicts(cur, cur.fetchall())
+        finally:
+            cur.close()
+            con.close()
+
+        listado = (filas, _firma(filas))
+        if usar_cache:
+            cacheReferenciales.guardar(spec.tabla, generacion, listado)
+        return listado
+
+    def getTodos(self):
+        filas, _ = self.getListado()
+        return _copiar(filas)
+
+    def getPorId(self, id):
+        spec = self.spec
+        listado = None if _modificadaEnRequest(spec.tabla) else cacheReferenciales.obtener(spec.tabla)
+        if listado is not None:
+            filas, _ = listado
+            for fila in filas:
+                if fila[spec.clave] == id:
+                    return dict(fila)
+            return None
+
+        con = Conexion().getConexion()
+        cur = con.cursor()
+        try:
+            cur.execute(f"{spec.selectSQL} WHERE {spec.clave} = %s", (id,))
+            return filaComoDict(cur, cur.fetchone())
+        finally:
+            cur.close()
+            con.close()
+
+    # ============================
+    # ESCRITURA POR REGISTRO
+    # ============================
+
+    def insertar(self, valores):
+        """INSERT sin validar; retorna el id generado.
+
+            El indice unico de la tabla (sql/04_indices_unicos.sql) decide si
+            es duplicado en el mismo INSERT: sin fila devuelta, DuplicadoError.
+        """
+        spec = self.spec
+        sql = f"""
+        INSERT INTO {spec.tabla} ({', '.join(spec.nombres)})
+        VALUES ({', '.join(['%s'] * len(spec.nombres))})
+        ON CONFLICT DO NOTHING
+        RETURNING {spec.clave}
+        """
+
+        def ejecutar(cur):
+            cur.execute(sql, [valores.get(c) for c in spec.nombres])
+            fila = cur.fetchone()
+            if fila is None:
+                raise DuplicadoError(f"Ya existe un registro de {spec.etiqueta} con esos datos.")
+            return fila[0]
+        return self._escribir(ejecutar)
+
+    def actualizar(self, id, valores):
+        """UPDATE sin validar; retorna True si el registro existia.
+
+            Si choca con otro registro el indice unico lo rechaza: DuplicadoError.
+        """
+        spec = self.spec
+        sql = f"""
+        UPDATE {spec.tabla} SET {', '.join(f'{c} = %s' for c in spec.nombres)}
+        WHERE {spec.clave} = %s
+        """
+
+        def ejecutar(cur):
+            cur.execute(sql, [valores.get(c) for c in spec.nombres] + [id])
+            return cur.rowcount > 0
+        return self._escribir(ejecutar)
+
+    def eliminar(self, id):
+        """DELETE; retorna True si el registro existia."""
+        sql = f"DELETE FROM {self.spec.tabla} WHERE {self.spec.clave} = %s"
+
+        def ejecutar(cur):
+            cur.execute(sql, (id,))
+            return cur.rowcount > 0
+        return self._escribir(ejecutar)
+
+    def crear(self, datos):
+        """Valida e inserta; retorna el registro guardado o lanza DuplicadoError."""
+        valores = self.spec.validar(datos)
+        return {self.spec.clave: self.insertar(valores), **valores}
+
+    def modificar(self, id, datos):
+        """Valida y actualiza; retorna None si el id no existe o lanza DuplicadoError."""
+        valores = self.spec.validar(datos)
+        if not self.actualizar(id, valores):
+            return None
+        return {self.spec.clave: id, **valores}
+
+    # ============================
+    # ESCRITURA POR LOTES
+    # ============================
+
+    def _validarLote(self, registros, con_clave=False):
+        spec = self.spec
+        if not isinstance(registros, list) or not registros:
+            raise ValidacionError("Se espera una lista de registros no vacía.")
+        if len(registros) > LOTE_MAXIMO:
+            raise ValidacionError(f"El lote no puede superar los {LOTE_MAXIMO} registros.")
+
+        lote = []
+        vistos = {}
+        ids = set()
+        for i, datos in enumerate(registros, start=1):
+            try:
+                valores = spec.validar(datos)
+                if con_clave:
+                    id = datos.get(spec.clave)
+                    if not isinstance(id, int) or isinstance(id, bool):
+                        raise ValidacionError(f"El campo {spec.clave} es obligatorio y debe ser un número entero.")
+                    if id in ids:
+                        raise ValidacionError(f"El {spec.clave} {id} está repetido en el lote.")
+                    ids.add(id)
+                    valores = {spec.clave: id, **valores}
+            except ValidacionError as e:
+                raise ValidacionError(f"Registro {i}: {e}")
+            unica = spec.claveUnica(valores)
+            if unica in vistos:
+                raise DuplicadoError(f"Los registros {vistos[unica]} y {i} del lote tienen los mismos datos.")
+            vistos[unica] = i
+            lote.append(valores)
+        return lote
+
+    def _plantilla(self, columnas):
+        tipos = {c.nombre: c.tipo for c in self.spec.columnas}
+        tipos[self.spec.clave] = 'integer'
+        return "(" + ", ".join(f"%s::{tipos[c]}" for c in columnas) + ")"
+
+    def guardarLote(self, registros):
+        """Inserta todos los registros con un solo INSERT ... VALUES ... ON CONFLICT DO NOTHING.
+
+            Los que ya existen en la tabla no se insertan; si hay alguno se
+            deshace el lote completo y se lanza DuplicadoError con sus datos.
+            Retorna los registros insertados con su id.
+        """
+        spec = self.spec
+        lote = self._validarLote(registros)
+        columnas = ", ".join(spec.nombres)
+        sql = f"""
+        INSERT INTO {spec.tabla} ({columnas})
+        VALUES %s
+        ON CONFLICT DO NOTHING
+        RETURNING {spec.clave}, {columnas}
+        """
+
+        def ejecutar(cur):
+            filas = execute_values(cur, sql, [[v[c] for c in spec.nombres] for v in lote],
+                                   template=self._plantilla(spec.nombres), page_size=len(lote), fetch=True)
+            insertados = filasComoDicts(cur, filas)
+            if len(insertados) < len(lote):
+                guardados = {spec.claveUnica(f) for f in insertados}
+                repetidos = [v for v in lote if spec.claveUnica(v) not in guardados]
+                raise DuplicadoError(
+                    f"Ya existen en {spec.etiqueta}: "
+                    + "; ".join(" / ".join(str(v[c]) for c in spec.unica) for v in repetidos[:10])
+                )
+            return insertados
+        return self._escribir(ejecutar)
+
+    def actualizarLote(self, registros):
+        """Actualiza todos los registros con un solo UPDATE ... FROM (VALUES ...).
+
+            Cada registro debe traer la clave. Retorna (actualizados, no_encontrados).
+        """
+        spec = self.spec
+        lote = self._validarLote(registros, con_clave=True)
+        columnas = [spec.clave] + spec.nombres
+        filas = [[v[c] for c in columnas] for v in lote]
+        plantilla = self._plantilla(columnas)
+        lista = ", ".join(columnas)
+        conflicto = " AND ".join(f"{spec.expresion('t.' + c)} = {spec.expresion('v.' + c)}" for c in spec.unica)
+        conflictoSQL = f"""
+        WITH v ({lista}) AS (VALUES %s)
+        SELECT v.{spec.clave} FROM v
+        JOIN {spec.tabla} t ON {conflicto}
+        WHERE t.{spec.clave} NOT IN (SELECT {spec.clave} FROM v)
+        LIMIT 10
+        """
+        updateSQL = f"""
+        UPDATE {spec.tabla} AS t SET {', '.join(f'{c} = v.{c}' for c in spec.nombres)}
+        FROM (VALUES %s) AS v ({lista})
+        WHERE t.{spec.clave} = v.{spec.clave}
+        RETURNING t.{spec.clave}
+        """
+
+        def ejecutar(cur):
+            en_conflicto = execute_values(cur, conflictoSQL, filas, template=plantilla, page_size=len(filas), fetch=True)
+            if en_conflicto:
+                raise DuplicadoError(
+                    f"Otro registro de {spec.etiqueta} ya tiene los datos de: "
+                    + ", ".join(f"{spec.clave} {f[0]}" for f in en_conflicto)
+                )
+            return {f[0] for f in execute_values(cur, updateSQL, filas, template=plantilla, page_size=len(filas), fetch=True)}
+
+        actualizados = self._escribir(ejecutar)
+        return (
+            [v for v in lote if v[spec.clave] in actualizados],
+            [v[spec.clave] for v in lote if v[spec.clave] not in actualizados],
+        )
+
+    def eliminarLote(self, ids):
+        """Elimina todos los ids con un solo DELETE; retorna (eliminados, no_encontrados).
+
+            Si alguno esta en uso se deshace el lote completo (EnUsoError).
+        """
+        spec = self.spec
+        if not isinstance(ids, list) or not ids:
+            raise ValidacionError("Se espera una lista de ids no vacía.")
+        if len(ids) > LOTE_MAXIMO:
+            raise ValidacionError(f"El lote no puede superar los {LOTE_MAXIMO} registros.")
+        if any(not isinstance(i, int) or isinstance(i, bool) for i in ids):
+            raise ValidacionError("Los ids deben ser números enteros.")
+        sql = f"DELETE FROM {spec.tabla} WHERE {spec.clave} = ANY(%s) RETURNING {spec.clave}"
+
+        def ejecutar(cur):
+            cur.execute(sql, (list(ids),))
+            return {f[0] for f in cur.fetchall()}
+
+        eliminados = self._escribir(ejecutar)
+        return sorted(eliminados), [i for i in dict.fromkeys(ids) if i not in eliminados]
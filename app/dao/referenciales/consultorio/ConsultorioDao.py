@@ -1,5 +1,6 @@
 import re
 from flask import current_app as app
+from psycopg2 import errors
 from app.conexion.Conexion import Conexion
 
 class ConsultorioDao:
@@ -23,38 +24,6 @@ class ConsultorioDao:
         """Valida correo electrónico básico"""
         return bool(re.match(r'^[\w\.-]+@[\w\.-]+\.\w+$', correo))
 
-    def existeDuplicado(self, nombre_consultorio, correo, codigo_excluir=None):
-        """
-        Verifica si existe un consultorio con el mismo nombre o correo.
-        Si se proporciona codigo_excluir, ignora ese registro (útil para actualizaciones).
-        """
-        if codigo_excluir:
-            sql = """
-            SELECT 1 FROM consultorio
-            WHERE (UPPER(nombre_consultorio) = UPPER(%s) OR UPPER(correo) = UPPER(%s))
-            AND codigo != %s
-            """
-            params = (nombre_consultorio, correo, codigo_excluir)
-        else:
-            sql = """
-            SELECT 1 FROM consultorio
-            WHERE UPPER(nombre_consultorio) = UPPER(%s) OR UPPER(correo) = UPPER(%s)
-            """
-            params = (nombre_consultorio, correo)
-        
-        conexion = Conexion()
-        con = conexion.getConexion()
-        cur = con.cursor()
-        try:
-            cur.execute(sql, params)
-            return cur.fetchone() is not None
-        except Exception as e:
-            app.logger.error(f"Error al verificar duplicado de consultorio: {str(e)}")
-            return False
-        finally:
-            cur.close()
-            con.close()
-
     def getConsultorios(self):
         """Obtiene todos los consultorios"""
         sql = "SELECT codigo, nombre_consultorio, direccion, telefono, correo FROM consultorio ORDER BY nombre_consultorio"
@@ -117,21 +86,25 @@ class ConsultorioDao:
         if not self._esTelefonoParaguayoValido(telefono):
             raise ValueError("El número de teléfono no es válido. Debe ser paraguayo (+595).")
 
-        if self.existeDuplicado(nombre_consultorio, correo):
-            raise ValueError("Ya existe un consultorio con ese nombre o correo.")
-
+        # nombre o correo repetido: lo decide el indice unico (sql/04_indices_unicos.sql)
         sql = """
         INSERT INTO consultorio(nombre_consultorio, direccion, telefono, correo)
-        VALUES (%s, %s, %s, %s) RETURNING codigo
+        VALUES (%s, %s, %s, %s)
+        ON CONFLICT DO NOTHING
+        RETURNING codigo
         """
         conexion = Conexion()
         con = conexion.getConexion()
         cur = con.cursor()
         try:
             cur.execute(sql, (nombre_consultorio, direccion, telefono, correo))
-            codigo = cur.fetchone()[0]
+            fila = cur.fetchone()
             con.commit()
-            return codigo
+            if fila is None:
+                raise ValueError("Ya existe un consultorio con ese nombre o correo.")
+            return fila[0]
+        except ValueError:
+            raise
         except Exception as e:
             app.logger.error(f"Error al insertar consultorio: {str(e)}")
             con.rollback()
@@ -152,10 +125,6 @@ class ConsultorioDao:
         if not self._esTelefonoParaguayoValido(telefono):
             raise ValueError("El número de teléfono no es válido. Debe ser paraguayo (+595).")
 
-        # Verificar duplicados excluyendo el registro actual
-        if self.existeDuplicado(nombre_consultorio, correo, codigo):
-            raise ValueError("Ya existe otro consultorio con ese nombre o correo.")
-
         sql = """
         UPDATE consultorio
         SET nombre_consultorio=%s,
@@ -172,6 +141,9 @@ class ConsultorioDao:
             filas_afectadas = cur.rowcount
             con.commit()
             return filas_afectadas > 0
+        except errors.UniqueViolation:
+            con.rollback()
+            raise ValueError("Ya existe otro consultorio con ese nombre o correo.")
         except Exception as e:
             app.logger.error(f"Error al actualizar consultorio: {str(e)}")
             con.rollback()
@@ -1,7 +1,12 @@
 # Data access object - DAO
+from bisect import bisect_left
+from collections import defaultdict
 from flask import current_app as app
+from psycopg2 import errors
+from psycopg2.extras import execute_values
 from app.conexion.Conexion import Conexion
-from datetime import datetime  # ✅ AGREGAR ESTE IMPORT
+from app.conexion.MapeoFilas import filasComoDicts
+from datetime import datetime, timedelta  # ✅ AGREGAR ESTE IMPORT
 
 # ✅ AGREGAR ESTA FUNCIÓN COMPLETA AQUÍ (después de los imports, antes de la clase)
 def formatear_hora_12h(hora_24h):
@@ -71,33 +76,102 @@ def validar_duracion_maxima(hora_inicio, hora_fin, max_horas=10):
         app.logger.error(f"Error al validar duración: {str(e)}")
         return {'valido': False, 'mensaje': 'Error al validar las horas.'}
 
+# horas en formato 12h y fecha como texto, igual que antes de usar el mapeador
+CONVERSION_DISPONIBILIDAD = {
+    'disponibilidad_hora_inicio': formatear_hora_12h,
+    'disponibilidad_hora_fin': formatear_hora_12h,
+    'disponibilidad_fecha': str,
+}
+
+# listados compartidos con la version async (LecturasAsyncDao)
+DISPONIBILIDADES_SQL = """
+    SELECT d.id_disponibilidad, d.id_medico, d.disponibilidad_hora_inicio,
+           d.disponibilidad_hora_fin, d.disponibilidad_fecha, d.disponibilidad_cupos,
+           m.nombre || ' ' || m.apellido AS medico_nombre
+    FROM disponibilidad_horaria d
+    JOIN medico m ON d.id_medico = m.id_medico
+"""
+
+DISPONIBILIDADES_MEDICO_FECHA_SQL = """
+    SELECT id_disponibilidad, disponibilidad_hora_inicio, disponibilidad_hora_fin, disponibilidad_cupos
+    FROM disponibilidad_horaria
+    WHERE id_medico = %s AND disponibilidad_fecha = %s
+    ORDER BY disponibilidad_hora_inicio
+"""
+
+# disponibilidades existentes de un medico en el periodo de una plantilla
+DISPONIBILIDADES_PERIODO_SQL = """
+    SELECT disponibilidad_fecha, disponibilidad_hora_inicio, disponibilidad_hora_fin
+    FROM disponibilidad_horaria
+    WHERE id_medico = %s AND disponibilidad_fecha BETWEEN %s AND %s
+"""
+
+INSERTAR_DISPONIBILIDADES_SQL = """
+    INSERT INTO disponibilidad_horaria(id_medico, disponibilidad_hora_inicio,
+                                       disponibilidad_hora_fin, disponibilidad_fecha, disponibilidad_cupos)
+    VALUES %s
+    RETURNING id_disponibilidad
+"""
+
+MENSAJE_SOLAPADA = 'Ya existe una disponibilidad en ese horario.'
+
+# 'codigo' de los errores que retorna DisponibilidadDao; la API elige el
+# estado HTTP por el codigo, no por el texto del mensaje
+ERROR_INVALIDA = 'INVALIDA'     # horas, duracion o plantilla sin fechas
+ERROR_SOLAPADA = 'SOLAPADA'     # choca con otra disponibilidad del medico
+ERROR_BASE = 'ERROR'            # fallo de la base
+
+# periodo maximo de una plantilla
+PLANTILLA_DIAS_MAXIMO = 366
+
+
+class IntervalosPorDia:
+    """Rangos horarios por fecha, ordenados por inicio, para detectar solapamientos en memoria.
+
+        Misma condicion que ex_disponibilidad_solapada: [inicio, fin) se
+        solapa con un rango existente si no termina antes ni empieza despues.
+    """
+    def __init__(self):
+        self._dias = defaultdict(lambda: ([], []))     # fecha -> (inicios, fines)
+
+    def solapa(self, fecha, inicio, fin):
+        inicios, fines = self._dias[fecha]
+        # solo los rangos que empiezan antes de `fin` pueden solaparse
+        return any(f > inicio for f in fines[:bisect_left(inicios, fin)])
+
+    def agregar(self, fecha, inicio, fin):
+        inicios, fines = self._dias[fecha]
+        i = bisect_left(inicios, inicio)
+        inicios.insert(i, inicio)
+        fines.insert(i, fin)
+
+
+def expandirPlantilla(desde, hasta, bloques):
+    """Filas (fecha, hora_inicio, hora_fin, cupos) de una plantilla semanal, por fecha y hora.
+
+        bloques: [{'dias_semana': [1..7] (1 = lunes), 'hora_inicio': time,
+        'hora_fin': time, 'cupos': int}]
+    """
+    filas = []
+    fecha = desde
+    while fecha <= hasta:
+        for bloque in bloques:
+            if fecha.isoweekday() in bloque['dias_semana']:
+                filas.append((fecha, bloque['hora_inicio'], bloque['hora_fin'], bloque['cupos']))
+        fecha += timedelta(days=1)
+    filas.sort()
+    return filas
+
+
 class DisponibilidadDao:
 
     def getDisponibilidades(self):
-        sql = """
-        SELECT d.id_disponibilidad, d.id_medico, d.disponibilidad_hora_inicio, 
-               d.disponibilidad_hora_fin, d.disponibilidad_fecha, d.disponibilidad_cupos,
-               m.nombre || ' ' || m.apellido AS medico_nombre
-        FROM disponibilidad_horaria d
-        JOIN medico m ON d.id_medico = m.id_medico
-        """
         conexion = Conexion()
         con = conexion.getConexion()
         cur = con.cursor()
         try:
-            cur.execute(sql)
-            disponibilidades = cur.fetchall()
-            return [
-                {
-                    'id_disponibilidad': d[0],
-                    'id_medico': d[1],
-                    'disponibilidad_hora_inicio': formatear_hora_12h(d[2]),
-                    'disponibilidad_hora_fin': formatear_hora_12h(d[3]),
-                    'disponibilidad_fecha': str(d[4]),
-                    'disponibilidad_cupos': d[5],
-                    'medico_nombre': d[6]
-                } for d in disponibilidades
-            ]
+            cur.execute(DISPONIBILIDADES_SQL)
+            return filasComoDicts(cur, cur.fetchall(), CONVERSION_DISPONIBILIDAD)
         except Exception as e:
             app.logger.error(f"Error al obtener disponibilidades: {str(e)}")
             return []
@@ -142,26 +216,12 @@ class DisponibilidadDao:
         """
         Retorna todas las disponibilidades de un médico en una fecha específica.
         """
-        sql = """
-        SELECT id_disponibilidad, disponibilidad_hora_inicio, disponibilidad_hora_fin, disponibilidad_cupos
-        FROM disponibilidad_horaria
-        WHERE id_medico = %s AND disponibilidad_fecha = %s
-        ORDER BY disponibilidad_hora_inicio
-        """
         conexion = Conexion()
         con = conexion.getConexion()
         cur = con.cursor()
         try:
-            cur.execute(sql, (id_medico, fecha))
-            rows = cur.fetchall()
-            return [
-                {
-                    'id_disponibilidad': r[0],
-                    'disponibilidad_hora_inicio': formatear_hora_12h(r[1]),  
-                    'disponibilidad_hora_fin': formatear_hora_12h(r[2]),  
-                    'disponibilidad_cupos': r[3]
-                } for r in rows
-            ]
+            cur.execute(DISPONIBILIDADES_MEDICO_FECHA_SQL, (id_medico, fecha))
+            return filasComoDicts(cur, cur.fetchall(), CONVERSION_DISPONIBILIDAD)
         except Exception as e:
             app.logger.error(f"Error al obtener disponibilidades por médico y fecha: {str(e)}")
             return []
@@ -169,52 +229,14 @@ class DisponibilidadDao:
             cur.close()
             con.close()
 
-    def existeDisponibilidad(self, id_medico, hora_inicio, hora_fin, fecha, excluir_id=None):
-        """
-        Verifica si existe una disponibilidad que solapa con el intervalo [hora_inicio, hora_fin)
-        para el mismo médico y fecha. Si excluir_id se pasa, lo excluye de la búsqueda (útil en updates).
-        """
-        # La condición NOT (existing_end <= new_start OR existing_start >= new_end)
-        sql = """
-        SELECT id_disponibilidad
-        FROM disponibilidad_horaria
-        WHERE id_medico = %s
-          AND disponibilidad_fecha = %s
-          AND NOT (disponibilidad_hora_fin <= %s OR disponibilidad_hora_inicio >= %s)
-        """
-        params = [id_medico, fecha, hora_inicio, hora_fin]
-        if excluir_id:
-            sql += " AND id_disponibilidad != %s"
-            params.append(excluir_id)
-
-        conexion = Conexion()
-        con = conexion.getConexion()
-        cur = con.cursor()
-        try:
-            cur.execute(sql, tuple(params))
-            existe = cur.fetchone() is not None
-            if existe:
-                app.logger.debug(f"Existe disponibilidad solapada: medico={id_medico}, fecha={fecha}, inicio={hora_inicio}, fin={hora_fin}, excluir_id={excluir_id}")
-            return existe
-        except Exception as e:
-            app.logger.error(f"Error en existeDisponibilidad: {str(e)}")
-            # En caso de error devolvemos False para no bloquear la lógica (mantén logs para depurar)
-            return False
-        finally:
-            cur.close()
-            con.close()
-
     def guardarDisponibilidad(self, id_medico, hora_inicio, hora_fin, fecha, cupos):
         # ✅ AGREGAR VALIDACIÓN DE 8 HORAS
         validacion = validar_duracion_maxima(hora_inicio, hora_fin, max_horas=10)  # ✅
         if not validacion['valido']:
             app.logger.warning(validacion['mensaje'])
-            return {'error': validacion['mensaje'], 'success': False}
-        
-        if self.existeDisponibilidad(id_medico, hora_inicio, hora_fin, fecha):
-            app.logger.warning("Disponibilidad duplicada detectada")
-            return {'error': 'Ya existe una disponibilidad en ese horario.', 'success': False}
+            return {'error': validacion['mensaje'], 'codigo': ERROR_INVALIDA, 'success': False}
 
+        # el solapamiento lo rechaza ex_disponibilidad_solapada (sql/07_exclusion_solapamientos.sql)
         sql = """
         INSERT INTO disponibilidad_horaria(id_medico, disponibilidad_hora_inicio, 
                                         disponibilidad_hora_fin, disponibilidad_fecha, disponibilidad_cupos)
@@ -229,10 +251,14 @@ class DisponibilidadDao:
             new_id = cur.fetchone()[0]
             con.commit()
             return {'success': True, 'id': new_id}
+        except errors.ExclusionViolation:
+            con.rollback()
+            app.logger.warning("Disponibilidad duplicada detectada")
+            return {'error': MENSAJE_SOLAPADA, 'codigo': ERROR_SOLAPADA, 'success': False}
         except Exception as e:
             app.logger.error(f"Error al insertar disponibilidad: {str(e)}")
             con.rollback()
-            return {'error': 'Error al guardar la disponibilidad.', 'success': False}
+            return {'error': 'Error al guardar la disponibilidad.', 'codigo': ERROR_BASE, 'success': False}
         finally:
             cur.close()
             con.close()
@@ -242,11 +268,7 @@ class DisponibilidadDao:
         validacion = validar_duracion_maxima(hora_inicio, hora_fin, max_horas=10)  # 
         if not validacion['valido']:
             app.logger.warning(validacion['mensaje'])
-            return {'error': validacion['mensaje'], 'success': False}
-        
-        if self.existeDisponibilidad(id_medico, hora_inicio, hora_fin, fecha, excluir_id=id_disponibilidad):
-            app.logger.warning("Disponibilidad duplicada detectada en update")
-            return {'error': 'Ya existe una disponibilidad en ese horario.', 'success': False}
+            return {'error': validacion['mensaje'], 'codigo': ERROR_INVALIDA, 'success': False}
 
         sql = """
         UPDATE disponibilidad_horaria
@@ -265,10 +287,14 @@ class DisponibilidadDao:
             filas = cur.rowcount
             con.commit()
             return {'success': True, 'updated': filas > 0}
+        except errors.ExclusionViolation:
+            con.rollback()
+            app.logger.warning("Disponibilidad duplicada detectada en update")
+            return {'error': MENSAJE_SOLAPADA, 'codigo': ERROR_SOLAPADA, 'success': False}
         except Exception as e:
             app.logger.error(f"Error al actualizar disponibilidad: {str(e)}")
             con.rollback()
-            return {'error': 'Error al actualizar la disponibilidad.', 'success': False}
+            return {'error': 'Error al actualizar la disponibilidad.', 'codigo': ERROR_BASE, 'success': False}
         finally:
             cur.close()
             con.close()
@@ -290,4 +316,64 @@ class DisponibilidadDao:
         finally:
             cur.close()
             con.close()
-    
\ No newline at end of file
+
+    def guardarPlantilla(self, id_medico, desde, hasta, bloques, omitir_solapados=False):
+        """Genera las disponibilidades de una plantilla semanal en una sola transaccion.
+
+            Los solapamientos (con lo que ya hay en el periodo o entre bloques
+            de la plantilla) se detectan en memoria con una sola lectura; las
+            filas se insertan con un unico INSERT ... VALUES. Si hay
+            solapamientos y no se pide omitirlos no se inserta nada.
+        """
+        for bloque in bloques:
+            validacion = validar_duracion_maxima(bloque['hora_inicio'], bloque['hora_fin'], max_horas=10)
+            if not validacion['valido']:
+                return {'error': validacion['mensaje'], 'codigo': ERROR_INVALIDA, 'success': False}
+
+        filas = expandirPlantilla(desde, hasta, bloques)
+        if not filas:
+            return {'error': 'La plantilla no genera ninguna fecha en el periodo indicado.',
+                    'codigo': ERROR_INVALIDA, 'success': False}
+
+        conexion = Conexion()
+        con = conexion.getConexion()
+        cur = con.cursor()
+        try:
+            cur.execute(DISPONIBILIDADES_PERIODO_SQL, (id_medico, desde, hasta))
+            intervalos = IntervalosPorDia()
+            for fecha, inicio, fin in cur.fetchall():
+                intervalos.agregar(fecha, inicio, fin)
+
+            nuevas, solapadas = [], []
+            for fecha, inicio, fin, cupos in filas:
+                if intervalos.solapa(fecha, inicio, fin):
+                    solapadas.append({'fecha': str(fecha), 'hora_inicio': formatear_hora_12h(inicio),
+                                      'hora_fin': formatear_hora_12h(fin)})
+                    continue
+                intervalos.agregar(fecha, inicio, fin)
+                nuevas.append((id_medico, inicio, fin, fecha, cupos))
+
+            if solapadas and not omitir_solapados:
+                app.logger.warning(f"Plantilla con {len(solapadas)} horarios solapados: medico={id_medico}")
+                return {'error': MENSAJE_SOLAPADA, 'codigo': ERROR_SOLAPADA, 'success': False,
+                        'solapadas': solapadas}
+
+            ids = []
+            if nuevas:
+                ids = [f[0] for f in execute_values(cur, INSERTAR_DISPONIBILIDADES_SQL, nuevas,
+                                                     page_size=len(nuevas), fetch=True)]
+            con.commit()
+            app.logger.info(f"Plantilla de disponibilidad: medico={id_medico}, {len(ids)} creadas, {len(solapadas)} omitidas")
+            return {'success': True, 'ids': ids, 'omitidas': solapadas}
+        except errors.ExclusionViolation:
+            # otra alta entre la lectura y el INSERT
+            con.rollback()
+            app.logger.warning(f"Plantilla con horarios solapados al insertar: medico={id_medico}")
+            return {'error': MENSAJE_SOLAPADA, 'codigo': ERROR_SOLAPADA, 'success': False, 'solapadas': []}
+        except Exception as e:
+            app.logger.error(f"Error al guardar plantilla de disponibilidad: {str(e)}")
+            con.rollback()
+            return {'error': 'Error al guardar la disponibilidad.', 'codigo': ERROR_BASE, 'success': False}
+        finally:
+            cur.close()
+            con.close()
@@ -1,141 +1,49 @@
 # Data access object - DAO
 from flask import current_app as app
-from app.conexion.Conexion import Conexion
+from app.dao.referenciales.Catalogo import CATALOGO
+from app.dao.referenciales.ReferencialDao import ReferencialDao, DuplicadoError
 
 class OcupacionDao:
 
-    def getOcupaciones(self):
+    """CRUD de ocupaciones; las consultas las arma ReferencialDao a partir del catalogo."""
+    def __init__(self):
+        self.referencial = ReferencialDao(CATALOGO['ocupaciones'])
 
-        ocupacionSQL = """
-        SELECT id, descripcion
-        FROM ocupaciones
-        """
-        # objeto conexion
-        conexion = Conexion()
-        con = conexion.getConexion()
-        cur = con.cursor()
+    def getOcupaciones(self):
         try:
-            cur.execute(ocupacionSQL)
-            ocupaciones = cur.fetchall() # trae datos de la bd
-
-            # Transformar los datos en una lista de diccionarios
-            return [{'id': ocupacion[0], 'descripcion': ocupacion[1]} for ocupacion in ocupaciones]
-
+            return self.referencial.getTodos()
         except Exception as e:
             app.logger.error(f"Error al obtener todas las ocupaciones: {str(e)}")
             return []
 
-        finally:
-            cur.close()
-            con.close()
-
     def getOcupacionById(self, id):
-
-        ocupacionSQL = """
-        SELECT id, descripcion
-        FROM ocupaciones WHERE id=%s
-        """
-        # objeto conexion
-        conexion = Conexion()
-        con = conexion.getConexion()
-        cur = con.cursor()
         try:
-            cur.execute(ocupacionSQL, (id,))
-            ocupacionEncontrada = cur.fetchone() # Obtener una sola fila
-            if ocupacionEncontrada:
-                return {
-                        "id": ocupacionEncontrada[0],
-                        "descripcion": ocupacionEncontrada[1]
-                    }  # Retornar los datos de la ocupacion
-            else:
-                return None # Retornar None si no se encuentra la ocupacion
+            return self.referencial.getPorId(id)
         except Exception as e:
-            app.logger.error(f"Error al obtener ocupacion: {str(e)}")
+            app.logger.error(f"Error al obtener la ocupacion: {str(e)}")
             return None
 
-        finally:
-            cur.close()
-            con.close()
-
     def guardarOcupacion(self, descripcion):
-
-        insertOcupacionSQL = """
-        INSERT INTO ocupaciones(descripcion) VALUES(%s) RETURNING id
-        """
-
-        conexion = Conexion()
-        con = conexion.getConexion()
-        cur = con.cursor()
-
-        # Ejecucion exitosa
         try:
-            cur.execute(insertOcupacionSQL, (descripcion,))
-            ocupacion_id = cur.fetchone()[0]
-            con.commit() # se confirma la insercion
-            return ocupacion_id
-
-        # Si algo fallo entra aqui
+            return self.referencial.insertar({'descripcion': descripcion})
+        except DuplicadoError:
+            return None
         except Exception as e:
-            app.logger.error(f"Error al insertar ocupacion: {str(e)}")
-            con.rollback() # retroceder si hubo error
+            app.logger.error(f"Error al insertar la ocupacion: {str(e)}")
             return False
 
-        # Siempre se va ejecutar
-        finally:
-            cur.close()
-            con.close()
-
     def updateOcupacion(self, id, descripcion):
-
-        updateOcupacionSQL = """
-        UPDATE ocupaciones
-        SET descripcion=%s
-        WHERE id=%s
-        """
-
-        conexion = Conexion()
-        con = conexion.getConexion()
-        cur = con.cursor()
-
         try:
-            cur.execute(updateOcupacionSQL, (descripcion, id,))
-            filas_afectadas = cur.rowcount # Obtener el número de filas afectadas
-            con.commit()
-
-            return filas_afectadas > 0 # Retornar True si se actualizó al menos una fila
-
+            return self.referencial.actualizar(id, {'descripcion': descripcion})
+        except DuplicadoError:
+            return None
         except Exception as e:
-            app.logger.error(f"Error al actualizar ocupacion: {str(e)}")
-            con.rollback()
+            app.logger.error(f"Error al actualizar la ocupacion: {str(e)}")
             return False
 
-        finally:
-            cur.close()
-            con.close()
-
     def deleteOcupacion(self, id):
-
-        updateOcupacionSQL = """
-        DELETE FROM ocupaciones
-        WHERE id=%s
-        """
-
-        conexion = Conexion()
-        con = conexion.getConexion()
-        cur = con.cursor()
-
         try:
-            cur.execute(updateOcupacionSQL, (id,))
-            rows_affected = cur.rowcount
-            con.commit()
-
-            return rows_affected > 0  # Retornar True si se eliminó al menos una fila
-
+            return self.referencial.eliminar(id)
         except Exception as e:
-            app.logger.error(f"Error al eliminar ocupacion: {str(e)}")
-            con.rollback()
+            app.logger.error(f"Error al eliminar la ocupacion: {str(e)}")
             return False
-
-        finally:
-            cur.close()
-            con.close()
\ No newline at end of file
@@ -1,141 +1,49 @@
 # Data access object - DAO
 from flask import current_app as app
-from app.conexion.Conexion import Conexion
+from app.dao.referenciales.Catalogo import CATALOGO
+from app.dao.referenciales.ReferencialDao import ReferencialDao, DuplicadoError
 
 class PaisDao:
 
-    def getPaises(self):
+    """CRUD de paises; las consultas las arma ReferencialDao a partir del catalogo."""
+    def __init__(self):
+        self.referencial = ReferencialDao(CATALOGO['paises'])
 
-        paisSQL = """
-        SELECT id, descripcion
-        FROM paises
-        """
-        # objeto conexion
-        conexion = Conexion()
-        con = conexion.getConexion()
-        cur = con.cursor()
+    def getPaises(self):
         try:
-            cur.execute(paisSQL)
-            paises = cur.fetchall() # trae datos de la bd
-
-            # Transformar los datos en una lista de diccionarios
-            return [{'id': pais[0], 'descripcion': pais[1]} for pais in paises]
-
+            return self.referencial.getTodos()
         except Exception as e:
-            app.logger.error(f"Error al obtener todas las paises: {str(e)}")
+            app.logger.error(f"Error al obtener todos los paises: {str(e)}")
             return []
 
-        finally:
-            cur.close()
-            con.close()
-
     def getPaisById(self, id):
-
-        paisSQL = """
-        SELECT id, descripcion
-        FROM paises WHERE id=%s
-        """
-        # objeto conexion
-        conexion = Conexion()
-        con = conexion.getConexion()
-        cur = con.cursor()
         try:
-            cur.execute(paisSQL, (id,))
-            paisEncontrada = cur.fetchone() # Obtener una sola fila
-            if paisEncontrada:
-                return {
-                        "id": paisEncontrada[0],
-                        "descripcion": paisEncontrada[1]
-                    }  # Retornar los datos de pais
-            else:
-                return None # Retornar None si no se encuentra el pais
+            return self.referencial.getPorId(id)
         except Exception as e:
-            app.logger.error(f"Error al obtener pais: {str(e)}")
+            app.logger.error(f"Error al obtener el pais: {str(e)}")
             return None
 
-        finally:
-            cur.close()
-            con.close()
-
     def guardarPais(self, descripcion):
-
-        insertPaisSQL = """
-        INSERT INTO paises(descripcion) VALUES(%s) RETURNING id
-        """
-
-        conexion = Conexion()
-        con = conexion.getConexion()
-        cur = con.cursor()
-
-        # Ejecucion exitosa
         try:
-            cur.execute(insertPaisSQL, (descripcion,))
-            pais_id = cur.fetchone()[0]
-            con.commit() # se confirma la insercion
-            return pais_id
-
-        # Si algo fallo entra aqui
+            return self.referencial.insertar({'descripcion': descripcion})
+        except DuplicadoError:
+            return None
         except Exception as e:
-            app.logger.error(f"Error al insertar pais: {str(e)}")
-            con.rollback() # retroceder si hubo error
+            app.logger.error(f"Error al insertar el pais: {str(e)}")
             return False
 
-        # Siempre se va ejecutar
-        finally:
-            cur.close()
-            con.close()
-
     def updatePais(self, id, descripcion):
-
-        updatePaisSQL = """
-        UPDATE paises
-        SET descripcion=%s
-        WHERE id=%s
-        """
-
-        conexion = Conexion()
-        con = conexion.getConexion()
-        cur = con.cursor()
-
         try:
-            cur.execute(updatePaisSQL, (descripcion, id,))
-            filas_afectadas = cur.rowcount # Obtener el número de filas afectadas
-            con.commit()
-
-            return filas_afectadas > 0 # Retornar True si se actualizó al menos una fila
-
+            return self.referencial.actualizar(id, {'descripcion': descripcion})
+        except DuplicadoError:
+            return None
         except Exception as e:
-            app.logger.error(f"Error al actualizar pais: {str(e)}")
-            con.rollback()
+            app.logger.error(f"Error al actualizar el pais: {str(e)}")
             return False
 
-        finally:
-            cur.close()
-            con.close()
-
     def deletePais(self, id):
-
-        updatePaisSQL = """
-        DELETE FROM paises
-        WHERE id=%s
-        """
-
-        conexion = Conexion()
-        con = conexion.getConexion()
-        cur = con.cursor()
-
         try:
-            cur.execute(updatePaisSQL, (id,))
-            rows_affected = cur.rowcount
-            con.commit()
-
-            return rows_affected > 0  # Retornar True si se eliminó al menos una fila
-
+            return self.referencial.eliminar(id)
         except Exception as e:
-            app.logger.error(f"Error al eliminar pais: {str(e)}")
-            con.rollback()
+            app.logger.error(f"Error al eliminar el pais: {str(e)}")
             return False
-
-        finally:
-            cur.close()
-            con.close()
\ No newline at end of file
@@ -1,4 +1,5 @@
 from flask import current_app as app
+from psycopg2 import errors
 from app.conexion.Conexion import Conexion
 
 class PersonalDao:
@@ -94,6 +95,7 @@ class PersonalDao:
             INSERT INTO personal (nombre, apellido, cedula, fecha_nacimiento,
                                   telefono, direccion, correo, id_ciudad, id_cargo, fecha_registro)
             VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+            ON CONFLICT DO NOTHING
             RETURNING id_personal
         """
         conexion = Conexion()
@@ -102,9 +104,10 @@ class PersonalDao:
         try:
             cur.execute(sql, (nombre, apellido, cedula, fecha_nacimiento,
                               telefono, direccion, correo, id_ciudad, id_cargo, fecha_registro))
-            personal_id = cur.fetchone()[0]
+            fila = cur.fetchone()
             con.commit()
-            return personal_id
+            # sin fila: un indice unico (cedula o correo) rechazo el duplicado
+            return fila[0] if fila else None
         except Exception as e:
             app.logger.error(f"Error al insertar personal: {str(e)}")
             con.rollback()
@@ -130,6 +133,9 @@ class PersonalDao:
             actualizado = cur.rowcount > 0
             con.commit()
             return actualizado
+        except errors.UniqueViolation:
+            con.rollback()
+            return None
         except Exception as e:
             app.logger.error(f"Error al actualizar personal: {str(e)}")
             con.rollback()
@@ -155,20 +161,3 @@ class PersonalDao:
         finally:
             cur.close()
             con.close()
-
-    def existeDuplicado(self, cedula, correo):
-        """Verifica si ya existe un personal con la misma cédula o correo"""
-        sql = "SELECT COUNT(*) FROM personal WHERE cedula = %s OR correo = %s"
-        conexion = Conexion()
-        con = conexion.getConexion()
-        cur = con.cursor()
-        try:
-            cur.execute(sql, (cedula, correo))
-            result = cur.fetchone()[0]
-            return result > 0
-        except Exception as e:
-            app.logger.error(f"Error al verificar duplicado: {str(e)}")
-            return False
-        finally:
-            cur.close()
-            con.close()
@@ -1,6 +1,7 @@
 # Data access object - DAO para tipo_diagnostico
 import re
 from flask import current_app as app
+from psycopg2 import errors
 from app.conexion.Conexion import Conexion
 
 class TipoDiagnosticoDao:
@@ -118,6 +119,7 @@ class TipoDiagnosticoDao:
         sql = """
         INSERT INTO tipo_diagnostico(descripcion_diagnostico, tipo_diagnostico)
         VALUES (%s, %s)
+        ON CONFLICT DO NOTHING
         RETURNING id_tipo_diagnostico
         """
         conexion = Conexion()
@@ -128,14 +130,14 @@ class TipoDiagnosticoDao:
                 app.logger.error("Descripción vacía o nula al intentar guardar diagnóstico")
                 return False
 
-            if self.diagnosticoExiste(descripcion_diagnostico):
-                app.logger.error(f"Ya existe un diagnóstico con la descripción: {descripcion_diagnostico}")
-                return False
-
             cur.execute(sql, (descripcion_diagnostico, tipo_diagnostico))
-            id_diagnostico = cur.fetchone()[0]
+            fila = cur.fetchone()
             con.commit()
-            return id_diagnostico
+            if fila is None:
+                # el indice unico sobre UPPER(descripcion_diagnostico) rechazo el duplicado
+                app.logger.warning(f"Ya existe un diagnóstico con la descripción: {descripcion_diagnostico}")
+                return None
+            return fila[0]
         except Exception as e:
             app.logger.error(f"Error al insertar diagnóstico: {str(e)}")
             con.rollback()
@@ -159,6 +161,9 @@ class TipoDiagnosticoDao:
             filas = cur.rowcount
             con.commit()
             return filas > 0
+        except errors.UniqueViolation:
+            con.rollback()
+            return None
         except Exception as e:
             app.logger.error(f"Error al actualizar diagnóstico: {str(e)}")
             con.rollback()
@@ -1,6 +1,7 @@
 # Data Access Object - DAO
 import re
 from flask import current_app as app
+from psycopg2 import errors
 from app.conexion.Conexion import Conexion
 
 class TipoProcedimientoDao:
@@ -126,16 +127,19 @@ class TipoProcedimientoDao:
         """
         sql = """
         INSERT INTO tipo_procedimiento_medico(procedimiento, descripcion, duracion)
-        VALUES(%s, %s, %s) RETURNING id_tipo_procedimiento
+        VALUES(%s, %s, %s)
+        ON CONFLICT DO NOTHING
+        RETURNING id_tipo_procedimiento
         """
         conexion = Conexion()
         con = conexion.getConexion()
         cur = con.cursor()
         try:
             cur.execute(sql, (procedimiento, descripcion, duracion))
-            id_tipo_procedimiento = cur.fetchone()[0]
+            fila = cur.fetchone()
             con.commit()
-            return id_tipo_procedimiento
+            # sin fila: el indice unico sobre UPPER(procedimiento) rechazo el duplicado
+            return fila[0] if fila else None
         except Exception as e:
             app.logger.error(f"Error al insertar tipo de procedimiento: {str(e)}")
             con.rollback()
@@ -163,6 +167,9 @@ class TipoProcedimientoDao:
             filas_afectadas = cur.rowcount
             con.commit()
             return filas_afectadas > 0
+        except errors.UniqueViolation:
+            con.rollback()
+            return None
         except Exception as e:
             app.logger.error(f"Error al actualizar tipo de procedimiento: {str(e)}")
             con.rollback()
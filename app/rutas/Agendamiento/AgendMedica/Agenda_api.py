@@ -8,6 +8,8 @@ agendaapi = Blueprint('agendaapi', __name__)
 # ==============================
 #   Obtener todas las agendas
 # ==============================
+# sin @condicional: agenda_medica no tiene version (sql/03_versiones_tablas.sql),
+# sus cupos cambian con cada reserva
 @agendaapi.route('/agenda', methods=['GET'])
 def getAgendas():
     agendadao = AgendaDao()
@@ -84,16 +86,12 @@ def addAgenda():
             return jsonify(success=False,
                            error="Faltan campos obligatorios: horario_disponible o id_disponibilidad"), 400
 
-    # Chequeo de duplicado con fecha y horario
     try:
-        if agendadao.existeDuplicado(
-            data['id_medico'], data['id_dia'], data['id_turno'], data['codigo'],
-            fecha_agenda=data.get('fecha_agenda'), horario_disponible=data.get('horario_disponible')
-        ):
+        # el duplicado (mismo dia, turno, consultorio, fecha y horario) lo rechaza el indice unico
+        agenda_id = agendadao.addAgenda(data)
+        if agenda_id is None:
             return jsonify(success=False,
                            error="Ya existe una agenda para este médico en el mismo día, turno, consultorio y horario."), 409
-
-        agenda_id = agendadao.addAgenda(data)
         if agenda_id:
             app.logger.info(f"Agenda creada con ID {agenda_id}.")
             return jsonify(success=True,
@@ -146,15 +144,10 @@ def updateAgenda(agenda_id):
             data['cupos'] = disp.get('disponibilidad_cupos', 0)
 
     try:
-        if agendadao.existeDuplicado(
-            data['id_medico'], data['id_dia'], data['id_turno'], data['codigo'],
-            fecha_agenda=data.get('fecha_agenda'), horario_disponible=data.get('horario_disponible'),
-            id_agenda=agenda_id
-        ):
+        actualizado = agendadao.updateAgenda(agenda_id, data)
+        if actualizado is None:
             return jsonify(success=False,
                            error="Ya existe otra agenda para este médico en el mismo día, turno, consultorio y horario."), 409
-
-        actualizado = agendadao.updateAgenda(agenda_id, data)
         if actualizado:
             app.logger.info(f"Agenda con ID {agenda_id} actualizada exitosamente.")
             return jsonify(success=True,
@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify, current_app as app, render_template
 from app.dao.RegisCita.RegistroCDao import RegistroCDao
-from datetime import time
+from app.conexion.Streaming import formatoStream, respuestaStream
+from app.conexion.Paginacion import leerPagina, PaginaInvalidaError
+from datetime import datetime, time
 
 regiscitaapi = Blueprint('regiscitaapi', __name__)
 
@@ -76,11 +78,22 @@ def listarAgendas():
 def RegistrosC():
     registrocdao = RegistroCDao()
     try:
+        # ?stream=ndjson|json envia el listado por partes sin cargarlo entero en memoria
+        formato = formatoStream()
+        if formato:
+            return respuestaStream(registrocdao.iterRegistrosC(), formato)
+        # ?limit=&cursor= pagina por clave; sin ellos se retorna el listado completo
+        pagina = leerPagina()
+        if pagina:
+            resultado = registrocdao.getRegistrosCPagina(*pagina)
+            return jsonify({'success': True, 'data': resultado['data'], 'paginacion': resultado['paginacion'], 'error': None}), 200
         registrosc = registrocdao.getRegistrosC()
         for registro in registrosc:
             if 'hora' in registro and isinstance(registro['hora'], time):
                 registro['hora'] = serialize_time(registro['hora'])
         return jsonify({'success': True, 'data': registrosc, 'error': None}), 200
+    except PaginaInvalidaError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         app.logger.error(f"Error al obtener todas los registros: {str(e)}")
         return jsonify({'success': False, 'error': 'Ocurrió un error interno al consultar las citas.'}), 500
@@ -198,6 +211,9 @@ def updateRegistroC(cita_id):
             id_agenda
         )
         
+        if exito == "DUPLICADO":
+            return jsonify({'success': False, 'error': 'Ya existe esta cita para el mismo médico, fecha y hora.'}), 409
+
         if exito == "SIN_CUPOS":
             return jsonify({'success': False, 'error': 'No hay cupos disponibles en esta agenda.'}), 409
             
@@ -242,4 +258,67 @@ def deleteRegistroC(cita_id):
             return jsonify({'success': False, 'error': f'No se encontró el registro con el ID {cita_id} o no se pudo eliminar.'}), 404
     except Exception as e:
         app.logger.error(f"Error al eliminar registro con ID {cita_id}: {str(e)}")
-        return jsonify({'success': False, 'error': 'Ocurrió un error interno al eliminar el registro.'}), 500
\ No newline at end of file
+        return jsonify({'success': False, 'error': 'Ocurrió un error interno al eliminar el registro.'}), 500
+
+# ------------------------
+# Operaciones por lote sobre el dia de un medico
+# ------------------------
+def _fechaDelCuerpo(data, campo):
+    """date del campo YYYY-MM-DD; lanza ValueError con el mensaje para el cliente."""
+    try:
+        return datetime.strptime(str(data[campo]), '%Y-%m-%d').date()
+    except (KeyError, ValueError):
+        raise ValueError(f'El campo {campo} es obligatorio y debe tener el formato YYYY-MM-DD.')
+
+@regiscitaapi.route('/registroc/medico/<int:id_medico>/cancelar', methods=['POST'])
+def cancelarCitasMedico(id_medico):
+    """{"desde": "2026-01-05", "hasta": "2026-01-05", "id_estado": 14}; hasta e id_estado opcionales."""
+    data = request.get_json() or {}
+    try:
+        desde = _fechaDelCuerpo(data, 'desde')
+        hasta = _fechaDelCuerpo(data, 'hasta') if data.get('hasta') else desde
+    except ValueError as ve:
+        return jsonify({'success': False, 'error': str(ve)}), 400
+    if hasta < desde:
+        return jsonify({'success': False, 'error': 'La fecha hasta no puede ser anterior a desde.'}), 400
+    registrocdao = RegistroCDao()
+    try:
+        id_estado = int(data.get('id_estado') or 14)
+    except (TypeError, ValueError):
+        id_estado = None
+    if not registrocdao.estado_es_cancelado(id_estado):
+        return jsonify({'success': False, 'error': 'El estado debe ser Cancelado o No Asistió.'}), 400
+
+    citas = registrocdao.cancelarCitasMedico(id_medico, desde, hasta, id_estado)
+    if citas is None:
+        return jsonify({'success': False, 'error': 'Ocurrió un error interno al cancelar las citas.'}), 500
+    return jsonify({'success': True, 'data': {'canceladas': len(citas), 'citas': citas}, 'error': None}), 200
+
+@regiscitaapi.route('/registroc/medico/<int:id_medico>/mover', methods=['POST'])
+def moverCitasMedico(id_medico):
+    """{"fecha": "2026-01-05", "fecha_destino": "2026-01-07", "id_agenda_medica": 12, "id_medico_destino": 3}
+
+        Mueve las citas activas del dia a la misma hora de otra fecha (y
+        opcionalmente de otro medico), en la agenda indicada.
+    """
+    data = request.get_json() or {}
+    try:
+        fecha = _fechaDelCuerpo(data, 'fecha')
+        fecha_destino = _fechaDelCuerpo(data, 'fecha_destino')
+    except ValueError as ve:
+        return jsonify({'success': False, 'error': str(ve)}), 400
+    try:
+        id_agenda = int(data['id_agenda_medica'])
+        id_medico_destino = int(data['id_medico_destino']) if data.get('id_medico_destino') else id_medico
+    except (KeyError, TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'Los campos id_agenda_medica e id_medico_destino deben ser números enteros (id_agenda_medica es obligatorio).'}), 400
+    if fecha == fecha_destino and id_medico_destino == id_medico:
+        return jsonify({'success': False, 'error': 'El destino debe ser otra fecha u otro médico.'}), 400
+
+    citas = RegistroCDao().moverCitasMedico(id_medico, fecha, fecha_destino, id_agenda, id_medico_destino)
+    if citas is None:
+        return jsonify({'success': False, 'error': 'Ocurrió un error interno al mover las citas.'}), 500
+    return jsonify({'success': True, 'data': {
+        'movidas': sum(1 for c in citas if c['resultado'] == 'MOVIDA'),
+        'citas': citas,
+    }, 'error': None}), 200
@@ -1,5 +1,7 @@
 from flask import Blueprint, jsonify, request, current_app as app
 from app.dao.avisosRecordatorios.AvisosRecordatorioDao import AvisoRecordatorioDao
+from app.conexion.Streaming import formatoStream, respuestaStream
+from app.conexion.Paginacion import leerPagina, PaginaInvalidaError
 from app.Services.whatsapp_service import AvisoRecordatorioService, WhatsAppService
 import threading
 
@@ -15,8 +17,19 @@ dao = AvisoRecordatorioDao()
 @avisoapi.route('/avisos', methods=['GET'])
 def listar_avisos():
     try:
+        # ?stream=ndjson|json envia el listado por partes sin cargarlo entero en memoria
+        formato = formatoStream()
+        if formato:
+            return respuestaStream(dao.iterAvisos(), formato)
+        # ?limit=&cursor= pagina por clave; sin ellos se retorna el listado completo
+        pagina = leerPagina()
+        if pagina:
+            resultado = dao.getAvisosPagina(*pagina)
+            return jsonify(success=True, data=resultado['data'], paginacion=resultado['paginacion'])
         avisos = dao.getAvisos()
         return jsonify(success=True, data=avisos)
+    except PaginaInvalidaError as e:
+        return jsonify(success=False, error=str(e)), 400
     except Exception as e:
         app.logger.error(f"Error en listar_avisos: {e}")
         return jsonify(success=False, error=str(e))
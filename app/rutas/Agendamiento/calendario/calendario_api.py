@@ -0,0 +1,70 @@
+import calendar
+import hashlib
+import json
+from flask import Blueprint, jsonify, request, current_app as app
+from datetime import date, datetime, timedelta
+from app.dao.AgendMedica.CalendarioDao import CalendarioDao
+
+calendarioapi = Blueprint('calendarioapi', __name__)
+
+# ventana maxima con desde/hasta explicitos
+CALENDARIO_DIAS_MAXIMO = 62
+
+
+def periodoDeVista(vista, referencia):
+    """(desde, hasta) de la semana (lunes a domingo) o del mes que contiene `referencia`."""
+    if vista == 'mes':
+        ultimo = calendar.monthrange(referencia.year, referencia.month)[1]
+        return referencia.replace(day=1), referencia.replace(day=ultimo)
+    lunes = referencia - timedelta(days=referencia.weekday())
+    return lunes, lunes + timedelta(days=6)
+
+
+# ==============================
+#   Calendario de un médico: ?vista=semana|mes&desde=YYYY-MM-DD[&hasta=YYYY-MM-DD]
+#   Sin hasta: la semana o el mes que contiene `desde` (hoy por defecto).
+#   ETag del contenido: If-None-Match -> 304
+# ==============================
+@calendarioapi.route('/calendario/medico/<int:id_medico>', methods=['GET'])
+def getCalendarioMedico(id_medico):
+    vista = request.args.get('vista', 'semana')
+    if vista not in ('semana', 'mes'):
+        return jsonify(success=False, error="El parámetro vista debe ser semana o mes"), 400
+    try:
+        desde = datetime.strptime(request.args['desde'], '%Y-%m-%d').date() if request.args.get('desde') else date.today()
+        hasta = datetime.strptime(request.args['hasta'], '%Y-%m-%d').date() if request.args.get('hasta') else None
+    except ValueError:
+        return jsonify(success=False, error="Formato de fecha inválido. Use YYYY-MM-DD"), 400
+    if hasta is None:
+        desde, hasta = periodoDeVista(vista, desde)
+    elif hasta < desde:
+        return jsonify(success=False, error="La fecha hasta no puede ser anterior a desde"), 400
+    elif (hasta - desde).days >= CALENDARIO_DIAS_MAXIMO:
+        return jsonify(success=False, error=f"El periodo no puede superar los {CALENDARIO_DIAS_MAXIMO} días"), 400
+
+    try:
+        secciones = CalendarioDao().getCalendarioMedico(id_medico, desde, hasta)
+    except Exception as e:
+        app.logger.error(f"Error al obtener el calendario del médico {id_medico}: {str(e)}")
+        return jsonify(success=False,
+                       error="Ocurrió un error interno al obtener el calendario."), 500
+
+    data = {
+        'id_medico': id_medico,
+        'vista': vista,
+        'desde': desde.isoformat(),
+        'hasta': hasta.isoformat(),
+        **secciones,
+    }
+    # cita y disponibilidad_horaria no tienen version (sql/03_versiones_tablas.sql):
+    # el ETag sale del contenido y ahorra el envio, no la consulta
+    cuerpo = json.dumps({'success': True, 'data': data, 'error': None},
+                        ensure_ascii=False, separators=(',', ':'))
+    etag = hashlib.sha1(cuerpo.encode('utf-8')).hexdigest()[:32]
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(cuerpo, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
@@ -1,5 +1,7 @@
 from flask import Blueprint, jsonify, request, current_app as app, make_response
 from app.dao.ficha_medica.FichaMedicaDao import FichaMedicaDao
+from app.conexion.Streaming import formatoStream, respuestaStream
+from app.conexion.Paginacion import leerPagina, PaginaInvalidaError
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
 from reportlab.lib import colors
@@ -121,8 +123,19 @@ def getFichaPDF(id_ficha):
 def getFichas():
     dao = FichaMedicaDao()
     try:
+        # ?stream=ndjson|json envia el listado por partes sin cargarlo entero en memoria
+        formato = formatoStream()
+        if formato:
+            return respuestaStream(dao.iterFichas(), formato)
+        # ?limit=&cursor= pagina por clave; sin ellos se retorna el listado completo
+        pagina = leerPagina()
+        if pagina:
+            resultado = dao.getFichasPagina(*pagina)
+            return jsonify(success=True, data=resultado['data'], paginacion=resultado['paginacion'], error=None), 200
         fichas = dao.getFichas()
         return jsonify(success=True, data=fichas, error=None), 200
+    except PaginaInvalidaError as e:
+        return jsonify(success=False, error=str(e)), 400
     except Exception as e:
         app.logger.error(f"Error al obtener fichas médicas: {str(e)}")
         return jsonify(success=False, error="Error interno al consultar fichas médicas."), 500
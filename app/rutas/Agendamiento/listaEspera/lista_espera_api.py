@@ -0,0 +1,86 @@
+from flask import Blueprint, jsonify, request, current_app as app
+from datetime import datetime
+from app.dao.RegisCita.ListaEsperaDao import ListaEsperaDao, PRIORIDAD_POR_DEFECTO
+
+listaesperaapi = Blueprint('listaesperaapi', __name__)
+
+# Cuando la oferta no se puede tomar aceptarOferta devuelve la espera a
+# EN_ESPERA y ofrece la hora al siguiente: esos resultados se responden 200
+# (con success=False) porque la sesion del request solo confirma las
+# respuestas < 400 y con un 409 se desharian esos cambios.
+MENSAJES_ACEPTAR = {
+    'SIN_OFERTA': ('La espera no tiene una oferta pendiente.', 404),
+    'OFERTA_ANULADA': ('La cita ofrecida ya no existe; el paciente vuelve a la lista de espera.', 200),
+    'DUPLICADO': ('La hora ofrecida ya fue tomada; el paciente vuelve a la lista de espera.', 200),
+    'SIN_CUPOS': ('No hay cupos disponibles en esta agenda; el paciente vuelve a la lista de espera.', 200),
+    'FUERA_DE_HORARIO': ('La hora ofrecida ya no está dentro de la disponibilidad del médico; '
+                         'el paciente vuelve a la lista de espera.', 200),
+}
+
+
+# ==============================
+#   Cola de una especialidad y fecha: ?id_especialidad=2&fecha=YYYY-MM-DD
+# ==============================
+@listaesperaapi.route('/lista-espera', methods=['GET'])
+def getListaEspera():
+    try:
+        id_especialidad = int(request.args['id_especialidad'])
+        fecha = datetime.strptime(request.args['fecha'], '%Y-%m-%d').date()
+    except (KeyError, ValueError):
+        return jsonify(success=False, error="id_especialidad y fecha (YYYY-MM-DD) son obligatorios"), 400
+    cola = ListaEsperaDao().getCola(id_especialidad, fecha)
+    if cola is None:
+        return jsonify(success=False, error="Ocurrió un error interno al obtener la lista de espera."), 500
+    return jsonify(success=True, data=cola, error=None), 200
+
+
+# ==============================
+#   Agregar: {"id_paciente", "id_especialidad", "fecha", "id_medico"?, "prioridad"? (1 = más urgente)}
+# ==============================
+@listaesperaapi.route('/lista-espera', methods=['POST'])
+def addListaEspera():
+    data = request.get_json() or {}
+    try:
+        id_paciente = int(data['id_paciente'])
+        id_especialidad = int(data['id_especialidad'])
+        fecha = datetime.strptime(str(data['fecha']), '%Y-%m-%d').date()
+        id_medico = int(data['id_medico']) if data.get('id_medico') else None
+        prioridad = int(data.get('prioridad') or PRIORIDAD_POR_DEFECTO)
+    except (KeyError, TypeError, ValueError):
+        return jsonify(success=False,
+                       error="id_paciente, id_especialidad y fecha (YYYY-MM-DD) son obligatorios"), 400
+    if prioridad < 1:
+        return jsonify(success=False, error="La prioridad debe ser 1 o mayor"), 400
+
+    id_espera = ListaEsperaDao().agregar(id_paciente, id_especialidad, fecha, id_medico, prioridad)
+    if id_espera == "DUPLICADO":
+        return jsonify(success=False, error="El paciente ya está en la lista de espera de ese día."), 409
+    if id_espera is None:
+        return jsonify(success=False, error="Ocurrió un error interno al agregar a la lista de espera."), 500
+    return jsonify(success=True, data={'id_espera': id_espera, 'id_paciente': id_paciente,
+                                       'id_especialidad': id_especialidad, 'id_medico': id_medico,
+                                       'fecha': fecha.isoformat(), 'prioridad': prioridad},
+                   error=None), 201
+
+
+@listaesperaapi.route('/lista-espera/<int:id_espera>', methods=['DELETE'])
+def deleteListaEspera(id_espera):
+    if ListaEsperaDao().retirar(id_espera):
+        return jsonify(success=True, mensaje=f"Espera {id_espera} retirada correctamente.", error=None), 200
+    return jsonify(success=False, error=f"No se encontró una espera pendiente con el ID {id_espera}."), 404
+
+
+# ==============================
+#   El paciente acepta la hora que se le ofreció: se reserva la cita
+# ==============================
+@listaesperaapi.route('/lista-espera/<int:id_espera>/aceptar', methods=['POST'])
+def aceptarListaEspera(id_espera):
+    resultado = ListaEsperaDao().aceptarOferta(id_espera)
+    if resultado in MENSAJES_ACEPTAR:
+        mensaje, estado = MENSAJES_ACEPTAR[resultado]
+        return jsonify(success=False, data={'id_espera': id_espera, 'resultado': resultado},
+                       error=mensaje), estado
+    if resultado is None:
+        app.logger.error(f"No se pudo aceptar la oferta de la espera {id_espera}")
+        return jsonify(success=False, error="Ocurrió un error interno al reservar la cita."), 500
+    return jsonify(success=True, data={'id_espera': id_espera, 'id_cita': resultado}, error=None), 201
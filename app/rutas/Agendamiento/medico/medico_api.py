@@ -1,5 +1,6 @@
 from flask import Blueprint, jsonify, request, current_app as app
 from app.dao.medico.MedicoDao import MedicoDao
+from app.conexion.Condicional import condicional
 
 medicoapi = Blueprint('medicoapi', __name__) 
 
@@ -8,6 +9,7 @@ medicoapi = Blueprint('medicoapi', __name__)
 #   Obtener todos los médicos
 # ==============================
 @medicoapi.route('/medico', methods=['GET'])
+@condicional('medico', 'especialidad', 'ciudad')
 def getMedicos():
     medicodao = MedicoDao()
     try:
@@ -25,6 +27,7 @@ def getMedicos():
 #   Obtener médico por ID
 # ==============================
 @medicoapi.route('/medico/<int:medico_id>', methods=['GET'])
+@condicional('medico', 'especialidad', 'ciudad')
 def getMedico(medico_id):
     medicodao = MedicoDao()
     try:
@@ -63,19 +66,19 @@ def addMedico():
             }), 400
 
     try:
-        # Validación de duplicados
-        if medicodao.existeDuplicado(data['cedula'], data['num_registro']):
-            return jsonify({
-                'success': False,
-                'error': 'El médico ya está registrado.'
-            }), 409
-
         medico_id = medicodao.guardarMedico(
             data['nombre'], data['apellido'], data['id_especialidad'], data['num_registro'],
             data['cedula'], data['fecha_nacimiento'], data['fecha_registro'],
             data['telefono'], data['direccion'], data['correo'], data['id_ciudad']
         )
 
+        # Validación de duplicados: cedula y num_registro tienen indice unico
+        if medico_id is None:
+            return jsonify({
+                'success': False,
+                'error': 'El médico ya está registrado.'
+            }), 409
+
         if medico_id:
             app.logger.info(f"Médico creado con ID {medico_id}.")
             return jsonify({
@@ -123,6 +126,12 @@ def updateMedico(medico_id):
             data['telefono'], data['direccion'], data['correo'], data['id_ciudad']
         )
 
+        if actualizado is None:
+            return jsonify({
+                'success': False,
+                'error': 'Ya existe otro médico con esa cédula o número de registro.'
+            }), 409
+
         if actualizado:
             app.logger.info(f"Médico con ID {medico_id} actualizado exitosamente.")
             return jsonify({
@@ -62,19 +62,19 @@ def addPersonal():
             }), 400
 
     try:
-        # Validación de duplicados
-        if personaldao.existeDuplicado(data['cedula'], data['correo']):
-            return jsonify({
-                'success': False,
-                'error': 'El personal ya está registrado.'
-            }), 409
-
         personal_id = personaldao.guardarPersonal(
             data['nombre'], data['apellido'], data['cedula'], data['fecha_nacimiento'],
             data['telefono'], data['direccion'], data['correo'],
             data['id_ciudad'], data['id_cargo'], data['fecha_registro']
         )
 
+        # Validación de duplicados: cedula y correo tienen indice unico
+        if personal_id is None:
+            return jsonify({
+                'success': False,
+                'error': 'El personal ya está registrado.'
+            }), 409
+
         if personal_id:
             app.logger.info(f"Personal creado con ID {personal_id}.")
             return jsonify({
@@ -121,6 +121,12 @@ def updatePersonal(personal_id):
             data['fecha_registro']
         )
 
+        if actualizado is None:
+            return jsonify({
+                'success': False,
+                'error': 'Ya existe otro personal con esa cédula o correo.'
+            }), 409
+
         if actualizado:
             app.logger.info(f"Personal con ID {personal_id} actualizado exitosamente.")
             return jsonify({
@@ -1,5 +1,7 @@
 from flask import Blueprint, jsonify, request, current_app as app
 from app.dao.RegisPaciente.RegistroPDao import PacienteDao
+from app.conexion.Paginacion import leerPagina, PaginaInvalidaError
+from app.conexion.Condicional import condicional
 pacienteapi = Blueprint('pacienteapi', __name__) 
 
 
@@ -7,11 +9,19 @@ pacienteapi = Blueprint('pacienteapi', __name__)
 #   Obtener todos los pacientes
 # ==============================
 @pacienteapi.route('/paciente', methods=['GET'])
+@condicional('paciente', 'ciudad')
 def getPacientes():
     pacientedao = PacienteDao()
     try:
+        # ?limit=&cursor= pagina por clave; sin ellos se retorna el listado completo
+        pagina = leerPagina()
+        if pagina:
+            resultado = pacientedao.getPacientesPagina(*pagina)
+            return jsonify({'success': True, 'data': resultado['data'], 'paginacion': resultado['paginacion'], 'error': None}), 200
         pacientes = pacientedao.getPacientes()
         return jsonify({'success': True, 'data': pacientes, 'error': None}), 200
+    except PaginaInvalidaError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         app.logger.error(f"Error al obtener todos los pacientes: {str(e)}")
         return jsonify({
@@ -24,6 +34,7 @@ def getPacientes():
 #   Obtener paciente por ID
 # ==============================
 @pacienteapi.route('/paciente/<int:paciente_id>', methods=['GET'])
+@condicional('paciente', 'ciudad')
 def getPaciente(paciente_id):
     pacientedao = PacienteDao()
     try:
@@ -68,6 +79,12 @@ def addPaciente():
             data.get('correo'), data['id_ciudad']
         )
 
+        # cedula_entidad tiene indice unico: el duplicado vuelve como None
+        if paciente_id is None:
+            return jsonify({
+                'success': False,
+                'error': 'El paciente ya está registrado con esa cédula.'
+            }), 409
         if paciente_id:
             return jsonify({
                 'success': True,
@@ -84,19 +101,19 @@ def addPaciente():
         return jsonify({'success': False, 'error': 'Error interno.'}), 500
 
     try:
-        # Validación de duplicados (cédula)
-        if pacientedao.existeDuplicado(data['cedula_entidad']):
-            return jsonify({
-                'success': False,
-                'error': 'El paciente ya está registrado con esa cédula.'
-            }), 409
-
         paciente_id = pacientedao.guardarPaciente(
             data['nombre'], data['apellido'], data['cedula_entidad'],
             data['fecha_nacimiento'], data['fecha_registro'],
             data['telefono'], data['direccion'], data['correo'], data['id_ciudad']
         )
 
+        # Validación de duplicados (cédula)
+        if paciente_id is None:
+            return jsonify({
+                'success': False,
+                'error': 'El paciente ya está registrado con esa cédula.'
+            }), 409
+
         if paciente_id:
             app.logger.info(f"Paciente creado con ID {paciente_id}.")
             return jsonify({
@@ -144,6 +161,12 @@ def updatePaciente(paciente_id):
             data['telefono'], data['direccion'], data['correo'], data['id_ciudad']
         )
 
+        if actualizado is None:
+            return jsonify({
+                'success': False,
+                'error': 'Ya existe otro paciente con esa cédula.'
+            }), 409
+
         if actualizado:
             app.logger.info(f"Paciente con ID {paciente_id} actualizado exitosamente.")
             return jsonify({
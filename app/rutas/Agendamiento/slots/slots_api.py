@@ -0,0 +1,140 @@
+from flask import Blueprint, jsonify, request, current_app as app
+from datetime import date, datetime, timedelta
+from app.dao.AgendMedica.SlotsDao import SlotsDao, CONFIG_SLOTS, duracionEnMinutos, horaDeMinutos
+from app.dao.AgendMedica.IndiceSlots import indiceSlots
+from app.dao.referenciales.Catalogo import CATALOGO
+from app.dao.referenciales.ReferencialDao import ReferencialDao
+
+slotsapi = Blueprint('slotsapi', __name__)
+
+
+def _fecha(nombre, defecto):
+    valor = request.args.get(nombre)
+    if not valor:
+        return defecto
+    return datetime.strptime(valor, '%Y-%m-%d').date()
+
+
+def periodoYDuracion():
+    """((desde, hasta, duracion), None, None) de los parametros del request.
+
+        Si son invalidos retorna (None, error, 400); si falla la lectura de
+        la duracion, (None, error, 500).
+
+        desde: hoy por defecto; hasta: 30 dias desde `desde`. La duracion se
+        toma de ?duracion=<minutos>, de ?id_duracion=<duracion_consulta> o de
+        CONFIG_SLOTS.
+    """
+    try:
+        desde = _fecha('desde', date.today())
+        hasta = _fecha('hasta', desde + timedelta(days=29))
+    except ValueError:
+        return None, "Formato de fecha inválido. Use YYYY-MM-DD", 400
+    if hasta < desde:
+        return None, "La fecha hasta no puede ser anterior a desde", 400
+    if (hasta - desde).days >= CONFIG_SLOTS['dias_maximo']:
+        return None, f"El periodo no puede superar los {CONFIG_SLOTS['dias_maximo']} días", 400
+
+    duracion = CONFIG_SLOTS['duracion']
+    if request.args.get('duracion'):
+        try:
+            duracion = int(request.args['duracion'])
+        except ValueError:
+            return None, "El parámetro duracion debe ser un número entero de minutos", 400
+    elif request.args.get('id_duracion'):
+        try:
+            registro = ReferencialDao(CATALOGO['duracion_consulta']).getPorId(int(request.args['id_duracion']))
+        except ValueError:
+            return None, "El parámetro id_duracion debe ser un número entero", 400
+        except Exception as e:
+            app.logger.error(f"Error al obtener la duración de consulta {request.args['id_duracion']}: {str(e)}")
+            return None, "Ocurrió un error interno al obtener la duración de consulta.", 500
+        duracion = duracionEnMinutos(registro['descripcion']) if registro else None
+        if duracion is None:
+            return None, "La duración de consulta indicada no existe o no tiene minutos", 400
+    if not 5 <= duracion <= 480:
+        return None, "La duración debe estar entre 5 y 480 minutos", 400
+    return (desde, hasta, duracion), None, None
+
+
+# ==============================
+#   Slots libres de un médico
+# ==============================
+@slotsapi.route('/slots', methods=['GET'])
+def getSlots():
+    id_medico = request.args.get('id_medico')
+    if not id_medico:
+        return jsonify(success=False, error="Falta el parámetro id_medico"), 400
+    try:
+        id_medico = int(id_medico)
+    except ValueError:
+        return jsonify(success=False, error="El parámetro id_medico debe ser un número entero"), 400
+
+    periodo, error, estado = periodoYDuracion()
+    if error:
+        return jsonify(success=False, error=error), estado
+    desde, hasta, duracion = periodo
+
+    dias = SlotsDao().getSlotsMedico(id_medico, desde, hasta, duracion)
+    if dias is None:
+        return jsonify(success=False,
+                       error="Ocurrió un error interno al calcular los horarios libres."), 500
+    return jsonify(success=True, data={
+        'id_medico': id_medico,
+        'desde': desde.isoformat(),
+        'hasta': hasta.isoformat(),
+        'duracion': duracion,
+        'total': sum(len(dia['slots']) for dia in dias),
+        'dias': dias,
+    }, error=None), 200
+
+
+# ==============================
+#   Primeros turnos libres de una especialidad
+# ==============================
+@slotsapi.route('/slots/primeros', methods=['GET'])
+def getPrimerosSlots():
+    filtros = {}
+    for nombre in ('id_especialidad', 'id_turno', 'codigo', 'cantidad'):
+        valor = request.args.get(nombre)
+        if not valor:
+            continue
+        try:
+            filtros[nombre] = int(valor)
+        except ValueError:
+            return jsonify(success=False, error=f"El parámetro {nombre} debe ser un número entero"), 400
+    if 'id_especialidad' not in filtros:
+        return jsonify(success=False, error="Falta el parámetro id_especialidad"), 400
+    cantidad = filtros.get('cantidad', 10)
+    if not 1 <= cantidad <= 100:
+        return jsonify(success=False, error="El parámetro cantidad debe estar entre 1 y 100"), 400
+
+    periodo, error, estado = periodoYDuracion()
+    if error:
+        return jsonify(success=False, error=error), estado
+    desde, hasta, duracion = periodo
+
+    try:
+        candidatos, nombres = SlotsDao().getCandidatos(
+            filtros['id_especialidad'], desde, hasta,
+            id_turno=filtros.get('id_turno'), codigo=filtros.get('codigo'))
+        primeros = indiceSlots.primerosLibres(candidatos, desde, hasta, duracion, cantidad)
+    except Exception as e:
+        app.logger.error(f"Error al buscar turnos libres de la especialidad {filtros['id_especialidad']}: {str(e)}")
+        return jsonify(success=False,
+                       error="Ocurrió un error interno al buscar los turnos libres."), 500
+
+    return jsonify(success=True, data={
+        'id_especialidad': filtros['id_especialidad'],
+        'duracion': duracion,
+        'slots': [
+            {
+                'fecha': fecha.isoformat(),
+                'hora_inicio': horaDeMinutos(minuto),
+                'hora_fin': horaDeMinutos(minuto + duracion),
+                'id_medico': id_medico,
+                'medico_nombre': nombres.get(id_medico),
+            }
+            for fecha, minuto, id_medico in primeros
+        ],
+    }, error=None), 200
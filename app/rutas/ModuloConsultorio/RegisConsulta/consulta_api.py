@@ -1,5 +1,7 @@
 from flask import Blueprint, jsonify, request, current_app as app, render_template
 from app.dao.ModuloConsultorio.RegisConsulta.ConsultasDao import ConsultasDao
+from app.conexion.Streaming import formatoStream, respuestaStream
+from app.conexion.Paginacion import leerPagina, PaginaInvalidaError
 import os
 from datetime import datetime
 
@@ -23,8 +25,15 @@ consultasapi = Blueprint(
 def getConsultasCabecera():
     dao = ConsultasDao()
     try:
+        # ?limit=&cursor= pagina por clave; sin ellos se retorna el listado completo
+        pagina = leerPagina()
+        if pagina:
+            resultado = dao.getConsultasCabeceraPagina(*pagina)
+            return jsonify(success=True, data=resultado['data'], paginacion=resultado['paginacion'], error=None), 200
         consultas = dao.getConsultasCabecera()
         return jsonify(success=True, data=consultas, error=None), 200
+    except PaginaInvalidaError as e:
+        return jsonify(success=False, error=str(e)), 400
     except Exception as e:
         app.logger.error(f"Error al obtener consultas cabecera: {str(e)}")
         return jsonify(success=False, error="Error interno al consultar consultas."), 500
@@ -155,6 +164,10 @@ def getConsultasDetalle():
 def getConsultasDetalleConInfo():
     dao = ConsultasDao()
     try:
+        # ?stream=ndjson|json envia el listado por partes sin cargarlo entero en memoria
+        formato = formatoStream()
+        if formato:
+            return respuestaStream(dao.iterConsultasDetalleConInfo(), formato)
         detalles = dao.getConsultasDetalleConInfo()
         return jsonify(success=True, data=detalles, error=None), 200
     except Exception as e:
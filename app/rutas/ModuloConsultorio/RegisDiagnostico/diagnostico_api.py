@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify, request, current_app as app
 from datetime import datetime
 from app.dao.ModuloConsultorio.RegisDiagnostico.RegDiagnosticoDao import DiagnosticoDao
+from app.conexion.Paginacion import leerPagina, PaginaInvalidaError
 Rdiagnosticoapi = Blueprint('Rdiagnosticoapi', __name__)
 
 # ==============================
@@ -10,8 +11,15 @@ Rdiagnosticoapi = Blueprint('Rdiagnosticoapi', __name__)
 def getDiagnosticos():
     diagnosticodao = DiagnosticoDao()
     try:
+        # ?limit=&cursor= pagina por clave; sin ellos se retorna el listado completo
+        pagina = leerPagina()
+        if pagina:
+            resultado = diagnosticodao.getDiagnosticosPagina(*pagina)
+            return jsonify({'success': True, 'data': resultado['data'], 'paginacion': resultado['paginacion'], 'error': None}), 200
         diagnosticos = diagnosticodao.getDiagnosticos()
         return jsonify({'success': True, 'data': diagnosticos, 'error': None}), 200
+    except PaginaInvalidaError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         app.logger.error(f"Error al obtener diagnósticos: {str(e)}")
         return jsonify(success=False,
@@ -1,5 +1,6 @@
 from flask import Blueprint, jsonify, request, current_app as app
 from app.dao.ModuloConsultorio.RegisTratamiento.RegisTratamientoDAO import TratamientoDao
+from app.conexion.Paginacion import leerPagina, PaginaInvalidaError
 
 tratamientoapi = Blueprint('tratamientoapi', __name__)
 
@@ -10,8 +11,15 @@ tratamientoapi = Blueprint('tratamientoapi', __name__)
 def getTratamientos():
     tratamientodao = TratamientoDao()
     try:
+        # ?limit=&cursor= pagina por clave; sin ellos se retorna el listado completo
+        pagina = leerPagina()
+        if pagina:
+            resultado = tratamientodao.getTratamientosPagina(*pagina)
+            return jsonify({'success': True, 'data': resultado['data'], 'paginacion': resultado['paginacion'], 'error': None}), 200
         tratamientos = tratamientodao.getTratamientos()
         return jsonify({'success': True, 'data': tratamientos, 'error': None}), 200
+    except PaginaInvalidaError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         app.logger.error(f"Error al obtener tratamientos: {str(e)}")
         return jsonify(success=False,
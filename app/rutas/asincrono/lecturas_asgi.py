@@ -0,0 +1,176 @@
+import asyncio
+from datetime import datetime
+from urllib.parse import parse_qsl
+from asgiref.wsgi import WsgiToAsgi
+from werkzeug.datastructures import MultiDict
+from app.conexion.ConexionAsync import getPoolAsync, cerrarPoolAsync, presupuestoAsync
+from app.conexion.Presupuesto import (PRESUPUESTOS, FilasExcedidasError, estadisticasPresupuesto,
+                                      presupuestoDeEndpoint, respuestaExceso)
+from app.conexion.Paginacion import leerPagina, PaginaInvalidaError
+from app.dao.asincrono.LecturasAsyncDao import LecturasAsyncDao
+
+VERSION1 = '/api/v1'
+
+dao = LecturasAsyncDao()
+
+
+class AplicacionAsgi:
+
+    """Aplicacion ASGI que atiende en el event loop los listados de solo lectura
+        mas consultados (LecturasAsyncDao) y pasa todo lo demas a Flask.
+
+        Cada consulta en curso solo ocupa una conexion del pool de asyncpg,
+        no un hilo, asi un proceso mantiene cientos de lecturas en vuelo.
+        Las vistas reciben los argumentos del query string y retornan
+        (cuerpo, estado); el cuerpo se serializa con el proveedor JSON de
+        Flask para que la respuesta sea igual a la de jsonify.
+
+        Cada lectura corre con el presupuesto de su endpoint de Flask
+        (statement_timeout y max_filas, Presupuesto.py) y responde 503/413
+        igual que Flask. Diferencias con Flask: las lecturas van siempre al
+        primario (el pool de asyncpg no pasa por app.conexion.Replica) y no
+        hay GET condicional; por eso /agenda, que tiene @condicional y se
+        revalida con un 304, no esta aca y la sigue atendiendo Flask.
+    """
+    def __init__(self, flask_app):
+        self.flask = flask_app
+        self.wsgi = WsgiToAsgi(flask_app)
+        self.rutas = {}
+        self._presupuestos = {}     # camino -> presupuesto de su endpoint en Flask
+
+    def ruta(self, camino):
+        def registrar(vista):
+            self.rutas[VERSION1 + camino] = vista
+            return vista
+        return registrar
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._cicloDeVida(receive, send)
+        if scope['type'] == 'http' and scope['method'] == 'GET':
+            vista = self.rutas.get(scope['path'].rstrip('/'))
+            args = MultiDict(parse_qsl(scope['query_string'].decode('latin-1'), keep_blank_values=True))
+            # ?stream= sigue en Flask (cursor con nombre de psycopg2)
+            if vista is not None and 'stream' not in args:
+                return await self._atender(vista, args, send, scope['path'].rstrip('/'))
+        return await self.wsgi(scope, receive, send)
+
+    async def _cicloDeVida(self, receive, send):
+        while True:
+            mensaje = await receive()
+            if mensaje['type'] == 'lifespan.startup':
+                try:
+                    await getPoolAsync()
+                except Exception as e:
+                    # sin base al arrancar: el pool se vuelve a intentar en la primera lectura
+                    self.flask.logger.error(f"No se pudo crear el pool async: {str(e)}")
+                await send({'type': 'lifespan.startup.complete'})
+            elif mensaje['type'] == 'lifespan.shutdown':
+                await cerrarPoolAsync()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def _presupuestoDe(self, camino):
+        """(endpoint, presupuesto) de la ruta de Flask que atiende `camino`."""
+        resultado = self._presupuestos.get(camino)
+        if resultado is None:
+            try:
+                endpoint, _ = self.flask.url_map.bind('').match(camino, method='GET')
+            except Exception:
+                endpoint = None
+            tabla = self.flask.extensions.get('presupuestos_bd', PRESUPUESTOS)
+            resultado = self._presupuestos[camino] = (endpoint, presupuestoDeEndpoint(tabla, endpoint))
+        return resultado
+
+    async def _atender(self, vista, args, send, camino):
+        endpoint, presupuesto = self._presupuestoDe(camino)
+        encabezados = {}
+        # contexto de aplicacion por tarea: current_app y app.logger funcionan en los DAO
+        with self.flask.app_context():
+            token = presupuestoAsync.set(presupuesto)
+            try:
+                cuerpo, estado = await vista(args)
+            except PaginaInvalidaError as e:
+                cuerpo, estado = {'success': False, 'error': str(e)}, 400
+            except (asyncio.TimeoutError, FilasExcedidasError) as e:
+                tipo = 'max_filas' if isinstance(e, FilasExcedidasError) else 'statement_timeout'
+                estadisticasPresupuesto.contar(endpoint, tipo)
+                self.flask.logger.warning(f"Presupuesto de BD excedido en {endpoint} ({tipo}): {str(e)}")
+                cuerpo, estado, encabezados = respuestaExceso(tipo, presupuesto)
+            except Exception as e:
+                self.flask.logger.error(f"Error en la lectura async {vista.__name__}: {str(e)}")
+                cuerpo, estado = {
+                    'success': False,
+                    'error': 'Ocurrió un error interno. Consulte con el administrador.'
+                }, 500
+            finally:
+                presupuestoAsync.reset(token)
+            datos = (self.flask.json.dumps(cuerpo) + "\n").encode()
+        await send({
+            'type': 'http.response.start',
+            'status': estado,
+            'headers': [
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(datos)).encode()),
+                *((nombre.lower().encode(), valor.encode()) for nombre, valor in encabezados.items()),
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': datos})
+
+
+def _ok(datos, **extra):
+    return {'success': True, 'data': datos, **extra, 'error': None}, 200
+
+
+def crearAplicacionAsgi(flask_app):
+    aplicacion = AplicacionAsgi(flask_app)
+
+    # ==============================
+    #   Disponibilidades de un medico en una fecha (/agenda/disponibilidad)
+    # ==============================
+    @aplicacion.ruta('/agenda/disponibilidad')
+    async def disponibilidadMedico(args):
+        id_medico = args.get('id_medico')
+        fecha = args.get('fecha')
+        if not id_medico or not fecha:
+            return {'success': False, 'error': "Faltan parámetros id_medico o fecha"}, 400
+        try:
+            id_medico = int(id_medico)
+        except ValueError:
+            return {'success': False, 'error': "El parámetro id_medico debe ser un número entero"}, 400
+        try:
+            fecha_obj = datetime.strptime(fecha, '%Y-%m-%d').date()
+        except ValueError:
+            return {'success': False, 'error': "Formato de fecha inválido. Use YYYY-MM-DD"}, 400
+        return _ok(await dao.getDisponibilidadesPorMedicoFecha(id_medico, fecha_obj))
+
+    # ==============================
+    #   Disponibilidades (/disponibilidades)
+    # ==============================
+    @aplicacion.ruta('/disponibilidades')
+    async def getDisponibilidades(args):
+        return _ok(await dao.getDisponibilidades())
+
+    # ==============================
+    #   Citas (/registroc), completo o paginado
+    # ==============================
+    @aplicacion.ruta('/registroc')
+    async def getRegistrosC(args):
+        pagina = leerPagina(args)
+        if pagina:
+            resultado = await dao.getRegistrosCPagina(*pagina)
+            return _ok(resultado['data'], paginacion=resultado['paginacion'])
+        return _ok(await dao.getRegistrosC())
+
+    # ==============================
+    #   Avisos (/avisos), completo o paginado
+    # ==============================
+    @aplicacion.ruta('/avisos')
+    async def getAvisos(args):
+        pagina = leerPagina(args)
+        if pagina:
+            resultado = await dao.getAvisosPagina(*pagina)
+            return _ok(resultado['data'], paginacion=resultado['paginacion'])
+        return _ok(await dao.getAvisos())
+
+    return aplicacion
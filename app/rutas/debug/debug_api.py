@@ -0,0 +1,97 @@
+from flask import Blueprint, request, jsonify, current_app as app
+from app.conexion.Conexion import getPool
+from app.conexion.Rastreador import rastreador
+from app.conexion.Replica import enrutadorReplica
+from app.conexion.Sentencias import sentencias
+from app.conexion.Presupuesto import PRESUPUESTO_DEFECTO, estadisticasPresupuesto
+from app.conexion.Notificaciones import escuchaActual
+from app.dao.referenciales.ReferencialDao import cacheReferenciales
+from app.dao.AgendMedica.IndiceSlots import indiceSlots
+
+debugapi = Blueprint('debugapi', __name__)
+
+# ===============================
+# Estado del pool y conexiones/cursores sin cerrar
+# Solo disponible con app.debug o DEBUG_BD=True
+# ===============================
+@debugapi.route('/debug/conexiones', methods=['GET'])
+def getConexionesAbiertas():
+    if not (app.debug or app.config.get('DEBUG_BD')):
+        return jsonify({
+            'success': False,
+            'error': 'Recurso no disponible.'
+        }), 404
+    try:
+        antiguedad = float(request.args.get('antiguedad', 0))
+        return jsonify({
+            'success': True,
+            'data': {
+                'pool': getPool().getEstadisticas(),
+                'replica': enrutadorReplica.getEstadisticas(),
+                'rastreo': rastreador.getResumen(),
+                'abiertos': rastreador.getAbiertos(antiguedad_min=antiguedad)
+            },
+            'error': None
+        }), 200
+    except Exception as e:
+        app.logger.error(f"Error al obtener el estado de las conexiones: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Ocurrió un error interno. Consulte con el administrador.'
+        }), 500
+
+# ===============================
+# Uso de las sentencias preparadas
+# ===============================
+@debugapi.route('/debug/sentencias', methods=['GET'])
+def getSentenciasPreparadas():
+    if not (app.debug or app.config.get('DEBUG_BD')):
+        return jsonify({
+            'success': False,
+            'error': 'Recurso no disponible.'
+        }), 404
+    return jsonify({
+        'success': True,
+        'data': sentencias.getEstadisticas(),
+        'error': None
+    }), 200
+
+# ===============================
+# Presupuestos de BD configurados y excesos por endpoint
+# ===============================
+@debugapi.route('/debug/presupuestos', methods=['GET'])
+def getPresupuestos():
+    if not (app.debug or app.config.get('DEBUG_BD')):
+        return jsonify({
+            'success': False,
+            'error': 'Recurso no disponible.'
+        }), 404
+    return jsonify({
+        'success': True,
+        'data': {
+            'defecto': PRESUPUESTO_DEFECTO,
+            'presupuestos': app.extensions.get('presupuestos_bd', {}),
+            'excesos': estadisticasPresupuesto.getEstadisticas()
+        },
+        'error': None
+    }), 200
+
+# ===============================
+# Aciertos y fallos de la cache de tablas referenciales y del indice de slots
+# ===============================
+@debugapi.route('/debug/cache', methods=['GET'])
+def getCacheReferenciales():
+    if not (app.debug or app.config.get('DEBUG_BD')):
+        return jsonify({
+            'success': False,
+            'error': 'Recurso no disponible.'
+        }), 404
+    return jsonify({
+        'success': True,
+        'data': {
+            'cache': cacheReferenciales.getEstadisticas(),
+            'slots': indiceSlots.getEstadisticas(),
+            'escucha': escuchaActual().getEstadisticas() if escuchaActual() else None
+        },
+        'error': None
+    }), 200
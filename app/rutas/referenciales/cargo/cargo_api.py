@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify, current_app as app
 import re
 from app.dao.referenciales.cargo.CargoDao import CargoDao
+from app.conexion.Condicional import condicional
 
 cargoapi = Blueprint('cargoapi', __name__)
 
@@ -17,6 +18,7 @@ def validar_descripcion(texto):
 # Trae todos los cargos
 # ===============================
 @cargoapi.route('/cargos', methods=['GET'])
+@condicional('cargo')
 def getCargos():
     cargodao = CargoDao()
     try:
@@ -38,6 +40,7 @@ def getCargos():
 # Trae un cargo por ID
 # ===============================
 @cargoapi.route('/cargos/<int:cargo_id>', methods=['GET'])
+@condicional('cargo')
 def getCargo(cargo_id):
     cargodao = CargoDao()
     try:
@@ -94,14 +97,13 @@ def addCargo():
                 'error': 'La descripción solo puede contener letras, números y espacios.'
             }), 400
 
-        # Validar duplicados
-        if cargodao.existeDescripcion(descripcion):
+        # Validar duplicados: los rechaza el indice unico, guardarCargo devuelve None
+        cargo_id = cargodao.guardarCargo(descripcion)
+        if cargo_id is None:
             return jsonify({
                 'success': False,
                 'error': 'Ya existe un cargo con esa descripción.'
             }), 409
-
-        cargo_id = cargodao.guardarCargo(descripcion)
         if cargo_id:
             return jsonify({
                 'success': True,
@@ -156,14 +158,13 @@ def updateCargo(cargo_id):
                 'error': 'La descripción solo puede contener letras, números y espacios.'
             }), 400
 
-        # Validar duplicados (excepto el mismo ID)
-        if cargodao.existeDescripcionExceptoId(descripcion, cargo_id):
+        # Validar duplicados (excepto el mismo ID): updateCargo devuelve None
+        actualizado = cargodao.updateCargo(cargo_id, descripcion)
+        if actualizado is None:
             return jsonify({
                 'success': False,
                 'error': 'Otro cargo con esa descripción ya existe.'
             }), 409
-
-        actualizado = cargodao.updateCargo(cargo_id, descripcion)
         if actualizado:
             return jsonify({
                 'success': True,
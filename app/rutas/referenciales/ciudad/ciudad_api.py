@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify, current_app as app
 from app.dao.referenciales.ciudad.CiudadDao import CiudadDao
+from app.conexion.Condicional import condicional
 
 ciuapi = Blueprint('ciuapi', __name__)
 
@@ -7,6 +8,7 @@ ciuapi = Blueprint('ciuapi', __name__)
 # Trae todas las ciudades
 # ===============================
 @ciuapi.route('/ciudades', methods=['GET'])
+@condicional('ciudad')
 def getCiudades():
     ciudao = CiudadDao()
     try:
@@ -27,6 +29,7 @@ def getCiudades():
 # Trae una ciudad por ID
 # ===============================
 @ciuapi.route('/ciudades/<int:ciudad_id>', methods=['GET'])
+@condicional('ciudad')
 def getCiudad(ciudad_id):
     ciudao = CiudadDao()
     try:
@@ -82,14 +85,13 @@ def addCiudad():
                 'error': 'La descripción solo puede contener letras, números y espacios.'
             }), 400
 
-        # Validar que no exista duplicado
-        if ciudao.existeDescripcion(descripcion):
+        # El duplicado lo rechaza el indice unico: guardarCiudad devuelve None
+        ciudad_id = ciudao.guardarCiudad(descripcion)
+        if ciudad_id is None:
             return jsonify({
                 'success': False,
                 'error': 'Ya existe una ciudad con esa descripción.'
             }), 409
-
-        ciudad_id = ciudao.guardarCiudad(descripcion)
         if ciudad_id:
             return jsonify({
                 'success': True,
@@ -144,14 +146,12 @@ def updateCiudad(ciudad_id):
                 'error': 'La descripción solo puede contener letras, números y espacios.'
             }), 400
 
-        # Validar que no exista otra ciudad con la misma descripción
-        if ciudao.existeDescripcionExceptoId(descripcion, ciudad_id):
+        actualizado = ciudao.updateCiudad(ciudad_id, descripcion)
+        if actualizado is None:
             return jsonify({
                 'success': False,
                 'error': 'Otra ciudad con esa descripción ya existe.'
             }), 409
-
-        actualizado = ciudao.updateCiudad(ciudad_id, descripcion)
         if actualizado:
             return jsonify({
                 'success': True,
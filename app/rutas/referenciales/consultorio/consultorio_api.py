@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify, current_app as app
 from app.dao.referenciales.consultorio.ConsultorioDao import ConsultorioDao
 import re
+from app.conexion.Condicional import condicional
 
 consultorioapi = Blueprint('consultorioapi', __name__)
 dao = ConsultorioDao()
@@ -57,6 +58,7 @@ def validar_datos_consultorio(nombre, direccion, telefono, correo):
 # 🔹 OBTENER TODOS LOS CONSULTORIOS
 # =============================
 @consultorioapi.route('/consultorios', methods=['GET'])
+@condicional('consultorio')
 def getConsultorios():
     try:
         consultorios = dao.getConsultorios()
@@ -70,6 +72,7 @@ def getConsultorios():
 # 🔹 OBTENER CONSULTORIO POR ID
 # =============================
 @consultorioapi.route('/consultorios/<int:codigo>', methods=['GET'])
+@condicional('consultorio')
 def getConsultorio(codigo):
     try:
         consultorio = dao.getConsultorioById(codigo)
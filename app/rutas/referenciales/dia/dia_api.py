@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify, current_app as app
 from app.dao.referenciales.dia.DiaDao import DiaDao
+from app.conexion.Condicional import condicional
 
 diaapi = Blueprint('diaapi', __name__)
 
@@ -9,6 +10,7 @@ DIAS_VALIDOS = ['LUNES', 'MARTES', 'MIÉRCOLES', 'JUEVES', 'VIERNES', 'SÁBADO',
 
 # Trae todos los dias
 @diaapi.route('/dias', methods=['GET'])
+@condicional('dia')
 def getDias():
     diadao = DiaDao()
 
@@ -29,6 +31,7 @@ def getDias():
         }), 500
 
 @diaapi.route('/dias/<int:dia_id>', methods=['GET'])
+@condicional('dia')
 def getDia(dia_id):
     diadao = DiaDao()
 
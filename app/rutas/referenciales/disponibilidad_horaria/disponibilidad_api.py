@@ -1,9 +1,24 @@
 from flask import Blueprint, request, jsonify, current_app as app
-from app.dao.referenciales.disponibilidad_horaria.DisponibilidadHorariaDao import DisponibilidadDao
+from app.dao.referenciales.disponibilidad_horaria.DisponibilidadHorariaDao import (
+    DisponibilidadDao, PLANTILLA_DIAS_MAXIMO, ERROR_INVALIDA, ERROR_SOLAPADA, ERROR_BASE)
 from datetime import datetime
 
 disponibilidadapi = Blueprint('disponibilidadapi', __name__)
 
+
+# estado HTTP de cada 'codigo' de error de DisponibilidadDao
+ESTADOS_ERROR = {
+    ERROR_INVALIDA: 400,
+    ERROR_SOLAPADA: 409,
+    ERROR_BASE: 500,
+}
+
+
+def estadoDeError(resultado):
+    """Codigo HTTP de un error devuelto por DisponibilidadDao."""
+    return ESTADOS_ERROR.get(resultado.get('codigo'), 500)
+
+
 @disponibilidadapi.route('/disponibilidades', methods=['GET'])
 def getDisponibilidades():
     dao = DisponibilidadDao()
@@ -42,21 +57,80 @@ def addDisponibilidad():
         hora_inicio = datetime.strptime(data['disponibilidad_hora_inicio'], "%H:%M").time()
         hora_fin = datetime.strptime(data['disponibilidad_hora_fin'], "%H:%M").time()
 
-        new_id = dao.guardarDisponibilidad(
+        resultado = dao.guardarDisponibilidad(
             data['id_medico'],
             hora_inicio,
             hora_fin,
             fecha,
             data['disponibilidad_cupos']
         )
-        if new_id:
-            return jsonify({'success': True, 'data': {'id_disponibilidad': new_id}, 'error': None}), 201
-        return jsonify({'success': False, 'error': 'Este horario ya está registrado'}), 500
+        if resultado.get('success'):
+            return jsonify({'success': True, 'data': {'id_disponibilidad': resultado['id']}, 'error': None}), 201
+        return jsonify({'success': False, 'error': resultado['error']}), estadoDeError(resultado)
     except Exception as e:
         app.logger.error(f"Error al agregar disponibilidad: {str(e)}")
         return jsonify({'success': False, 'error': 'Error interno'}), 500
         return jsonify({'success': False, 'error': 'Error interno'}), 500
 
+@disponibilidadapi.route('/disponibilidades/plantilla', methods=['POST'])
+def addPlantillaDisponibilidad():
+    """Genera disponibilidades de un periodo a partir de bloques semanales.
+
+        {"id_medico": 1, "desde": "2026-01-05", "hasta": "2026-03-31",
+         "bloques": [{"dias_semana": [1, 3], "hora_inicio": "08:00",
+                      "hora_fin": "12:00", "cupos": 8}],
+         "omitir_solapados": false}
+        dias_semana: 1 = lunes ... 7 = domingo.
+    """
+    data = request.get_json() or {}
+    dao = DisponibilidadDao()
+
+    for campo in ['id_medico', 'desde', 'hasta', 'bloques']:
+        if campo not in data or not data[campo]:
+            return jsonify({'success': False, 'error': f'El campo {campo} es obligatorio'}), 400
+
+    try:
+        desde = datetime.strptime(data['desde'], "%Y-%m-%d").date()
+        hasta = datetime.strptime(data['hasta'], "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'Formato de fecha inválido. Use YYYY-MM-DD'}), 400
+    if hasta < desde:
+        return jsonify({'success': False, 'error': 'La fecha hasta no puede ser anterior a desde'}), 400
+    if (hasta - desde).days >= PLANTILLA_DIAS_MAXIMO:
+        return jsonify({'success': False, 'error': f'El periodo no puede superar los {PLANTILLA_DIAS_MAXIMO} días'}), 400
+
+    bloques = []
+    for n, bloque in enumerate(data['bloques'], start=1):
+        try:
+            dias = {int(d) for d in bloque['dias_semana']}
+            bloques.append({
+                'dias_semana': dias,
+                'hora_inicio': datetime.strptime(bloque['hora_inicio'], "%H:%M").time(),
+                'hora_fin': datetime.strptime(bloque['hora_fin'], "%H:%M").time(),
+                'cupos': int(bloque['cupos']),
+            })
+        except (KeyError, TypeError, ValueError):
+            return jsonify({'success': False, 'error': f'El bloque {n} debe tener dias_semana, hora_inicio, hora_fin (HH:MM) y cupos'}), 400
+        if not dias or not dias <= set(range(1, 8)):
+            return jsonify({'success': False, 'error': f'El bloque {n} tiene días de la semana inválidos (1 = lunes ... 7 = domingo)'}), 400
+        if bloques[-1]['cupos'] <= 0:
+            return jsonify({'success': False, 'error': f'El bloque {n} debe tener cupos mayores a 0'}), 400
+
+    try:
+        resultado = dao.guardarPlantilla(data['id_medico'], desde, hasta, bloques,
+                                         omitir_solapados=bool(data.get('omitir_solapados')))
+        if not resultado['success']:
+            return jsonify({'success': False, 'error': resultado['error'],
+                            'data': {'solapadas': resultado.get('solapadas', [])}}), estadoDeError(resultado)
+        return jsonify({'success': True, 'data': {
+            'creadas': len(resultado['ids']),
+            'ids': resultado['ids'],
+            'omitidas': resultado['omitidas'],
+        }, 'error': None}), 201
+    except Exception as e:
+        app.logger.error(f"Error al generar plantilla de disponibilidad: {str(e)}")
+        return jsonify({'success': False, 'error': 'Error interno'}), 500
+
 @disponibilidadapi.route('/disponibilidades/<int:id_disponibilidad>', methods=['PUT'])
 def updateDisponibilidad(id_disponibilidad):
     data = request.get_json()
@@ -76,7 +150,9 @@ def updateDisponibilidad(id_disponibilidad):
             data['disponibilidad_fecha'],
             data['disponibilidad_cupos']
         )
-        if exito:
+        if not exito['success']:
+            return jsonify({'success': False, 'error': exito['error']}), estadoDeError(exito)
+        if exito['updated']:
             return jsonify({'success': True, 'data': {'id_disponibilidad': id_disponibilidad}, 'error': None}), 200
         return jsonify({'success': False, 'error': 'No se encontró la disponibilidad o no se pudo actualizar'}), 404
     except Exception as e:
@@ -1,10 +1,12 @@
 from flask import Blueprint, request, jsonify, current_app as app
 from app.dao.referenciales.duracion_consulta.DuracionConsultaDao import DuracionConsultaDao
+from app.conexion.Condicional import condicional
 
 duraconsuapi = Blueprint('duraconsuapi', __name__)
 
 # Trae todas las duraciones de consultas
 @duraconsuapi.route('/duracionconsulta', methods=['GET'])
+@condicional('duracion_consulta')
 def getDuracionConsultas():
     duraconsuldao = DuracionConsultaDao()
 
@@ -25,6 +27,7 @@ def getDuracionConsultas():
         }), 500
 
 @duraconsuapi.route('/duracionconsultas/<int:duracionconsulta_id>', methods=['GET'])
+@condicional('duracion_consulta')
 def getDuracionConsulta(duracionconsulta_id):
     duraconsudao = DuracionConsultaDao()
 
@@ -70,7 +73,9 @@ def addDuracionConsulta():
     try:
         descripcion = data['descripcion'].upper()
         duracionconsulta_id = duraconsudao.guardarDuracionConsulta(descripcion)
-        if duracionconsulta_id is not None:
+        if duracionconsulta_id is None:
+            return jsonify({ 'success': False, 'error': 'Ya existe un registro de duración de consulta con esa descripción.' }), 409
+        if duracionconsulta_id:
             return jsonify({
                 'success': True,
                 'data': {'id': duracionconsulta_id, 'descripcion': descripcion},
@@ -102,7 +107,10 @@ def updateDuracionConsulta(duracionconsulta_id):
                             }), 400
     descripcion = data['descripcion']
     try:
-        if duraconsudao.updateDuracionConsulta(duracionconsulta_id, descripcion.upper()):
+        actualizado = duraconsudao.updateDuracionConsulta(duracionconsulta_id, descripcion.upper())
+        if actualizado is None:
+            return jsonify({ 'success': False, 'error': 'Ya existe otro registro de duración de consulta con esa descripción.' }), 409
+        if actualizado:
             return jsonify({
                 'success': True,
                 'data': {'id': duracionconsulta_id, 'descripcion': descripcion},
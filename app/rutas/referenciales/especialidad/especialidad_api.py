@@ -1,10 +1,12 @@
 from flask import Blueprint, request, jsonify, current_app as app
 from app.dao.referenciales.especialidad.EspecialidadDao import EspecialidadDao
+from app.conexion.Condicional import condicional
 
 especiapi = Blueprint('especiapi', __name__)
 
 # Trae todas las especialidades
 @especiapi.route('/especialidades', methods=['GET'])
+@condicional('especialidad')
 def getEspecialidades():
     especialidaddao = EspecialidadDao()
 
@@ -25,6 +27,7 @@ def getEspecialidades():
         }), 500
 
 @especiapi.route('/especialidades/<int:especialidad_id>', methods=['GET'])
+@condicional('especialidad')
 def getEspecialidad(especialidad_id):
     especialidaddao = EspecialidadDao()
 
@@ -70,7 +73,9 @@ def addEspecialidad():
     try:
         descripcion = data['descripcion'].upper()
         especialidad_id = especialidaddao.guardarEspecialidad(descripcion)
-        if especialidad_id is not None:
+        if especialidad_id is None:
+            return jsonify({ 'success': False, 'error': 'Ya existe un registro de especialidad con esa descripción.' }), 409
+        if especialidad_id:
             return jsonify({
                 'success': True,
                 'data': {'id_especialidad': especialidad_id, 'descripcion': descripcion},
@@ -102,7 +107,10 @@ def updateEspeccialidad(especialidad_id):
                             }), 400
     descripcion = data['descripcion']
     try:
-        if especialidaddao.updateEspecialidad(especialidad_id, descripcion.upper()):
+        actualizado = especialidaddao.updateEspecialidad(especialidad_id, descripcion.upper())
+        if actualizado is None:
+            return jsonify({ 'success': False, 'error': 'Ya existe otro registro de especialidad con esa descripción.' }), 409
+        if actualizado:
             return jsonify({
                 'success': True,
                 'data': {'id_especialidad': especialidad_id, 'descripcion': descripcion},
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify, current_app as app
 from app.dao.referenciales.estado_cita.EstadoCitaDao import EstadoCitaDao
 import re
+from app.conexion.Condicional import condicional
 
 estacitapi = Blueprint('estacitapi', __name__)
 
@@ -17,6 +18,7 @@ def validar_descripcion(texto):
 # Trae todos los estados de cita
 # ===============================
 @estacitapi.route('/estadoscitas', methods=['GET'])
+@condicional('estado_cita')
 def getEstadosCitas():
     estdao = EstadoCitaDao()
     try:
@@ -38,6 +40,7 @@ def getEstadosCitas():
 # Trae un estado de cita por ID
 # ===============================
 @estacitapi.route('/estadoscitas/<int:estado_id>', methods=['GET'])
+@condicional('estado_cita')
 def getEstadoCita(estado_id):
     estdao = EstadoCitaDao()
     try:
@@ -92,15 +95,14 @@ def addEstadoCita():
 
    
 
-    # Validar duplicado
-    if estdao.existeDescripcion(descripcion):
-        return jsonify({
-            'success': False,
-            'error': f'Ya existe un estado de cita con la descripción "{descripcion}".'
-        }), 409
-
     try:
+        # El duplicado lo rechaza el indice unico: guardarEstadoCita devuelve None
         estado_id = estdao.guardarEstadoCita(descripcion)
+        if estado_id is None:
+            return jsonify({
+                'success': False,
+                'error': f'Ya existe un estado de cita con la descripción "{descripcion}".'
+            }), 409
         if estado_id:
             return jsonify({
                 'success': True,
@@ -150,14 +152,13 @@ def updateEstadoCita(estado_id):
 
    
 
-    if estdao.existeDescripcionExceptoId(descripcion, estado_id):
-        return jsonify({
-            'success': False,
-            'error': f'Otro estado de cita con la descripción "{descripcion}" ya existe.'
-        }), 409
-
     try:
         actualizado = estdao.updateEstadoCita(estado_id, descripcion)
+        if actualizado is None:
+            return jsonify({
+                'success': False,
+                'error': f'Otro estado de cita con la descripción "{descripcion}" ya existe.'
+            }), 409
         if actualizado:
             return jsonify({
                 'success': True,
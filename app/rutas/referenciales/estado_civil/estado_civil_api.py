@@ -1,10 +1,12 @@
 from flask import Blueprint, request, jsonify, current_app as app
 from app.dao.referenciales.estado_civil.EstadoCivilDao import EstadoCivilDao
+from app.conexion.Condicional import condicional
 
 estacivapi = Blueprint('estacivapi', __name__)
 
 # Trae todos los Estados Civiles
 @estacivapi.route('/estadocivil', methods=['GET'])
+@condicional('estado_civil')
 def getEstadosCiviles():
     estacivdao = EstadoCivilDao()
 
@@ -25,6 +27,7 @@ def getEstadosCiviles():
         }), 500
 
 @estacivapi.route('/estadosciviles/<int:estadocivil_id>', methods=['GET'])
+@condicional('estado_civil')
 def getEstadoCivil(estadocivil_id):
     estacivdao = EstadoCivilDao()
 
@@ -70,7 +73,9 @@ def addEstadoCivil():
     try:
         descripcion = data['descripcion'].upper()
         estadocivil_id = estacivdao.guardarEstadoCivil(descripcion)
-        if estadocivil_id is not None:
+        if estadocivil_id is None:
+            return jsonify({ 'success': False, 'error': 'Ya existe un registro de estado civil con esa descripción.' }), 409
+        if estadocivil_id:
             return jsonify({
                 'success': True,
                 'data': {'id': estadocivil_id, 'descripcion': descripcion},
@@ -102,7 +107,10 @@ def updateEstadoCivil(estadocivil_id):
                             }), 400
     descripcion = data['descripcion']
     try:
-        if estacivdao.updateEstadoCivil(estadocivil_id, descripcion.upper()):
+        actualizado = estacivdao.updateEstadoCivil(estadocivil_id, descripcion.upper())
+        if actualizado is None:
+            return jsonify({ 'success': False, 'error': 'Ya existe otro registro de estado civil con esa descripción.' }), 409
+        if actualizado:
             return jsonify({
                 'success': True,
                 'data': {'id': estadocivil_id, 'descripcion': descripcion},
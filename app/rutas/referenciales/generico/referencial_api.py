@@ -0,0 +1,273 @@
+import hashlib
+from flask import Blueprint, request, jsonify, current_app as app
+from app.conexion.Condicional import condicional
+from app.dao.referenciales.Catalogo import CATALOGO
+from app.dao.referenciales.ReferencialDao import (
+    ReferencialDao, ValidacionError, DuplicadoError, EnUsoError
+)
+
+referencialapi = Blueprint('referencialapi', __name__)
+
+
+def _getDao(tabla):
+    spec = CATALOGO.get(tabla)
+    return ReferencialDao(spec) if spec else None
+
+
+def _noExiste(tabla):
+    return jsonify({
+        'success': False,
+        'error': f'La tabla referencial {tabla} no existe.'
+    }), 404
+
+
+def _errorInterno(mensaje, e):
+    app.logger.error(f"{mensaje}: {str(e)}")
+    return jsonify({
+        'success': False,
+        'error': 'Ocurrió un error interno. Consulte con el administrador.'
+    }), 500
+
+
+def _errorDatos(e):
+    return jsonify({
+        'success': False,
+        'error': str(e)
+    }), 400 if isinstance(e, ValidacionError) else 409
+
+
+def _leerLote(clave):
+    """Cuerpo de las rutas /lote: una lista o {clave: [...]}."""
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get(clave)
+    return data
+
+# ===============================
+# Lista las tablas disponibles
+# ===============================
+@referencialapi.route('/referenciales', methods=['GET'])
+def getTablas():
+    return jsonify({
+        'success': True,
+        'data': [
+            {
+                'tabla': spec.tabla,
+                'clave': spec.clave,
+                'columnas': spec.nombres,
+                'unica': spec.unica,
+            }
+            for spec in CATALOGO.values()
+        ],
+        'error': None
+    }), 200
+
+# ===============================
+# Varias tablas en una sola respuesta: ?tablas=ciudad,sexos,especialidad
+# Sin ?tablas trae todo el catalogo. ETag combinado: If-None-Match -> 304
+# ===============================
+@referencialapi.route('/referenciales/bundle', methods=['GET'])
+def getBundle():
+    pedidas = [t.strip() for t in request.args.get('tablas', '').split(',') if t.strip()]
+    tablas = list(dict.fromkeys(pedidas)) or list(CATALOGO)
+    desconocidas = [t for t in tablas if t not in CATALOGO]
+    if desconocidas:
+        return jsonify({
+            'success': False,
+            'error': f"Tablas referenciales inexistentes: {', '.join(desconocidas)}."
+        }), 400
+    try:
+        listados = {tabla: ReferencialDao(CATALOGO[tabla]).getListado() for tabla in tablas}
+    except Exception as e:
+        return _errorInterno("Error al obtener el bundle de referenciales", e)
+
+    firmas = ','.join(f"{tabla}:{firma}" for tabla, (_, firma) in listados.items())
+    etag = hashlib.sha1(firmas.encode('utf-8')).hexdigest()[:32]
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = jsonify({
+            'success': True,
+            'data': {tabla: filas for tabla, (filas, _) in listados.items()},
+            'error': None
+        })
+    response.set_etag(etag)
+    # el navegador guarda la respuesta pero revalida siempre (un 304 si nada cambio)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+# ===============================
+# Trae todos los registros de una tabla
+# ===============================
+@referencialapi.route('/referenciales/<tabla>', methods=['GET'])
+@condicional(lambda tabla, **_: [tabla])
+def getRegistros(tabla):
+    dao = _getDao(tabla)
+    if dao is None:
+        return _noExiste(tabla)
+    try:
+        return jsonify({
+            'success': True,
+            'data': dao.getTodos(),
+            'error': None
+        }), 200
+    except Exception as e:
+        return _errorInterno(f"Error al obtener {tabla}", e)
+
+# ===============================
+# Trae un registro por ID
+# ===============================
+@referencialapi.route('/referenciales/<tabla>/<int:id>', methods=['GET'])
+@condicional(lambda tabla, **_: [tabla])
+def getRegistro(tabla, id):
+    dao = _getDao(tabla)
+    if dao is None:
+        return _noExiste(tabla)
+    try:
+        registro = dao.getPorId(id)
+        if registro:
+            return jsonify({
+                'success': True,
+                'data': registro,
+                'error': None
+            }), 200
+        return jsonify({
+            'success': False,
+            'error': 'No se encontró el registro con el ID proporcionado.'
+        }), 404
+    except Exception as e:
+        return _errorInterno(f"Error al obtener {tabla} {id}", e)
+
+# ===============================
+# Agrega un registro
+# ===============================
+@referencialapi.route('/referenciales/<tabla>', methods=['POST'])
+def addRegistro(tabla):
+    dao = _getDao(tabla)
+    if dao is None:
+        return _noExiste(tabla)
+    try:
+        return jsonify({
+            'success': True,
+            'data': dao.crear(request.get_json(silent=True)),
+            'error': None
+        }), 201
+    except (ValidacionError, DuplicadoError) as e:
+        return _errorDatos(e)
+    except Exception as e:
+        return _errorInterno(f"Error al agregar en {tabla}", e)
+
+# ===============================
+# Actualiza un registro
+# ===============================
+@referencialapi.route('/referenciales/<tabla>/<int:id>', methods=['PUT'])
+def updateRegistro(tabla, id):
+    dao = _getDao(tabla)
+    if dao is None:
+        return _noExiste(tabla)
+    try:
+        registro = dao.modificar(id, request.get_json(silent=True))
+        if registro:
+            return jsonify({
+                'success': True,
+                'data': registro,
+                'error': None
+            }), 200
+        return jsonify({
+            'success': False,
+            'error': 'No se encontró el registro con el ID proporcionado o no se pudo actualizar.'
+        }), 404
+    except (ValidacionError, DuplicadoError) as e:
+        return _errorDatos(e)
+    except Exception as e:
+        return _errorInterno(f"Error al actualizar {tabla} {id}", e)
+
+# ===============================
+# Elimina un registro
+# ===============================
+@referencialapi.route('/referenciales/<tabla>/<int:id>', methods=['DELETE'])
+def deleteRegistro(tabla, id):
+    dao = _getDao(tabla)
+    if dao is None:
+        return _noExiste(tabla)
+    try:
+        if dao.eliminar(id):
+            return jsonify({
+                'success': True,
+                'mensaje': f'Registro con ID {id} eliminado correctamente.',
+                'error': None
+            }), 200
+        return jsonify({
+            'success': False,
+            'error': 'No se encontró el registro con el ID proporcionado o no se pudo eliminar.'
+        }), 404
+    except EnUsoError as e:
+        return _errorDatos(e)
+    except Exception as e:
+        return _errorInterno(f"Error al eliminar {tabla} {id}", e)
+
+# ===============================
+# Carga masiva: [{...}, ...] o {"datos": [...]}
+# ===============================
+@referencialapi.route('/referenciales/<tabla>/lote', methods=['POST'])
+def addLote(tabla):
+    dao = _getDao(tabla)
+    if dao is None:
+        return _noExiste(tabla)
+    try:
+        insertados = dao.guardarLote(_leerLote('datos'))
+        return jsonify({
+            'success': True,
+            'data': insertados,
+            'error': None
+        }), 201
+    except (ValidacionError, DuplicadoError) as e:
+        return _errorDatos(e)
+    except Exception as e:
+        return _errorInterno(f"Error al cargar el lote de {tabla}", e)
+
+# ===============================
+# Actualizacion masiva: cada registro con su clave
+# ===============================
+@referencialapi.route('/referenciales/<tabla>/lote', methods=['PUT'])
+def updateLote(tabla):
+    dao = _getDao(tabla)
+    if dao is None:
+        return _noExiste(tabla)
+    try:
+        actualizados, no_encontrados = dao.actualizarLote(_leerLote('datos'))
+        return jsonify({
+            'success': True,
+            'data': {
+                'actualizados': actualizados,
+                'no_encontrados': no_encontrados,
+            },
+            'error': None
+        }), 200
+    except (ValidacionError, DuplicadoError) as e:
+        return _errorDatos(e)
+    except Exception as e:
+        return _errorInterno(f"Error al actualizar el lote de {tabla}", e)
+
+# ===============================
+# Eliminacion masiva: [id, ...] o {"ids": [...]}
+# ===============================
+@referencialapi.route('/referenciales/<tabla>/lote', methods=['DELETE'])
+def deleteLote(tabla):
+    dao = _getDao(tabla)
+    if dao is None:
+        return _noExiste(tabla)
+    try:
+        eliminados, no_encontrados = dao.eliminarLote(_leerLote('ids'))
+        return jsonify({
+            'success': True,
+            'data': {
+                'eliminados': eliminados,
+                'no_encontrados': no_encontrados,
+            },
+            'error': None
+        }), 200
+    except (ValidacionError, EnUsoError) as e:
+        return _errorDatos(e)
+    except Exception as e:
+        return _errorInterno(f"Error al eliminar el lote de {tabla}", e)
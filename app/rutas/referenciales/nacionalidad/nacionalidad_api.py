@@ -1,10 +1,12 @@
 from flask import Blueprint, request, jsonify, current_app as app
 from app.dao.referenciales.nacionalidad.NacionalidadDao import NacionalidadDao
+from app.conexion.Condicional import condicional
 
 nacioapi = Blueprint('nacioapi', __name__)
 
 # Trae todas las nacionalidades
 @nacioapi.route('/nacionalidades', methods=['GET'])
+@condicional('nacionalidades')
 def getNacionalidades():
     nacionalidaddao = NacionalidadDao()
 
@@ -25,6 +27,7 @@ def getNacionalidades():
         }), 500
 
 @nacioapi.route('/nacionalidades/<int:nacionalidad_id>', methods=['GET'])
+@condicional('nacionalidades')
 def getNacionalidad(nacionalidad_id):
     nacionalidaddao = NacionalidadDao()
 
@@ -70,7 +73,9 @@ def addNacionalidad():
     try:
         descripcion = data['descripcion'].upper()
         nacionalidad_id = nacionalidaddao.guardarNacionalidad(descripcion)
-        if nacionalidad_id is not None:
+        if nacionalidad_id is None:
+            return jsonify({ 'success': False, 'error': 'Ya existe un registro de nacionalidad con esa descripción.' }), 409
+        if nacionalidad_id:
             return jsonify({
                 'success': True,
                 'data': {'id': nacionalidad_id, 'descripcion': descripcion},
@@ -102,7 +107,10 @@ def updateNacionalidad(nacionalidad_id):
                             }), 400
     descripcion = data['descripcion']
     try:
-        if nacionalidaddao.updateNacionalidad(nacionalidad_id, descripcion.upper()):
+        actualizado = nacionalidaddao.updateNacionalidad(nacionalidad_id, descripcion.upper())
+        if actualizado is None:
+            return jsonify({ 'success': False, 'error': 'Ya existe otro registro de nacionalidad con esa descripción.' }), 409
+        if actualizado:
             return jsonify({
                 'success': True,
                 'data': {'id': nacionalidad_id, 'descripcion': descripcion},
@@ -1,10 +1,12 @@
 from flask import Blueprint, request, jsonify, current_app as app
 from app.dao.referenciales.ocupacion.OcupacionDao import OcupacionDao
+from app.conexion.Condicional import condicional
 
 ocupapi = Blueprint('ocupapi', __name__)
 
 # Trae todas las ocupaciones
 @ocupapi.route('/ocupaciones', methods=['GET'])
+@condicional('ocupaciones')
 def getOcupaciones():
     ocupaciondao = OcupacionDao()
 
@@ -25,6 +27,7 @@ def getOcupaciones():
         }), 500
 
 @ocupapi.route('/ocupaciones/<int:ocupacion_id>', methods=['GET'])
+@condicional('ocupaciones')
 def getOcupacion(ocupacion_id):
     ocupaciondao = OcupacionDao()
 
@@ -70,7 +73,9 @@ def addOcupacion():
     try:
         descripcion = data['descripcion'].upper()
         ocupacion_id = ocupaciondao.guardarOcupacion(descripcion)
-        if ocupacion_id is not None:
+        if ocupacion_id is None:
+            return jsonify({ 'success': False, 'error': 'Ya existe un registro de ocupación con esa descripción.' }), 409
+        if ocupacion_id:
             return jsonify({
                 'success': True,
                 'data': {'id': ocupacion_id, 'descripcion': descripcion},
@@ -102,7 +107,10 @@ def updateOcupacion(ocupacion_id):
                             }), 400
     descripcion = data['descripcion']
     try:
-        if ocupaciondao.updateOcupacion(ocupacion_id, descripcion.upper()):
+        actualizado = ocupaciondao.updateOcupacion(ocupacion_id, descripcion.upper())
+        if actualizado is None:
+            return jsonify({ 'success': False, 'error': 'Ya existe otro registro de ocupación con esa descripción.' }), 409
+        if actualizado:
             return jsonify({
                 'success': True,
                 'data': {'id': ocupacion_id, 'descripcion': descripcion},
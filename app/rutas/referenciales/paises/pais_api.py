@@ -1,10 +1,12 @@
 from flask import Blueprint, request, jsonify, current_app as app
 from app.dao.referenciales.paises.PaisDao import PaisDao
+from app.conexion.Condicional import condicional
 
 paisapi = Blueprint('paisapi', __name__)
 
 # Trae todas los paises
 @paisapi.route('/paises', methods=['GET'])
+@condicional('paises')
 def getPaises():
     paisdao = PaisDao()
 
@@ -25,6 +27,7 @@ def getPaises():
         }), 500
 
 @paisapi.route('/paises/<int:pais_id>', methods=['GET'])
+@condicional('paises')
 def getPais(pais_id):
     paisdao = PaisDao()
 
@@ -70,7 +73,9 @@ def addPais():
     try:
         descripcion = data['descripcion'].upper()
         pais_id = paisdao.guardarPais(descripcion)
-        if pais_id is not None:
+        if pais_id is None:
+            return jsonify({ 'success': False, 'error': 'Ya existe un registro de pais con esa descripción.' }), 409
+        if pais_id:
             return jsonify({
                 'success': True,
                 'data': {'id': pais_id, 'descripcion': descripcion},
@@ -102,7 +107,10 @@ def updatePais(pais_id):
                             }), 400
     descripcion = data['descripcion']
     try:
-        if paisdao.updatePais(pais_id, descripcion.upper()):
+        actualizado = paisdao.updatePais(pais_id, descripcion.upper())
+        if actualizado is None:
+            return jsonify({ 'success': False, 'error': 'Ya existe otro registro de pais con esa descripción.' }), 409
+        if actualizado:
             return jsonify({
                 'success': True,
                 'data': {'id': pais_id, 'descripcion': descripcion},
@@ -1,11 +1,13 @@
 from flask import Blueprint, request, jsonify, current_app as app
 from app.dao.referenciales.persona.PersonaDao import PersonaDao
+from app.conexion.Condicional import condicional
 
 
 persapi = Blueprint('persapi', __name__)
 
 # Trae todas las personas
 @persapi.route('/personas', methods=['GET'])
+@condicional('personas')
 def getPersonas():
     personadao = PersonaDao()
 
@@ -26,6 +28,7 @@ def getPersonas():
         }), 500
 
 @persapi.route('/personas/<int:persona_id>', methods=['GET'])
+@condicional('personas')
 def getPersona(persona_id):
     personadao = PersonaDao()
 
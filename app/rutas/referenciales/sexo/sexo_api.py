@@ -1,10 +1,12 @@
 from flask import Blueprint, request, jsonify, current_app as app
 from app.dao.referenciales.sexo.SexoDao import SexoDao
+from app.conexion.Condicional import condicional
 
 sexapi = Blueprint('sexapi', __name__)
 
 # Trae todas los sexos de las personas
 @sexapi.route('/sexos', methods=['GET'])
+@condicional('sexos')
 def getSexos():
     sexodao = SexoDao()
 
@@ -25,6 +27,7 @@ def getSexos():
         }), 500
 
 @sexapi.route('/sexos/<int:sexo_id>', methods=['GET'])
+@condicional('sexos')
 def getSexo(sexo_id):
     sexodao = SexoDao()
 
@@ -70,7 +73,9 @@ def addSexo():
     try:
         descripcion = data['descripcion'].upper()
         sexo_id = sexodao.guardarSexo(descripcion)
-        if sexo_id is not None:
+        if sexo_id is None:
+            return jsonify({ 'success': False, 'error': 'Ya existe un registro de sexo con esa descripción.' }), 409
+        if sexo_id:
             return jsonify({
                 'success': True,
                 'data': {'id': sexo_id, 'descripcion': descripcion},
@@ -102,7 +107,10 @@ def updateSexo(sexo_id):
                             }), 400
     descripcion = data['descripcion']
     try:
-        if sexodao.updateSexo(sexo_id, descripcion.upper()):
+        actualizado = sexodao.updateSexo(sexo_id, descripcion.upper())
+        if actualizado is None:
+            return jsonify({ 'success': False, 'error': 'Ya existe otro registro de sexo con esa descripción.' }), 409
+        if actualizado:
             return jsonify({
                 'success': True,
                 'data': {'id': sexo_id, 'descripcion': descripcion},
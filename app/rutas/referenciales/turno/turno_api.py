@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify, current_app as app
 from app.dao.referenciales.turno.TurnoDao import TurnoDao
+from app.conexion.Condicional import condicional
 
 turnoapi = Blueprint('turnoapi', __name__)
 
@@ -8,6 +9,7 @@ turnoapi = Blueprint('turnoapi', __name__)
 
 # Trae todos los turnos
 @turnoapi.route('/turnos', methods=['GET'])
+@condicional('turno')
 def getTurnos():
     turnodao = TurnoDao()
 
@@ -28,6 +30,7 @@ def getTurnos():
         }), 500
 
 @turnoapi.route('/turnos/<int:turno_id>', methods=['GET'])
+@condicional('turno')
 def getTurno(turno_id):
     turnodao = TurnoDao()
 
@@ -1,10 +1,12 @@
 from flask import Blueprint, request, jsonify, current_app as app
 from app.dao.referenciales_consultorio.medicamento.MedicamentoDao import MedicamentoDao
+from app.conexion.Condicional import condicional
 
 medicamentoapi = Blueprint('medicamentoapi', __name__)
 
 # Trae todos los medicamentos
 @medicamentoapi.route('/medicamentos', methods=['GET'])
+@condicional('medicamento')
 def getMedicamentos():
     dao = MedicamentoDao()
     try:
@@ -24,6 +26,7 @@ def getMedicamentos():
 
 # Trae un medicamento por id
 @medicamentoapi.route('/medicamentos/<int:id_medicamento>', methods=['GET'])
+@condicional('medicamento')
 def getMedicamento(id_medicamento):
     dao = MedicamentoDao()
     try:
@@ -84,12 +87,11 @@ def addMedicamento():
     if not dao.validarPalabraConSentido(forma_farmaceutica):
         return jsonify({'success': False, 'error': 'La forma farmacéutica debe contener al menos una vocal.'}), 400
 
-    # Validación de duplicados
+    # Validación de duplicados: la hace el indice unico, guardarMedicamento devuelve None
     try:
-        if dao.existeDuplicado(nombre_medicamento, dosis, forma_farmaceutica):
-            return jsonify({'success': False, 'error': f'Ya está registrado el medicamento "{nombre_medicamento}" con la dosis "{dosis}" y forma "{forma_farmaceutica}".'}), 409
-
         id_medicamento = dao.guardarMedicamento(nombre_medicamento, dosis, indicaciones, forma_farmaceutica)
+        if id_medicamento is None:
+            return jsonify({'success': False, 'error': f'Ya está registrado el medicamento "{nombre_medicamento}" con la dosis "{dosis}" y forma "{forma_farmaceutica}".'}), 409
         if id_medicamento:
             return jsonify({'success': True, 'data': {
                 'id_medicamento': id_medicamento,
@@ -152,12 +154,12 @@ def updateMedicamento(id_medicamento):
     if not dao.validarPalabraConSentido(forma_farmaceutica):
         return jsonify({'success': False, 'error': 'La forma farmacéutica debe contener al menos una vocal.'}), 400
 
-    # Validación de duplicados (excluyendo el registro actual)
+    # Validación de duplicados (excluyendo el registro actual): updateMedicamento devuelve None
     try:
-        if dao.existeDuplicadoExceptoId(nombre_medicamento, dosis, forma_farmaceutica, id_medicamento):
+        actualizado = dao.updateMedicamento(id_medicamento, nombre_medicamento, dosis, indicaciones, forma_farmaceutica)
+        if actualizado is None:
             return jsonify({'success': False, 'error': f'Ya existe otro medicamento con el nombre "{nombre_medicamento}", dosis "{dosis}" y forma "{forma_farmaceutica}".'}), 409
-
-        if dao.updateMedicamento(id_medicamento, nombre_medicamento, dosis, indicaciones, forma_farmaceutica):
+        if actualizado:
             return jsonify({'success': True, 'data': {
                 'id_medicamento': id_medicamento,
                 'nombre_medicamento': nombre_medicamento,
@@ -1,10 +1,12 @@
 from flask import Blueprint, request, jsonify, current_app as app
 from app.dao.referenciales_consultorio.sintomas.SintomasDao import SintomaDao
+from app.conexion.Condicional import condicional
 
 sintomaapi = Blueprint('sintomaapi', __name__)
 
 # Trae todos los síntomas
 @sintomaapi.route('/sintomas', methods=['GET'])
+@condicional('sintoma')
 def getSintomas():
     dao = SintomaDao()
     try:
@@ -23,6 +25,7 @@ def getSintomas():
 
 # Trae un síntoma por ID
 @sintomaapi.route('/sintomas/<int:id_sintoma>', methods=['GET'])
+@condicional('sintoma')
 def getSintoma(id_sintoma):
     dao = SintomaDao()
     try:
@@ -73,15 +76,14 @@ def addSintoma():
             'error': 'La descripción debe contener palabras entendibles.'
         }), 400
 
-    # ===== VALIDACIÓN DE DUPLICADOS =====
+    # ===== VALIDACIÓN DE DUPLICADOS (indice unico; guardar devuelve None) =====
     try:
-        if dao.sintomaExiste(descripcion_sintoma):
+        id_sintoma = dao.guardarSintoma(descripcion_sintoma)
+        if id_sintoma is None:
             return jsonify({
                 'success': False,
                 'error': f'El síntoma "{descripcion_sintoma}" ya existe.'
             }), 409
-
-        id_sintoma = dao.guardarSintoma(descripcion_sintoma)
         if id_sintoma:
             return jsonify({
                 'success': True,
@@ -132,15 +134,15 @@ def updateSintoma(id_sintoma):
             'error': 'La descripción debe contener palabras entendibles.'
         }), 400
 
-    # ===== VALIDACIÓN DE DUPLICADOS (excluyendo el registro actual) =====
+    # ===== VALIDACIÓN DE DUPLICADOS (excluyendo el registro actual; update devuelve None) =====
     try:
-        if dao.sintomaExisteExceptoId(descripcion_sintoma, id_sintoma):
+        actualizado = dao.updateSintoma(id_sintoma, descripcion_sintoma)
+        if actualizado is None:
             return jsonify({
                 'success': False,
                 'error': f'Ya existe otro síntoma con la descripción "{descripcion_sintoma}".'
             }), 409
-
-        if dao.updateSintoma(id_sintoma, descripcion_sintoma):
+        if actualizado:
             return jsonify({
                 'success': True,
                 'data': {
@@ -1,10 +1,12 @@
 from flask import Blueprint, request, jsonify, current_app as app
 from app.dao.referenciales_consultorio.tipo_analisis.Tipo_AnalisisDao import TipoAnalisisDao
+from app.conexion.Condicional import condicional
 
 analisisapi = Blueprint('analisisapi', __name__)
 
 # Trae todos los análisis
 @analisisapi.route('/analisis', methods=['GET'])
+@condicional('tipo_analisis')
 def getAnalisis():
     dao = TipoAnalisisDao()
     try:
@@ -23,6 +25,7 @@ def getAnalisis():
 
 # Trae un análisis por ID
 @analisisapi.route('/analisis/<int:id_analisis>', methods=['GET'])
+@condicional('tipo_analisis')
 def getAnalisisById(id_analisis):
     dao = TipoAnalisisDao()
     try:
@@ -73,15 +76,14 @@ def addAnalisis():
             'error': 'La descripción debe contener al menos una vocal.'
         }), 400
 
-    # ===== VALIDACIÓN DE DUPLICADOS =====
+    # ===== VALIDACIÓN DE DUPLICADOS (indice unico; guardar devuelve None) =====
     try:
-        if dao.analisisExiste(descripcion_analisis):
+        id_analisis = dao.guardarTipoAnalisis(descripcion_analisis)
+        if id_analisis is None:
             return jsonify({
                 'success': False,
                 'error': f'El tipo de análisis "{descripcion_analisis}" ya existe.'
             }), 409
-
-        id_analisis = dao.guardarTipoAnalisis(descripcion_analisis)
         if id_analisis:
             return jsonify({
                 'success': True,
@@ -132,15 +134,15 @@ def updateAnalisis(id_analisis):
             'error': 'La descripción debe contener al menos una vocal.'
         }), 400
 
-    # ===== VALIDACIÓN DE DUPLICADOS (excluyendo el registro actual) =====
+    # ===== VALIDACIÓN DE DUPLICADOS (excluyendo el registro actual; update devuelve None) =====
     try:
-        if dao.analisisExisteExceptoId(descripcion_analisis, id_analisis):
+        actualizado = dao.updateTipoAnalisis(id_analisis, descripcion_analisis)
+        if actualizado is None:
             return jsonify({
                 'success': False,
                 'error': f'Ya existe otro tipo de análisis con la descripción "{descripcion_analisis}".'
             }), 409
-
-        if dao.updateTipoAnalisis(id_analisis, descripcion_analisis):
+        if actualizado:
             return jsonify({
                 'success': True,
                 'data': {
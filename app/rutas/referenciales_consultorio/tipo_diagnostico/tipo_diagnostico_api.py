@@ -1,10 +1,12 @@
 from flask import Blueprint, request, jsonify, current_app as app
 from app.dao.referenciales_consultorio.tipo_diagnostico.TipoDiagnosticoDao import TipoDiagnosticoDao
+from app.conexion.Condicional import condicional
 
 diagnosticoapi = Blueprint('diagnosticoapi', __name__)
 
 # Obtener todos los diagnósticos
 @diagnosticoapi.route('/diagnosticos', methods=['GET'])
+@condicional('tipo_diagnostico')
 def getDiagnosticos():
     dao = TipoDiagnosticoDao()
     try:
@@ -17,6 +19,7 @@ def getDiagnosticos():
 
 # Obtener un diagnóstico por ID
 @diagnosticoapi.route('/diagnosticos/<int:id_tipo_diagnostico>', methods=['GET'])
+@condicional('tipo_diagnostico')
 def getDiagnostico(id_tipo_diagnostico):
     dao = TipoDiagnosticoDao()
     try:
@@ -69,12 +72,11 @@ def addDiagnostico():
     if not dao.validarPalabraConSentido(tipo_diagnostico):
         return jsonify({'success': False, 'error': 'El tipo diagnóstico debe contener al menos una vocal.'}), 400
 
-    # Validación de duplicados
+    # Validación de duplicados: indice unico, guardarTipoDiagnostico devuelve None
     try:
-        if dao.diagnosticoExiste(descripcion_diagnostico):
-            return jsonify({'success': False, 'error': f'El diagnóstico "{descripcion_diagnostico}" ya existe.'}), 409
-
         nuevo_id = dao.guardarTipoDiagnostico(descripcion_diagnostico, tipo_diagnostico)
+        if nuevo_id is None:
+            return jsonify({'success': False, 'error': f'El diagnóstico "{descripcion_diagnostico}" ya existe.'}), 409
         if nuevo_id:
             return jsonify({'success': True, 'data': {
                 'id_tipo_diagnostico': nuevo_id,
@@ -127,12 +129,11 @@ def updateDiagnostico(id_tipo_diagnostico):
     if not dao.validarPalabraConSentido(tipo_diagnostico):
         return jsonify({'success': False, 'error': 'El tipo diagnóstico debe contener al menos una vocal.'}), 400
 
-    # Validación de duplicados (excluyendo el registro actual)
+    # Validación de duplicados (excluyendo el registro actual): updateTipoDiagnostico devuelve None
     try:
-        if dao.diagnosticoExisteExceptoId(descripcion_diagnostico, id_tipo_diagnostico):
-            return jsonify({'success': False, 'error': f'Ya existe otro diagnóstico con la descripción "{descripcion_diagnostico}".'}), 409
-
         actualizado = dao.updateTipoDiagnostico(id_tipo_diagnostico, descripcion_diagnostico, tipo_diagnostico)
+        if actualizado is None:
+            return jsonify({'success': False, 'error': f'Ya existe otro diagnóstico con la descripción "{descripcion_diagnostico}".'}), 409
         if actualizado:
             return jsonify({'success': True, 'data': {
                 'id_tipo_diagnostico': id_tipo_diagnostico,
@@ -1,10 +1,12 @@
 from flask import Blueprint, request, jsonify, current_app as app
 from app.dao.referenciales_consultorio.tipo_estudio.Tipo_EstudioDao import TipoEstudioDao
+from app.conexion.Condicional import condicional
 
 estudioapi = Blueprint('estudioapi', __name__)
 
 # Trae todos los estudios
 @estudioapi.route('/estudios', methods=['GET'])
+@condicional('tipo_estudio')
 def getEstudios():
     dao = TipoEstudioDao()
     try:
@@ -23,6 +25,7 @@ def getEstudios():
 
 # Trae un estudio por ID
 @estudioapi.route('/estudios/<int:id_estudio>', methods=['GET'])
+@condicional('tipo_estudio')
 def getEstudioById(id_estudio):
     dao = TipoEstudioDao()
     try:
@@ -73,15 +76,14 @@ def addEstudio():
             'error': 'La descripción debe contener al menos una vocal.'
         }), 400
 
-    # ===== VALIDACIÓN DE DUPLICADOS =====
+    # ===== VALIDACIÓN DE DUPLICADOS (indice unico; guardar devuelve None) =====
     try:
-        if dao.estudioExiste(descripcion_estudio):
+        id_estudio = dao.guardarTipoEstudio(descripcion_estudio)
+        if id_estudio is None:
             return jsonify({
                 'success': False,
                 'error': f'El tipo de estudio "{descripcion_estudio}" ya existe.'
             }), 409
-
-        id_estudio = dao.guardarTipoEstudio(descripcion_estudio)
         if id_estudio:
             return jsonify({
                 'success': True,
@@ -132,15 +134,15 @@ def updateEstudio(id_estudio):
             'error': 'La descripción debe contener al menos una vocal.'
         }), 400
 
-    # ===== VALIDACIÓN DE DUPLICADOS (excluyendo el registro actual) =====
+    # ===== VALIDACIÓN DE DUPLICADOS (excluyendo el registro actual; update devuelve None) =====
     try:
-        if dao.estudioExisteExceptoId(descripcion_estudio, id_estudio):
+        actualizado = dao.updateTipoEstudio(id_estudio, descripcion_estudio)
+        if actualizado is None:
             return jsonify({
                 'success': False,
                 'error': f'Ya existe otro tipo de estudio con la descripción "{descripcion_estudio}".'
             }), 409
-
-        if dao.updateTipoEstudio(id_estudio, descripcion_estudio):
+        if actualizado:
             return jsonify({
                 'success': True,
                 'data': {
@@ -1,10 +1,12 @@
 from flask import Blueprint, request, jsonify, current_app as app
 from app.dao.referenciales_consultorio.tipo_procedimiento_medico.Tipo_Procedimiento_MedicoDao import TipoProcedimientoDao
+from app.conexion.Condicional import condicional
 
 procedimientoapi = Blueprint('procedimientoapi', __name__)
 
 # Trae todos los procedimientos
 @procedimientoapi.route('/procedimientos', methods=['GET'])
+@condicional('tipo_procedimiento_medico')
 def getProcedimientos():
     dao = TipoProcedimientoDao()
     try:
@@ -23,6 +25,7 @@ def getProcedimientos():
 
 # Trae un procedimiento por ID
 @procedimientoapi.route('/procedimientos/<int:id_procedimiento>', methods=['GET'])
+@condicional('tipo_procedimiento_medico')
 def getProcedimientoById(id_procedimiento):
     dao = TipoProcedimientoDao()
     try:
@@ -105,15 +108,14 @@ def addProcedimiento():
             'error': 'La duración solo puede contener letras, números, espacios, guiones, barras, comas y puntos.'
         }), 400
 
-    # ===== VALIDACIÓN DE DUPLICADOS =====
+    # ===== VALIDACIÓN DE DUPLICADOS (indice unico; guardar devuelve None) =====
     try:
-        if dao.procedimientoExiste(procedimiento):
+        id_procedimiento = dao.guardarTipoProcedimiento(procedimiento, descripcion, duracion)
+        if id_procedimiento is None:
             return jsonify({
                 'success': False,
                 'error': f'El procedimiento "{procedimiento}" ya existe.'
             }), 409
-
-        id_procedimiento = dao.guardarTipoProcedimiento(procedimiento, descripcion, duracion)
         if id_procedimiento:
             return jsonify({
                 'success': True,
@@ -198,15 +200,15 @@ def updateProcedimiento(id_procedimiento):
             'error': 'La duración solo puede contener letras, números, espacios, guiones, barras, comas y puntos.'
         }), 400
 
-    # ===== VALIDACIÓN DE DUPLICADOS (excluyendo el registro actual) =====
+    # ===== VALIDACIÓN DE DUPLICADOS (excluyendo el registro actual; update devuelve None) =====
     try:
-        if dao.procedimientoExisteExceptoId(procedimiento, id_procedimiento):
+        actualizado = dao.updateTipoProcedimiento(id_procedimiento, procedimiento, descripcion, duracion)
+        if actualizado is None:
             return jsonify({
                 'success': False,
                 'error': f'Ya existe otro procedimiento con el nombre "{procedimiento}".'
             }), 409
-
-        if dao.updateTipoProcedimiento(id_procedimiento, procedimiento, descripcion, duracion):
+        if actualizado:
             return jsonify({
                 'success': True,
                 'data': {
@@ -0,0 +1,7 @@
+# Servidor ASGI: los listados de LecturasAsyncDao se atienden en el event loop
+# con asyncpg y el resto de la aplicacion Flask pasa por el adaptador WSGI.
+#   uvicorn asgi:aplicacion --host 0.0.0.0 --port 8000
+from app import app
+from app.rutas.asincrono.lecturas_asgi import crearAplicacionAsgi
+
+aplicacion = crearAplicacionAsgi(app)
@@ -0,0 +1,118 @@
+"""Benchmark: tasa de aciertos de la cache de referenciales y latencia de invalidacion por NOTIFY.
+
+    Necesita PostgreSQL local con datos y los triggers de sql/02_notificar_cambios.sql:
+
+        psql -d agendamiento -f sql/02_notificar_cambios.sql
+        python benchmarks/invalidacion_cache.py [--tabla sexos] [--lectores 8]
+            [--escrituras 5] [--duracion 10]
+
+    `lectores` hilos leen la tabla con ReferencialDao.getTodos() sin pausa,
+    como los formularios. Un escritor con su propia conexion (otro "worker":
+    este proceso no se entera por la invalidacion local) modifica la tabla
+    `escrituras` veces por segundo. La latencia va desde el commit del
+    escritor hasta que el hilo de escucha descarto la entrada de la cache;
+    el objetivo es p95 < 100 ms con la tasa de aciertos cerca de 1.
+"""
+import argparse
+import logging
+import threading
+import time
+from collections import deque
+
+import psycopg2
+
+from app.conexion.Conexion import PARAMETROS_DB
+from app.conexion.Notificaciones import EscuchaCambios, suscribirCambios
+from app.dao.referenciales.Catalogo import CATALOGO
+from app.dao.referenciales.ReferencialDao import ReferencialDao, cacheReferenciales
+
+OBJETIVO_MS = 100
+
+
+def percentil(ordenados, p):
+    """Percentil p en milisegundos de una lista ya ordenada."""
+    if not ordenados:
+        return float('nan')
+    return ordenados[min(len(ordenados) - 1, len(ordenados) * p // 100)] * 1000
+
+
+def lector(dao, fin, lecturas):
+    n = 0
+    while time.perf_counter() < fin:
+        dao.getTodos()
+        n += 1
+    lecturas.append(n)
+
+
+def escritor(spec, fin, por_segundo, pendientes):
+    columna = spec.columnas[0].nombre
+    # UPDATE sin cambios: dispara el trigger igual que una edicion real
+    sql = (f"UPDATE {spec.tabla} SET {columna} = {columna} "
+           f"WHERE {spec.clave} = (SELECT MIN({spec.clave}) FROM {spec.tabla})")
+    con = psycopg2.connect(**PARAMETROS_DB)
+    try:
+        while time.perf_counter() < fin:
+            cur = con.cursor()
+            cur.execute(sql)
+            cur.close()
+            pendientes.append(time.perf_counter())
+            con.commit()
+            time.sleep(1 / por_segundo)
+    finally:
+        con.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tabla', default='sexos', choices=sorted(CATALOGO))
+    parser.add_argument('--lectores', type=int, default=8)
+    parser.add_argument('--escrituras', type=float, default=5, help='escrituras por segundo')
+    parser.add_argument('--duracion', type=float, default=10)
+    args = parser.parse_args()
+
+    spec = CATALOGO[args.tabla]
+    pendientes = deque()
+    latencias = []
+
+    def medir(tabla, operacion):
+        # se registra despues de la cache: la medicion incluye el descarte
+        if tabla == spec.tabla and pendientes:
+            latencias.append(time.perf_counter() - pendientes.popleft())
+
+    suscribirCambios(medir)
+    escucha = EscuchaCambios(PARAMETROS_DB, logging.getLogger('benchmark'))
+    escucha.start()
+    if not escucha.escuchando.wait(10):
+        raise SystemExit("No se pudo abrir la conexion de LISTEN")
+
+    dao = ReferencialDao(spec)
+    dao.getTodos()
+    antes = cacheReferenciales.getEstadisticas()['tablas'].get(spec.tabla, {})
+
+    fin = time.perf_counter() + args.duracion
+    lecturas = []
+    hilos = [threading.Thread(target=lector, args=(dao, fin, lecturas)) for _ in range(args.lectores)]
+    hilos.append(threading.Thread(target=escritor, args=(spec, fin, args.escrituras, pendientes)))
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    time.sleep(0.5)     # avisos de las ultimas escrituras
+    escucha.detener()
+
+    despues = cacheReferenciales.getEstadisticas()['tablas'][spec.tabla]
+    aciertos = despues['aciertos'] - antes.get('aciertos', 0)
+    fallos = despues['fallos'] - antes.get('fallos', 0)
+    latencias.sort()
+    p95 = percentil(latencias, 95)
+    print(f"tabla={spec.tabla} lectores={args.lectores} escrituras/s={args.escrituras} duracion={args.duracion}s")
+    print(f"lecturas     {sum(lecturas):9d}  ({sum(lecturas) / args.duracion:.0f}/s)")
+    print(f"aciertos     {aciertos / max(aciertos + fallos, 1):9.4f}  (fallos={fallos})")
+    print(f"avisos       {len(latencias):9d}  sin recibir={len(pendientes)}")
+    print(f"invalidacion p50={percentil(latencias, 50):.1f}ms  p95={p95:.1f}ms  "
+          f"max={latencias[-1] * 1000 if latencias else float('nan'):.1f}ms")
+    print("OK" if p95 < OBJETIVO_MS and not pendientes else f"FUERA DE OBJETIVO ({OBJETIVO_MS} ms)")
+
+
+if __name__ == '__main__':
+    main()
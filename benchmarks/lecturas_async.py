@@ -0,0 +1,89 @@
+"""Benchmark: requests/seg de los listados de lectura, servidor Flask con hilos vs ASGI + asyncpg.
+
+    Necesita PostgreSQL local con datos y los dos servidores levantados:
+
+        python run.py                                        # Flask con hilos, puerto 5000
+        uvicorn asgi:aplicacion --port 8000 --workers 1      # ASGI, un solo proceso
+
+    python benchmarks/lecturas_async.py [--concurrencia 200] [--duracion 15]
+        [--hilos http://127.0.0.1:5000] [--asgi http://127.0.0.1:8000]
+
+    Cada corrida mantiene `concurrencia` pedidas en vuelo durante `duracion`
+    segundos repartidas entre los caminos de CAMINOS y reporta pedidas por
+    segundo, latencia p50/p95/p99 y errores de cada servidor.
+"""
+import argparse
+import asyncio
+import time
+
+import aiohttp
+
+CAMINOS = [
+    '/api/v1/disponibilidades',
+    '/api/v1/registroc?limit=50',
+    '/api/v1/avisos?limit=50',
+]
+
+
+async def trabajador(sesion, base, fin, latencias, errores, indice):
+    while time.perf_counter() < fin:
+        camino = CAMINOS[indice % len(CAMINOS)]
+        indice += 1
+        inicio = time.perf_counter()
+        try:
+            async with sesion.get(base + camino) as respuesta:
+                await respuesta.read()
+                if respuesta.status != 200:
+                    errores.append(respuesta.status)
+                    continue
+        except aiohttp.ClientError as e:
+            errores.append(type(e).__name__)
+            continue
+        latencias.append(time.perf_counter() - inicio)
+
+
+async def medir(base, concurrencia, duracion):
+    latencias = []
+    errores = []
+    conector = aiohttp.TCPConnector(limit=concurrencia)
+    tiempo = aiohttp.ClientTimeout(total=60)
+    async with aiohttp.ClientSession(connector=conector, timeout=tiempo) as sesion:
+        # calentamiento: abre conexiones y prepara sentencias en el servidor
+        for camino in CAMINOS:
+            async with sesion.get(base + camino) as respuesta:
+                await respuesta.read()
+        inicio = time.perf_counter()
+        fin = inicio + duracion
+        await asyncio.gather(*(
+            trabajador(sesion, base, fin, latencias, errores, i) for i in range(concurrencia)
+        ))
+        transcurrido = time.perf_counter() - inicio
+    return latencias, errores, transcurrido
+
+
+def percentil(ordenados, p):
+    """Percentil p en milisegundos de una lista ya ordenada."""
+    if not ordenados:
+        return float('nan')
+    return ordenados[min(len(ordenados) - 1, len(ordenados) * p // 100)] * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--concurrencia', type=int, default=200)
+    parser.add_argument('--duracion', type=float, default=15)
+    parser.add_argument('--hilos', default='http://127.0.0.1:5000')
+    parser.add_argument('--asgi', default='http://127.0.0.1:8000')
+    args = parser.parse_args()
+
+    print(f"concurrencia={args.concurrencia} duracion={args.duracion}s caminos={len(CAMINOS)}")
+    for nombre, base in (('flask con hilos', args.hilos), ('asgi + asyncpg', args.asgi)):
+        latencias, errores, transcurrido = await medir(base, args.concurrencia, args.duracion)
+        latencias.sort()
+        print(f"{nombre:16s} {len(latencias) / transcurrido:9.1f} req/s  "
+              f"p50={percentil(latencias, 50):7.1f}ms  p95={percentil(latencias, 95):7.1f}ms  "
+              f"p99={percentil(latencias, 99):7.1f}ms  errores={len(errores)}")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
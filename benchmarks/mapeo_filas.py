@@ -0,0 +1,96 @@
+"""Benchmark: dict(zip(columnas, row)) + convert() por fila vs mapeador compilado.
+
+    Simula el listado de AvisoRecordatorioDao.getAvisos sin base de datos.
+
+    python benchmarks/mapeo_filas.py [cantidad_filas]
+"""
+import os
+import sys
+import time
+import types
+from datetime import date, time as dtime
+
+# se carga app.conexion sin ejecutar app/__init__.py (no hace falta Flask ni la BD)
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+paquete = types.ModuleType('app')
+paquete.__path__ = [os.path.join(RAIZ, 'app')]
+sys.modules.setdefault('app', paquete)
+
+from app.conexion.MapeoFilas import filasComoDicts, fechaISO, horaHHMM
+
+COLUMNAS = ['id_aviso', 'paciente', 'telefono_paciente', 'personal', 'medico',
+            'nombre_consultorio', 'fecha_cita', 'hora_cita', 'forma_envio',
+            'mensaje', 'estado_envio', 'estado_confirmacion']
+
+
+class CursorFalso:
+    description = [(c, None, None, None, None, None, None) for c in COLUMNAS]
+
+
+def generarFilas(n):
+    return [
+        (i, 'JUAN PEREZ', '0981000000', 'ANA GOMEZ', 'DR. LOPEZ', 'CONSULTORIO 1',
+         date(2025, 1 + i % 12, 1 + i % 28), dtime(8 + i % 10, (i * 7) % 60),
+         'WhatsApp', 'Recordatorio de cita', 'Pendiente', 'Pendiente')
+        for i in range(n)
+    ]
+
+
+def actual(cur, rows):
+    """Copia del codigo anterior de getAvisos."""
+    columnas = [desc[0] for desc in cur.description]
+
+    def convert(row):
+        data = dict(zip(columnas, row))
+        if data.get("fecha_cita") and hasattr(data["fecha_cita"], "isoformat"):
+            data["fecha_cita"] = data["fecha_cita"].isoformat()
+        if data.get("hora_cita") and hasattr(data["hora_cita"], "strftime"):
+            data["hora_cita"] = data["hora_cita"].strftime("%H:%M")
+        return data
+
+    return [convert(row) for row in rows]
+
+
+def compilado(cur, rows):
+    return filasComoDicts(cur, rows, {'fecha_cita': fechaISO, 'hora_cita': horaHHMM})
+
+
+def actualSinConversion(cur, rows):
+    """Patron de ConsultasDao/AgendaDao: [dict(zip(columnas, row)) for row in rows]."""
+    columnas = [desc[0] for desc in cur.description]
+    return [dict(zip(columnas, row)) for row in rows]
+
+
+def compiladoSinConversion(cur, rows):
+    return filasComoDicts(cur, rows)
+
+
+def medir(funcion, cur, rows, repeticiones=5):
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(cur, rows)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    cur = CursorFalso()
+    rows = generarFilas(n)
+    assert actual(cur, rows) == compilado(cur, rows)
+
+    t_actual = medir(actual, cur, rows)
+    t_compilado = medir(compilado, cur, rows)
+    print(f"filas: {n}")
+    print(f"dict(zip) + convert(): {t_actual * 1000:8.1f} ms  ({t_actual / n * 1e6:.2f} us/fila)")
+    print(f"mapeador compilado:    {t_compilado * 1000:8.1f} ms  ({t_compilado / n * 1e6:.2f} us/fila)")
+    print(f"mejora: {t_actual / t_compilado:.2f}x")
+
+    assert actualSinConversion(cur, rows) == compiladoSinConversion(cur, rows)
+    t_actual = medir(actualSinConversion, cur, rows)
+    t_compilado = medir(compiladoSinConversion, cur, rows)
+    print("sin conversiones de fecha/hora:")
+    print(f"dict(zip):             {t_actual * 1000:8.1f} ms  ({t_actual / n * 1e6:.2f} us/fila)")
+    print(f"mapeador compilado:    {t_compilado * 1000:8.1f} ms  ({t_compilado / n * 1e6:.2f} us/fila)")
+    print(f"mejora: {t_actual / t_compilado:.2f}x")
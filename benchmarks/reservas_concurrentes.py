@@ -0,0 +1,142 @@
+"""Prueba de carga: reservas simultaneas sobre una misma agenda, sin sobreventa de cupos.
+
+    Necesita PostgreSQL local con datos: una agenda_medica con fecha y una
+    disponibilidad_horaria del mismo medico ese dia.
+
+        python benchmarks/reservas_concurrentes.py --agenda 12 --paciente 3
+            [--clientes 200] [--cupos 50] [--estado 10] [--rondas 3]
+
+    En cada ronda la agenda arranca con `cupos` cupos y `clientes` hilos
+    (cada uno con su propia cita: la hora avanza de a un segundo desde el
+    inicio de la disponibilidad, para no chocar por duplicado) llaman juntos
+    a RegistroCDao.guardarRegistroC. Se reporta reservas/seg y latencia, y
+    se verifica que las reservas exitosas sean exactamente los cupos que
+    habia, que la agenda termine en 0 y que no haya citas de mas. Las citas
+    creadas se borran y los cupos originales se restauran al terminar.
+"""
+import argparse
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+# cada cliente necesita su conexion mientras espera el bloqueo de la agenda
+os.environ.setdefault('DB_POOL_MAX', '220')
+os.environ.setdefault('DB_POOL_TIMEOUT', '60')
+
+import psycopg2
+
+from app import app
+from app.conexion.Conexion import PARAMETROS_DB
+from app.dao.RegisCita.RegistroCDao import RegistroCDao
+
+AGENDA_SQL = """
+    SELECT a.id_medico, a.id_especialidad, a.id_turno, a.fecha_agenda, a.cupos, d.disponibilidad_hora_inicio
+    FROM agenda_medica a
+    JOIN disponibilidad_horaria d ON d.id_medico = a.id_medico AND d.disponibilidad_fecha = a.fecha_agenda
+    WHERE a.id_agenda_medica = %s
+    ORDER BY d.disponibilidad_hora_inicio
+    LIMIT 1
+"""
+
+
+def percentil(ordenados, p):
+    """Percentil p en milisegundos de una lista ya ordenada."""
+    if not ordenados:
+        return float('nan')
+    return ordenados[min(len(ordenados) - 1, len(ordenados) * p // 100)] * 1000
+
+
+def cliente(indice, datos, args, largada, resultados, latencias):
+    id_medico, id_especialidad, id_turno, fecha, _, inicio = datos
+    hora = (datetime.combine(fecha, inicio) + timedelta(seconds=indice)).time()
+    dao = RegistroCDao()
+    with app.app_context():
+        largada.wait()
+        t0 = time.perf_counter()
+        resultado = dao.guardarRegistroC(args.paciente, id_medico, id_especialidad, id_turno, fecha,
+                                         hora, args.estado, 'prueba de carga', args.agenda)
+        latencias.append(time.perf_counter() - t0)
+    resultados.append(resultado)
+
+
+def ronda(con, datos, args):
+    """Una ronda completa; retorna (ok, duracion, resultados, latencias, cupos_finales, citas_creadas)."""
+    cur = con.cursor()
+    cur.execute("UPDATE agenda_medica SET cupos = %s WHERE id_agenda_medica = %s", (args.cupos, args.agenda))
+    con.commit()
+
+    resultados, latencias = [], []
+    largada = threading.Barrier(args.clientes + 1)
+    hilos = [threading.Thread(target=cliente, args=(i, datos, args, largada, resultados, latencias))
+             for i in range(args.clientes)]
+    for hilo in hilos:
+        hilo.start()
+    largada.wait()
+    t0 = time.perf_counter()
+    for hilo in hilos:
+        hilo.join()
+    duracion = time.perf_counter() - t0
+
+    creadas = [r for r in resultados if isinstance(r, int)]
+    cur.execute("SELECT cupos FROM agenda_medica WHERE id_agenda_medica = %s", (args.agenda,))
+    cupos_finales = cur.fetchone()[0]
+    cur.execute("SELECT count(*) FROM cita WHERE id_cita = ANY(%s)", (creadas,))
+    en_base = cur.fetchone()[0]
+
+    esperadas = min(args.cupos, args.clientes)
+    ok = (len(creadas) == esperadas == en_base
+          and cupos_finales == args.cupos - esperadas
+          and all(r == 'SIN_CUPOS' or isinstance(r, int) for r in resultados))
+
+    cur.execute("DELETE FROM cita WHERE id_cita = ANY(%s)", (creadas,))
+    con.commit()
+    cur.close()
+    return ok, duracion, resultados, latencias, cupos_finales, len(creadas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--agenda', type=int, required=True, help='id_agenda_medica')
+    parser.add_argument('--paciente', type=int, required=True, help='id_paciente de las citas de prueba')
+    parser.add_argument('--clientes', type=int, default=200)
+    parser.add_argument('--cupos', type=int, default=50)
+    parser.add_argument('--estado', type=int, default=10, help='estado inicial (debe ocupar cupo)')
+    parser.add_argument('--rondas', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.estado not in RegistroCDao().estados_que_usan_cupo():
+        raise SystemExit(f"El estado {args.estado} no ocupa cupo")
+
+    con = psycopg2.connect(**PARAMETROS_DB)
+    cur = con.cursor()
+    cur.execute(AGENDA_SQL, (args.agenda,))
+    datos = cur.fetchone()
+    cur.close()
+    if datos is None:
+        raise SystemExit(f"La agenda {args.agenda} no existe o su medico no tiene disponibilidad ese dia")
+    cupos_originales = datos[4]
+
+    print(f"agenda={args.agenda} clientes={args.clientes} cupos={args.cupos} rondas={args.rondas}")
+    todo_ok = True
+    try:
+        for n in range(1, args.rondas + 1):
+            ok, duracion, resultados, latencias, cupos_finales, creadas = ronda(con, datos, args)
+            todo_ok &= ok
+            latencias.sort()
+            otros = [r for r in resultados if not isinstance(r, int) and r != 'SIN_CUPOS']
+            print(f"ronda {n}: {len(resultados) / duracion:7.0f} reservas/s  "
+                  f"p50={percentil(latencias, 50):.1f}ms p95={percentil(latencias, 95):.1f}ms  "
+                  f"creadas={creadas} sin_cupos={resultados.count('SIN_CUPOS')} otros={len(otros)}  "
+                  f"cupos_finales={cupos_finales}  {'OK' if ok else 'SOBREVENTA O ERROR'}")
+    finally:
+        cur = con.cursor()
+        cur.execute("UPDATE agenda_medica SET cupos = %s WHERE id_agenda_medica = %s",
+                    (cupos_originales, args.agenda))
+        con.commit()
+        con.close()
+    print("OK" if todo_ok else "FALLO")
+
+
+if __name__ == '__main__':
+    main()
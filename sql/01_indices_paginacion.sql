@@ -0,0 +1,33 @@
+-- Indices para la paginacion por clave (keyset) de los listados de /api/v1.
+--
+-- Cada indice tiene las mismas columnas y el mismo orden que el Keyset del DAO,
+-- asi "WHERE (fecha, hora, id) < (...) ORDER BY ... LIMIT n" es un recorrido
+-- de indice que arranca en el cursor: la pagina N cuesta lo mismo que la 1.
+--
+-- CONCURRENTLY no bloquea escrituras; ejecutar fuera de una transaccion:
+--   psql -d agendamiento -f sql/01_indices_paginacion.sql
+
+-- /consultas  (ConsultasDao.KEYSET_CONSULTAS)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_consultas_cabecera_fecha_hora_id
+    ON consultas_cabecera (fecha_cita DESC, hora_cita DESC, id_consulta_cab DESC);
+
+-- /registroc  (RegistroCDao.KEYSET_CITAS)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cita_fecha_hora_id
+    ON cita (fecha_cita DESC, hora DESC, id_cita DESC);
+
+-- /avisos  (AvisoRecordatorioDao.KEYSET_AVISOS)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_avisos_recordatorios_fecha_hora_id
+    ON avisos_recordatorios (fecha_cita DESC, hora_cita DESC, id_aviso DESC);
+
+-- /Diagnostico  (DiagnosticoDao.KEYSET_DIAGNOSTICOS)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_diagnosticos_fecha_id
+    ON diagnosticos (fecha_diagnostico DESC, id_diagnostico DESC);
+
+-- /Tratamiento  (TratamientoDao.KEYSET_TRATAMIENTOS)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tratamientos_fecha_id
+    ON tratamientos (fecha_tratamiento DESC, id_tratamiento DESC);
+
+-- /paciente y /fichas se paginan por su clave primaria, que ya tiene indice.
+-- Los medicamentos de cada ficha se buscan por id_ficha_medica (LATERAL en FichaMedicaDao).
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ficha_medicamento_ficha
+    ON ficha_medicamento (id_ficha_medica);
@@ -0,0 +1,50 @@
+-- Aviso de cambios en tablas referenciales y maestras para las caches en memoria.
+--
+-- Cada INSERT/UPDATE/DELETE (y TRUNCATE) manda un NOTIFY por el canal
+-- cambios_tablas con {"tabla": ..., "op": ...}. Cada worker escucha ese canal
+-- en un hilo (app.conexion.Notificaciones) y descarta lo que tenga en cache
+-- de esa tabla, aunque el cambio lo haya hecho otro worker u otro nodo.
+--
+-- El trigger es por sentencia: una carga masiva manda un solo aviso, y
+-- PostgreSQL entrega los NOTIFY recien al confirmar la transaccion.
+--
+--   psql -d agendamiento -f sql/02_notificar_cambios.sql
+
+CREATE OR REPLACE FUNCTION notificar_cambio_tabla() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify(
+        'cambios_tablas',
+        json_build_object('tabla', TG_TABLE_NAME, 'op', TG_OP)::text
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    tabla text;
+BEGIN
+    FOREACH tabla IN ARRAY ARRAY[
+        -- referenciales (app/dao/referenciales/Catalogo.py)
+        'sexos', 'paises', 'nacionalidades', 'ocupaciones', 'estado_civil',
+        'duracion_consulta', 'ciudad', 'cargo', 'estado_cita', 'especialidad',
+        'dia', 'turno', 'sintoma', 'tipo_analisis', 'tipo_estudio', 'medicamento',
+        'tipo_diagnostico', 'tipo_procedimiento_medico',
+        -- maestras
+        'personas', 'medico', 'consultorio'
+    ]
+    LOOP
+        IF to_regclass(tabla) IS NULL THEN
+            RAISE NOTICE 'tabla % no existe, se omite', tabla;
+            CONTINUE;
+        END IF;
+        EXECUTE format('DROP TRIGGER IF EXISTS trg_notificar_cambio ON %I', tabla);
+        EXECUTE format(
+            'CREATE TRIGGER trg_notificar_cambio
+                AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %I
+                FOR EACH STATEMENT EXECUTE FUNCTION notificar_cambio_tabla()',
+            tabla
+        );
+    END LOOP;
+END;
+$$;
@@ -0,0 +1,66 @@
+-- Version por tabla para ETag / Last-Modified (app/conexion/Condicional.py).
+--
+-- Cada sentencia que modifica una tabla de la lista sube su version en la
+-- misma transaccion: la vista que lee la version despues del commit nunca
+-- ve una version nueva con datos viejos ni al reves.
+--
+-- No se incluyen cita, disponibilidad_horaria ni agenda_medica: cada
+-- reserva, cancelacion o movimiento las modifica (agenda_medica.cupos) y la
+-- fila de version seria un punto de bloqueo para todas las reservas. Los
+-- listados de agenda muestran los cupos, asi que tampoco sirve versionar
+-- agenda_medica sin contar los cambios de cupos.
+--
+--   psql -d agendamiento -f sql/03_versiones_tablas.sql
+
+CREATE TABLE IF NOT EXISTS versiones_tablas (
+    tabla       text PRIMARY KEY,
+    version     bigint NOT NULL DEFAULT 1,
+    modificado  timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE OR REPLACE FUNCTION incrementar_version_tabla() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO versiones_tablas (tabla) VALUES (TG_TABLE_NAME)
+    ON CONFLICT (tabla) DO UPDATE
+        SET version = versiones_tablas.version + 1,
+            modificado = now();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    tabla text;
+BEGIN
+    FOREACH tabla IN ARRAY ARRAY[
+        -- referenciales (app/dao/referenciales/Catalogo.py)
+        'sexos', 'paises', 'nacionalidades', 'ocupaciones', 'estado_civil',
+        'duracion_consulta', 'ciudad', 'cargo', 'estado_cita', 'especialidad',
+        'dia', 'turno', 'sintoma', 'tipo_analisis', 'tipo_estudio', 'medicamento',
+        'tipo_diagnostico', 'tipo_procedimiento_medico',
+        -- maestras
+        'personas', 'medico', 'consultorio', 'personal', 'paciente'
+    ]
+    LOOP
+        IF to_regclass(tabla) IS NULL THEN
+            RAISE NOTICE 'tabla % no existe, se omite', tabla;
+            CONTINUE;
+        END IF;
+        -- la fila existe desde el principio: sin ella Condicional no emite ETag
+        INSERT INTO versiones_tablas (tabla) VALUES (tabla) ON CONFLICT DO NOTHING;
+        EXECUTE format('DROP TRIGGER IF EXISTS trg_version_tabla ON %I', tabla);
+        EXECUTE format(
+            'CREATE TRIGGER trg_version_tabla
+                AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %I
+                FOR EACH STATEMENT EXECUTE FUNCTION incrementar_version_tabla()',
+            tabla
+        );
+    END LOOP;
+
+    -- instalaciones anteriores versionaban agenda_medica
+    IF to_regclass('agenda_medica') IS NOT NULL THEN
+        DROP TRIGGER IF EXISTS trg_version_tabla ON agenda_medica;
+    END IF;
+    DELETE FROM versiones_tablas WHERE tabla = 'agenda_medica';
+END;
+$$;
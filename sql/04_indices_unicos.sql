@@ -0,0 +1,60 @@
+-- Indices unicos que reemplazan las verificaciones SELECT-antes-del-INSERT.
+--
+-- Los DAO insertan con INSERT ... ON CONFLICT DO NOTHING RETURNING: si no
+-- vuelve fila el registro ya existia y la API responde 409 con el mismo
+-- mensaje de antes. En los UPDATE el choque llega como UniqueViolation.
+-- Una sola ida a la base y sin carrera entre dos altas simultaneas.
+--
+-- Cada indice usa la misma comparacion que hacia el existeDuplicado que
+-- reemplaza (Catalogo.py: 'exacto', 'mayusculas' o 'normalizado').
+--
+-- Si ya hay duplicados el CREATE falla; para encontrarlos, por ejemplo:
+--   SELECT UPPER(descripcion), count(*) FROM sexos GROUP BY 1 HAVING count(*) > 1;
+--
+--   psql -d agendamiento -f sql/04_indices_unicos.sql
+
+-- referenciales con comparacion exacta
+CREATE UNIQUE INDEX IF NOT EXISTS ux_ciudad_descripcion ON ciudad (descripcion);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_cargo_descripcion ON cargo (descripcion);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_estado_cita_descripcion ON estado_cita (descripcion);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_especialidad_descripcion ON especialidad (descripcion);
+
+-- referenciales sin distinguir mayusculas
+CREATE UNIQUE INDEX IF NOT EXISTS ux_sexos_descripcion ON sexos (UPPER(descripcion));
+CREATE UNIQUE INDEX IF NOT EXISTS ux_paises_descripcion ON paises (UPPER(descripcion));
+CREATE UNIQUE INDEX IF NOT EXISTS ux_nacionalidades_descripcion ON nacionalidades (UPPER(descripcion));
+CREATE UNIQUE INDEX IF NOT EXISTS ux_ocupaciones_descripcion ON ocupaciones (UPPER(descripcion));
+CREATE UNIQUE INDEX IF NOT EXISTS ux_estado_civil_descripcion ON estado_civil (UPPER(descripcion));
+CREATE UNIQUE INDEX IF NOT EXISTS ux_duracion_consulta_descripcion ON duracion_consulta (UPPER(descripcion));
+CREATE UNIQUE INDEX IF NOT EXISTS ux_sintoma_descripcion ON sintoma (UPPER(descripcion_sintoma));
+CREATE UNIQUE INDEX IF NOT EXISTS ux_tipo_analisis_descripcion ON tipo_analisis (UPPER(descripcion_analisis));
+CREATE UNIQUE INDEX IF NOT EXISTS ux_tipo_estudio_descripcion ON tipo_estudio (UPPER(descripcion_estudio));
+CREATE UNIQUE INDEX IF NOT EXISTS ux_tipo_diagnostico_descripcion
+    ON tipo_diagnostico (UPPER(descripcion_diagnostico));
+CREATE UNIQUE INDEX IF NOT EXISTS ux_tipo_procedimiento_medico_procedimiento
+    ON tipo_procedimiento_medico (UPPER(procedimiento));
+CREATE UNIQUE INDEX IF NOT EXISTS ux_medicamento
+    ON medicamento (UPPER(nombre_medicamento), UPPER(dosis), UPPER(forma_farmaceutica));
+
+-- dia y turno: sin distinguir mayusculas ni espacios de los extremos
+CREATE UNIQUE INDEX IF NOT EXISTS ux_dia_descripcion ON dia (LOWER(TRIM(descripcion)));
+CREATE UNIQUE INDEX IF NOT EXISTS ux_turno_descripcion ON turno (LOWER(TRIM(descripcion)));
+
+-- maestras
+CREATE UNIQUE INDEX IF NOT EXISTS ux_medico_cedula ON medico (cedula);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_medico_num_registro ON medico (num_registro);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_personal_cedula ON personal (cedula);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_personal_correo ON personal (correo);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_paciente_cedula ON paciente (cedula_entidad);
+
+-- consultorio: ni el nombre ni el correo se repiten, sin distinguir mayusculas
+CREATE UNIQUE INDEX IF NOT EXISTS ux_consultorio_nombre ON consultorio (UPPER(nombre_consultorio));
+CREATE UNIQUE INDEX IF NOT EXISTS ux_consultorio_correo ON consultorio (UPPER(correo));
+
+-- agenda: mismo medico, dia, turno, consultorio, fecha y horario. Los NULL
+-- se comparan como iguales (COALESCE) para que dos agendas sin fecha choquen.
+CREATE UNIQUE INDEX IF NOT EXISTS ux_agenda_medica ON agenda_medica (
+    id_medico, id_dia, id_turno, codigo,
+    COALESCE(fecha_agenda, '-infinity'::date),
+    COALESCE(horario_disponible, '')
+);
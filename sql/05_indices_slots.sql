@@ -0,0 +1,15 @@
+-- Indices para el calculo de slots libres (app/dao/AgendMedica/SlotsDao.py).
+--
+-- SLOTS_PERIODO_SQL lee las disponibilidades y las citas de uno o varios
+-- medicos en un periodo: con estos indices cada parte es un recorrido por
+-- rango (id_medico, fecha) y no un barrido de la tabla.
+--
+--   psql -d agendamiento -f sql/05_indices_slots.sql
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_disponibilidad_medico_fecha
+    ON disponibilidad_horaria (id_medico, disponibilidad_fecha, disponibilidad_hora_inicio);
+
+-- las citas canceladas / no asistidas (14, 15) no ocupan lugar
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cita_medico_fecha_hora_activas
+    ON cita (id_medico, fecha_cita, hora)
+    WHERE id_estado NOT IN (14, 15);
@@ -0,0 +1,59 @@
+-- Avisos por fila de citas y disponibilidades para el indice de slots libres.
+--
+-- app/dao/AgendMedica/IndiceSlots.py guarda en memoria los slots libres de
+-- cada medico por dia. Cada fila de cita o disponibilidad_horaria que cambia
+-- manda por cambios_tablas {"tabla", "op", "id_medico", "fecha"} (la fila
+-- vieja y la nueva si es un UPDATE que la mueve) y el indice recalcula solo
+-- ese medico en ese dia. PostgreSQL junta los avisos repetidos de una misma
+-- transaccion, asi que una carga de muchas citas del mismo dia manda uno.
+--
+-- TRUNCATE usa el aviso por sentencia de sql/02_notificar_cambios.sql: sin
+-- id_medico, el indice se vacia entero.
+--
+--   psql -d agendamiento -f sql/02_notificar_cambios.sql   (funcion notificar_cambio_tabla)
+--   psql -d agendamiento -f sql/06_notificar_agenda.sql
+
+CREATE OR REPLACE FUNCTION notificar_cambio_agenda() RETURNS trigger AS $$
+DECLARE
+    fila jsonb;
+BEGIN
+    -- TG_ARGV[0]: columna de fecha de la tabla
+    FOREACH fila IN ARRAY ARRAY[
+        CASE WHEN TG_OP <> 'INSERT' THEN to_jsonb(OLD) END,
+        CASE WHEN TG_OP <> 'DELETE' THEN to_jsonb(NEW) END
+    ]
+    LOOP
+        CONTINUE WHEN fila IS NULL;
+        PERFORM pg_notify(
+            'cambios_tablas',
+            json_build_object(
+                'tabla', TG_TABLE_NAME,
+                'op', TG_OP,
+                'id_medico', fila->>'id_medico',
+                'fecha', fila->>TG_ARGV[0]
+            )::text
+        );
+    END LOOP;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_notificar_agenda ON cita;
+CREATE TRIGGER trg_notificar_agenda
+    AFTER INSERT OR UPDATE OR DELETE ON cita
+    FOR EACH ROW EXECUTE FUNCTION notificar_cambio_agenda('fecha_cita');
+
+DROP TRIGGER IF EXISTS trg_notificar_agenda ON disponibilidad_horaria;
+CREATE TRIGGER trg_notificar_agenda
+    AFTER INSERT OR UPDATE OR DELETE ON disponibilidad_horaria
+    FOR EACH ROW EXECUTE FUNCTION notificar_cambio_agenda('disponibilidad_fecha');
+
+DROP TRIGGER IF EXISTS trg_notificar_cambio ON cita;
+CREATE TRIGGER trg_notificar_cambio
+    AFTER TRUNCATE ON cita
+    FOR EACH STATEMENT EXECUTE FUNCTION notificar_cambio_tabla();
+
+DROP TRIGGER IF EXISTS trg_notificar_cambio ON disponibilidad_horaria;
+CREATE TRIGGER trg_notificar_cambio
+    AFTER TRUNCATE ON disponibilidad_horaria
+    FOR EACH STATEMENT EXECUTE FUNCTION notificar_cambio_tabla();
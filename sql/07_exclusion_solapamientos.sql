@@ -0,0 +1,54 @@
+-- Restricciones de exclusion que reemplazan las verificaciones de solapamiento
+-- SELECT-antes-del-INSERT de disponibilidad_horaria y consultas_cabecera.
+--
+-- Cada fila guarda su intervalo en una columna generada (tsrange) y la
+-- restriccion EXCLUDE rechaza, con un indice GiST, otra fila del mismo medico
+-- (o consultorio) cuyo intervalo se cruce. La verificacion y el INSERT son
+-- una sola operacion: dos altas simultaneas ya no pueden pasar las dos.
+-- Los DAO capturan ExclusionViolation y responden con el mismo mensaje de antes.
+--
+-- disponibilidad_horaria: [inicio, fin), igual que existeDisponibilidad.
+-- consultas_cabecera: [fecha + hora, + duracion_minutos); sin duracion la
+-- consulta ocupa solo su hora de inicio ('[]'), que es lo que comparaba
+-- _validar_consulta_duplicada.
+--
+-- Si ya hay solapamientos el ADD CONSTRAINT falla; para encontrarlos, por ejemplo:
+--   SELECT a.id_disponibilidad, b.id_disponibilidad
+--   FROM disponibilidad_horaria a JOIN disponibilidad_horaria b
+--     ON a.id_medico = b.id_medico AND a.id_disponibilidad < b.id_disponibilidad
+--    AND a.rango && b.rango;
+--
+--   psql -d agendamiento -f sql/07_exclusion_solapamientos.sql
+
+-- igualdad de enteros dentro de un indice GiST
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+ALTER TABLE disponibilidad_horaria
+    ADD COLUMN IF NOT EXISTS rango tsrange GENERATED ALWAYS AS (
+        tsrange(disponibilidad_fecha + disponibilidad_hora_inicio,
+                disponibilidad_fecha + disponibilidad_hora_fin, '[)')
+    ) STORED;
+
+ALTER TABLE consultas_cabecera
+    ADD COLUMN IF NOT EXISTS rango tsrange GENERATED ALWAYS AS (
+        CASE WHEN COALESCE(duracion_minutos, 0) > 0
+             THEN tsrange(fecha_cita + hora_cita,
+                          fecha_cita + hora_cita + duracion_minutos * interval '1 minute', '[)')
+             ELSE tsrange(fecha_cita + hora_cita, fecha_cita + hora_cita, '[]')
+        END
+    ) STORED;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'ex_disponibilidad_solapada') THEN
+        ALTER TABLE disponibilidad_horaria
+            ADD CONSTRAINT ex_disponibilidad_solapada
+            EXCLUDE USING gist (id_medico WITH =, rango WITH &&);
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'ex_consulta_solapada') THEN
+        ALTER TABLE consultas_cabecera
+            ADD CONSTRAINT ex_consulta_solapada
+            EXCLUDE USING gist (id_consultorio WITH =, rango WITH &&);
+    END IF;
+END;
+$$;
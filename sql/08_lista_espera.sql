@@ -0,0 +1,36 @@
+-- Lista de espera por especialidad y fecha (app/dao/RegisCita/ListaEsperaDao.py).
+--
+-- Cuando una cita pasa a Cancelado / No Asistio (14, 15) y devuelve su cupo,
+-- RegistroCDao.updateRegistroC ofrece el lugar al primero de la lista en la
+-- misma transaccion y deja un aviso pendiente en avisos_recordatorios.
+--
+-- La cola es el indice parcial ix_lista_espera_cola: el primero de una
+-- (especialidad, fecha) se encuentra bajando por el indice en orden de
+-- prioridad y antiguedad, sin recorrer la tabla. FOR UPDATE SKIP LOCKED hace
+-- que dos cancelaciones simultaneas ofrezcan el lugar a pacientes distintos.
+--
+--   psql -d agendamiento -f sql/08_lista_espera.sql
+
+CREATE TABLE IF NOT EXISTS lista_espera (
+    id_espera         serial PRIMARY KEY,
+    id_paciente       integer NOT NULL REFERENCES paciente (id_paciente),
+    id_especialidad   integer NOT NULL REFERENCES especialidad (id_especialidad),
+    id_medico         integer REFERENCES medico (id_medico),   -- NULL: cualquier medico
+    fecha             date NOT NULL,
+    prioridad         smallint NOT NULL DEFAULT 3,             -- 1 = mas urgente
+    estado            text NOT NULL DEFAULT 'EN_ESPERA'
+                      CHECK (estado IN ('EN_ESPERA', 'OFRECIDA', 'ASIGNADA', 'RETIRADA')),
+    creado            timestamptz NOT NULL DEFAULT now(),
+    id_cita_liberada  integer REFERENCES cita (id_cita) ON DELETE SET NULL,
+    ofrecido_en       timestamptz,
+    id_cita           integer REFERENCES cita (id_cita) ON DELETE SET NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_lista_espera_cola
+    ON lista_espera (id_especialidad, fecha, prioridad, creado, id_espera)
+    WHERE estado = 'EN_ESPERA';
+
+-- un paciente espera una sola vez por especialidad y fecha
+CREATE UNIQUE INDEX IF NOT EXISTS ux_lista_espera_paciente
+    ON lista_espera (id_paciente, id_especialidad, fecha)
+    WHERE estado IN ('EN_ESPERA', 'OFRECIDA');
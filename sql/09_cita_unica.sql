@@ -0,0 +1,22 @@
+-- Una sola cita activa por medico, fecha y hora.
+--
+-- RESERVAR_CITA_SQL (app/dao/RegisCita/RegistroCDao.py) controla el
+-- duplicado con un EXISTS que lee la foto de la sentencia: dos reservas
+-- simultaneas de la misma hora lo pasan las dos. Con este indice la segunda
+-- espera a la primera y su INSERT ... ON CONFLICT DO NOTHING no inserta; el
+-- DAO responde "DUPLICADO". En los UPDATE el choque llega como
+-- UniqueViolation. Las canceladas / no asistio (14, 15) no cuentan.
+--
+-- El ON CONFLICT no nombra el indice: el codigo funciona antes de correr
+-- este script (solo con el control de duplicado) y toma la proteccion en
+-- cuanto el indice existe. Se puede aplicar en cualquier momento.
+--
+-- Si ya hay duplicados el CREATE falla; para encontrarlos:
+--   SELECT id_medico, fecha_cita, hora, count(*) FROM cita
+--   WHERE id_estado NOT IN (14, 15) GROUP BY 1, 2, 3 HAVING count(*) > 1;
+--
+--   psql -d agendamiento -f sql/09_cita_unica.sql
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_cita_activa
+    ON cita (id_medico, fecha_cita, hora)
+    WHERE id_estado NOT IN (14, 15);